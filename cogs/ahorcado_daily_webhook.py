@@ -11,6 +11,8 @@ from discord.ext import commands
 
 from aiohttp import web
 
+from cogs.message_router import MessageContext, get_router
+
 log = logging.getLogger(__name__)
 
 def _extract_share_stats(text: str) -> Optional[dict]:
@@ -119,6 +121,14 @@ class AhorcadoDailyWebhookCog(commands.Cog):
         self._share_seen: set[int] = set()
 
     async def cog_load(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.register(
+                "ahorcado.share",
+                self._on_share_message,
+                owner=self,
+                predicate=lambda ctx: len(ctx.text) >= 30,
+            )
         secret = (os.getenv("AHORCADO_WEBHOOK_SECRET") or "").strip()
         port = _env_int("AHORCADO_WEBHOOK_PORT", 0)
         if not secret or port <= 0:
@@ -137,6 +147,9 @@ class AhorcadoDailyWebhookCog(commands.Cog):
         log.info("Ahorcado webhook: escuchando en http://%s:%s/ahorcado/daily", host, port)
 
     async def cog_unload(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
         try:
             if self._site:
                 await self._site.stop()
@@ -180,10 +193,10 @@ class AhorcadoDailyWebhookCog(commands.Cog):
             db = getattr(self.bot, "economia_db", None)
             if not db:
                 return web.json_response({"ok": False, "error": "db_unavailable"}, status=503)
-            prog = db.get_progress_diaria(uid)
+            prog = await db.aio.get_progress_diaria(uid)
             if int(prog.get("dia_ahorcado") or 0) >= 1 and int(prog.get("dia_ahorcado_id") or 0) == id_dia:
                 return web.json_response({"ok": False, "error": "already_submitted"}, status=409)
-            db.mark_diaria_ahorcado_result(uid, id_dia)
+            await db.aio.mark_diaria_ahorcado_result(uid, id_dia)
 
             # Publicar en Discord (por defecto, #general)
             ch_id = _env_int("AHORCADO_DAILY_CHANNEL_ID", 0) or _env_int("GENERAL_CHANNEL_ID", 0)
@@ -217,15 +230,10 @@ class AhorcadoDailyWebhookCog(commands.Cog):
             log.exception("Ahorcado webhook: error inesperado")
             return web.json_response({"ok": False, "error": "internal_error"}, status=500)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+    async def _on_share_message(self, ctx: MessageContext):
         # Cuando alguien pega el cuadrito del share del ahorcado, respondemos con embed + botones.
-        if message.author.bot or not message.guild:
-            return
-        txt = (message.content or "").strip()
-        if len(txt) < 30:
-            return
-        stats = _extract_share_stats(txt)
+        message = ctx.message
+        stats = _extract_share_stats(ctx.text)
         if not stats:
             return
         if message.id in self._share_seen:
@@ -256,9 +264,9 @@ class AhorcadoDailyWebhookCog(commands.Cog):
             if day == today_id:
                 db = getattr(self.bot, "economia_db", None)
                 if db:
-                    prog = db.get_progress_diaria(message.author.id)
+                    prog = await db.aio.get_progress_diaria(message.author.id)
                     if not (int(prog.get("dia_ahorcado") or 0) >= 1 and int(prog.get("dia_ahorcado_id") or 0) == day):
-                        db.mark_diaria_ahorcado_result(message.author.id, day)
+                        await db.aio.mark_diaria_ahorcado_result(message.author.id, day)
         except Exception:
             pass
 
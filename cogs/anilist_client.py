@@ -0,0 +1,265 @@
+# Cliente compartido de AniList (GraphQL público): una sesión aiohttp reutilizada, caché TTL+LRU,
+# coalescencia de pedidos idénticos en vuelo y token bucket que respeta X-RateLimit-Remaining / Retry-After.
+# `timeout` de `query` es un plazo total (espera de token + HTTP): si el bucket o un 429 no se liberan antes,
+# devuelve None enseguida en vez de dormir (el que pregunta en Discord no espera un minuto de Retry-After).
+# Lo usan oracle_media (recomendaciones / fichas), economia/trivia_anilist e impostor/chars.
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+ANILIST_GQL_URL = "https://graphql.anilist.co"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _anilist_ua() -> str:
+    u = (os.getenv("ORACLE_ANILIST_UA") or "").strip()
+    return u or "AnimeAlToqueOracle/1.0 (Discord bot) Python/aiohttp — AniList GraphQL"
+
+
+CacheKey = Tuple[str, str]
+
+
+class AniListClient:
+    def __init__(
+        self,
+        *,
+        url: str = ANILIST_GQL_URL,
+        cache_ttl: Optional[float] = None,
+        cache_max: Optional[int] = None,
+        rate_per_min: Optional[float] = None,
+        burst: Optional[float] = None,
+    ):
+        self.url = url
+        self.cache_ttl = _env_float("ANILIST_CACHE_TTL_S", 900.0) if cache_ttl is None else float(cache_ttl)
+        self.cache_max = int(_env_float("ANILIST_CACHE_MAX", 512) if cache_max is None else cache_max)
+        # AniList documenta 90 req/min (a veces degradado a 30): por defecto vamos con el piso.
+        rate = _env_float("ANILIST_RATE_PER_MIN", 30.0) if rate_per_min is None else float(rate_per_min)
+        self.rate_per_s = max(0.01, rate / 60.0)
+        self.capacity = max(1.0, _env_float("ANILIST_BURST", 5.0) if burst is None else float(burst))
+        self._tokens = self.capacity
+        self._refill_ts = time.monotonic()
+        self._blocked_until = 0.0
+        self._cache: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.shed = 0
+
+    # --- Caché ---
+
+    @staticmethod
+    def cache_key(query: str, variables: Optional[Dict[str, Any]]) -> CacheKey:
+        return " ".join(query.split()), json.dumps(variables or {}, sort_keys=True, ensure_ascii=False)
+
+    def _cache_get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _cache_put(self, key: CacheKey, data: Dict[str, Any], ttl: float) -> None:
+        if ttl <= 0 or self.cache_max <= 0:
+            return
+        self._cache[key] = (time.monotonic() + ttl, data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max:
+            self._cache.popitem(last=False)
+
+    # --- Sesión y límite ---
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sesión / futures son de un loop; en tests (asyncio.run repetido) se rehacen.
+            self._loop = loop
+            self._session = None
+            self._inflight = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300),
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                    "User-Agent": _anilist_ua(),
+                },
+            )
+        return self._session
+
+    async def _acquire_token(self, deadline: float) -> bool:
+        """
+        Toma un token del bucket. False sin esperar si no hay token (o el bloqueo por 429 no termina)
+        antes de `deadline` (time.monotonic()). Chequeo y descuento van sin await en el medio: no hace falta lock.
+        """
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._refill_ts) * self.rate_per_s)
+            self._refill_ts = now
+            if now < self._blocked_until:
+                ready_at = self._blocked_until
+            elif self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            else:
+                ready_at = now + (1.0 - self._tokens) / self.rate_per_s
+            if ready_at > deadline:
+                self.shed += 1
+                return False
+            self.throttled += 1
+            await asyncio.sleep(ready_at - now)
+
+    def _apply_rate_headers(self, status: int, headers: Any) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            try:
+                self._tokens = min(self._tokens, float(remaining))
+            except ValueError:
+                pass
+        retry_after = headers.get("Retry-After")
+        if status == 429 or retry_after is not None:
+            try:
+                wait = float(retry_after) if retry_after is not None else 60.0
+            except ValueError:
+                wait = 60.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + max(0.0, wait))
+            self._tokens = 0.0
+
+    # --- API ---
+
+    async def query(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        *,
+        ttl: Optional[float] = None,
+        timeout: float = 8.0,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve `data` del GraphQL (None si falla, hay `errors` o el límite corta).
+        `timeout` acota todo el pedido, incluida la espera por el límite de AniList.
+        """
+        self._bind_loop()
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        key = self.cache_key(query, variables)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(fut), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                return None
+
+        self.misses += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        data: Optional[Dict[str, Any]] = None
+        try:
+            data = await self._post(query, variables, deadline)
+            if data is not None:
+                self._cache_put(key, data, self.cache_ttl if ttl is None else float(ttl))
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+            if not fut.done():
+                fut.set_result(data)
+        return data
+
+    async def _post(self, query: str, variables: Optional[Dict[str, Any]], deadline: float) -> Optional[Dict[str, Any]]:
+        if not await self._acquire_token(deadline):
+            log.debug("anilist: límite de tasa, se descarta el pedido (plazo vencido)")
+            return None
+        total = deadline - time.monotonic()
+        if total <= 0:
+            self.shed += 1
+            return None
+        self.requests += 1
+        client_timeout = aiohttp.ClientTimeout(total=total, connect=min(4.0, total), sock_read=min(4.0, total))
+        try:
+            async with self._get_session().post(
+                self.url, json={"query": query, "variables": variables or {}}, timeout=client_timeout
+            ) as resp:
+                self._apply_rate_headers(resp.status, resp.headers)
+                if resp.status != 200:
+                    self.errors += 1
+                    log.debug("anilist: HTTP %s", resp.status)
+                    return None
+                payload = await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.errors += 1
+            log.debug("anilist: error de red", exc_info=True)
+            return None
+        except Exception:
+            self.errors += 1
+            log.debug("anilist: error inesperado", exc_info=True)
+            return None
+
+        if not isinstance(payload, dict):
+            return None
+        if payload.get("errors"):
+            log.debug("anilist: errors=%s", payload.get("errors")[:1])
+            return None
+        data = payload.get("data")
+        return data if isinstance(data, dict) else None
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "shed": self.shed,
+            "cached": len(self._cache),
+        }
+
+
+_CLIENT: Optional[AniListClient] = None
+
+
+def get_client() -> AniListClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = AniListClient()
+    return _CLIENT
+
+
+async def close_client() -> None:
+    if _CLIENT is not None:
+        await _CLIENT.close()
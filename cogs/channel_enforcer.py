@@ -6,6 +6,8 @@ from typing import FrozenSet, Optional
 import discord
 from discord.ext import commands
 
+from cogs.message_router import MessageContext, get_router
+
 
 def _env_truthy(key: str) -> bool:
     return os.getenv(key, "").strip().lower() in ("1", "true", "yes", "on")
@@ -18,19 +20,6 @@ def _normalize_token_fragment(s: str) -> str:
     return ascii_fold.lower()
 
 
-def _normalized_message_content(message: discord.Message) -> str:
-    """
-    Algunos teclados mandan '？' (U+FF1F) en vez de '?'.
-    Normalizamos solo el primer carácter para que el prefijo siga funcionando.
-    """
-    raw = (message.content or "").strip()
-    if raw.startswith("\ufeff"):
-        raw = raw.lstrip("\ufeff").strip()
-    if raw.startswith("？"):
-        return "?" + raw[1:]
-    return raw
-
-
 def _prefix_first_token(content: str) -> str:
     """Primer token tras '?' (sin acentos, minúsculas). Ej.: guía → guia."""
     raw = (content or "").strip()
@@ -71,6 +60,20 @@ class ChannelEnforcerCog(commands.Cog, name="Limpieza de Chat"):
             self.general_id = 0
             self.bot_channel_id = 0
 
+    async def cog_load(self):
+        router = get_router(self.bot)
+        if router and self.general_id and self.bot_channel_id:
+            # `ctx.text` ya viene sin BOM y con `？` (teclados de ancho completo) pasado a `?`.
+            router.register(
+                "channel_enforcer.general", self._on_general_message, owner=self,
+                channels=(self.general_id,), predicate=lambda ctx: ctx.prefix == "?",
+            )
+
+    async def cog_unload(self):
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+
     def _tokens_for_bot(self) -> FrozenSet[str]:
         # Nota: los comandos pueden cargarse después de este cog (extensiones).
         # Si cacheamos para siempre, terminamos borrando comandos válidos en #general.
@@ -78,19 +81,11 @@ class ChannelEnforcerCog(commands.Cog, name="Limpieza de Chat"):
             self._allowed_tokens_cache = _allowed_prefix_tokens(self.bot)
         return self._allowed_tokens_cache
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
-            return
+    async def _on_general_message(self, ctx: MessageContext):
         if _env_truthy("DISABLE_CHANNEL_PREFIX_ENFORCER"):
             return
-        if self.general_id == 0 or self.bot_channel_id == 0:
-            return
-
-        if message.channel.id != self.general_id:
-            return
-
-        text = _normalized_message_content(message)
+        message = ctx.message
+        text = ctx.text
         if not (text.startswith("?") and len(text) > 1 and not text.startswith("? ")):
             return
 
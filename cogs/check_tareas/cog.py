@@ -76,7 +76,7 @@ class CheckTareasCog(commands.Cog, name="Check Tareas Antiguas"):
         await interaction.response.defer(ephemeral=True)
         user_id = interaction.user.id
 
-        prog = self.db.get_progress_inicial(user_id)
+        prog = await self.db.aio.get_progress_inicial(user_id)
         if inicial_all_claimed(prog):
             await interaction.followup.send("¡Ya has completado y reclamado tus tareas de iniciación!", ephemeral=True)
             return
@@ -87,35 +87,35 @@ class CheckTareasCog(commands.Cog, name="Check Tareas Antiguas"):
         # 1. Tarea 'presentacion'
         if prog['presentacion'] == 0:
             if await self._check_message_in_channel(self._get_channel_id("presentacion"), user_id):
-                self.db.update_task_inicial(user_id, "presentacion")
+                await self.db.aio.update_task_inicial(user_id, "presentacion")
 
         # 2. Tarea 'reaccion_pais'
         if prog['reaccion_pais'] == 0:
             if await self._check_reaction_on_message(self._get_channel_id("autorol"), self._get_message_id("pais"), user_id):
-                self.db.update_task_inicial(user_id, "reaccion_pais")
+                await self.db.aio.update_task_inicial(user_id, "reaccion_pais")
 
         # 3. Tarea 'reaccion_rol'
         if prog['reaccion_rol'] == 0:
             if await self._check_reaction_on_message(self._get_channel_id("autorol"), self._get_message_id("rol"), user_id):
-                self.db.update_task_inicial(user_id, "reaccion_rol")
+                await self.db.aio.update_task_inicial(user_id, "reaccion_rol")
         
         # 4. Tarea 'reaccion_social'
         if prog['reaccion_social'] == 0:
             if await self._check_reaction_in_channel(self._get_channel_id("social"), user_id):
-                self.db.update_task_inicial(user_id, "reaccion_social")
+                await self.db.aio.update_task_inicial(user_id, "reaccion_social")
         
         # 5. Tarea 'reaccion_reglas'
         if prog['reaccion_reglas'] == 0:
             if await self._check_reaction_in_channel(self._get_channel_id("reglas"), user_id):
-                self.db.update_task_inicial(user_id, "reaccion_reglas")
+                await self.db.aio.update_task_inicial(user_id, "reaccion_reglas")
         
         # 6. Tarea 'general_mensaje'
         if prog['general_mensaje'] == 0:
             if await self._check_message_in_channel(self._get_channel_id("general"), user_id):
-                self.db.update_task_inicial(user_id, "general_mensaje")
+                await self.db.aio.update_task_inicial(user_id, "general_mensaje")
 
         # --- Mostrar el reporte final ---
-        new_prog = self.db.get_progress_inicial(user_id)
+        new_prog = await self.db.aio.get_progress_inicial(user_id)
         
         embed_final = discord.Embed(title="Verificación de Tareas Completada", color=discord.Color.blue())
         desc_final = (
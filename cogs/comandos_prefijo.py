@@ -15,6 +15,7 @@ from cogs.economia.db_manager import EconomiaDBManagerV2
 from cogs.economia.card_db_manager import CardDBManager
 from cogs.economia.cartas_cog import StockCatalogView
 from cogs.economia import card_effectos
+from cogs.economia.blister_open import open_blisters
 from cogs.economia.reclamar_service import (
     RECLAMO_TIPOS_AYUDA,
     build_inicial_reclaim_hint,
@@ -211,8 +212,8 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
 
     @commands.command(aliases=["puntos"])
     async def puntos_cmd(self, ctx: commands.Context):
-        self.db.ensure_user_exists(ctx.author.id)
-        eco = self.db.get_user_economy(ctx.author.id)
+        await self.db.aio.ensure_user_exists(ctx.author.id)
+        eco = await self.db.aio.get_user_economy(ctx.author.id)
         tq = toque_emote()
         embed = discord.Embed(
             title=f"{tq} Toque points — {ctx.author.display_name}",
@@ -227,9 +228,9 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
 
     @commands.command()
     async def inventario(self, ctx: commands.Context):
-        self.db.ensure_user_exists(ctx.author.id)
-        eco = self.db.get_user_economy(ctx.author.id)
-        blisters = self.db.get_blisters_for_user(ctx.author.id)
+        await self.db.aio.ensure_user_exists(ctx.author.id)
+        eco = await self.db.aio.get_user_economy(ctx.author.id)
+        blisters = await self.db.aio.get_blisters_for_user(ctx.author.id)
         lines = "\n".join(f"• {b['blister_tipo']}: x{b['cantidad']}" for b in blisters) or "Ninguno"
         embed = discord.Embed(
             title=f"Inventario de {ctx.author.display_name}",
@@ -241,8 +242,8 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     @commands.command(name="blisters", aliases=["blister", "sobres", "misblisters", "missobres"])
     async def blisters_cmd(self, ctx: commands.Context):
         """Ver blisters/sobres que tenés para abrir."""
-        self.db.ensure_user_exists(ctx.author.id)
-        blisters = self.db.get_blisters_for_user(ctx.author.id)
+        await self.db.aio.ensure_user_exists(ctx.author.id)
+        blisters = await self.db.aio.get_blisters_for_user(ctx.author.id)
         if not blisters:
             await ctx.send("No tenés blisters. Ganás con tareas (`?reclamar`) o tienda (`?canjes`).")
             return
@@ -257,8 +258,8 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     @commands.command(name="blistersde", aliases=["blisterde", "sobresde"])
     async def blisters_de_cmd(self, ctx: commands.Context, quien: discord.Member):
         """Ver blisters/sobres de otra persona."""
-        self.db.ensure_user_exists(quien.id)
-        blisters = self.db.get_blisters_for_user(quien.id)
+        await self.db.aio.ensure_user_exists(quien.id)
+        blisters = await self.db.aio.get_blisters_for_user(quien.id)
         if not blisters:
             return await ctx.send(f"**{quien.display_name}** no tiene blisters.", delete_after=10)
         lines = "\n".join(
@@ -290,7 +291,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if cantidad <= 0 or cantidad > 9999:
             return await ctx.send("Cantidad inválida.", delete_after=8)
         t = (tipo or "").strip().lower()
-        nuevo, _ = self.db.modify_blisters(quien.id, t, -abs(int(cantidad)))
+        nuevo, _ = await self.db.aio.modify_blisters(quien.id, t, -abs(int(cantidad)))
         await ctx.send(
             f"✅ A {quien.mention} le dejé **{nuevo}** blister(s) de **{t}**.",
             allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False),
@@ -440,7 +441,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     async def animetop(self, ctx: commands.Context, quien: Optional[discord.Member] = None):
         """Ver top anime propio o de otro miembro (mismo texto que el slash)."""
         target = quien or ctx.author
-        rows = self.db.anime_top_list(target.id)
+        rows = await self.db.aio.anime_top_list(target.id)
         emb = _embed_top_for(self.bot, target, rows, viewer_is_target=target.id == ctx.author.id)
         await ctx.send(embed=emb)
 
@@ -461,7 +462,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     async def wishlist_ver(self, ctx: commands.Context, quien: Optional[discord.Member] = None):
         """Ver tu wishlist (o la de otro)."""
         target = quien or ctx.author
-        rows = self.db.wishlist_list(target.id)
+        rows = await self.db.aio.wishlist_list(target.id)
         embed = discord.Embed(
             title=f"⭐ Wishlist — {target.display_name}",
             description=self._fmt_pos_list(rows, cap=33),
@@ -474,7 +475,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     async def wishlist_set_cmd(self, ctx: commands.Context, pos: int, *, titulo: str):
         """Setear una posición de wishlist (1–33)."""
         try:
-            self.db.wishlist_set(ctx.author.id, int(pos), str(titulo))
+            await self.db.aio.wishlist_set(ctx.author.id, int(pos), str(titulo))
         except ValueError as e:
             await ctx.send(str(e), delete_after=10)
             return
@@ -486,14 +487,14 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if pos < 1 or pos > 33:
             await ctx.send("La posición debe ser entre 1 y 33.", delete_after=8)
             return
-        self.db.wishlist_remove(ctx.author.id, int(pos))
+        await self.db.aio.wishlist_remove(ctx.author.id, int(pos))
         await ctx.send(f"🗑️ Wishlist: posición **{pos}** vaciada.")
 
     @commands.command(name="odiados", aliases=["odio", "hated", "hates"])
     async def odiados_ver(self, ctx: commands.Context, quien: Optional[discord.Member] = None):
         """Ver tu lista de odiados (o la de otro)."""
         target = quien or ctx.author
-        rows = self.db.hated_list(target.id)
+        rows = await self.db.aio.hated_list(target.id)
         embed = discord.Embed(
             title=f"💢 Odiados — {target.display_name}",
             description=self._fmt_pos_list(rows, cap=10),
@@ -506,7 +507,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     async def odiados_set_cmd(self, ctx: commands.Context, pos: int, *, titulo: str):
         """Setear una posición de odiados (1–10)."""
         try:
-            self.db.hated_set(ctx.author.id, int(pos), str(titulo))
+            await self.db.aio.hated_set(ctx.author.id, int(pos), str(titulo))
         except ValueError as e:
             await ctx.send(str(e), delete_after=10)
             return
@@ -518,7 +519,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if pos < 1 or pos > 10:
             await ctx.send("La posición debe ser entre 1 y 10.", delete_after=8)
             return
-        self.db.hated_remove(ctx.author.id, int(pos))
+        await self.db.aio.hated_remove(ctx.author.id, int(pos))
         await ctx.send(f"🗑️ Odiados: posición **{pos}** vaciada.")
 
     @commands.command(name="topset", aliases=["topanimeset", "animetopset"])
@@ -528,14 +529,14 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if len(t) > 200:
             return await ctx.send("El título es demasiado largo (máx. 200 caracteres).", delete_after=10)
         try:
-            self.db.anime_top_set(ctx.author.id, int(posicion), t)
+            await self.db.aio.anime_top_set(ctx.author.id, int(posicion), t)
         except ValueError as e:
             return await ctx.send(str(e), delete_after=10)
         rw = (self.task_config or {}).get("rewards") or {}
         b10 = int(rw.get("anime_top10_bonus") or 0)
         b30 = int(rw.get("anime_top30_bonus") or 0)
-        bonus = self.db.apply_anime_milestones(ctx.author.id, b10, b30)
-        rows = self.db.anime_top_list(ctx.author.id)
+        bonus = await self.db.aio.apply_anime_milestones(ctx.author.id, b10, b30)
+        rows = await self.db.aio.anime_top_list(ctx.author.id)
         emb = _embed_top_for(self.bot, ctx.author, rows, viewer_is_target=True)
         extra = "\n".join(bonus) if bonus else ""
         msg = "Listo: guardado (si ya había algo en esa posición, quedó **reemplazado**)."
@@ -548,8 +549,8 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         """Vaciar una posición del top anime (1–33)."""
         if posicion < 1 or posicion > 33:
             return await ctx.send("La posición debe ser entre 1 y 33.", delete_after=8)
-        self.db.anime_top_remove(ctx.author.id, int(posicion))
-        rows = self.db.anime_top_list(ctx.author.id)
+        await self.db.aio.anime_top_remove(ctx.author.id, int(posicion))
+        rows = await self.db.aio.anime_top_list(ctx.author.id)
         emb = _embed_top_for(self.bot, ctx.author, rows, viewer_is_target=True)
         await ctx.send(content=f"Posición **{posicion}** vaciada.", embed=emb)
 
@@ -568,7 +569,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     @commands.command(name="topsubir", aliases=["topup", "subirtop", "animesubir"])
     async def topsubir_cmd(self, ctx: commands.Context, *, titulo: str):
         """Subir un anime por nombre (mueve el resto). Ej: `?topsubir naruto`."""
-        matches = self.db.anime_top_find(ctx.author.id, titulo)
+        matches = await self.db.aio.anime_top_find(ctx.author.id, titulo)
         picked = self._pick_single_top_match(matches, titulo)
         if not picked:
             if not matches:
@@ -583,15 +584,15 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if pos <= 1:
             await ctx.send("Ese ya está en la posición **1**.")
             return
-        self.db.anime_top_move_by_pos(ctx.author.id, pos, pos - 1)
-        rows = self.db.anime_top_list(ctx.author.id)
+        await self.db.aio.anime_top_move_by_pos(ctx.author.id, pos, pos - 1)
+        rows = await self.db.aio.anime_top_list(ctx.author.id)
         emb = _embed_top_for(self.bot, ctx.author, rows, viewer_is_target=True)
         await ctx.send(content=f"⬆️ Movido a posición **{pos - 1}**.", embed=emb)
 
     @commands.command(name="topbajar", aliases=["topdown", "bajartop", "animebajar"])
     async def topbajar_cmd(self, ctx: commands.Context, *, titulo: str):
         """Bajar un anime por nombre (mueve el resto). Ej: `?topbajar naruto`."""
-        matches = self.db.anime_top_find(ctx.author.id, titulo)
+        matches = await self.db.aio.anime_top_find(ctx.author.id, titulo)
         picked = self._pick_single_top_match(matches, titulo)
         if not picked:
             if not matches:
@@ -606,8 +607,8 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if pos >= 33:
             await ctx.send("Ese ya está en la posición **33**.")
             return
-        self.db.anime_top_move_by_pos(ctx.author.id, pos, pos + 1)
-        rows = self.db.anime_top_list(ctx.author.id)
+        await self.db.aio.anime_top_move_by_pos(ctx.author.id, pos, pos + 1)
+        rows = await self.db.aio.anime_top_list(ctx.author.id)
         emb = _embed_top_for(self.bot, ctx.author, rows, viewer_is_target=True)
         await ctx.send(content=f"⬇️ Movido a posición **{pos + 1}**.", embed=emb)
 
@@ -626,7 +627,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     @commands.command()
     async def mi(self, ctx: commands.Context):
         """Saldo, posición en `?top` y `?tophist`, cartas en inventario y totales."""
-        self.db.ensure_user_exists(ctx.author.id)
+        await self.db.aio.ensure_user_exists(ctx.author.id)
         embed = await render_mi_embed(self.bot, self.db, ctx.author)
         await ctx.send(embed=embed)
 
@@ -663,7 +664,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         """Tablas de economía con paginación y botones (tops trivia, tu resumen, top anime)."""
         if ctx.author.bot:
             return
-        self.db.ensure_user_exists(ctx.author.id)
+        await self.db.aio.ensure_user_exists(ctx.author.id)
         view = RankingHubView(self.bot, self.db, ctx.author.id)
         embed = await render_ranking_hub_embed(
             self.bot, self.db, view.mode, view.offset, view.page_size, ctx.author
@@ -675,7 +676,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if await reject_progress_in_impostor_zone(ctx):
             return
         await _reply_paginated_embeds(
-            ctx, self._pages_diaria(ctx), label="?diario / ?diaria / ?daily", reclaim_layout="diaria"
+            ctx, await self.db.aio.run(self._pages_diaria, ctx), label="?diario / ?diaria / ?daily", reclaim_layout="diaria"
         )
 
     @commands.command(aliases=["weekly", "semanal"])
@@ -683,7 +684,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if await reject_progress_in_impostor_zone(ctx):
             return
         await _reply_paginated_embeds(
-            ctx, self._pages_semanal(ctx), label="?semanal / ?weekly", reclaim_layout="semanal"
+            ctx, await self.db.aio.run(self._pages_semanal, ctx), label="?semanal / ?weekly", reclaim_layout="semanal"
         )
 
     @commands.command(aliases=["starter", "iniciacion"])
@@ -691,7 +692,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if await reject_progress_in_impostor_zone(ctx):
             return
         await _reply_paginated_embeds(
-            ctx, self._pages_inicial(ctx), label="?inicial / ?starter", reclaim_layout="inicial"
+            ctx, await self.db.aio.run(self._pages_inicial, ctx), label="?inicial / ?starter", reclaim_layout="inicial"
         )
 
     @commands.command(name="progresoayuda", aliases=["ayudaprogreso", "leyendaprogreso", "comoprogreso"])
@@ -705,10 +706,10 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         if await reject_progress_in_impostor_zone(ctx):
             return
         pages: List[List[discord.Embed]] = []
-        pages.extend(build_progreso_resumen_pages(self.db, self.task_config or {}, ctx.author.id))
-        pages.extend(self._pages_inicial(ctx))
-        pages.extend(self._pages_diaria(ctx))
-        pages.extend(self._pages_semanal(ctx))
+        pages.extend(await self.db.aio.run(build_progreso_resumen_pages, self.db, self.task_config or {}, ctx.author.id))
+        pages.extend(await self.db.aio.run(self._pages_inicial, ctx))
+        pages.extend(await self.db.aio.run(self._pages_diaria, ctx))
+        pages.extend(await self.db.aio.run(self._pages_semanal, ctx))
         await _reply_paginated_embeds(
             ctx,
             pages,
@@ -722,7 +723,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
             return
         parts = args.strip().split()
         if not parts:
-            pages = build_reclamar_help_pages(self.db, self.task_config or {}, ctx.author.id)
+            pages = await self.db.aio.run(build_reclamar_help_pages, self.db, self.task_config or {}, ctx.author.id)
             view = ReclamarHelpView(ctx.bot, ctx.author.id, pages, label="?reclamar — guía")
             await ctx.send(content=view.header(), embeds=pages[0], view=view)
             return
@@ -744,11 +745,11 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
                 return
             tipo = parsed  # type: ignore[assignment]
 
-        ok, ok_msgs, err_msgs = reclaim_rewards(self.db, self.task_config, ctx.author.id, tipo)  # type: ignore[arg-type]
-        embed = build_reclaim_result_embed(self.db, self.task_config or {}, ctx.author.id, ok_msgs, err_msgs)
+        ok, ok_msgs, err_msgs = await self.db.aio.run(reclaim_rewards, self.db, self.task_config, ctx.author.id, tipo)  # type: ignore[arg-type]
+        embed = await self.db.aio.run(build_reclaim_result_embed, self.db, self.task_config or {}, ctx.author.id, ok_msgs, err_msgs)
         await ctx.send(embed=embed)
         if not ok and not err_msgs:
-            hint = build_inicial_reclaim_hint(self.db, ctx.author.id)
+            hint = await self.db.aio.run(build_inicial_reclaim_hint, self.db, ctx.author.id)
             if hint:
                 await ctx.send(
                     hint + "\n\nPara **diario** / **semanal**: `?diario` · `?semanal` · `?progreso` o `/aat-progreso-*`."
@@ -780,7 +781,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
 
         if q.isdigit():
             cid = int(q)
-            inv = self.db.get_card_from_inventory(user_id, cid)
+            inv = await self.db.aio.get_card_from_inventory(user_id, cid)
             if not inv:
                 await ctx.send("No tenés esa carta en tu inventario (revisá el ID con `?miscartas`).")
                 return
@@ -800,7 +801,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         owned: List[tuple[dict, dict]] = []
         for m in matches:
             cid = int(m.get("carta_id") or 0)
-            inv = self.db.get_card_from_inventory(user_id, cid)
+            inv = await self.db.aio.get_card_from_inventory(user_id, cid)
             if not inv:
                 continue
             full = self.card_db.get_carta_stock_by_id(cid)
@@ -842,7 +843,7 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
         )
 
     async def _send_miscartas_list(self, ctx: commands.Context) -> None:
-        cartas = self.db.get_cards_in_inventory(ctx.author.id)
+        cartas = await self.db.aio.get_cards_in_inventory(ctx.author.id)
         if not cartas:
             await ctx.send(
                 "No tenés cartas. Abrí blisters con `?abrir` o `/aat-abrirblister`. "
@@ -884,34 +885,20 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
     @commands.command()
     async def abrir(self, ctx: commands.Context):
         user_id = ctx.author.id
-        blisters = self.db.get_blisters_for_user(user_id)
-        if not blisters:
+        blisters = await self.db.aio.get_blisters_for_user(user_id)
+        pedido = {b["blister_tipo"]: int(b["cantidad"]) for b in blisters if int(b["cantidad"] or 0) > 0}
+        if not pedido:
             await ctx.send("No tenés blisters.")
             return
-        cartas_nuevas: List[str] = []
-        count = 0
-        for b in blisters:
-            cant = b["cantidad"]
-            if cant <= 0:
-                continue
-            _, _ = self.db.modify_blisters(user_id, b["blister_tipo"], -cant)
-            count += cant
-            for _ in range(cant * 3):
-                if b["blister_tipo"].lower() == "trampa":
-                    c = self.card_db.get_random_card_blister_trampa()
-                else:
-                    c = self.card_db.get_random_card_by_rarity()
-                if c:
-                    self.db.add_card_to_inventory(user_id, c["carta_id"], 1)
-                    cartas_nuevas.append(c["nombre"])
-        if not cartas_nuevas:
+        res = await self.db.aio.run(open_blisters, self.db, self.card_db, user_id, pedido)
+        if not res.applied:
+            await ctx.send("Tus blisters cambiaron mientras abrías; probá de nuevo.")
+            return
+        if not res.cards:
             await ctx.send("Error de stock de cartas (avisá al staff).")
             return
-        resumen: dict = {}
-        for n in cartas_nuevas:
-            resumen[n] = resumen.get(n, 0) + 1
-        text = "\n".join(f"• {k} x{v}" for k, v in resumen.items())
-        await ctx.send(f"Abriste **{count}** blister(s).\n{text[:1800]}")
+        text = "\n".join(f"• {c['nombre']} x{n}" for c, n in res.resumen())
+        await ctx.send(f"Abriste **{res.total_blisters}** blister(s).\n{text[:1800]}")
 
     @commands.command(aliases=["usarcarta"])
     @commands.cooldown(1, 10, commands.BucketType.user)
@@ -921,28 +908,28 @@ class ComandosPrefijoCog(commands.Cog, name="Comandos Prefijo"):
             return
         cid = int(carta_id)
         user_id = ctx.author.id
-        uso = self.db.get_card_usage_history(user_id, minutes=10)
+        uso = await self.db.aio.get_card_usage_history(user_id, minutes=10)
         if len(uso) >= 5:
             await ctx.send("Límite: 5 cartas cada 10 minutos.")
             return
-        if not self.db.get_card_from_inventory(user_id, cid):
+        if not await self.db.aio.get_card_from_inventory(user_id, cid):
             await ctx.send("No tenés esa carta.")
             return
-        self.db.use_card_from_inventory(user_id, cid)
-        self.db.log_card_usage(user_id)
+        await self.db.aio.use_card_from_inventory(user_id, cid)
+        await self.db.aio.log_card_usage(user_id)
         c_data = self.card_db.get_carta_stock_by_id(cid)
         if not c_data:
             await ctx.send("Carta no encontrada en catálogo.")
             return
         g_id = ctx.guild.id if ctx.guild else None
         if (c_data.get("tipo_carta") or "").lower() == "trampa":
-            self.db.log_trampa_uso(
+            await self.db.aio.log_trampa_uso(
                 user_id, target.id if target else None, cid, str(c_data.get("nombre") or "?"), g_id, ctx.channel.id
             )
             if target:
-                self.db.mark_trampa_enviada(user_id)
+                await self.db.aio.mark_trampa_enviada(user_id)
             else:
-                self.db.bump_trampa_sin_objetivo(user_id)
+                await self.db.aio.bump_trampa_sin_objetivo(user_id)
         titulo = "¡Carta activada!"
         desc = f"**{ctx.author.display_name}** usó **{c_data['nombre']}**"
         if target:
@@ -5,6 +5,7 @@ from discord import app_commands
 import logging
 
 from cogs.economia.db_manager import EconomiaDBManagerV2
+from cogs.message_router import MessageContext, get_router
 
 class CreadorCog(commands.Cog, name="Rol de Creador"):
     def __init__(self, bot: commands.Bot):
@@ -18,6 +19,16 @@ class CreadorCog(commands.Cog, name="Rol de Creador"):
         self.canal_contenido_id = self.task_config.get("channels", {}).get("contenido_comunidad")
         self.hokage_role_id = bot.hokage_role_id
 
+    async def cog_load(self):
+        router = get_router(self.bot)
+        if router and self.rol_creador_id and self.canal_contenido_id:
+            router.register("creador.contenido", self._on_contenido_message, owner=self, channels=(self.canal_contenido_id,))
+
+    async def cog_unload(self):
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+
     @app_commands.command(name="solicitar-rol-creador", description="Verifica si tienes 20,000+ puntos para obtener el rol Creador (1 sola vez).")
     async def solicitar_rol_creador(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
@@ -36,19 +47,19 @@ class CreadorCog(commands.Cog, name="Rol de Creador"):
             await interaction.followup.send("¡Ya tienes el rol de Creador de Contenido!", ephemeral=True)
             return
 
-        status = self.economia_db.get_rol_creador_status(user_id)
+        status = await self.economia_db.aio.get_rol_creador_status(user_id)
         if status == 1:
             await interaction.followup.send("Ya has canjeado este rol en el pasado. Si no lo tienes, debes hablar con un administrador para que te lo devuelva.", ephemeral=True)
             return
 
-        user_data = self.economia_db.get_user_economy(user_id)
+        user_data = await self.economia_db.aio.get_user_economy(user_id)
         if user_data['puntos_actuales'] < self.costo_rol:
             await interaction.followup.send(f"No tienes suficientes puntos. Necesitas **{self.costo_rol}** y tienes **{user_data['puntos_actuales']}**.", ephemeral=True)
             return
 
         try:
             # self.economia_db.modify_points(user_id, self.costo_rol, gastar=True) # <-- Desactivado como pediste
-            self.economia_db.claim_rol_creador(user_id)
+            await self.economia_db.aio.claim_rol_creador(user_id)
             await interaction.user.add_roles(role, reason=f"Verificó {self.costo_rol} puntos")
             
             canal_mention = f"en <#{self.canal_contenido_id}>" if self.canal_contenido_id else "en el canal de comunidad"
@@ -68,12 +79,8 @@ class CreadorCog(commands.Cog, name="Rol de Creador"):
             self.log.exception(f"Error al canjear el rol de creador: {e}")
             await interaction.followup.send("Ocurrió un error inesperado.", ephemeral=True)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild or not self.rol_creador_id or not self.canal_contenido_id:
-            return
-        if message.channel.id != self.canal_contenido_id:
-            return
+    async def _on_contenido_message(self, ctx: MessageContext):
+        message = ctx.message
         if self.hokage_role_id and message.author.get_role(self.hokage_role_id):
             return
         if message.author.guild_permissions.administrator:
@@ -102,7 +109,7 @@ class CreadorCog(commands.Cog, name="Rol de Creador"):
             return
 
         _, semana_key = self.economia_db.get_current_date_keys()
-        posts_esta_semana = self.economia_db.get_creator_posts_this_week(message.author.id, semana_key)
+        posts_esta_semana = await self.economia_db.aio.get_creator_posts_this_week(message.author.id, semana_key)
         
         post_limit = 2
         
@@ -119,7 +126,7 @@ class CreadorCog(commands.Cog, name="Rol de Creador"):
                 self.log.error(f"Error al borrar mensaje de creador (límite alcanzado): {e}")
             return
             
-        self.economia_db.log_creator_post(message.author.id, message.id, semana_key)
+        await self.economia_db.aio.log_creator_post(message.author.id, message.id, semana_key)
         self.log.info(f"Post de creador registrado para {message.author.name}. (Post {len(posts_esta_semana) + 1}/{post_limit} esta semana)")
 
 async def setup(bot):
@@ -138,7 +138,7 @@ class AdminCog(commands.Cog, name="Economia Admin"):
         if cantidad <= 0:
             await interaction.response.send_message("La cantidad debe ser positiva.", ephemeral=True)
             return
-        nuevo_total = self.economia_db.modify_points(usuario.id, cantidad, gastar=False)
+        nuevo_total = await self.economia_db.aio.modify_points(usuario.id, cantidad, gastar=False)
         await interaction.response.send_message(f"✅ Se dieron {cantidad} puntos a {usuario.mention}. Ahora tiene {nuevo_total} puntos.", ephemeral=True)
         try:
             msg = f"Has recibido **{cantidad} puntos** de un administrador."
@@ -152,7 +152,7 @@ class AdminCog(commands.Cog, name="Economia Admin"):
         if cantidad <= 0:
             await interaction.response.send_message("La cantidad debe ser positiva.", ephemeral=True)
             return
-        nuevo_total = self.economia_db.modify_points(usuario.id, cantidad, gastar=True)
+        nuevo_total = await self.economia_db.aio.modify_points(usuario.id, cantidad, gastar=True)
         await interaction.response.send_message(f"🗑️ Se quitaron {cantidad} puntos a {usuario.mention}. Ahora tiene {nuevo_total} puntos.", ephemeral=True)
         try:
             msg = f"Se te han quitado **{cantidad} puntos** por un administrador."
@@ -175,7 +175,7 @@ class AdminCog(commands.Cog, name="Economia Admin"):
         if cantidad <= 0:
             await interaction.response.send_message("La cantidad debe ser positiva.", ephemeral=True)
             return
-        res = self.economia_db.remove_historic_points(usuario.id, int(cantidad))
+        res = await self.economia_db.aio.remove_historic_points(usuario.id, int(cantidad))
         await interaction.response.send_message(
             (
                 f"🧾 Se quitaron **{cantidad}** puntos del **histórico** de {usuario.mention}.\n"
@@ -199,7 +199,7 @@ class AdminCog(commands.Cog, name="Economia Admin"):
             await interaction.response.send_message("La cantidad debe ser positiva.", ephemeral=True)
             return
         tipo_blister = tipo_blister.lower().strip()
-        nuevo_total, bcol = self.economia_db.modify_blisters(usuario.id, tipo_blister, cantidad)
+        nuevo_total, bcol = await self.economia_db.aio.modify_blisters(usuario.id, tipo_blister, cantidad)
         extra = ("\n" + "\n".join(bcol)) if bcol else ""
         await interaction.response.send_message(
             f"🎁 Se dieron {cantidad} blister(s) de tipo '{tipo_blister}' a {usuario.mention}. Ahora tiene {nuevo_total} de ese tipo.{extra}",
@@ -221,7 +221,7 @@ class AdminCog(commands.Cog, name="Economia Admin"):
             await interaction.response.send_message("La cantidad debe ser positiva.", ephemeral=True)
             return
         tipo_blister = tipo_blister.lower().strip()
-        nuevo_total, _ = self.economia_db.modify_blisters(usuario.id, tipo_blister, -abs(int(cantidad)))
+        nuevo_total, _ = await self.economia_db.aio.modify_blisters(usuario.id, tipo_blister, -abs(int(cantidad)))
         await interaction.response.send_message(
             f"🗑️ Se quitaron {cantidad} blister(s) de tipo '{tipo_blister}' a {usuario.mention}. Ahora tiene {nuevo_total}.",
             ephemeral=True,
@@ -235,7 +235,7 @@ class AdminCog(commands.Cog, name="Economia Admin"):
     @app_commands.describe(usuario="El usuario", razon="Opcional: razón")
     async def limpiar_blisters(self, interaction: discord.Interaction, usuario: discord.Member, razon: Optional[str] = None):
         await interaction.response.defer(ephemeral=True)
-        res = self.economia_db.clear_blisters_for_user(usuario.id)
+        res = await self.economia_db.aio.clear_blisters_for_user(usuario.id)
         types = int(res.get("types") or 0)
         total = int(res.get("total") or 0)
         extra = f"\n**Razón:** {razon}" if razon else ""
@@ -258,9 +258,9 @@ class AdminCog(commands.Cog, name="Economia Admin"):
     @app_commands.describe(usuario="El usuario")
     async def ver_economia_usuario(self, interaction: discord.Interaction, usuario: discord.Member):
         await interaction.response.defer(ephemeral=True)
-        self.economia_db.ensure_user_exists(usuario.id)
-        eco = self.economia_db.get_user_economy(usuario.id) or {}
-        blisters = self.economia_db.get_blisters_for_user(usuario.id)
+        await self.economia_db.aio.ensure_user_exists(usuario.id)
+        eco = await self.economia_db.aio.get_user_economy(usuario.id) or {}
+        blisters = await self.economia_db.aio.get_blisters_for_user(usuario.id)
 
         puntos_actuales = int(eco.get("puntos_actuales") or 0)
         puntos_conseguidos = int(eco.get("puntos_conseguidos") or 0)
@@ -297,7 +297,7 @@ class AdminCog(commands.Cog, name="Economia Admin"):
         if cantidad < 0:
             await interaction.response.send_message("La cantidad no puede ser negativa.", ephemeral=True)
             return
-        self.economia_db.set_credits(usuario.id, cantidad)
+        await self.economia_db.aio.set_credits(usuario.id, cantidad)
         await interaction.response.send_message(f"📌 Se establecieron los créditos de {usuario.mention} a {cantidad}.", ephemeral=True)
 
     @app_commands.command(name="aat-admin-crear-carta", description="[ADMIN] Añade una nueva carta al stock global.")
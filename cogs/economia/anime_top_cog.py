@@ -83,7 +83,7 @@ class AnimeTopCog(commands.Cog, name="Anime top"):
     @app_commands.describe(usuario="Usuario a consultar (opcional)")
     async def anime_top_ver(self, interaction: discord.Interaction, usuario: Optional[discord.User] = None):
         target = usuario or interaction.user
-        rows = self.db.anime_top_list(target.id)
+        rows = await self.db.aio.anime_top_list(target.id)
         emb = _embed_top_for(self.bot, target, rows, viewer_is_target=target.id == interaction.user.id)
         await interaction.response.send_message(embed=emb, ephemeral=(target.id == interaction.user.id))
 
@@ -104,13 +104,13 @@ class AnimeTopCog(commands.Cog, name="Anime top"):
             return
         await interaction.response.defer(ephemeral=True)
         try:
-            self.db.anime_top_set(interaction.user.id, int(posicion), t)
+            await self.db.aio.anime_top_set(interaction.user.id, int(posicion), t)
         except ValueError as e:
             await interaction.followup.send(str(e), ephemeral=True)
             return
         b10, b30 = self._bonuses()
-        bonus_msgs = self.db.apply_anime_milestones(interaction.user.id, b10, b30)
-        rows = self.db.anime_top_list(interaction.user.id)
+        bonus_msgs = await self.db.aio.apply_anime_milestones(interaction.user.id, b10, b30)
+        rows = await self.db.aio.anime_top_list(interaction.user.id)
         emb = _embed_top_for(self.bot, interaction.user, rows, viewer_is_target=True)
         extra = "\n".join(bonus_msgs) if bonus_msgs else ""
         await interaction.followup.send(
@@ -125,8 +125,8 @@ class AnimeTopCog(commands.Cog, name="Anime top"):
     @app_commands.command(name="aat-anime-top-quitar", description="Borrar el título de una posición.")
     @app_commands.describe(posicion="Número de posición a vaciar (1–33)")
     async def anime_top_quitar(self, interaction: discord.Interaction, posicion: app_commands.Range[int, 1, 33]):
-        self.db.anime_top_remove(interaction.user.id, int(posicion))
-        rows = self.db.anime_top_list(interaction.user.id)
+        await self.db.aio.anime_top_remove(interaction.user.id, int(posicion))
+        rows = await self.db.aio.anime_top_list(interaction.user.id)
         emb = _embed_top_for(self.bot, interaction.user, rows, viewer_is_target=True)
         await interaction.response.send_message(
             content=f"Posición **{posicion}** vaciada.",
@@ -147,11 +147,11 @@ class AnimeTopCog(commands.Cog, name="Anime top"):
     ):
         await interaction.response.defer(ephemeral=True)
         try:
-            self.db.anime_top_move_by_pos(interaction.user.id, int(desde), int(hacia))
+            await self.db.aio.anime_top_move_by_pos(interaction.user.id, int(desde), int(hacia))
         except ValueError as e:
             await interaction.followup.send(str(e), ephemeral=True)
             return
-        rows = self.db.anime_top_list(interaction.user.id)
+        rows = await self.db.aio.anime_top_list(interaction.user.id)
         emb = _embed_top_for(self.bot, interaction.user, rows, viewer_is_target=True)
         await interaction.followup.send(content=f"✅ Movido de **{desde}** a **{hacia}**.", embed=emb, ephemeral=True)
 
@@ -0,0 +1,52 @@
+# Apertura de blisters en bloque (?abrir y /aat-abrirblister).
+# Sortea todas las cartas en memoria (catálogo de CardDBManager), las agrupa por carta_id y aplica
+# el descuento de sobres + las sumas al inventario en una sola transacción de economía.
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class BlisterOpening:
+    """Resultado de abrir: sobres descontados, cartas sorteadas y tipos sin stock (esos no se descuentan)."""
+
+    opened: Dict[str, int] = field(default_factory=dict)
+    cards: List[Dict[str, Any]] = field(default_factory=list)
+    counts: Dict[int, int] = field(default_factory=dict)
+    sin_stock: List[str] = field(default_factory=list)
+    applied: bool = True
+
+    @property
+    def total_blisters(self) -> int:
+        return sum(self.opened.values())
+
+    def resumen(self) -> List[Tuple[Dict[str, Any], int]]:
+        """(carta, cantidad) en orden de primera aparición."""
+        first: Dict[int, Dict[str, Any]] = {}
+        for c in self.cards:
+            first.setdefault(int(c["carta_id"]), c)
+        return [(first[cid], self.counts[cid]) for cid in first]
+
+
+def open_blisters(economia_db: Any, card_db: Any, user_id: int, pedido: Dict[str, int]) -> BlisterOpening:
+    """
+    Abre `pedido` (tipo → cantidad) para el usuario. Sincrónico: llamar con `economia_db.aio.run(...)`.
+    Si el inventario cambió entre medio y ya no alcanza, no se aplica nada (`applied=False`).
+    """
+    out = BlisterOpening()
+    for tipo, cant in pedido.items():
+        cant = int(cant)
+        if cant <= 0:
+            continue
+        drawn = card_db.draw_blister_cards(tipo, cant)
+        if not drawn:
+            out.sin_stock.append(tipo)
+            continue
+        out.opened[tipo] = cant
+        out.cards.extend(drawn)
+    out.counts = dict(Counter(int(c["carta_id"]) for c in out.cards))
+    if out.opened:
+        out.applied = economia_db.apply_blister_opening(user_id, out.opened, out.counts)
+    return out
@@ -0,0 +1,131 @@
+# cogs/economia/card_catalog.py
+"""
+Catálogo de cartas en memoria para abrir blisters sin `ORDER BY RANDOM()`.
+
+`CardCatalog` indexa `cartas_stock` por rareza y tipo y arma una tabla alias (Vose) por tipo de blister:
+cada carta se sortea en O(1) con la misma probabilidad que el gacha en SQL (rareza 70/25/5, fallback a
+Común si la rareza sorteada no tiene stock; blister trampa: 70% una Trampa, si no el gacha normal).
+Lo invalida `CardDBManager` en cada alta / edición / baja de stock.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# (rareza, peso sobre 100) — mismo reparto que get_random_card_by_rarity.
+RARITY_WEIGHTS: Tuple[Tuple[str, int], ...] = (("Común", 70), ("Rara", 25), ("Legendaria", 5))
+FALLBACK_RARITY = "Común"
+# Probabilidad de sacar una carta Trampa en un blister trampa (si hay stock).
+TRAMPA_SHARE = 0.70
+CARDS_PER_BLISTER = 3
+
+
+class AliasTable:
+    """Muestreo discreto ponderado en O(1) (método alias de Vose)."""
+
+    __slots__ = ("_prob", "_alias", "_n")
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(w for w in weights if w > 0))
+        if n == 0 or total <= 0:
+            raise ValueError("AliasTable necesita al menos un peso > 0")
+        scaled = [max(0.0, float(w)) * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in large + small:
+            # Restos por error de redondeo: quedan con probabilidad 1.
+            prob[i] = 1.0
+        self._prob = prob
+        self._alias = alias
+        self._n = n
+
+    def sample(self, rng: random.Random = random) -> int:
+        u = rng.random() * self._n
+        i = int(u)
+        if i >= self._n:
+            i = self._n - 1
+        return i if (u - i) < self._prob[i] else self._alias[i]
+
+
+class CardCatalog:
+    """Foto inmutable de `cartas_stock` con índices por rareza / tipo y tablas alias por blister."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.cards: List[Dict[str, Any]] = []
+        self.by_rarity: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_tipo: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            card = dict(row)
+            if card.get("poder") is None:
+                card["poder"] = 50
+            self.cards.append(card)
+            self.by_rarity.setdefault(str(card.get("rareza") or ""), []).append(card)
+            self.by_tipo.setdefault(str(card.get("tipo_carta") or "").lower(), []).append(card)
+
+        # Resultados posibles: índice en self.cards, o None (rareza sin stock y sin Común de respaldo).
+        normal = self._gacha_weights()
+        self._normal = self._build(normal)
+        trampas = self.by_tipo.get("trampa") or []
+        if trampas:
+            w_trampa = {id(c): TRAMPA_SHARE / len(trampas) for c in trampas}
+            mixed: Dict[Optional[int], float] = {k: v * (1.0 - TRAMPA_SHARE) for k, v in normal.items()}
+            for i, c in enumerate(self.cards):
+                if id(c) in w_trampa:
+                    mixed[i] = mixed.get(i, 0.0) + w_trampa[id(c)]
+            self._trampa = self._build(mixed)
+        else:
+            self._trampa = self._normal
+
+    def _gacha_weights(self) -> Dict[Optional[int], float]:
+        index = {id(c): i for i, c in enumerate(self.cards)}
+        weights: Dict[Optional[int], float] = {}
+        for rareza, peso in RARITY_WEIGHTS:
+            pool = self.by_rarity.get(rareza)
+            if not pool and rareza != FALLBACK_RARITY:
+                pool = self.by_rarity.get(FALLBACK_RARITY)
+            if not pool:
+                weights[None] = weights.get(None, 0.0) + peso / 100.0
+                continue
+            each = peso / 100.0 / len(pool)
+            for c in pool:
+                k = index[id(c)]
+                weights[k] = weights.get(k, 0.0) + each
+        return weights
+
+    @staticmethod
+    def _build(weights: Dict[Optional[int], float]) -> Tuple[List[Optional[int]], Optional[AliasTable]]:
+        outcomes = [k for k, w in weights.items() if w > 0]
+        if not outcomes or all(k is None for k in outcomes):
+            return [], None
+        return outcomes, AliasTable([weights[k] for k in outcomes])
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def draw(self, blister_tipo: str = "", rng: random.Random = random) -> Optional[Dict[str, Any]]:
+        outcomes, table = self._trampa if (blister_tipo or "").lower() == "trampa" else self._normal
+        if table is None:
+            return None
+        k = outcomes[table.sample(rng)]
+        return dict(self.cards[k]) if k is not None else None
+
+    def draw_many(self, blister_tipo: str, n: int, rng: random.Random = random) -> List[Dict[str, Any]]:
+        """n sorteos de una pasada (se omiten los que no tienen stock, como en el loop original)."""
+        outcomes, table = self._trampa if (blister_tipo or "").lower() == "trampa" else self._normal
+        if table is None or n <= 0:
+            return []
+        out: List[Dict[str, Any]] = []
+        for _ in range(int(n)):
+            k = outcomes[table.sample(rng)]
+            if k is not None:
+                out.append(dict(self.cards[k]))
+        return out
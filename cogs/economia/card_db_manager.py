@@ -1,9 +1,11 @@
 # cogs/economia/card_db_manager.py
 import re
 import sqlite3
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-import random
+
+from .card_catalog import CARDS_PER_BLISTER, CardCatalog
 
 DB_FILE = Path(__file__).parent / "cartas.db"
 
@@ -26,6 +28,9 @@ def _catalog_sort_key(card: Dict[str, Any]) -> Tuple[str, int, int]:
 class CardDBManager:
     def __init__(self, db_path: Path = DB_FILE):
         self.db_path = db_path
+        # Catálogo en memoria para sortear cartas (se reconstruye perezosamente tras cada cambio de stock).
+        self._catalog: Optional[CardCatalog] = None
+        self._catalog_lock = threading.Lock()
         self._create_tables()
         self._migrate_schema()
 
@@ -196,6 +201,7 @@ class CardDBManager:
                     ),
                 )
                 conn.commit()
+                self.invalidate_catalog()
                 return True, ""
             except sqlite3.IntegrityError:
                 conn.rollback()
@@ -247,6 +253,7 @@ class CardDBManager:
                     conn.rollback()
                     return False, "No se encontró esa carta (id inválido)."
                 conn.commit()
+                self.invalidate_catalog()
                 return True, ""
             except sqlite3.IntegrityError:
                 conn.rollback()
@@ -257,6 +264,7 @@ class CardDBManager:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM cartas_stock WHERE carta_id = ?", (carta_id,))
             conn.commit()
+            self.invalidate_catalog()
             return cursor.rowcount > 0
 
     def get_cartas_stock_by_name(self, query: str) -> List[Dict[str, Any]]:
@@ -287,63 +295,37 @@ class CardDBManager:
                 d["poder"] = 50
             return d
 
-    def get_random_card_by_rarity(self) -> Optional[Dict[str, Any]]:
-        roll = random.randint(1, 100)
-
-        if roll <= 70:
-            rareza = "Común"
-        elif roll <= 95:
-            rareza = "Rara"
-        else:
-            rareza = "Legendaria"
-
-        with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                SELECT * FROM cartas_stock
-                WHERE rareza = ?
-                ORDER BY RANDOM() LIMIT 1
-                """,
-                (rareza,),
-            )
+    # --- Sorteo de cartas (catálogo en memoria) ---
 
-            row = cursor.fetchone()
+    def invalidate_catalog(self) -> None:
+        with self._catalog_lock:
+            self._catalog = None
 
-            if not row and rareza != "Común":
-                cursor.execute(
-                    """
-                    SELECT * FROM cartas_stock
-                    WHERE rareza = 'Común'
-                    ORDER BY RANDOM() LIMIT 1
-                    """
-                )
-                row = cursor.fetchone()
+    def get_catalog(self) -> CardCatalog:
+        cat = self._catalog
+        if cat is not None:
+            return cat
+        with self._catalog_lock:
+            if self._catalog is None:
+                with self._get_connection() as conn:
+                    conn.row_factory = sqlite3.Row
+                    rows = [dict(r) for r in conn.execute("SELECT * FROM cartas_stock ORDER BY carta_id")]
+                self._catalog = CardCatalog(rows)
+            return self._catalog
 
-            return dict(row) if row else None
+    def get_random_card_by_rarity(self) -> Optional[Dict[str, Any]]:
+        """Gacha normal: Común 70% · Rara 25% · Legendaria 5% (sin stock de la rareza → Común)."""
+        return self.get_catalog().draw("")
 
     def get_random_card_blister_trampa(self) -> Optional[Dict[str, Any]]:
         """Sobres tipo trampa: prioriza cartas con tipo Trampa (~70%), si no hay stock cae al gacha normal."""
-        if random.randint(1, 100) > 30:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    SELECT * FROM cartas_stock
-                    WHERE LOWER(tipo_carta) = 'trampa'
-                    ORDER BY RANDOM() LIMIT 1
-                    """
-                )
-                row = cursor.fetchone()
-                if row:
-                    d = dict(row)
-                    if d.get("poder") is None:
-                        d["poder"] = 50
-                    return d
-        return self.get_random_card_by_rarity()
+        return self.get_catalog().draw("trampa")
+
+    def draw_blister_cards(
+        self, blister_tipo: str, cantidad: int, per_blister: int = CARDS_PER_BLISTER
+    ) -> List[Dict[str, Any]]:
+        """Cartas de `cantidad` blisters de una pasada (lista vacía si no hay stock)."""
+        return self.get_catalog().draw_many(blister_tipo, int(cantidad) * int(per_blister))
 
     def get_all_cards_stock(self) -> List[Dict[str, Any]]:
         with self._get_connection() as conn:
@@ -161,7 +161,7 @@ async def _efecto_rol_trampa_24h(
 
     now = time.time()
     exp = now + max(1, min(168, int(hours))) * 3600
-    economia_db.register_temp_shop_role(
+    row_id = await economia_db.aio.register_temp_shop_role(
         guild.id,
         role.id,
         target.id,
@@ -171,6 +171,9 @@ async def _efecto_rol_trampa_24h(
         exp,
         kind="card",
     )
+    from .tienda_cog import schedule_temp_role_expiry
+
+    schedule_temp_role_expiry(row_id, exp)
     if hasattr(channel, "send"):
         await channel.send(
             f"{target.mention} recibió **{role.name}** por **{hours}** h (cartas trampa). Se quita solo al vencer.",
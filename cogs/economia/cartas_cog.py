@@ -10,6 +10,7 @@ from .db_manager import EconomiaDBManagerV2
 from .toque_labels import guia_toque_explicacion, toque_emote
 from .card_db_manager import CardDBManager
 from . import card_effectos
+from .blister_open import open_blisters
 
 TipoBlister = Literal["trampa"] 
 CantidadBlister = Literal["1", "5", "todos"]
@@ -102,14 +103,14 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
 
     # --- Autocompletados ---
     async def blister_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-        blisters = self.economia_db.get_blisters_for_user(interaction.user.id)
+        blisters = await self.economia_db.aio.get_blisters_for_user(interaction.user.id)
         return [
             app_commands.Choice(name=f"{b['blister_tipo'].capitalize()} (Tienes: {b['cantidad']})", value=b['blister_tipo'])
             for b in blisters if current.lower() in b['blister_tipo'].lower()
         ]
         
     async def card_inventory_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-        cartas_raw = self.economia_db.get_cards_in_inventory(interaction.user.id)
+        cartas_raw = await self.economia_db.aio.get_cards_in_inventory(interaction.user.id)
         choices = []
         for c in cartas_raw:
             carta_stock = self.card_db.get_carta_stock_by_id(c['carta_id'])
@@ -131,7 +132,7 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
     @app_commands.command(name="aat-puntos", description="Muestra tu saldo de Toque points (moneda del canal).")
     async def mis_puntos(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        user_data = self.economia_db.get_user_economy(interaction.user.id)
+        user_data = await self.economia_db.aio.get_user_economy(interaction.user.id)
         tq = toque_emote()
         embed = discord.Embed(
             title=f"{tq} Toque points — {interaction.user.display_name}",
@@ -150,8 +151,8 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
         await interaction.response.defer(ephemeral=True)
         user_id = interaction.user.id
         
-        eco_data = self.economia_db.get_user_economy(user_id)
-        blisters = self.economia_db.get_blisters_for_user(user_id)
+        eco_data = await self.economia_db.aio.get_user_economy(user_id)
+        blisters = await self.economia_db.aio.get_blisters_for_user(user_id)
         
         embed = discord.Embed(title=f"Inventario de {interaction.user.display_name}", color=discord.Color.dark_green())
         embed.add_field(name=f"{toque_emote()} Toque points", value=f"{eco_data['puntos_actuales']}", inline=True)
@@ -175,7 +176,7 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
         user_id = interaction.user.id
         
         tipo = tipo.lower().strip()
-        blisters = self.economia_db.get_blisters_for_user(user_id)
+        blisters = await self.economia_db.aio.get_blisters_for_user(user_id)
         blister_a_abrir = next((b for b in blisters if b['blister_tipo'] == tipo), None)
         
         if not blister_a_abrir or blister_a_abrir['cantidad'] <= 0:
@@ -192,34 +193,24 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
             await interaction.followup.send(f"Solo tienes {blister_a_abrir['cantidad']} blister(s) de tipo '{tipo}', no puedes abrir {cantidad_a_abrir}.", ephemeral=True)
             return
         
-        _, _ = self.economia_db.modify_blisters(user_id, tipo, -cantidad_a_abrir)
-        
-        cartas_obtenidas = []
-        for _ in range(cantidad_a_abrir * 3):
-            if tipo == "trampa":
-                carta = self.card_db.get_random_card_blister_trampa()
-            else:
-                carta = self.card_db.get_random_card_by_rarity()
-            if carta:
-                self.economia_db.add_card_to_inventory(user_id, carta['carta_id'], 1)
-                cartas_obtenidas.append(carta)
-
-        if not cartas_obtenidas:
-            _, bref = self.economia_db.modify_blisters(user_id, tipo, cantidad_a_abrir)
-            err_txt = f"¡Error! No hay cartas en el stock para el tipo de blister '{tipo}'. Contacta a un admin. (Tus blisters han sido devueltos)."
-            if bref:
-                err_txt += "\n\n" + "\n".join(bref)
-            await interaction.followup.send(err_txt, ephemeral=True)
+        res = await self.economia_db.aio.run(
+            open_blisters, self.economia_db, self.card_db, user_id, {tipo: cantidad_a_abrir}
+        )
+        if res.sin_stock:
+            await interaction.followup.send(
+                f"¡Error! No hay cartas en el stock para el tipo de blister '{tipo}'. Contacta a un admin. "
+                "(No se descontaron tus blisters).",
+                ephemeral=True,
+            )
+            return
+        if not res.applied:
+            await interaction.followup.send("Tus blisters cambiaron mientras abrías; probá de nuevo.", ephemeral=True)
             return
 
         embed = discord.Embed(title=f"¡Has abierto {cantidad_a_abrir} Blister(s) de {tipo.capitalize()}!", color=discord.Color.purple())
-        conteo_cartas = {}
-        for carta in cartas_obtenidas:
-            nombre = f"**{carta['nombre']}** ({carta['rareza']})"
-            conteo_cartas[nombre] = conteo_cartas.get(nombre, 0) + 1
         desc = "¡Recibiste las siguientes cartas!:\n\n"
-        for nombre, num in conteo_cartas.items():
-            desc += f"• {nombre} (x{num})\n"
+        for carta, num in res.resumen():
+            desc += f"• **{carta['nombre']}** ({carta['rareza']}) (x{num})\n"
         embed.description = desc
         embed.set_footer(text="Colección: /aat-miscartas (privado) · ?miscartas / ?vercartas (público) · detalle: ?vercarta")
         await interaction.followup.send(embed=embed, ephemeral=True)
@@ -227,7 +218,7 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
     @app_commands.command(name="aat-miscartas", description="Muestra tu inventario de cartas.")
     async def mis_cartas(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        cartas_inv = self.economia_db.get_cards_in_inventory(interaction.user.id)
+        cartas_inv = await self.economia_db.aio.get_cards_in_inventory(interaction.user.id)
         embed = discord.Embed(title=f"Inventario de Cartas de {interaction.user.display_name}", color=discord.Color.blue())
         if not cartas_inv:
             embed.description = "No tenés ninguna carta. ¡Conseguí blisters con `/aat-reclamar diaria`!"
@@ -266,18 +257,18 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
             await interaction.followup.send("ID de carta inválido. Debes usar el autocompletado.", ephemeral=True)
             return
 
-        uso_reciente = self.economia_db.get_card_usage_history(user_id, minutes=10)
+        uso_reciente = await self.economia_db.aio.get_card_usage_history(user_id, minutes=10)
         if len(uso_reciente) >= 5:
             await interaction.followup.send("¡Has usado demasiadas cartas! Límite: 5 cartas cada 10 minutos.", ephemeral=True)
             return
             
-        carta_inv = self.economia_db.get_card_from_inventory(user_id, int(carta_id))
+        carta_inv = await self.economia_db.aio.get_card_from_inventory(user_id, int(carta_id))
         if not carta_inv:
             await interaction.followup.send("No tienes esa carta o no tienes copias.", ephemeral=True)
             return
             
-        self.economia_db.use_card_from_inventory(user_id, int(carta_id))
-        self.economia_db.log_card_usage(user_id)
+        await self.economia_db.aio.use_card_from_inventory(user_id, int(carta_id))
+        await self.economia_db.aio.log_card_usage(user_id)
 
         carta = self.card_db.get_carta_stock_by_id(int(carta_id))
 
@@ -316,7 +307,7 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
         ch_id = interaction.channel.id if interaction.channel else None
         g_id = guild.id if guild else None
         if (carta.get("tipo_carta") or "").lower() == "trampa":
-            self.economia_db.log_trampa_uso(
+            await self.economia_db.aio.log_trampa_uso(
                 user_id,
                 usuario_objetivo.id if usuario_objetivo else None,
                 int(carta_id),
@@ -325,9 +316,9 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
                 ch_id,
             )
             if usuario_objetivo:
-                self.economia_db.mark_trampa_enviada(user_id)
+                await self.economia_db.aio.mark_trampa_enviada(user_id)
             else:
-                self.economia_db.bump_trampa_sin_objetivo(user_id)
+                await self.economia_db.aio.bump_trampa_sin_objetivo(user_id)
 
         actor = interaction.user
         sc = getattr(self.bot, "shop_config", None) or {}
@@ -353,7 +344,7 @@ class CartasCog(commands.Cog, name="Economia Cartas"):
         if not carta_id.isdigit():
             await interaction.followup.send("ID de carta inválido. Debes usar el autocompletado y seleccionar una carta.", ephemeral=True)
             return
-        carta_inv = self.economia_db.get_card_from_inventory(interaction.user.id, int(carta_id))
+        carta_inv = await self.economia_db.aio.get_card_from_inventory(interaction.user.id, int(carta_id))
         if not carta_inv:
             await interaction.followup.send("No tienes esa carta en tu inventario.", ephemeral=True)
             return
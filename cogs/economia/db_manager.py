@@ -1,24 +1,150 @@
 # cogs/economia/db_manager.py
+import asyncio
+import contextlib
+import functools
 import os
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
 import datetime
 
+from .progress_snapshot import ProgressReadCache, UserProgressSnapshot
+from .rank_index import RANKING_COLUMNS, RankingIndex
+from .task_counters import TaskCounterBuffer
 from .toque_labels import fmt_toque_sentence
 
 DB_FILE = Path(__file__).parent / "economia.db"
 
+
+def _progress_cache_ttl() -> float:
+    try:
+        return max(0.0, min(300.0, float((os.getenv("ECONOMIA_PROGRESS_CACHE_TTL_S") or "15").strip())))
+    except ValueError:
+        return 15.0
+
 # --- RENOMBRADA CLASE ---
 class EconomiaDBManagerV2:
     def __init__(self, db_path: Path = DB_FILE):
         self.db_path = db_path
+        # Una conexión larga por hilo (loop de discord + executor de escritura), en WAL.
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.aio = EconomiaDBAsync(self)
+        # Contadores de mensajes/reacciones en memoria; se vuelcan con flush_task_counters().
+        self.task_counters = TaskCounterBuffer()
+        # Usuarios que ya tienen fila en economia_usuarios + tareas_inicial: ensure_user_exists no toca la DB.
+        self._known_users: set = set()
+        self.ensure_user_skipped = 0
+        self.ensure_user_inserted = 0
+        # Rankings (?top / hub / mi resumen) servidos desde memoria; se actualiza en cada escritura de puntos.
+        self.rank_index = RankingIndex()
+        self._rank_index_loaded = False
+        # Foto de progreso por usuario (?progreso / ?diaria / ?semanal y sus botones) servida de memoria unos
+        # segundos; cada escritura del manager sobre esas tablas invalida al usuario (TTL 0 = sin caché).
+        self.progress_cache = ProgressReadCache(_progress_cache_ttl())
         self._create_tables()
         self._check_and_update_schema()
-
-    def _get_connection(self):
-        return sqlite3.connect(self.db_path)
+        self._warm_known_users()
+        self._load_rank_index()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            return tx
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Agrupa varias operaciones del manager en una sola transacción (BEGIN IMMEDIATE … COMMIT).
+        Dentro, los `commit()` de cada método no cierran nada; si algo falla se hace rollback de todo.
+        Anidado usa SAVEPOINT: un error interno deshace solo ese bloque.
+        """
+        depth = int(getattr(self._local, "tx_depth", 0) or 0)
+        if depth == 0:
+            raw = self._get_connection()
+            if raw.in_transaction:
+                raw.commit()
+            raw.execute("BEGIN IMMEDIATE")
+            self._local.tx = _TxConnection(raw)
+            self._local.tx_new_users = []
+            self._local.tx_progress_dirty = []
+        else:
+            raw = self._local.tx.raw
+            raw.execute(f"SAVEPOINT tx_{depth}")
+        mark = len(self._local.tx_new_users)
+        self._local.tx_depth = depth + 1
+        try:
+            yield self._local.tx
+        except BaseException:
+            if depth == 0:
+                raw.rollback()
+            else:
+                raw.execute(f"ROLLBACK TO tx_{depth}")
+                raw.execute(f"RELEASE tx_{depth}")
+            del self._local.tx_new_users[mark:]
+            # Los puntajes ya se pasaron al índice de rankings; se recarga desde lo que quedó en la DB.
+            self._load_rank_index()
+            raise
+        else:
+            if depth == 0:
+                raw.commit()
+                self._known_users.update(self._local.tx_new_users)
+                # Otra vez tras el commit: una lectura de otro hilo pudo cachear el estado previo mientras tanto.
+                for uid in self._local.tx_progress_dirty:
+                    self.progress_cache.invalidate(uid)
+            else:
+                raw.execute(f"RELEASE tx_{depth}")
+        finally:
+            self._local.tx_depth = depth
+            if depth == 0:
+                self._local.tx = None
+                self._local.tx_new_users = []
+                self._local.tx_progress_dirty = []
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Un solo worker: SQLite admite un escritor a la vez; así las escrituras no compiten por el lock.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="economia-db")
+        return self._executor
+
+    async def run_in_executor(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Corre `fn(*args, **kwargs)` en el hilo de la DB sin bloquear el loop de discord."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        """Vuelca contadores pendientes, cierra el executor y todas las conexiones (llamar al apagar el bot)."""
+        try:
+            self.flush_task_counters()
+        except Exception as e:
+            print(f"Error volcando contadores de tareas al cerrar: {e}")
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
 
     def _create_tables(self):
         with self._get_connection() as conn:
@@ -402,16 +528,80 @@ class EconomiaDBManagerV2:
                     """
                 )
 
+                # Índices de ranking: respaldo en frío si el índice en memoria no está cargado.
+                for col in RANKING_COLUMNS.values():
+                    cursor.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_economia_usuarios_{col} "
+                        f"ON economia_usuarios ({col} DESC, user_id)"
+                    )
+
                 conn.commit()
             except Exception as e:
                 print(f"Error actualizando el schema de economia_usuarios: {e}")
 
+    def _warm_known_users(self) -> None:
+        with self._get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT u.user_id FROM economia_usuarios u JOIN tareas_inicial t ON t.user_id = u.user_id"
+            )
+            self._known_users.update(int(r[0]) for r in cur.fetchall())
+
+    def _load_rank_index(self) -> None:
+        try:
+            with self._get_connection() as conn:
+                cur = conn.cursor()
+                cur.execute(
+                    "SELECT user_id, puntos_actuales, puntos_conseguidos, puntos_gastados FROM economia_usuarios "
+                    "WHERE puntos_actuales > 0 OR puntos_conseguidos > 0 OR puntos_gastados > 0"
+                )
+                self.rank_index.load((int(r[0]), int(r[1] or 0), int(r[2] or 0), int(r[3] or 0)) for r in cur.fetchall())
+            self._rank_index_loaded = True
+        except Exception as e:
+            self._rank_index_loaded = False
+            print(f"No se pudo cargar el índice de rankings (se usa SQL): {e}")
+
+    def _refresh_rank(self, cur: sqlite3.Cursor, user_id: int) -> None:
+        """Relee los tres puntajes del usuario (misma conexión) y los pasa al índice de rankings."""
+        cur.execute(
+            "SELECT puntos_actuales, puntos_conseguidos, puntos_gastados FROM economia_usuarios WHERE user_id = ?",
+            (user_id,),
+        )
+        row = cur.fetchone()
+        if row:
+            self.rank_index.update_user(user_id, int(row[0] or 0), int(row[1] or 0), int(row[2] or 0))
+
+    def _progress_dirty(self, *user_ids: int) -> None:
+        """Saca de la caché de progreso a los usuarios escritos (y de nuevo al commit si hay transacción)."""
+        in_tx = getattr(self._local, "tx", None) is not None
+        for uid in user_ids:
+            self.progress_cache.invalidate(uid)
+            if in_tx:
+                self._local.tx_progress_dirty.append(int(uid))
+
     def ensure_user_exists(self, user_id: int):
+        if int(user_id) in self._known_users:
+            self.ensure_user_skipped += 1
+            return
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("INSERT OR IGNORE INTO economia_usuarios (user_id) VALUES (?)", (user_id,))
             cursor.execute("INSERT OR IGNORE INTO tareas_inicial (user_id) VALUES (?)", (user_id,))
             conn.commit()
+        if getattr(self._local, "tx", None) is not None:
+            # Recién queda "conocido" cuando la transacción hace commit.
+            self._local.tx_new_users.append(int(user_id))
+        else:
+            self._known_users.add(int(user_id))
+        self.ensure_user_inserted += 1
+
+    def known_users_stats(self) -> Dict[str, int]:
+        """Tamaño del caché de usuarios y cuántos round-trips de ensure_user_exists se ahorraron."""
+        return {
+            "known_users": len(self._known_users),
+            "round_trips_saved": self.ensure_user_skipped,
+            "round_trips_done": self.ensure_user_inserted,
+        }
 
     def get_user_economy(self, user_id: int) -> Optional[Dict[str, Any]]:
         self.ensure_user_exists(user_id)
@@ -421,37 +611,6 @@ class EconomiaDBManagerV2:
             cursor.execute("SELECT * FROM economia_usuarios WHERE user_id = ?", (user_id,))
             return dict(cursor.fetchone())
 
-    def get_oracle_media_limits(self, user_id: int) -> Dict[str, int]:
-        """Estado para rate-limit del oráculo con media (cooldown y usos diarios)."""
-        self.ensure_user_exists(user_id)
-        fecha, _ = self.get_current_date_keys()
-        with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute("SELECT oracle_media_last_ts FROM economia_usuarios WHERE user_id = ?", (user_id,))
-            row = cur.fetchone()
-            last_ts = int(row["oracle_media_last_ts"] or 0) if row else 0
-            cur.execute("INSERT OR IGNORE INTO tareas_diarias (user_id, fecha) VALUES (?, ?)", (user_id, fecha))
-            cur.execute("SELECT oracle_media_uses FROM tareas_diarias WHERE user_id = ? AND fecha = ?", (user_id, fecha))
-            drow = cur.fetchone()
-            uses_today = int(drow["oracle_media_uses"] or 0) if drow else 0
-            return {"last_ts": last_ts, "uses_today": uses_today}
-
-    def bump_oracle_media_use(self, user_id: int) -> None:
-        """Suma 1 uso diario + setea last_ts para cooldown."""
-        self.ensure_user_exists(user_id)
-        fecha, _ = self.get_current_date_keys()
-        now = int(time.time())
-        with self._get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("UPDATE economia_usuarios SET oracle_media_last_ts = ? WHERE user_id = ?", (now, user_id))
-            cur.execute("INSERT OR IGNORE INTO tareas_diarias (user_id, fecha) VALUES (?, ?)", (user_id, fecha))
-            cur.execute(
-                "UPDATE tareas_diarias SET oracle_media_uses = oracle_media_uses + 1 WHERE user_id = ? AND fecha = ?",
-                (user_id, fecha),
-            )
-            conn.commit()
-
     def modify_points(self, user_id: int, cantidad: int, gastar: bool = False) -> int:
         self.ensure_user_exists(user_id)
         with self._get_connection() as conn:
@@ -463,6 +622,8 @@ class EconomiaDBManagerV2:
                 cantidad_abs = abs(cantidad)
                 cursor.execute("UPDATE economia_usuarios SET puntos_actuales = puntos_actuales + ?, puntos_conseguidos = puntos_conseguidos + ? WHERE user_id = ?", (cantidad_abs, cantidad_abs, user_id))
             conn.commit()
+            self._progress_dirty(user_id)
+            self._refresh_rank(cursor, user_id)
             cursor.execute("SELECT puntos_actuales FROM economia_usuarios WHERE user_id = ?", (user_id,))
             return cursor.fetchone()[0]
 
@@ -494,6 +655,8 @@ class EconomiaDBManagerV2:
                 (new_conseg, new_actual, user_id),
             )
             conn.commit()
+            self._progress_dirty(user_id)
+            self.rank_index.update_user(user_id, new_actual, new_conseg, gast)
             return {"actual": int(new_actual), "conseguidos": int(new_conseg), "gastados": int(gast)}
 
     def modify_blisters(self, user_id: int, blister_tipo: str, cantidad: int) -> Tuple[int, List[str]]:
@@ -556,6 +719,9 @@ class EconomiaDBManagerV2:
                     f"(meta versión **{version}**; subí `REWARD_BLISTER_COLLECTION_VERSION` cuando agregues tipos nuevos)."
                 )
             conn.commit()
+            self._progress_dirty(user_id)
+            if msgs:
+                self._refresh_rank(cur, user_id)
         return msgs
 
     def set_credits(self, user_id: int, cantidad: int) -> int:
@@ -564,6 +730,7 @@ class EconomiaDBManagerV2:
             cursor = conn.cursor()
             cursor.execute("UPDATE economia_usuarios SET creditos_pin = ? WHERE user_id = ?", (cantidad, user_id))
             conn.commit()
+            self._progress_dirty(user_id)
             return cantidad
     
     def use_credit(self, user_id: int) -> bool:
@@ -575,6 +742,7 @@ class EconomiaDBManagerV2:
             if creditos > 0:
                 cursor.execute("UPDATE economia_usuarios SET creditos_pin = creditos_pin - 1 WHERE user_id = ?", (user_id,))
                 conn.commit()
+                self._progress_dirty(user_id)
                 return True
             return False
 
@@ -590,7 +758,10 @@ class EconomiaDBManagerV2:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM tareas_inicial WHERE user_id = ?", (user_id,))
-            return dict(cursor.fetchone())
+            row = dict(cursor.fetchone())
+        if not self._inicial_locked(row):
+            self.task_counters.merge_inicial(user_id, row)
+        return row
 
     def get_progress_diaria(self, user_id: int) -> Dict[str, Any]:
         self.ensure_user_exists(user_id)
@@ -600,8 +771,11 @@ class EconomiaDBManagerV2:
             cursor = conn.cursor()
             cursor.execute("INSERT OR IGNORE INTO tareas_diarias (user_id, fecha) VALUES (?, ?)", (user_id, fecha))
             cursor.execute("SELECT * FROM tareas_diarias WHERE user_id = ? AND fecha = ?", (user_id, fecha))
-            return dict(cursor.fetchone())
-            
+            row = dict(cursor.fetchone())
+        if not self._diaria_locked(row):
+            self.task_counters.merge_diaria(user_id, fecha, row)
+        return row
+
     def get_progress_semanal(self, user_id: int) -> Dict[str, Any]:
         self.ensure_user_exists(user_id)
         _, semana = self.get_current_date_keys()
@@ -610,7 +784,98 @@ class EconomiaDBManagerV2:
             cursor = conn.cursor()
             cursor.execute("INSERT OR IGNORE INTO tareas_semanales (user_id, semana) VALUES (?, ?)", (user_id, semana))
             cursor.execute("SELECT * FROM tareas_semanales WHERE user_id = ? AND semana = ?", (user_id, semana))
-            return dict(cursor.fetchone())
+            row = dict(cursor.fetchone())
+        if not int(row.get("completado") or 0):
+            self.task_counters.merge_semanal(user_id, semana, row)
+        return row
+
+    def get_progress_snapshot(self, user_id: int) -> UserProgressSnapshot:
+        """
+        Iniciación + diario + semanal + fila de economía + conteos de perfil/cartas, en una sola transacción.
+        Servida desde `progress_cache` si hay una foto vigente; los contadores en buffer se mezclan siempre al final.
+        """
+        fecha, semana = self.get_current_date_keys()
+        # Dentro de una transacción se lee lo no confirmado: ni se usa ni se guarda la caché.
+        cacheable = getattr(self._local, "tx", None) is None
+        snap = self.progress_cache.get(user_id, fecha, semana) if cacheable else None
+        if snap is None:
+            token = self.progress_cache.begin(user_id) if cacheable else None
+            snap = self._read_progress_snapshot(user_id, fecha, semana)
+            if token is not None:
+                self.progress_cache.put(user_id, token, snap)
+        snap = snap.copy()
+        if not self._inicial_locked(snap.inicial):
+            self.task_counters.merge_inicial(user_id, snap.inicial)
+        if not self._diaria_locked(snap.diaria):
+            self.task_counters.merge_diaria(user_id, fecha, snap.diaria)
+        if not int(snap.semanal.get("completado") or 0):
+            self.task_counters.merge_semanal(user_id, semana, snap.semanal)
+        return snap
+
+    def _read_progress_snapshot(self, user_id: int, fecha: str, semana: str) -> UserProgressSnapshot:
+        self.ensure_user_exists(user_id)
+        with self.transaction() as conn:
+            cur = conn.cursor()
+            cur.execute("INSERT OR IGNORE INTO tareas_diarias (user_id, fecha) VALUES (?, ?)", (user_id, fecha))
+            cur.execute("INSERT OR IGNORE INTO tareas_semanales (user_id, semana) VALUES (?, ?)", (user_id, semana))
+            cur.execute("SELECT * FROM tareas_inicial WHERE user_id = ?", (user_id,))
+            inicial = dict(cur.fetchone())
+            cur.execute("SELECT * FROM tareas_diarias WHERE user_id = ? AND fecha = ?", (user_id, fecha))
+            diaria = dict(cur.fetchone())
+            cur.execute("SELECT * FROM tareas_semanales WHERE user_id = ? AND semana = ?", (user_id, semana))
+            semanal = dict(cur.fetchone())
+            cur.execute("SELECT * FROM economia_usuarios WHERE user_id = ?", (user_id,))
+            economy = dict(cur.fetchone())
+            cur.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM user_wishlist_entries WHERE user_id = ? AND TRIM(title) != ''),
+                    (SELECT COUNT(*) FROM user_anime_hated_entries WHERE user_id = ? AND TRIM(title) != ''),
+                    (SELECT COALESCE(SUM(cantidad), 0) FROM inventario_cartas WHERE user_id = ? AND cantidad > 0),
+                    (SELECT COUNT(*) FROM inventario_cartas WHERE user_id = ? AND cantidad > 0)
+                """,
+                (user_id, user_id, user_id, user_id),
+            )
+            wl, hat, copies, kinds = (int(v or 0) for v in cur.fetchone())
+            cur.execute(
+                "SELECT pos FROM anime_top_entries WHERE user_id = ? AND pos >= 1 AND TRIM(title) != '' ORDER BY pos",
+                (user_id,),
+            )
+            top_positions = [int(r[0]) for r in cur.fetchall()]
+        return UserProgressSnapshot(
+            user_id=int(user_id),
+            fecha=fecha,
+            semana=semana,
+            inicial=inicial,
+            diaria=diaria,
+            semanal=semanal,
+            economy=economy,
+            wishlist_filled=wl,
+            hated_filled=hat,
+            top_positions=top_positions,
+            cards_copies=copies,
+            cards_kinds=kinds,
+        )
+
+    @staticmethod
+    def _inicial_locked(row: Dict[str, Any]) -> bool:
+        return all(
+            int(row.get(c) or 0) == 1
+            for c in ("completado_inicial_comunidad", "completado_inicial_perfil_min", "completado_inicial_perfil_max")
+        )
+
+    @staticmethod
+    def _diaria_locked(row: Dict[str, Any]) -> bool:
+        return all(
+            int(row.get(c) or 0) == 1
+            for c in (
+                "completado_diaria_actividad",
+                "completado_diaria_trampa",
+                "completado_diaria_rolls",
+                "completado_diaria_rps",
+                "completado_diaria_ahorcado",
+            )
+        )
 
     def update_task_inicial(self, user_id: int, task_name: str):
         self.ensure_user_exists(user_id)
@@ -628,6 +893,7 @@ class EconomiaDBManagerV2:
                 (user_id,),
             )
             conn.commit()
+            self._progress_dirty(user_id)
     
     def update_task_diaria(self, user_id: int, task_name: str, fecha: str, amount: int = 1):
         self.ensure_user_exists(user_id)
@@ -658,6 +924,7 @@ class EconomiaDBManagerV2:
                     (amount, user_id, fecha),
                 )
             conn.commit()
+            self._progress_dirty(user_id)
             
     def update_task_semanal(self, user_id: int, task_name: str, semana: str, amount: int = 1):
         self.ensure_user_exists(user_id)
@@ -666,6 +933,104 @@ class EconomiaDBManagerV2:
             cursor.execute("INSERT OR IGNORE INTO tareas_semanales (user_id, semana) VALUES (?, ?)", (user_id, semana))
             cursor.execute(f"UPDATE tareas_semanales SET {task_name} = {task_name} + ? WHERE user_id = ? AND semana = ? AND completado = 0", (amount, user_id, semana))
             conn.commit()
+            self._progress_dirty(user_id)
+
+    # --- Write-behind de contadores (listeners): se suman en memoria y se vuelcan en lote ---
+    def buffer_task_inicial(self, user_id: int, task_name: str) -> int:
+        """Como update_task_inicial, pero diferido. Devuelve cuántos eventos hay pendientes."""
+        return self.task_counters.add_inicial(user_id, task_name)
+
+    def buffer_task_diaria(self, user_id: int, task_name: str, fecha: str, amount: int = 1) -> int:
+        """Como update_task_diaria, pero diferido. Devuelve cuántos eventos hay pendientes."""
+        return self.task_counters.add_diaria(user_id, task_name, fecha, amount)
+
+    def buffer_task_semanal(self, user_id: int, task_name: str, semana: str, amount: int = 1) -> int:
+        """Como update_task_semanal, pero diferido. Devuelve cuántos eventos hay pendientes."""
+        return self.task_counters.add_semanal(user_id, task_name, semana, amount)
+
+    def flush_task_counters(self) -> int:
+        """
+        Vuelca los contadores pendientes en una sola transacción (mismas reglas que update_task_*).
+        Devuelve cuántas filas/claves se escribieron. Si falla, el lote vuelve al buffer.
+        """
+        diaria, semanal, inicial = self.task_counters.drain()
+        if not diaria and not semanal and not inicial:
+            return 0
+        users = {k[0] for k in diaria} | {k[0] for k in semanal} | {k[0] for k in inicial}
+        new_users = [u for u in users if u not in self._known_users]
+        self.ensure_user_skipped += len(users) - len(new_users)
+        try:
+            with self._get_connection() as conn:
+                cur = conn.cursor()
+                cur.executemany(
+                    "INSERT OR IGNORE INTO economia_usuarios (user_id) VALUES (?)", [(u,) for u in new_users]
+                )
+                cur.executemany(
+                    "INSERT OR IGNORE INTO tareas_inicial (user_id) VALUES (?)", [(u,) for u in new_users]
+                )
+
+                by_col: Dict[str, List[Tuple[Any, ...]]] = {}
+                for (uid, fecha, col), amount in diaria.items():
+                    by_col.setdefault(col, []).append((amount, uid, fecha))
+                cur.executemany(
+                    "INSERT OR IGNORE INTO tareas_diarias (user_id, fecha) VALUES (?, ?)",
+                    list({(uid, fecha) for uid, fecha, _ in diaria}),
+                )
+                for col, rows in by_col.items():
+                    if col == "oraculo_preguntas":
+                        sql = f"UPDATE tareas_diarias SET {col} = {col} + ? WHERE user_id = ? AND fecha = ?"
+                    else:
+                        sql = f"""
+                            UPDATE tareas_diarias SET {col} = {col} + ?
+                            WHERE user_id = ? AND fecha = ? AND NOT (
+                                IFNULL(completado_diaria_actividad, 0) = 1
+                                AND IFNULL(completado_diaria_trampa, 0) = 1
+                                AND IFNULL(completado_diaria_rolls, 0) = 1
+                                AND IFNULL(completado_diaria_rps, 0) = 1
+                                AND IFNULL(completado_diaria_ahorcado, 0) = 1
+                            )
+                            """
+                    cur.executemany(sql, rows)
+
+                by_col = {}
+                for (uid, semana, col), amount in semanal.items():
+                    by_col.setdefault(col, []).append((amount, uid, semana))
+                cur.executemany(
+                    "INSERT OR IGNORE INTO tareas_semanales (user_id, semana) VALUES (?, ?)",
+                    list({(uid, semana) for uid, semana, _ in semanal}),
+                )
+                for col, rows in by_col.items():
+                    cur.executemany(
+                        f"UPDATE tareas_semanales SET {col} = {col} + ? WHERE user_id = ? AND semana = ? AND completado = 0",
+                        rows,
+                    )
+
+                by_col = {}
+                for uid, col in inicial:
+                    by_col.setdefault(col, []).append((uid,))
+                for col, rows in by_col.items():
+                    cur.executemany(
+                        f"""
+                        UPDATE tareas_inicial SET {col} = 1
+                        WHERE user_id = ? AND NOT (
+                            IFNULL(completado_inicial_comunidad, 0) = 1
+                            AND IFNULL(completado_inicial_perfil_min, 0) = 1
+                            AND IFNULL(completado_inicial_perfil_max, 0) = 1
+                        )
+                        """,
+                        rows,
+                    )
+                conn.commit()
+        except Exception:
+            self.task_counters.restore(diaria, semanal, inicial)
+            raise
+        self._known_users.update(new_users)
+        self.ensure_user_inserted += len(new_users)
+        # Lo volcado pasa del buffer (que se mezcla al leer) a la DB: las fotos cacheadas quedaron cortas.
+        self._progress_dirty(*users)
+        n = len(diaria) + len(semanal) + len(inicial)
+        self.task_counters.mark_flushed(n)
+        return n
 
     def claim_reward(self, user_id: int, task_type: str) -> bool:
         self.ensure_user_exists(user_id)
@@ -793,70 +1158,96 @@ class EconomiaDBManagerV2:
                     (user_id, fecha),
                 )
             conn.commit()
+            self._progress_dirty(user_id)
             return affected > 0
 
-    def record_impostor_game_end(self, lobby: Any, winner_role: str) -> None:
-        """Cuenta partida jugada para cada humano y victoria del impostor si corresponde."""
-        from cogs.impostor.engine import ROLE_IMPOSTOR
+    def record_impostor_game_result(self, lobby: Any, winner_role: str, reason: str) -> None:
+        """
+        Todo lo de fin de partida en una transacción: tareas semanales (partidas / victoria como impostor),
+        ranking `impostor_stats` e `impostor_game_log`. Un solo commit por partida, con executemany.
+        """
+        from cogs.impostor.engine import ROLE_IMPOSTOR, ROLE_SOCIAL
 
         _, semana = self.get_current_date_keys()
-        imp_ids = set(getattr(lobby, "impostor_ids", None) or [])
-        if not imp_ids and getattr(lobby, "impostor_id", None):
-            imp_ids = {int(lobby.impostor_id)}
-        for p in lobby.players.values():
-            if getattr(p, "is_bot", False):
-                continue
-            uid = int(getattr(p, "user_id", 0))
-            if not uid:
-                continue
-            self.ensure_user_exists(uid)
-            self.update_task_semanal(uid, "impostor_partidas", semana, 1)
-        if winner_role == ROLE_IMPOSTOR:
-            for imp_id in imp_ids:
-                self.ensure_user_exists(int(imp_id))
-                self.update_task_semanal(int(imp_id), "impostor_victorias", semana, 1)
-
-    def record_impostor_ranked_stats(self, lobby: Any, winner_role: str) -> None:
-        """Ranking global/personal: partidas y victorias por rol."""
-        from cogs.impostor.engine import ROLE_IMPOSTOR, ROLE_SOCIAL
+        imp_ids = {int(i) for i in (getattr(lobby, "impostor_ids", None) or [])}
+        # Semanal y ranking aceptan el `impostor_id` viejo (lobbies de una sola plaza); el log cuenta impostor_ids.
+        impostors = set(imp_ids)
+        if not impostors and getattr(lobby, "impostor_id", None):
+            impostors = {int(lobby.impostor_id)}
+        imp_winners = impostors if winner_role == ROLE_IMPOSTOR else set()
+        humans = [p for p in lobby.players.values() if not getattr(p, "is_bot", False)]
+        human_ids = [uid for uid in (int(getattr(p, "user_id", 0)) for p in humans) if uid]
+
+        users = set(human_ids) | imp_winners
+        new_users = [u for u in users if u not in self._known_users]
+        self.ensure_user_skipped += len(users) - len(new_users)
+        stats_rows = []
+        for uid in human_ids:
+            is_imp = uid in impostors
+            won_imp = winner_role == ROLE_IMPOSTOR and is_imp
+            won_soc = winner_role == ROLE_SOCIAL and not is_imp
+            stats_rows.append(
+                (0 if is_imp else 1, 1 if is_imp else 0, 1 if won_soc else 0, 1 if won_imp else 0, uid)
+            )
 
-        imp_ids = set(getattr(lobby, "impostor_ids", None) or [])
-        if not imp_ids and getattr(lobby, "impostor_id", None):
-            imp_ids = {int(lobby.impostor_id)}
         with self._get_connection() as conn:
             cur = conn.cursor()
-            for p in lobby.players.values():
-                if getattr(p, "is_bot", False):
-                    continue
-                uid = int(getattr(p, "user_id", 0))
-                if not uid:
-                    continue
-                is_imp = uid in imp_ids
-                won_imp = winner_role == ROLE_IMPOSTOR and is_imp
-                won_soc = winner_role == ROLE_SOCIAL and not is_imp
-                cur.execute(
-                    "INSERT OR IGNORE INTO impostor_stats (user_id) VALUES (?)",
-                    (uid,),
-                )
-                cur.execute(
-                    """
-                    UPDATE impostor_stats SET
-                        games_played = games_played + 1,
-                        games_social = games_social + ?,
-                        games_impostor = games_impostor + ?,
-                        wins_social = wins_social + ?,
-                        wins_impostor = wins_impostor + ?
-                    WHERE user_id = ?
-                    """,
-                    (
-                        0 if is_imp else 1,
-                        1 if is_imp else 0,
-                        1 if won_soc else 0,
-                        1 if won_imp else 0,
-                        uid,
-                    ),
-                )
+            cur.executemany("INSERT OR IGNORE INTO economia_usuarios (user_id) VALUES (?)", [(u,) for u in new_users])
+            cur.executemany("INSERT OR IGNORE INTO tareas_inicial (user_id) VALUES (?)", [(u,) for u in new_users])
+            cur.executemany(
+                "INSERT OR IGNORE INTO tareas_semanales (user_id, semana) VALUES (?, ?)",
+                [(u, semana) for u in users],
+            )
+            cur.executemany(
+                "UPDATE tareas_semanales SET impostor_partidas = impostor_partidas + 1 "
+                "WHERE user_id = ? AND semana = ? AND completado = 0",
+                [(u, semana) for u in human_ids],
+            )
+            cur.executemany(
+                "UPDATE tareas_semanales SET impostor_victorias = impostor_victorias + 1 "
+                "WHERE user_id = ? AND semana = ? AND completado = 0",
+                [(u, semana) for u in imp_winners],
+            )
+            cur.executemany("INSERT OR IGNORE INTO impostor_stats (user_id) VALUES (?)", [(u,) for u in human_ids])
+            cur.executemany(
+                """
+                UPDATE impostor_stats SET
+                    games_played = games_played + 1,
+                    games_social = games_social + ?,
+                    games_impostor = games_impostor + ?,
+                    wins_social = wins_social + ?,
+                    wins_impostor = wins_impostor + ?
+                WHERE user_id = ?
+                """,
+                stats_rows,
+            )
+            cur.execute(
+                """
+                INSERT INTO impostor_game_log (
+                    ended_ts, guild_id, channel_id, lobby_name, winner_role,
+                    secret_name, secret_theme, human_count, impostor_count, reason
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    time.time(),
+                    int(getattr(lobby, "guild_id", 0) or 0),
+                    int(getattr(lobby, "channel_id", 0) or 0),
+                    str(getattr(lobby, "lobby_name", ""))[:120],
+                    str(winner_role or ""),
+                    (str(getattr(lobby, "character_name", "")) or "")[:200],
+                    (str(getattr(lobby, "secret_theme", "")) or "")[:32],
+                    len(humans),
+                    len(imp_ids),
+                    (str(reason or ""))[:500],
+                ),
+            )
             conn.commit()
+        self._progress_dirty(*users)
+        if getattr(self._local, "tx", None) is not None:
+            self._local.tx_new_users.extend(new_users)
+        else:
+            self._known_users.update(new_users)
+        self.ensure_user_inserted += len(new_users)
 
     def get_impostor_stats(self, user_id: int) -> Dict[str, int]:
         with self._get_connection() as conn:
@@ -904,39 +1295,6 @@ class EconomiaDBManagerV2:
             )
             return [(int(r[0]), int(r[1])) for r in cur.fetchall()]
 
-    def record_impostor_game_log(self, lobby: Any, winner_role: str, reason: str) -> None:
-        """Historial ligero de partidas (staff / consulta)."""
-        import time
-        from cogs.impostor.engine import ROLE_IMPOSTOR
-
-        imp_ids = set(getattr(lobby, "impostor_ids", None) or [])
-        humans = [
-            p for p in lobby.players.values() if not getattr(p, "is_bot", False)
-        ]
-        with self._get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO impostor_game_log (
-                    ended_ts, guild_id, channel_id, lobby_name, winner_role,
-                    secret_name, secret_theme, human_count, impostor_count, reason
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    time.time(),
-                    int(getattr(lobby, "guild_id", 0) or 0),
-                    int(getattr(lobby, "channel_id", 0) or 0),
-                    str(getattr(lobby, "lobby_name", ""))[:120],
-                    str(winner_role or ""),
-                    (str(getattr(lobby, "character_name", "")) or "")[:200],
-                    (str(getattr(lobby, "secret_theme", "")) or "")[:32],
-                    len(humans),
-                    len(imp_ids),
-                    (str(reason or ""))[:500],
-                ),
-            )
-            conn.commit()
-
     def get_impostor_game_log_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
         lim = max(1, min(30, int(limit)))
         with self._get_connection() as conn:
@@ -989,6 +1347,7 @@ class EconomiaDBManagerV2:
                 (user_id, fecha),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def bump_trampa_sin_objetivo(self, user_id: int) -> None:
         """Trampa sin objetivo: suma 1 por uso; 1 en el día alcanza la parte Trampa de la diaria (alternativa a trampa con mención)."""
@@ -1010,6 +1369,7 @@ class EconomiaDBManagerV2:
                 (user_id, fecha),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def mark_diaria_ahorcado_result(self, user_id: int, id_dia: int) -> None:
         """Marca que el usuario completó el ahorcado del día (guarda el id del puzzle para antifraude)."""
@@ -1027,6 +1387,7 @@ class EconomiaDBManagerV2:
                 (int(id_dia or 0), user_id, fecha),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def log_trampa_uso(
         self,
@@ -1063,6 +1424,7 @@ class EconomiaDBManagerV2:
                 (user_id, semana),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     # --- Invitaciones roll / duelo (SQLite en economia.db) ---
     def minijuego_invite_create(
@@ -1125,15 +1487,20 @@ class EconomiaDBManagerV2:
             conn.cursor().execute("UPDATE minijuego_invite SET status = ? WHERE id = ?", (new_status, invite_id))
             conn.commit()
 
-    def minijuego_fetch_expired_pending(self) -> List[Dict[str, Any]]:
+    def minijuego_invite_get(self, invite_id: int) -> Optional[Dict[str, Any]]:
         with self._get_connection() as conn:
             conn.row_factory = sqlite3.Row
             cur = conn.cursor()
-            cur.execute(
-                "SELECT * FROM minijuego_invite WHERE status = 'pending' AND expires_ts < ?",
-                (time.time(),),
-            )
-            return [dict(r) for r in cur.fetchall()]
+            cur.execute("SELECT * FROM minijuego_invite WHERE id = ?", (invite_id,))
+            row = cur.fetchone()
+            return dict(row) if row else None
+
+    def minijuego_pending_expiries(self) -> List[Tuple[int, float]]:
+        """(id, expires_ts) de las invitaciones pendientes (para agendar sus vencimientos al arrancar)."""
+        with self._get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id, expires_ts FROM minijuego_invite WHERE status = 'pending'")
+            return [(int(r[0]), float(r[1] or 0)) for r in cur.fetchall()]
 
     def minijuego_invite_update_row(
         self, invite_id: int, payload: Optional[str] = None, expires_ts: Optional[float] = None
@@ -1220,6 +1587,7 @@ class EconomiaDBManagerV2:
                 (new_streak, fecha_hoy, user_id),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
         rewards = (task_config or {}).get("rewards") or {}
         step = int(
@@ -1289,9 +1657,46 @@ class EconomiaDBManagerV2:
             cursor = conn.cursor()
             cursor.execute("INSERT INTO inventario_cartas (user_id, carta_id, cantidad) VALUES (?, ?, ?) ON CONFLICT(user_id, carta_id) DO UPDATE SET cantidad = cantidad + ?", (user_id, carta_id, cantidad, cantidad))
             conn.commit()
+            self._progress_dirty(user_id)
             cursor.execute("SELECT cantidad FROM inventario_cartas WHERE user_id = ? AND carta_id = ?", (user_id, carta_id))
             return cursor.fetchone()[0]
 
+    def apply_blister_opening(self, user_id: int, opened: Dict[str, int], card_counts: Dict[int, int]) -> bool:
+        """
+        Descuenta los blisters abiertos (tipo → cantidad) y suma las cartas (carta_id → cantidad) en una
+        sola transacción (BEGIN IMMEDIATE), con executemany. Devuelve False sin tocar nada si algún tipo no alcanza.
+        """
+        self.ensure_user_exists(user_id)
+        debits = [(int(n), user_id, tipo.lower().strip(), int(n)) for tipo, n in opened.items() if int(n) > 0]
+        try:
+            # El lock de escritura se toma antes de leer: otra apertura no puede gastar el mismo stock en el medio.
+            with self.transaction() as conn:
+                cur = conn.cursor()
+                for n, _uid, tipo, _min in debits:
+                    cur.execute(
+                        "SELECT cantidad FROM inventario_blisters WHERE user_id = ? AND blister_tipo = ?",
+                        (user_id, tipo),
+                    )
+                    row = cur.fetchone()
+                    if not row or int(row[0] or 0) < n:
+                        return False
+                cur.executemany(
+                    "UPDATE inventario_blisters SET cantidad = cantidad - ? "
+                    "WHERE user_id = ? AND blister_tipo = ? AND cantidad >= ?",
+                    debits,
+                )
+                if cur.rowcount != len(debits):
+                    raise _BlisterShortfall()
+                cur.executemany(
+                    "INSERT INTO inventario_cartas (user_id, carta_id, cantidad) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id, carta_id) DO UPDATE SET cantidad = cantidad + excluded.cantidad",
+                    [(user_id, int(cid), int(n)) for cid, n in card_counts.items() if int(n) > 0],
+                )
+                self._progress_dirty(user_id)
+        except _BlisterShortfall:
+            return False
+        return True
+
     def get_cards_in_inventory(self, user_id: int) -> List[Dict[str, Any]]:
         self.ensure_user_exists(user_id)
         with self._get_connection() as conn:
@@ -1315,6 +1720,7 @@ class EconomiaDBManagerV2:
             cursor = conn.cursor()
             cursor.execute("UPDATE inventario_cartas SET cantidad = cantidad - 1 WHERE user_id = ? AND carta_id = ? AND cantidad > 0", (user_id, carta_id))
             conn.commit()
+            self._progress_dirty(user_id)
             return cursor.rowcount > 0
 
     def log_card_usage(self, user_id: int):
@@ -1334,23 +1740,25 @@ class EconomiaDBManagerV2:
             return [dict(row) for row in cursor.fetchall()]
             
     def get_top_users(self, ranking_type: str, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
-        column_map = {"actual": "puntos_actuales", "conseguidos": "puntos_conseguidos", "gastados": "puntos_gastados"}
-        column_name = column_map.get(ranking_type, "puntos_actuales")
+        column_name = RANKING_COLUMNS.get(ranking_type, "puntos_actuales")
         off = max(0, int(offset))
+        if self._rank_index_loaded:
+            return [{"user_id": uid, column_name: val} for uid, val in self.rank_index.top(column_name, limit, off)]
         with self._get_connection() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             query = (
                 f"SELECT user_id, {column_name} FROM economia_usuarios WHERE {column_name} > 0 "
-                f"ORDER BY {column_name} DESC LIMIT ? OFFSET ?"
+                f"ORDER BY {column_name} DESC, user_id LIMIT ? OFFSET ?"
             )
             cursor.execute(query, (limit, off))
             return [dict(row) for row in cursor.fetchall()]
 
     def count_ranked_users(self, ranking_type: str) -> int:
         """Usuarios con puntaje > 0 en la columna del ranking (misma regla que get_top_users)."""
-        column_map = {"actual": "puntos_actuales", "conseguidos": "puntos_conseguidos", "gastados": "puntos_gastados"}
-        column_name = column_map.get(ranking_type, "puntos_actuales")
+        column_name = RANKING_COLUMNS.get(ranking_type, "puntos_actuales")
+        if self._rank_index_loaded:
+            return self.rank_index.count_positive(column_name)
         with self._get_connection() as conn:
             cur = conn.cursor()
             cur.execute(f"SELECT COUNT(*) FROM economia_usuarios WHERE {column_name} > 0")
@@ -1358,9 +1766,11 @@ class EconomiaDBManagerV2:
 
     def get_user_rank_info(self, user_id: int, ranking_type: str) -> Dict[str, Any]:
         """Posición (1 = mejor) según columna de ranking; `value` es el puntaje del usuario."""
-        column_map = {"actual": "puntos_actuales", "conseguidos": "puntos_conseguidos", "gastados": "puntos_gastados"}
-        col = column_map.get(ranking_type, "puntos_actuales")
+        col = RANKING_COLUMNS.get(ranking_type, "puntos_actuales")
         self.ensure_user_exists(user_id)
+        if self._rank_index_loaded:
+            val, rank, with_positive = self.rank_index.rank_info(col, user_id)
+            return {"value": val, "rank": rank, "with_positive": with_positive}
         with self._get_connection() as conn:
             cur = conn.cursor()
             cur.execute(f"SELECT {col} FROM economia_usuarios WHERE user_id = ?", (user_id,))
@@ -1405,6 +1815,7 @@ class EconomiaDBManagerV2:
             cursor = conn.cursor()
             cursor.execute("UPDATE economia_usuarios SET reclamado_rol_creador = 1 WHERE user_id = ?", (user_id,))
             conn.commit()
+            self._progress_dirty(user_id)
             return cursor.rowcount > 0
             
     def get_creator_posts_this_week(self, user_id: int, semana_key: str) -> List[Dict[str, Any]]:
@@ -1445,15 +1856,20 @@ class EconomiaDBManagerV2:
             conn.commit()
             return int(cur.lastrowid)
 
-    def get_expired_temp_shop_roles(self, now_ts: float) -> List[Dict[str, Any]]:
+    def get_temp_shop_role(self, row_id: int) -> Optional[Dict[str, Any]]:
         with self._get_connection() as conn:
             conn.row_factory = sqlite3.Row
             cur = conn.cursor()
-            cur.execute(
-                "SELECT * FROM temp_roles_shop WHERE expires_ts <= ? ORDER BY id ASC",
-                (now_ts,),
-            )
-            return [dict(r) for r in cur.fetchall()]
+            cur.execute("SELECT * FROM temp_roles_shop WHERE id = ?", (row_id,))
+            row = cur.fetchone()
+            return dict(row) if row else None
+
+    def temp_shop_role_expiries(self) -> List[Tuple[int, float]]:
+        """(id, expires_ts) de todos los roles temporales vigentes o vencidos sin procesar."""
+        with self._get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id, expires_ts FROM temp_roles_shop")
+            return [(int(r[0]), float(r[1] or 0)) for r in cur.fetchall()]
 
     def delete_temp_shop_role_row(self, row_id: int) -> None:
         with self._get_connection() as conn:
@@ -1506,6 +1922,7 @@ class EconomiaDBManagerV2:
                 (user_id, pos, t, ts),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def anime_top_remove(self, user_id: int, pos: int) -> None:
         self.ensure_user_exists(user_id)
@@ -1515,6 +1932,7 @@ class EconomiaDBManagerV2:
                 (user_id, pos),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def anime_top_find(self, user_id: int, query: str) -> List[Dict[str, Any]]:
         """Buscar en el top por coincidencia parcial (case-insensitive)."""
@@ -1595,6 +2013,7 @@ class EconomiaDBManagerV2:
                 (user_id, int(pos_to), title, ts),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def get_anime_bonus_flags(self, user_id: int) -> Dict[str, int]:
         self.ensure_user_exists(user_id)
@@ -1646,6 +2065,8 @@ class EconomiaDBManagerV2:
                     msgs.append(f"🏆 **¡Top 30 completo!** +{fmt_toque_sentence(int(bonus_top30))} (bono único).")
             if msgs:
                 conn.commit()
+                self._progress_dirty(user_id)
+                self._refresh_rank(cur, user_id)
         return msgs
 
     # --- Trivia anime: victorias (primera respuesta correcta por ronda) ---
@@ -1751,6 +2172,7 @@ class EconomiaDBManagerV2:
                 (user_id, pos, t, ts),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def wishlist_remove(self, user_id: int, pos: int) -> None:
         self.ensure_user_exists(user_id)
@@ -1760,6 +2182,7 @@ class EconomiaDBManagerV2:
                 (user_id, pos),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     # --- Animes odiados (1–10) ---
     def hated_list(self, user_id: int) -> List[Dict[str, Any]]:
@@ -1807,6 +2230,7 @@ class EconomiaDBManagerV2:
                 (user_id, pos, t, ts),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     def hated_remove(self, user_id: int, pos: int) -> None:
         self.ensure_user_exists(user_id)
@@ -1816,6 +2240,7 @@ class EconomiaDBManagerV2:
                 (user_id, pos),
             )
             conn.commit()
+            self._progress_dirty(user_id)
 
     # --- Personajes favoritos (1–10: nombre + anime) ---
     def fav_char_list(self, user_id: int) -> List[Dict[str, Any]]:
@@ -1860,4 +2285,60 @@ class EconomiaDBManagerV2:
                 "DELETE FROM user_fav_char_entries WHERE user_id = ? AND pos = ?",
                 (user_id, pos),
             )
-            conn.commit()
\ No newline at end of file
+            conn.commit()
+
+
+class _BlisterShortfall(Exception):
+    """Algún descuento de blisters no encontró stock: deshace la apertura entera."""
+
+
+class _TxConnection:
+    """Conexión prestada dentro de `transaction()`: `with conn:` y `conn.commit()` no cierran la transacción."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: sqlite3.Connection):
+        object.__setattr__(self, "raw", raw)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.raw, name, value)
+
+    def __enter__(self) -> "_TxConnection":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def commit(self) -> None:
+        pass
+
+
+class EconomiaDBAsync:
+    """
+    Versión awaitable de EconomiaDBManagerV2: `await db.aio.modify_points(uid, 10)`.
+    Cada método público corre en el executor de la DB (no bloquea heartbeats ni otros eventos).
+    """
+
+    def __init__(self, db: EconomiaDBManagerV2):
+        self._db = db
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Corre una función sync que usa la DB (p. ej. `reclaim_rewards`) en el executor."""
+        return await self._db.run_in_executor(fn, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        fn = getattr(self._db, name)
+        if not callable(fn):
+            raise AttributeError(name)
+
+        @functools.wraps(fn)
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            return await self._db.run_in_executor(fn, *args, **kwargs)
+
+        setattr(self, name, _call)
+        return _call
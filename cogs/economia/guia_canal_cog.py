@@ -68,7 +68,7 @@ class GuiaCanalCog(commands.Cog, name="Guía canal fijo"):
         if not forum.permissions_for(me).create_public_threads:
             log.warning("Foro de guía %s: falta permiso create_public_threads", forum.id)
             return None
-        raw = self.db.bot_meta_get(META_FORUM_THREAD)
+        raw = await self.db.aio.bot_meta_get(META_FORUM_THREAD)
         thread: Optional[discord.Thread] = None
         if raw and str(raw).strip().isdigit():
             ch = self.bot.get_channel(int(raw))
@@ -91,7 +91,7 @@ class GuiaCanalCog(commands.Cog, name="Guía canal fijo"):
                 if thread is None or not isinstance(thread, discord.Thread):
                     log.warning("Foro guía %s: create_thread no devolvió un hilo reconocible.", forum.id)
                     return None
-                self.db.bot_meta_set(META_FORUM_THREAD, str(thread.id))
+                await self.db.aio.bot_meta_set(META_FORUM_THREAD, str(thread.id))
                 log.info("Creado hilo de guía en foro %s → %s", forum.id, thread.id)
             except Exception as e:
                 log.warning("Foro de guía %s: no se pudo crear hilo: %s", forum.id, e)
@@ -196,8 +196,8 @@ class GuiaCanalCog(commands.Cog, name="Guía canal fijo"):
             return
 
         content_sig = _guia_chunks_signature(chunks)
-        old_ids = _parse_guia_message_ids(self.db.bot_meta_get(META_KEY))
-        stored_sig = (self.db.bot_meta_get(META_HASH) or "").strip()
+        old_ids = _parse_guia_message_ids(await self.db.aio.bot_meta_get(META_KEY))
+        stored_sig = (await self.db.aio.bot_meta_get(META_HASH) or "").strip()
         if stored_sig == content_sig and len(old_ids) == n and n > 0:
             try:
                 probe = await write_ch.fetch_message(old_ids[0])
@@ -256,8 +256,8 @@ class GuiaCanalCog(commands.Cog, name="Guía canal fijo"):
             except Exception as e:
                 log.debug("No se pudo borrar mensaje guía sobrante %s: %s", m.id, e)
 
-        self.db.bot_meta_set(META_KEY, "|".join(str(x) for x in new_ids))
-        self.db.bot_meta_set(META_HASH, content_sig)
+        await self.db.aio.bot_meta_set(META_KEY, "|".join(str(x) for x in new_ids))
+        await self.db.aio.bot_meta_set(META_HASH, content_sig)
         log.info("Guía sincronizada (%s) en destino %s — %s mensaje(s).", reason, write_ch.id, len(new_ids))
 
 
@@ -1,22 +1,73 @@
 # cogs/economia/listeners_cog.py
+import asyncio
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import datetime
 import logging
+import os
+from typing import Optional
+
+from cogs.message_router import MessageContext, get_router
 
 from .db_manager import EconomiaDBManagerV2
 
+
+def _env_int(name: str, default: int, lo: int) -> int:
+    try:
+        return max(lo, int((os.getenv(name) or "").strip() or default))
+    except ValueError:
+        return default
+
+
+# Write-behind: los contadores se vuelcan cada N ms o al juntar M eventos (lo que pase primero).
+TASK_FLUSH_MS = _env_int("ECON_TASK_FLUSH_MS", 2000, 100)
+TASK_FLUSH_EVENTS = _env_int("ECON_TASK_FLUSH_EVENTS", 200, 1)
+
+
 class EconomiaListenersCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.db: EconomiaDBManagerV2 = bot.economia_db
         self.config = bot.task_config
         self.log = logging.getLogger(self.__class__.__name__)
+        self._flush_task: Optional[asyncio.Task] = None
         self.log.info("Cog de Listeners de Economía cargado.")
 
-    def cog_unload(self):
+    async def cog_load(self):
+        self._flush_loop.change_interval(seconds=TASK_FLUSH_MS / 1000)
+        self._flush_loop.start()
+        router = get_router(self.bot)
+        if router:
+            # Todo mensaje del servidor cuenta para la diaria; solo toca el buffer en memoria, sin tarea propia.
+            router.register("economia.tareas", self._on_task_message, owner=self, inline=True)
+
+    async def cog_unload(self):
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+        self._flush_loop.cancel()
+        await self._flush_now()
         self.log.info("EconomiaListenersCog descargado.")
 
+    async def _flush_now(self) -> None:
+        try:
+            await self.db.aio.flush_task_counters()
+        except Exception:
+            self.log.exception("No se pudieron volcar los contadores de tareas (quedan en el buffer).")
+
+    def _after_buffer(self, pending: int) -> None:
+        """Si el buffer llegó al tope de eventos, adelanta el flush sin esperar al loop."""
+        if pending < TASK_FLUSH_EVENTS:
+            return
+        if self._flush_task and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.create_task(self._flush_now())
+
+    @tasks.loop(seconds=2)
+    async def _flush_loop(self):
+        if self.db.task_counters.pending_events:
+            await self._flush_now()
+
     def _get_current_date_keys(self) -> tuple:
         now = datetime.datetime.now()
         fecha = now.strftime("%Y-%m-%d")
@@ -29,34 +80,26 @@ class EconomiaListenersCog(commands.Cog):
     def _get_message_id(self, name: str) -> int:
         return self.config.get("messages", {}).get(name, 0)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
-            return
-        user_id = message.author.id
-        channel_id = message.channel.id
-
-        if not hasattr(self, "db"):
-            return
+    async def _on_task_message(self, ctx: MessageContext):
+        user_id = ctx.author_id
+        channel_id = ctx.channel_id
         fecha, semana = self._get_current_date_keys()
 
         if channel_id == self._get_channel_id("presentacion"):
-            self.db.update_task_inicial(user_id, "presentacion")
+            self._after_buffer(self.db.buffer_task_inicial(user_id, "presentacion"))
         if channel_id == self._get_channel_id("general"):
-            self.db.update_task_inicial(user_id, "general_mensaje")
+            self._after_buffer(self.db.buffer_task_inicial(user_id, "general_mensaje"))
 
         # Diaria: mensajes en cualquier canal de texto o hilo del servidor
-        if isinstance(message.channel, (discord.TextChannel, discord.Thread)):
-            text = (message.content or "").strip()
-            if text:
-                self.db.update_task_diaria(user_id, "mensajes_servidor", fecha, 1)
+        if ctx.is_text_channel and ctx.text:
+            self._after_buffer(self.db.buffer_task_diaria(user_id, "mensajes_servidor", fecha, 1))
 
         if channel_id in [
             self._get_channel_id("fanarts"),
             self._get_channel_id("cosplays"),
             self._get_channel_id("memes"),
         ]:
-            self.db.update_task_semanal(user_id, "media_escrito", semana, 1)
+            self._after_buffer(self.db.buffer_task_semanal(user_id, "media_escrito", semana, 1))
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
@@ -78,21 +121,21 @@ class EconomiaListenersCog(commands.Cog):
         message_id = payload.message_id
         fecha, semana = self._get_current_date_keys()
 
-        self.db.update_task_diaria(user_id, "reacciones_servidor", fecha, 1)
+        self._after_buffer(self.db.buffer_task_diaria(user_id, "reacciones_servidor", fecha, 1))
 
         if channel_id == self._get_channel_id("autorol"):
             if message_id == self._get_message_id("pais"):
-                self.db.update_task_inicial(user_id, "reaccion_pais")
+                self._after_buffer(self.db.buffer_task_inicial(user_id, "reaccion_pais"))
             elif message_id == self._get_message_id("rol"):
-                self.db.update_task_inicial(user_id, "reaccion_rol")
+                self._after_buffer(self.db.buffer_task_inicial(user_id, "reaccion_rol"))
         if channel_id == self._get_channel_id("social"):
-            self.db.update_task_inicial(user_id, "reaccion_social")
+            self._after_buffer(self.db.buffer_task_inicial(user_id, "reaccion_social"))
         if channel_id == self._get_channel_id("reglas"):
-            self.db.update_task_inicial(user_id, "reaccion_reglas")
+            self._after_buffer(self.db.buffer_task_inicial(user_id, "reaccion_reglas"))
 
         # Canal semanal “videos” en env = **#videos-nuevos** (VIDEOS_CHANNEL_ID).
         if channel_id == self._get_channel_id("videos"):
-            self.db.update_task_semanal(user_id, "videos_reaccion", semana, 1)
+            self._after_buffer(self.db.buffer_task_semanal(user_id, "videos_reaccion", semana, 1))
 
     @commands.Cog.listener()
     async def on_thread_create(self, thread: discord.Thread):
@@ -106,7 +149,7 @@ class EconomiaListenersCog(commands.Cog):
         _, semana = self._get_current_date_keys()
 
         if channel_id in [self._get_channel_id("anime_debate"), self._get_channel_id("manga_debate")]:
-            self.db.update_task_semanal(user_id, "debate_post", semana, 1)
+            self._after_buffer(self.db.buffer_task_semanal(user_id, "debate_post", semana, 1))
 
 async def setup(bot):
     if not bot.task_config:
@@ -76,7 +76,7 @@ async def render_ranking_hub_embed(
         rows = db.get_top_users(ranking_type, limit=page_size, offset=off)
         start_rank = off + 1
         body = await _leaderboard_body_global(bot, rows, points_key, start_rank)
-    info = db.get_user_rank_info(viewer.id, ranking_type)
+    info = await db.aio.get_user_rank_info(viewer.id, ranking_type)
     val = int(info["value"] or 0)
     rk = int(info["rank"] or 0)
     wp = int(info["with_positive"] or 0)
@@ -102,11 +102,11 @@ async def render_ranking_hub_embed(
 
 async def render_mi_embed(bot: commands.Bot, db: EconomiaDBManagerV2, user: discord.abc.User) -> discord.Embed:
     uid = user.id
-    db.ensure_user_exists(uid)
-    eco = db.get_user_economy(uid)
+    snap = await db.aio.get_progress_snapshot(uid)
+    eco = snap.economy
     ra = db.get_user_rank_info(uid, "actual")
     rh = db.get_user_rank_info(uid, "conseguidos")
-    copies, kinds = db.inventory_cards_totals(uid)
+    copies, kinds = snap.cards_copies, snap.cards_kinds
     tq = toque_emote()
     embed = discord.Embed(
         title=f"{tq} Tu resumen — {user.display_name}",
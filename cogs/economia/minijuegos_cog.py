@@ -5,11 +5,14 @@ import json
 import logging
 import os
 import random
+import time
 from typing import Any, Dict, Literal, Optional, Tuple
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
+
+from cogs.scheduler import get_scheduler
 
 log = logging.getLogger(__name__)
 
@@ -17,6 +20,9 @@ log = logging.getLogger(__name__)
 RETO_ACCEPT_MINUTES = 5
 RETO_ACCEPT_TTL_SEC = RETO_ACCEPT_MINUTES * 60
 
+# Trabajo del scheduler: vencimiento de cada invitación (clave = id de minijuego_invite).
+INVITE_EXPIRY_JOB = "minijuegos.invite_expiry"
+
 # Tras aceptar piedra/papel/tijera, tiempo para elegir (cada uno en `/aat-rps-elegir`, solo vos lo ves).
 RPS_PICK_TTL_SEC = max(60, min(900, int(os.getenv("RPS_PICK_SECONDS", "240") or 240)))
 
@@ -32,46 +38,54 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         self.voto_a = os.getenv("VOTO_SEMANAL_OPCION_A", "Opción A")
         self.voto_b = os.getenv("VOTO_SEMANAL_OPCION_B", "Opción B")
 
-    def cog_unload(self):
-        self._expire_loop.cancel()
-
-    @commands.Cog.listener()
-    async def on_ready(self):
-        if not self._expire_loop.is_running():
-            self._expire_loop.start()
+    async def cog_load(self) -> None:
+        sch = get_scheduler()
+        sch.register(INVITE_EXPIRY_JOB, self._on_invite_due)
+        # Invitaciones pendientes de antes del scheduler (o agendadas en otro proceso): una sola consulta al cargar.
+        for invite_id, expires_ts in await self.db.aio.minijuego_pending_expiries():
+            sch.schedule(INVITE_EXPIRY_JOB, invite_id, expires_ts, earliest=True)
 
-    @tasks.loop(seconds=45)
-    async def _expire_loop(self):
-        try:
-            for row in self.db.minijuego_fetch_expired_pending():
-                kind = str(row.get("kind") or "")
-                stake = int(row.get("stake") or 0)
-                p1, p2 = int(row["p1_id"]), int(row["p2_id"])
-                if kind in ("rps_bet", "rps_casual"):
-                    pl = {}
-                    try:
-                        pl = json.loads(row.get("payload") or "{}")
-                    except Exception:
-                        pass
-                    if kind == "rps_bet":
-                        if str(pl.get("phase")) == "pick":
-                            self.db.modify_points(p1, stake, gastar=False)
-                            self.db.modify_points(p2, stake, gastar=False)
-                        elif stake > 0:
-                            self.db.modify_points(p1, stake, gastar=False)
-                    self.db.minijuego_invite_resolve(int(row["id"]), "expired")
-                    await self._post_reto_expired_message(row)
-                    continue
-                if stake > 0:
-                    self.db.modify_points(p1, stake, gastar=False)
-                self.db.minijuego_invite_resolve(int(row["id"]), "expired")
-                await self._post_reto_expired_message(row)
-        except Exception:
-            log.exception("expire minijuegos")
+    def cog_unload(self):
+        get_scheduler().unregister(INVITE_EXPIRY_JOB)
+
+    def _arm_invite_expiry(self, invite_id: int, expires_ts: float) -> None:
+        get_scheduler().schedule(INVITE_EXPIRY_JOB, invite_id, expires_ts)
+
+    async def _on_invite_due(self, key: str, payload: Dict[str, Any]) -> Optional[float]:
+        row = await self.db.aio.minijuego_invite_get(int(key))
+        if not row or row.get("status") != "pending":
+            return None
+        expires_ts = float(row.get("expires_ts") or 0)
+        if expires_ts >= time.time():
+            # Se extendió (p. ej. RPS pasó a la fase de elegir): volver a mirar al nuevo vencimiento.
+            return expires_ts
+        await self._expire_invite(row)
+        return None
 
-    @_expire_loop.before_loop
-    async def _expire_before(self):
-        await self.bot.wait_until_ready()
+    async def _expire_invite(self, row: Dict[str, Any]) -> None:
+        """Devuelve la apuesta del reto vencido, lo marca `expired` y avisa en el canal."""
+        kind = str(row.get("kind") or "")
+        stake = int(row.get("stake") or 0)
+        p1, p2 = int(row["p1_id"]), int(row["p2_id"])
+        if kind in ("rps_bet", "rps_casual"):
+            pl = {}
+            try:
+                pl = json.loads(row.get("payload") or "{}")
+            except Exception:
+                pass
+            if kind == "rps_bet":
+                if str(pl.get("phase")) == "pick":
+                    await self.db.aio.modify_points(p1, stake, gastar=False)
+                    await self.db.aio.modify_points(p2, stake, gastar=False)
+                elif stake > 0:
+                    await self.db.aio.modify_points(p1, stake, gastar=False)
+            await self.db.aio.minijuego_invite_resolve(int(row["id"]), "expired")
+            await self._post_reto_expired_message(row)
+            return
+        if stake > 0:
+            await self.db.aio.modify_points(p1, stake, gastar=False)
+        await self.db.aio.minijuego_invite_resolve(int(row["id"]), "expired")
+        await self._post_reto_expired_message(row)
 
     async def _display_name_uid(self, user_id: int) -> str:
         u = self.bot.get_user(user_id)
@@ -180,13 +194,13 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
 
     def _roll_retar_crear_invite(
         self, guild_id: int, channel_id: int, p1_id: int, p2_id: int, apuesta: int
-    ) -> None:
+    ) -> int:
         if apuesta > 0:
             self.db.modify_points(p1_id, apuesta, gastar=True)
             kind = "roll_bet"
         else:
             kind = "roll_casual"
-        self.db.minijuego_invite_create(
+        return self.db.minijuego_invite_create(
             kind,
             guild_id,
             channel_id,
@@ -213,12 +227,12 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
                 r1 = random.randint(1, 100)
                 r2 = random.randint(1, 100)
             winner = p1 if r1 > r2 else accepter.id
-            self.db.minijuego_invite_resolve(int(row["id"]), "done")
+            await self.db.aio.minijuego_invite_resolve(int(row["id"]), "done")
             for uid in (p1, accepter.id):
-                self.db.mark_diaria_minijuego_hecho(uid, "dia_roll_casual")
-                prog = self.db.get_progress_semanal(uid)
+                await self.db.aio.mark_diaria_minijuego_hecho(uid, "dia_roll_casual")
+                prog = await self.db.aio.get_progress_semanal(uid)
                 if int(prog.get("mg_roll_casual") or 0) == 0:
-                    self.db.mark_minijuego_semanal(uid, "mg_roll_casual")
+                    await self.db.aio.mark_minijuego_semanal(uid, "mg_roll_casual")
             u1 = self.bot.get_user(p1) or await self.bot.fetch_user(p1)
             msg = (
                 f"🎲 **Roll amistoso** — {u1.display_name}: **{r1}** vs {accepter.display_name}: **{r2}**.\n"
@@ -226,22 +240,22 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
             )
             return True, msg
 
-        eco = self.db.get_user_economy(accepter.id)
+        eco = await self.db.aio.get_user_economy(accepter.id)
         if eco["puntos_actuales"] < stake:
             return False, "No te alcanza la apuesta para aceptar."
-        self.db.modify_points(accepter.id, stake, gastar=True)
+        await self.db.aio.modify_points(accepter.id, stake, gastar=True)
         r1, r2 = 0, 0
         while r1 == r2:
             r1 = random.randint(1, 100)
             r2 = random.randint(1, 100)
         winner = p1 if r1 > r2 else accepter.id
         pot = stake * 2
-        self.db.modify_points(winner, pot, gastar=False)
-        self.db.minijuego_invite_resolve(int(row["id"]), "done")
-        self.db.mark_diaria_minijuego_hecho(p1, "dia_roll_bet")
-        self.db.mark_diaria_minijuego_hecho(accepter.id, "dia_roll_bet")
-        self.db.mark_minijuego_semanal(p1, "mg_ret_roll_apuesta")
-        self.db.mark_minijuego_semanal(accepter.id, "mg_ret_roll_apuesta")
+        await self.db.aio.modify_points(winner, pot, gastar=False)
+        await self.db.aio.minijuego_invite_resolve(int(row["id"]), "done")
+        await self.db.aio.mark_diaria_minijuego_hecho(p1, "dia_roll_bet")
+        await self.db.aio.mark_diaria_minijuego_hecho(accepter.id, "dia_roll_bet")
+        await self.db.aio.mark_minijuego_semanal(p1, "mg_ret_roll_apuesta")
+        await self.db.aio.mark_minijuego_semanal(accepter.id, "mg_ret_roll_apuesta")
         u1 = self.bot.get_user(p1) or await self.bot.fetch_user(p1)
         msg = (
             f"🎲 **Roll bet** — {u1.display_name}: **{r1}** vs {accepter.display_name}: **{r2}**.\n"
@@ -251,12 +265,15 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
 
     async def roll_reto_desde_prefijo(self, ctx: commands.Context, oponente: discord.Member, apuesta: int) -> None:
         """`?rollp` (apuesta=0) o `?rollc` (apuesta>0)."""
-        err = self._roll_retar_validar(ctx.guild, ctx.author, oponente, apuesta)
+        err = await self.db.aio.run(self._roll_retar_validar, ctx.guild, ctx.author, oponente, apuesta)
         if err:
             await ctx.send(err, delete_after=12)
             return
         assert ctx.guild is not None
-        self._roll_retar_crear_invite(ctx.guild.id, ctx.channel.id, ctx.author.id, oponente.id, apuesta)
+        invite_id = await self.db.aio.run(
+            self._roll_retar_crear_invite, ctx.guild.id, ctx.channel.id, ctx.author.id, oponente.id, apuesta
+        )
+        self._arm_invite_expiry(invite_id, time.time() + RETO_ACCEPT_TTL_SEC)
         if apuesta == 0:
             txt = (
                 f"🎲 Reto **sin apuesta** a {oponente.mention}: el mayor en 1–100 gana (solo honor).\n"
@@ -278,7 +295,7 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         if not ctx.guild:
             await ctx.send("Solo en servidor.", delete_after=8)
             return
-        row = self.db.minijuego_invite_pending_for_target_kinds(ctx.author.id, ("roll_bet", "roll_casual"))
+        row = await self.db.aio.minijuego_invite_pending_for_target_kinds(ctx.author.id, ("roll_bet", "roll_casual"))
         if not row:
             await ctx.send("No tenés retos de roll pendientes.", delete_after=12)
             return
@@ -300,11 +317,11 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         if maximo - minimo > 500:
             return await interaction.response.send_message("Rango máximo 500.", ephemeral=True)
         r = random.randint(minimo, maximo)
-        prog = self.db.get_progress_semanal(interaction.user.id)
+        prog = await self.db.aio.get_progress_semanal(interaction.user.id)
         if int(prog.get("mg_roll_casual") or 0) == 0:
-            self.db.mark_minijuego_semanal(interaction.user.id, "mg_roll_casual")
+            await self.db.aio.mark_minijuego_semanal(interaction.user.id, "mg_roll_casual")
         await interaction.response.send_message(f"🎲 **{interaction.user.display_name}** sacó **{r}** ({minimo}–{maximo}).")
-        self.db.mark_diaria_minijuego_hecho(interaction.user.id, "dia_roll_casual")
+        await self.db.aio.mark_diaria_minijuego_hecho(interaction.user.id, "dia_roll_casual")
 
     # --- Roll 1–100 vs otra persona (con o sin apuesta) ---
     @app_commands.command(
@@ -323,17 +340,21 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
     ):
         if not isinstance(interaction.user, discord.Member):
             return await interaction.response.send_message("Solo en servidor.", ephemeral=True)
-        err = self._roll_retar_validar(interaction.guild, interaction.user, oponente, int(apuesta))
+        err = await self.db.aio.run(
+            self._roll_retar_validar, interaction.guild, interaction.user, oponente, int(apuesta)
+        )
         if err:
             return await interaction.response.send_message(err, ephemeral=True)
         assert interaction.guild is not None
-        self._roll_retar_crear_invite(
+        invite_id = await self.db.aio.run(
+            self._roll_retar_crear_invite,
             interaction.guild.id,
             interaction.channel_id,
             interaction.user.id,
             oponente.id,
             int(apuesta),
         )
+        self._arm_invite_expiry(invite_id, time.time() + RETO_ACCEPT_TTL_SEC)
         a = int(apuesta)
         if a == 0:
             txt = (
@@ -359,7 +380,7 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
     async def aat_roll_aceptar(self, interaction: discord.Interaction):
         if not interaction.guild or not isinstance(interaction.user, discord.Member):
             return await interaction.response.send_message("Solo en servidor.", ephemeral=True)
-        row = self.db.minijuego_invite_pending_for_target_kinds(interaction.user.id, ("roll_bet", "roll_casual"))
+        row = await self.db.aio.minijuego_invite_pending_for_target_kinds(interaction.user.id, ("roll_bet", "roll_casual"))
         if not row:
             return await interaction.response.send_message("No tenés retos de roll pendientes.", ephemeral=True)
         ok, msg = await self._roll_aceptar_resolver(row, interaction.user)
@@ -400,13 +421,13 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
             return 2
         return 0
 
-    def _rps_crear_invite(self, guild_id: int, channel_id: int, p1: int, p2: int, apuesta: int) -> None:
+    def _rps_crear_invite(self, guild_id: int, channel_id: int, p1: int, p2: int, apuesta: int) -> int:
         if apuesta > 0:
             self.db.modify_points(p1, apuesta, gastar=True)
             kind = "rps_bet"
         else:
             kind = "rps_casual"
-        self.db.minijuego_invite_create(
+        return self.db.minijuego_invite_create(
             kind,
             guild_id,
             channel_id,
@@ -427,13 +448,15 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
             return False, "No tenés **piedra/papel/tijera** pendiente para vos."
 
         if kind == "rps_bet":
-            eco = self.db.get_user_economy(accepter.id)
+            eco = await self.db.aio.get_user_economy(accepter.id)
             if eco["puntos_actuales"] < stake:
                 return False, "No te alcanza la apuesta para aceptar."
-            self.db.modify_points(accepter.id, stake, gastar=True)
+            await self.db.aio.modify_points(accepter.id, stake, gastar=True)
 
         pl = {"phase": "pick", "p1": None, "p2": None}
-        self.db.minijuego_invite_update_row(int(row["id"]), json.dumps(pl), time.time() + RPS_PICK_TTL_SEC)
+        pick_until = time.time() + RPS_PICK_TTL_SEC
+        await self.db.aio.minijuego_invite_update_row(int(row["id"]), json.dumps(pl), pick_until)
+        self._arm_invite_expiry(int(row["id"]), pick_until)
 
         return True, ""
 
@@ -455,7 +478,7 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         if not choice_n:
             return False, "Usá **piedra**, **papel** o **tijera**."
 
-        row = self.db.minijuego_invite_pending_rps_for_user(member.id)
+        row = await self.db.aio.minijuego_invite_pending_rps_for_user(member.id)
         if not row:
             return False, "No tenés ningún **piedra/papel/tijera** en curso."
 
@@ -480,7 +503,7 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
 
         pl[slot] = choice_n
         invite_id = int(row["id"])
-        self.db.minijuego_invite_update_row(invite_id, json.dumps(pl))
+        await self.db.aio.minijuego_invite_update_row(invite_id, json.dumps(pl))
 
         emoji_ok = {"piedra": "🪨", "papel": "📄", "tijera": "✂️"}
 
@@ -492,9 +515,9 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
 
         a, b = str(pl["p1"]), str(pl["p2"])
         out = self._rps_outcome(a, b)
-        self.db.minijuego_invite_resolve(invite_id, "done")
-        self.db.mark_diaria_minijuego_hecho(p1, "dia_rps")
-        self.db.mark_diaria_minijuego_hecho(p2, "dia_rps")
+        await self.db.aio.minijuego_invite_resolve(invite_id, "done")
+        await self.db.aio.mark_diaria_minijuego_hecho(p1, "dia_rps")
+        await self.db.aio.mark_diaria_minijuego_hecho(p2, "dia_rps")
 
         u1 = self.bot.get_user(p1) or await self.bot.fetch_user(p1)
         u2 = self.bot.get_user(p2) or await self.bot.fetch_user(p2)
@@ -504,13 +527,13 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         la = f'{em.get(a, "")} {label.get(a, a)}'.strip()
         lb = f'{em.get(b, "")} {label.get(b, b)}'.strip()
 
-        self.db.mark_minijuego_semanal(p1, "mg_rps")
-        self.db.mark_minijuego_semanal(p2, "mg_rps")
+        await self.db.aio.mark_minijuego_semanal(p1, "mg_rps")
+        await self.db.aio.mark_minijuego_semanal(p2, "mg_rps")
 
         if out == 0:
             if kind == "rps_bet" and stake > 0:
-                self.db.modify_points(p1, stake, gastar=False)
-                self.db.modify_points(p2, stake, gastar=False)
+                await self.db.aio.modify_points(p1, stake, gastar=False)
+                await self.db.aio.modify_points(p2, stake, gastar=False)
             pub = (
                 f"✂️ **Piedra / papel / tijera** — **{u1.display_name}**: {la} vs **{u2.display_name}**: {lb}.\n"
                 f"🤝 **Empate** — nadie pierde puntos."
@@ -521,7 +544,7 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         winner = p1 if out == 1 else p2
         if kind == "rps_bet" and stake > 0:
             pot = stake * 2
-            self.db.modify_points(winner, pot, gastar=False)
+            await self.db.aio.modify_points(winner, pot, gastar=False)
             pub = (
                 f"✂️ **Piedra / papel / tijera** — **{u1.display_name}**: {la} vs **{u2.display_name}**: {lb}.\n"
                 f"🏆 Gana <@{winner}> (**{pot}** pts)."
@@ -535,12 +558,15 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         return True, "Partida cerrada — resultado en el canal del reto."
 
     async def rps_reto_desde_prefijo(self, ctx: commands.Context, oponente: discord.Member, apuesta: int) -> None:
-        err = self._roll_retar_validar(ctx.guild, ctx.author, oponente, apuesta)
+        err = await self.db.aio.run(self._roll_retar_validar, ctx.guild, ctx.author, oponente, apuesta)
         if err:
             await ctx.send(err, delete_after=12)
             return
         assert ctx.guild is not None
-        self._rps_crear_invite(ctx.guild.id, ctx.channel.id, ctx.author.id, oponente.id, apuesta)
+        invite_id = await self.db.aio.run(
+            self._rps_crear_invite, ctx.guild.id, ctx.channel.id, ctx.author.id, oponente.id, apuesta
+        )
+        self._arm_invite_expiry(invite_id, time.time() + RETO_ACCEPT_TTL_SEC)
         if apuesta == 0:
             txt = (
                 f"✂️ Reto **piedra/papel/tijera** (sin puntos) a {oponente.mention}.\n"
@@ -562,10 +588,10 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         if not ctx.guild:
             await ctx.send("Solo en servidor.", delete_after=8)
             return
-        row = self.db.minijuego_invite_pending_for_target_kinds(ctx.author.id, ("rps_bet", "rps_casual"))
+        row = await self.db.aio.minijuego_invite_pending_for_target_kinds(ctx.author.id, ("rps_bet", "rps_casual"))
         if not row:
             # Ayuda: muchas veces el usuario tiene otro reto pendiente o el reto no era hacia él.
-            any_row = self.db.minijuego_invite_pending_for_target(ctx.author.id)
+            any_row = await self.db.aio.minijuego_invite_pending_for_target(ctx.author.id)
             if any_row:
                 kind = str(any_row.get("kind") or "")
                 p1 = int(any_row.get("p1_id") or 0)
@@ -621,17 +647,21 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
     ):
         if not isinstance(interaction.user, discord.Member):
             return await interaction.response.send_message("Solo en servidor.", ephemeral=True)
-        err = self._roll_retar_validar(interaction.guild, interaction.user, oponente, int(apuesta))
+        err = await self.db.aio.run(
+            self._roll_retar_validar, interaction.guild, interaction.user, oponente, int(apuesta)
+        )
         if err:
             return await interaction.response.send_message(err, ephemeral=True)
         assert interaction.guild is not None
-        self._rps_crear_invite(
+        invite_id = await self.db.aio.run(
+            self._rps_crear_invite,
             interaction.guild.id,
             interaction.channel_id,
             interaction.user.id,
             oponente.id,
             int(apuesta),
         )
+        self._arm_invite_expiry(invite_id, time.time() + RETO_ACCEPT_TTL_SEC)
         a = int(apuesta)
         if a == 0:
             txt = (
@@ -652,9 +682,9 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
     async def aat_rps_aceptar(self, interaction: discord.Interaction):
         if not interaction.guild or not isinstance(interaction.user, discord.Member):
             return await interaction.response.send_message("Solo en servidor.", ephemeral=True)
-        row = self.db.minijuego_invite_pending_for_target_kinds(interaction.user.id, ("rps_bet", "rps_casual"))
+        row = await self.db.aio.minijuego_invite_pending_for_target_kinds(interaction.user.id, ("rps_bet", "rps_casual"))
         if not row:
-            any_row = self.db.minijuego_invite_pending_for_target(interaction.user.id)
+            any_row = await self.db.aio.minijuego_invite_pending_for_target(interaction.user.id)
             if any_row:
                 kind = str(any_row.get("kind") or "")
                 p1 = int(any_row.get("p1_id") or 0)
@@ -734,20 +764,20 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
             return await interaction.response.send_message("Uso inválido.", ephemeral=True)
         if apuesta < 1 or apuesta > 5000 or oponente.bot or oponente.id == interaction.user.id:
             return await interaction.response.send_message("Datos inválidos.", ephemeral=True)
-        if self.db.minijuego_invite_pending_for_target(oponente.id):
+        if await self.db.aio.minijuego_invite_pending_for_target(oponente.id):
             return await interaction.response.send_message("Esa persona ya tiene un reto pendiente.", ephemeral=True)
-        eco = self.db.get_user_economy(interaction.user.id)
+        eco = await self.db.aio.get_user_economy(interaction.user.id)
         if eco["puntos_actuales"] < apuesta:
             return await interaction.response.send_message("Sin puntos suficientes.", ephemeral=True)
         cid = int(carta_id)
-        if not self.db.get_card_from_inventory(interaction.user.id, cid):
+        if not await self.db.aio.get_card_from_inventory(interaction.user.id, cid):
             return await interaction.response.send_message("No tenés esa carta.", ephemeral=True)
         carta = self.card_db.get_carta_stock_by_id(cid)
         if not carta:
             return await interaction.response.send_message("Carta inválida.", ephemeral=True)
-        self.db.modify_points(interaction.user.id, apuesta, gastar=True)
+        await self.db.aio.modify_points(interaction.user.id, apuesta, gastar=True)
         payload = json.dumps({"p1_card": cid, "guess": prediccion})
-        self.db.minijuego_invite_create(
+        invite_id = await self.db.aio.minijuego_invite_create(
             "duel",
             interaction.guild.id,
             interaction.channel_id,
@@ -757,6 +787,7 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
             payload,
             ttl_sec=RETO_ACCEPT_TTL_SEC,
         )
+        self._arm_invite_expiry(invite_id, time.time() + RETO_ACCEPT_TTL_SEC)
         await interaction.response.send_message(
             f"⚔️ {oponente.mention}: **duelo** por **{apuesta}** pts. Predicción del retador: **{prediccion}**.\n"
             f"Usá **`/aat-duelo-aceptar`** con tu `carta_id` (**{RETO_ACCEPT_MINUTES} min** o se cancela y se devuelve la apuesta).",
@@ -771,11 +802,11 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
             return await interaction.response.send_message("⚠️ Los **duelos** están desactivados por el staff.", ephemeral=True)
         if not interaction.guild or not carta_id.isdigit():
             return await interaction.response.send_message("Solo en servidor / ID inválido.", ephemeral=True)
-        row = self.db.minijuego_invite_pending_for_target_kinds(interaction.user.id, ("duel",))
+        row = await self.db.aio.minijuego_invite_pending_for_target_kinds(interaction.user.id, ("duel",))
         if not row:
             return await interaction.response.send_message("No hay duelo pendiente para vos.", ephemeral=True)
         stake = int(row["stake"])
-        eco = self.db.get_user_economy(interaction.user.id)
+        eco = await self.db.aio.get_user_economy(interaction.user.id)
         if eco["puntos_actuales"] < stake:
             return await interaction.response.send_message("No alcanza la apuesta.", ephemeral=True)
         p1 = int(row["p1_id"])
@@ -783,15 +814,15 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         c1 = int(pl["p1_card"])
         guess = pl["guess"]
         c2 = int(carta_id)
-        if not self.db.get_card_from_inventory(interaction.user.id, c2):
+        if not await self.db.aio.get_card_from_inventory(interaction.user.id, c2):
             return await interaction.response.send_message("No tenés esa carta.", ephemeral=True)
         carta1 = self.card_db.get_carta_stock_by_id(c1)
         carta2 = self.card_db.get_carta_stock_by_id(c2)
         if not carta1 or not carta2:
             return await interaction.response.send_message("Error de datos de cartas.", ephemeral=True)
-        self.db.modify_points(interaction.user.id, stake, gastar=True)
-        self.db.use_card_from_inventory(p1, c1)
-        self.db.use_card_from_inventory(interaction.user.id, c2)
+        await self.db.aio.modify_points(interaction.user.id, stake, gastar=True)
+        await self.db.aio.use_card_from_inventory(p1, c1)
+        await self.db.aio.use_card_from_inventory(interaction.user.id, c2)
         d1 = random.randint(1, 60)
         d2 = random.randint(1, 60)
         s1 = int(carta1.get("poder") or 50) + d1
@@ -799,12 +830,12 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
         p1_wins = (guess == "mayor" and s1 > s2) or (guess == "menor" and s1 < s2)
         winner = p1 if p1_wins else interaction.user.id
         pot = stake * 2
-        self.db.modify_points(winner, pot, gastar=False)
-        self.db.minijuego_invite_resolve(int(row["id"]), "done")
-        self.db.mark_minijuego_semanal(p1, "mg_duelo")
-        self.db.mark_minijuego_semanal(interaction.user.id, "mg_duelo")
-        self.db.mark_minijuego_semanal(p1, "mg_ret_roll_apuesta")
-        self.db.mark_minijuego_semanal(interaction.user.id, "mg_ret_roll_apuesta")
+        await self.db.aio.modify_points(winner, pot, gastar=False)
+        await self.db.aio.minijuego_invite_resolve(int(row["id"]), "done")
+        await self.db.aio.mark_minijuego_semanal(p1, "mg_duelo")
+        await self.db.aio.mark_minijuego_semanal(interaction.user.id, "mg_duelo")
+        await self.db.aio.mark_minijuego_semanal(p1, "mg_ret_roll_apuesta")
+        await self.db.aio.mark_minijuego_semanal(interaction.user.id, "mg_ret_roll_apuesta")
         u1 = self.bot.get_user(p1) or await self.bot.fetch_user(p1)
         msg = (
             f"⚔️ **Duelo** {u1.display_name} (`{carta1['nombre']}` p={carta1.get('poder',50)} +🎲{d1}=**{s1}**) vs "
@@ -817,10 +848,10 @@ class MinijuegosCog(commands.Cog, name="Economia Minijuegos"):
     @app_commands.command(name="aat-voto-semanal", description="Votá en la encuesta semanal del servidor (una vez por semana).")
     @app_commands.describe(opcion="Tu voto")
     async def aat_voto_semanal(self, interaction: discord.Interaction, opcion: Literal["A", "B"]):
-        prog = self.db.get_progress_semanal(interaction.user.id)
+        prog = await self.db.aio.get_progress_semanal(interaction.user.id)
         if int(prog.get("mg_voto_dom") or 0) >= 1:
             return await interaction.response.send_message("Ya votaste esta semana.", ephemeral=True)
-        self.db.mark_minijuego_semanal(interaction.user.id, "mg_voto_dom")
+        await self.db.aio.mark_minijuego_semanal(interaction.user.id, "mg_voto_dom")
         label = self.voto_a if opcion == "A" else self.voto_b
         await interaction.response.send_message(f"✅ Voto **{opcion}** ({label}) registrado.", ephemeral=True)
 
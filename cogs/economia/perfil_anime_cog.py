@@ -61,7 +61,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
     @app_commands.describe(usuario="Usuario (por defecto vos)")
     async def wishlist_ver(self, interaction: discord.Interaction, usuario: Optional[discord.User] = None):
         target = usuario or interaction.user
-        rows = self.db.wishlist_list(target.id)
+        rows = await self.db.aio.wishlist_list(target.id)
         body = _fmt_wishlist(rows)
         emb = discord.Embed(
             title=f"Wishlist — {target.display_name}",
@@ -81,7 +81,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
     ):
         await interaction.response.defer(ephemeral=True)
         try:
-            self.db.wishlist_set(interaction.user.id, int(posicion), titulo)
+            await self.db.aio.wishlist_set(interaction.user.id, int(posicion), titulo)
         except ValueError as e:
             await interaction.followup.send(str(e), ephemeral=True)
             return
@@ -89,7 +89,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
 
     @app_commands.command(name="aat-wishlist-quitar", description="Vaciar una posición de tu wishlist.")
     async def wishlist_quitar(self, interaction: discord.Interaction, posicion: app_commands.Range[int, 1, 33]):
-        self.db.wishlist_remove(interaction.user.id, int(posicion))
+        await self.db.aio.wishlist_remove(interaction.user.id, int(posicion))
         await interaction.response.send_message(f"Posición **{posicion}** vaciada.", ephemeral=True)
 
     # --- Odiados ---
@@ -97,7 +97,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
     @app_commands.describe(usuario="Usuario (por defecto vos)")
     async def hated_ver(self, interaction: discord.Interaction, usuario: Optional[discord.User] = None):
         target = usuario or interaction.user
-        rows = self.db.hated_list(target.id)
+        rows = await self.db.aio.hated_list(target.id)
         body = _fmt_hated(rows)
         emb = discord.Embed(
             title=f"Animes odiados — {target.display_name}",
@@ -116,7 +116,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
     ):
         await interaction.response.defer(ephemeral=True)
         try:
-            self.db.hated_set(interaction.user.id, int(posicion), titulo)
+            await self.db.aio.hated_set(interaction.user.id, int(posicion), titulo)
         except ValueError as e:
             await interaction.followup.send(str(e), ephemeral=True)
             return
@@ -124,7 +124,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
 
     @app_commands.command(name="aat-hated-quitar", description="Vaciar una posición de odiados.")
     async def hated_quitar(self, interaction: discord.Interaction, posicion: app_commands.Range[int, 1, 10]):
-        self.db.hated_remove(interaction.user.id, int(posicion))
+        await self.db.aio.hated_remove(interaction.user.id, int(posicion))
         await interaction.response.send_message(f"Posición **{posicion}** vaciada.", ephemeral=True)
 
     # --- Personajes ---
@@ -132,7 +132,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
     @app_commands.describe(usuario="Usuario (por defecto vos)")
     async def chars_ver(self, interaction: discord.Interaction, usuario: Optional[discord.User] = None):
         target = usuario or interaction.user
-        rows = self.db.fav_char_list(target.id)
+        rows = await self.db.aio.fav_char_list(target.id)
         body = _fmt_chars(rows)
         emb = discord.Embed(
             title=f"Personajes favoritos — {target.display_name}",
@@ -155,7 +155,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
     ):
         await interaction.response.defer(ephemeral=True)
         try:
-            self.db.fav_char_set(interaction.user.id, int(posicion), personaje, anime)
+            await self.db.aio.fav_char_set(interaction.user.id, int(posicion), personaje, anime)
         except ValueError as e:
             await interaction.followup.send(str(e), ephemeral=True)
             return
@@ -163,7 +163,7 @@ class PerfilAnimeCog(commands.Cog, name="Perfil anime"):
 
     @app_commands.command(name="aat-chars-quitar", description="Vaciar una posición de personajes.")
     async def chars_quitar(self, interaction: discord.Interaction, posicion: app_commands.Range[int, 1, 10]):
-        self.db.fav_char_remove(interaction.user.id, int(posicion))
+        await self.db.aio.fav_char_remove(interaction.user.id, int(posicion))
         await interaction.response.send_message(f"Posición **{posicion}** vaciada.", ephemeral=True)
 
 
@@ -123,9 +123,9 @@ class ProgressEmbedsWithReclaimView(GuiaEmbedsPaginator):
                     return
                 tipo = m
         await interaction.response.defer(ephemeral=False)
-        _ok, ok_msgs, err_msgs = reclaim_rewards(db, tc, interaction.user.id, tipo)  # type: ignore[arg-type]
-        emb = build_reclaim_result_embed(db, tc, interaction.user.id, ok_msgs, err_msgs)
-        self.pages = self._rebuild_pages(interaction.user.id)
+        _ok, ok_msgs, err_msgs = await db.aio.run(reclaim_rewards, db, tc, interaction.user.id, tipo)  # type: ignore[arg-type]
+        emb = await db.aio.run(build_reclaim_result_embed, db, tc, interaction.user.id, ok_msgs, err_msgs)
+        self.pages = await db.aio.run(self._rebuild_pages, interaction.user.id)
         if self.pages:
             self.idx = min(self.idx, len(self.pages) - 1)
         else:
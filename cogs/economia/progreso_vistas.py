@@ -210,11 +210,10 @@ def flatten_embed_pages(pages: List[List[discord.Embed]]) -> List[discord.Embed]
 
 def build_progreso_resumen_pages(db: Any, task_config: Dict[str, Any], user_id: int) -> List[List[discord.Embed]]:
     """Primera pantalla de `?progreso`: qué bloques ya están bien / reclamados."""
-    fecha, semana = db.get_current_date_keys()
+    snap = db.get_progress_snapshot(user_id)
+    fecha, semana = snap.fecha, snap.semana
     sl = semana.split("-")[-1]
-    ini = db.get_progress_inicial(user_id)
-    dia = db.get_progress_diaria(user_id)
-    sem = db.get_progress_semanal(user_id)
+    ini, dia, sem = snap.inicial, snap.diaria, snap.semanal
     mg_marks = (
         int(sem.get("mg_ret_roll_apuesta") or 0) >= 1
         and int(sem.get("mg_roll_casual") or 0) >= 1
@@ -224,8 +223,8 @@ def build_progreso_resumen_pages(db: Any, task_config: Dict[str, Any], user_id:
     ini_claimed = inicial_all_claimed(ini)
     ini_ready = not ini_claimed and (
         (_inicial_discord_done(ini) and not _inicial_sub_claimed(ini, "completado_inicial_comunidad"))
-        or (inicial_profile_ready(db, user_id) and not _inicial_sub_claimed(ini, "completado_inicial_perfil_min"))
-        or (inicial_perfil_max_ready(db, user_id) and not _inicial_sub_claimed(ini, "completado_inicial_perfil_max"))
+        or (inicial_profile_ready(db, user_id, snap) and not _inicial_sub_claimed(ini, "completado_inicial_perfil_min"))
+        or (inicial_perfil_max_ready(db, user_id, snap) and not _inicial_sub_claimed(ini, "completado_inicial_perfil_max"))
     )
     det_ini = (
         "los **3 premios** de iniciación ya cobrados"
@@ -311,7 +310,8 @@ def build_progreso_resumen_pages(db: Any, task_config: Dict[str, Any], user_id:
 
 
 def build_pages_inicial(db: Any, task_config: Dict[str, Any], user_id: int) -> List[List[discord.Embed]]:
-    prog = db.get_progress_inicial(user_id)
+    snap = db.get_progress_snapshot(user_id)
+    prog = snap.inicial
     rw = task_config.get("rewards") or {}
     b1 = int(rw.get("inicial_comunidad_blisters") or 1)
     b2 = int(rw.get("inicial_perfil_min_blisters") or 1)
@@ -321,9 +321,9 @@ def build_pages_inicial(db: Any, task_config: Dict[str, Any], user_id: int) -> L
     discord_lines = "\n".join(
         _tline(int(prog.get(key) or 0) == 1, label) for key, label in _INICIAL_DISCORD_TASKS
     )
-    wl = int(db.wishlist_total_filled(user_id))
-    top10 = int(db.anime_top_count_filled(user_id, INICIAL_TOP_MIN))
-    hat = int(db.hated_total_filled(user_id))
+    wl = snap.wishlist_filled
+    top10 = snap.top_filled(INICIAL_TOP_MIN)
+    hat = snap.hated_filled
     wl_ok = wl >= INICIAL_WISHLIST_MIN
     top_ok = top10 >= INICIAL_TOP_MIN
     hat_ok = hat >= INICIAL_HATED_MIN
@@ -334,7 +334,7 @@ def build_pages_inicial(db: Any, task_config: Dict[str, Any], user_id: int) -> L
             _tline(hat_ok, f"**Odiados** (mín. {INICIAL_HATED_MIN})", f"{hat}/{INICIAL_HATED_MIN}"),
         ]
     )
-    top_cap = int(db.anime_top_count_filled(user_id, PERFIL_TOP_CAP))
+    top_cap = snap.top_filled(PERFIL_TOP_CAP)
     wl_show = min(wl, PERFIL_WISHLIST_CAP)
     hat_show = min(hat, PERFIL_HATED_CAP)
     perfil_amp_lines = "\n".join(
@@ -419,9 +419,10 @@ def build_pages_inicial(db: Any, task_config: Dict[str, Any], user_id: int) -> L
 
 
 def build_pages_diaria(db: Any, task_config: Dict[str, Any], user_id: int) -> List[List[discord.Embed]]:
-    fecha, _ = db.get_current_date_keys()
-    prog = db.get_progress_diaria(user_id)
-    eco = db.get_user_economy(user_id) or {}
+    snap = db.get_progress_snapshot(user_id)
+    fecha = snap.fecha
+    prog = snap.diaria
+    eco = snap.economy or {}
     racha = int(eco.get("daily_streak") or 0)
     racha_line = (
         f"🔥 **Racha:** **{racha}** día(s) cobrando **diaria 1 + 2** el mismo día.\n"
@@ -608,8 +609,9 @@ def build_pages_diaria(db: Any, task_config: Dict[str, Any], user_id: int) -> Li
 
 
 def build_pages_semanal(db: Any, task_config: Dict[str, Any], user_id: int) -> List[List[discord.Embed]]:
-    _, semana = db.get_current_date_keys()
-    prog = db.get_progress_semanal(user_id)
+    snap = db.get_progress_snapshot(user_id)
+    semana = snap.semana
+    prog = snap.semanal
     rw = task_config.get("rewards") or {}
     chans = task_config.get("channels") or {}
     vid_id = int(chans.get("videos") or 0)
@@ -0,0 +1,113 @@
+# cogs/economia/progress_snapshot.py
+"""
+Foto del progreso de un usuario (iniciación / diario / semanal + conteos de perfil) leída en una sola transacción.
+
+La arma `EconomiaDBManagerV2.get_progress_snapshot`; la usan `/aat-reclamar`, `?progreso` y `?mi` para no abrir
+una conexión (y repetir `ensure_user_exists`) por cada tabla.
+
+`ProgressReadCache` guarda la foto por usuario unos segundos: las páginas de `?progreso` / `?diaria` / `?semanal`
+y cada botón de la vista se sirven de memoria. Toda escritura del manager sobre esas tablas invalida al usuario.
+"""
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from cogs.expiring_map import ExpiringMap
+
+
+@dataclass
+class UserProgressSnapshot:
+    user_id: int
+    fecha: str
+    semana: str
+    inicial: Dict[str, Any]
+    diaria: Dict[str, Any]
+    semanal: Dict[str, Any]
+    economy: Dict[str, Any]
+    wishlist_filled: int = 0
+    hated_filled: int = 0
+    # Posiciones del top anime con título (ordenadas); `top_filled(hasta)` reemplaza a `anime_top_count_filled`.
+    top_positions: List[int] = field(default_factory=list)
+    cards_copies: int = 0
+    cards_kinds: int = 0
+
+    def top_filled(self, hasta: int) -> int:
+        return bisect.bisect_right(self.top_positions, int(hasta))
+
+    def copy(self) -> "UserProgressSnapshot":
+        """Copia con filas propias (el llamador puede mezclar contadores o tocarlas sin ensuciar la caché)."""
+        return dataclasses.replace(
+            self,
+            inicial=dict(self.inicial),
+            diaria=dict(self.diaria),
+            semanal=dict(self.semanal),
+            economy=dict(self.economy),
+            top_positions=list(self.top_positions),
+        )
+
+
+class ProgressReadCache:
+    """
+    Fotos por usuario con TTL corto, invalidadas en cada escritura. Thread-safe (loop + executor de la DB).
+
+    Una lectura empieza con `begin` y guarda con `put` sólo si nadie invalidó a ese usuario en el medio:
+    así una foto leída antes de un commit ajeno no queda pisando el dato nuevo hasta que venza.
+    """
+
+    def __init__(self, ttl: float, *, clock: Callable[[], float] = time.monotonic):
+        self.ttl = max(0.0, float(ttl))
+        self._lock = threading.Lock()
+        self._entries: ExpiringMap[int, UserProgressSnapshot] = ExpiringMap("progress", clock=clock)
+        self._reading: Dict[int, object] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int, fecha: str, semana: str) -> Optional[UserProgressSnapshot]:
+        with self._lock:
+            snap = self._entries.get(int(user_id))
+            # Cambio de día / semana: la foto ya no corresponde a las claves vigentes.
+            if snap is None or snap.fecha != fecha or snap.semana != semana:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return snap
+
+    def begin(self, user_id: int) -> object:
+        token = object()
+        with self._lock:
+            self._reading[int(user_id)] = token
+        return token
+
+    def put(self, user_id: int, token: object, snap: UserProgressSnapshot) -> bool:
+        uid = int(user_id)
+        with self._lock:
+            if self._reading.get(uid) is not token:
+                return False
+            del self._reading[uid]
+            if self.ttl <= 0:
+                return False
+            self._entries.put(uid, snap, self.ttl)
+            self._entries.sweep()
+            return True
+
+    def invalidate(self, user_id: int) -> None:
+        uid = int(user_id)
+        with self._lock:
+            self._reading.pop(uid, None)
+            if self._entries.pop(uid) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
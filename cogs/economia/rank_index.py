@@ -0,0 +1,95 @@
+# cogs/economia/rank_index.py
+"""
+Índice en memoria para los rankings de economía (?top, ?ranking, mi resumen).
+
+Una lista ordenada por columna de puntos con claves (-puntaje, user_id): top-N, puesto de un usuario y
+cantidad de rankeados se resuelven con bisect (O(log n)) sin escanear `economia_usuarios`.
+Solo guarda puntajes > 0 (misma regla que `get_top_users` / `count_ranked_users`).
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+RANKING_COLUMNS: Dict[str, str] = {
+    "actual": "puntos_actuales",
+    "conseguidos": "puntos_conseguidos",
+    "gastados": "puntos_gastados",
+}
+
+
+class SortedScoreIndex:
+    """Puntajes de una columna, ordenados de mayor a menor (desempate por user_id)."""
+
+    def __init__(self) -> None:
+        self._keys: List[Tuple[int, int]] = []
+        self._score: Dict[int, int] = {}
+
+    def load(self, rows: Iterable[Tuple[int, int]]) -> None:
+        self._score = {int(uid): int(v) for uid, v in rows if int(v or 0) > 0}
+        self._keys = sorted((-v, uid) for uid, v in self._score.items())
+
+    def set(self, user_id: int, score: int) -> None:
+        uid, new = int(user_id), int(score or 0)
+        old = self._score.get(uid)
+        if old == new or (old is None and new <= 0):
+            return
+        if old is not None:
+            i = bisect.bisect_left(self._keys, (-old, uid))
+            if i < len(self._keys) and self._keys[i] == (-old, uid):
+                del self._keys[i]
+            del self._score[uid]
+        if new > 0:
+            bisect.insort(self._keys, (-new, uid))
+            self._score[uid] = new
+
+    def score_of(self, user_id: int) -> int:
+        return self._score.get(int(user_id), 0)
+
+    def count_positive(self) -> int:
+        return len(self._keys)
+
+    def count_above(self, score: int) -> int:
+        # Claves con -v < -score  ⇔  v > score (user_id >= 0, así que (-score, -1) queda antes del empate).
+        return bisect.bisect_left(self._keys, (-int(score), -1))
+
+    def page(self, limit: int, offset: int = 0) -> List[Tuple[int, int]]:
+        off = max(0, int(offset))
+        return [(uid, -neg) for neg, uid in self._keys[off : off + max(0, int(limit))]]
+
+
+class RankingIndex:
+    """Un SortedScoreIndex por columna de ranking; thread-safe (loop de discord + executor de la DB)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cols: Dict[str, SortedScoreIndex] = {c: SortedScoreIndex() for c in RANKING_COLUMNS.values()}
+
+    def load(self, rows: Iterable[Tuple[int, int, int, int]]) -> None:
+        """rows = (user_id, puntos_actuales, puntos_conseguidos, puntos_gastados)."""
+        rows = list(rows)
+        with self._lock:
+            for i, col in enumerate(("puntos_actuales", "puntos_conseguidos", "puntos_gastados"), start=1):
+                self._cols[col].load((r[0], r[i]) for r in rows)
+
+    def update_user(self, user_id: int, actual: int, conseguidos: int, gastados: int) -> None:
+        with self._lock:
+            self._cols["puntos_actuales"].set(user_id, actual)
+            self._cols["puntos_conseguidos"].set(user_id, conseguidos)
+            self._cols["puntos_gastados"].set(user_id, gastados)
+
+    def top(self, column: str, limit: int, offset: int = 0) -> List[Tuple[int, int]]:
+        with self._lock:
+            return self._cols[column].page(limit, offset)
+
+    def count_positive(self, column: str) -> int:
+        with self._lock:
+            return self._cols[column].count_positive()
+
+    def rank_info(self, column: str, user_id: int) -> Tuple[int, int, int]:
+        """(valor, puesto 1-based, usuarios con valor > 0)."""
+        with self._lock:
+            idx = self._cols[column]
+            val = idx.score_of(user_id)
+            return val, idx.count_above(val) + 1, idx.count_positive()
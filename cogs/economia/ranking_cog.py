@@ -106,7 +106,7 @@ class RankingCog(commands.Cog, name="Economia Ranking"):
     @app_commands.command(name="aat-mi", description="Tu saldo, posición en tops, cartas e histórico ganado.")
     async def aat_mi(self, interaction: discord.Interaction):
         await interaction.response.defer()
-        self.economia_db.ensure_user_exists(interaction.user.id)
+        await self.economia_db.aio.ensure_user_exists(interaction.user.id)
         embed = await render_mi_embed(self.bot, self.economia_db, interaction.user)
         await interaction.followup.send(embed=embed)
 
@@ -134,7 +134,7 @@ class _HubExtraButton(discord.ui.Button):
             return
 
         if self.kind == "mi":
-            self.hub.db.ensure_user_exists(interaction.user.id)
+            await self.hub.db.aio.ensure_user_exists(interaction.user.id)
             emb = await render_mi_embed(self.hub.bot, self.hub.db, interaction.user)
             await interaction.response.send_message(embed=emb, ephemeral=True)
             return
@@ -145,7 +145,7 @@ class _HubExtraButton(discord.ui.Button):
             return
 
         if self.kind == "trivia_me":
-            rank, wins = self.hub.db.trivia_stats_rank_user(interaction.user.id)
+            rank, wins = await self.hub.db.aio.trivia_stats_rank_user(interaction.user.id)
             if wins <= 0:
                 await interaction.response.send_message(
                     "No tenés victorias en trivia todavía: cuando el bot publique la pregunta en **#general**, "
@@ -160,7 +160,7 @@ class _HubExtraButton(discord.ui.Button):
             return
 
         if self.kind == "anime_top":
-            rows = self.hub.db.anime_top_list(interaction.user.id)
+            rows = await self.hub.db.aio.anime_top_list(interaction.user.id)
             emb = _embed_top_for(self.hub.bot, interaction.user, rows, viewer_is_target=True)
             await interaction.response.send_message(embed=emb, ephemeral=True)
             return
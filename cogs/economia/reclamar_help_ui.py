@@ -103,16 +103,16 @@ class ReclamarHelpView(GuiaEmbedsPaginator):
         tc = getattr(self.bot, "task_config", None) or {}
         uid = interaction.user.id
         if kind == "inicial":
-            parts = build_pages_inicial(db, tc, uid)
+            parts = await db.aio.run(build_pages_inicial, db, tc, uid)
             title = "**Progreso — Iniciación**"
         elif kind == "diaria":
-            parts = build_pages_diaria(db, tc, uid)
+            parts = await db.aio.run(build_pages_diaria, db, tc, uid)
             title = "**Progreso — Diario** (*daily*)"
         elif kind == "semanal":
-            parts = build_pages_semanal(db, tc, uid)
+            parts = await db.aio.run(build_pages_semanal, db, tc, uid)
             title = "**Progreso — Semanal** (*weekly*: base + especial + minijuegos)"
         else:
-            full = build_pages_semanal(db, tc, uid)
+            full = await db.aio.run(build_pages_semanal, db, tc, uid)
             parts = [full[2]] if len(full) >= 3 else full[-1:]
             title = "**Progreso — Especial Impostor** (*weekly special*)"
         flat = flatten_embed_pages(parts)[:10]
@@ -134,6 +134,6 @@ class ReclamarHelpView(GuiaEmbedsPaginator):
         db = self.bot.economia_db
         tc = getattr(self.bot, "task_config", None) or {}
         uid = interaction.user.id
-        ok, ok_msgs, err_msgs = reclaim_rewards(db, tc, uid, None)
-        emb = build_reclaim_result_embed(db, tc, uid, ok_msgs, err_msgs)
+        ok, ok_msgs, err_msgs = await db.aio.run(reclaim_rewards, db, tc, uid, None)
+        emb = await db.aio.run(build_reclaim_result_embed, db, tc, uid, ok_msgs, err_msgs)
         await interaction.response.send_message(embed=emb, ephemeral=False)
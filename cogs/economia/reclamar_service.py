@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
+from .progress_snapshot import UserProgressSnapshot
 from .toque_labels import fmt_toque_sentence
 
 log = logging.getLogger(__name__)
@@ -304,22 +305,29 @@ def _inicial_discord_done(prog: Dict[str, Any]) -> bool:
     return all(_pv(prog.get(k)) >= 1 for k in INICIAL_DISCORD_KEYS)
 
 
-def _inicial_profile_counts(db: Any, user_id: int) -> Tuple[int, int, int]:
+def _profile_counts(db: Any, user_id: int, top_hasta: int, snap: Optional[UserProgressSnapshot]) -> Tuple[int, int, int]:
+    """(wishlist, top anime 1..top_hasta, odiados); con `snap` no consulta la DB."""
+    if snap is not None:
+        return snap.wishlist_filled, snap.top_filled(top_hasta), snap.hated_filled
     wl = int(db.wishlist_total_filled(user_id))
-    top = int(db.anime_top_count_filled(user_id, INICIAL_TOP_MIN))
+    top = int(db.anime_top_count_filled(user_id, top_hasta))
     hat = int(db.hated_total_filled(user_id))
     return wl, top, hat
 
 
-def inicial_profile_ready(db: Any, user_id: int) -> bool:
-    wl, top, hat = _inicial_profile_counts(db, user_id)
+def _inicial_profile_counts(
+    db: Any, user_id: int, snap: Optional[UserProgressSnapshot] = None
+) -> Tuple[int, int, int]:
+    return _profile_counts(db, user_id, INICIAL_TOP_MIN, snap)
+
+
+def inicial_profile_ready(db: Any, user_id: int, snap: Optional[UserProgressSnapshot] = None) -> bool:
+    wl, top, hat = _inicial_profile_counts(db, user_id, snap)
     return wl >= INICIAL_WISHLIST_MIN and top >= INICIAL_TOP_MIN and hat >= INICIAL_HATED_MIN
 
 
-def inicial_perfil_max_ready(db: Any, user_id: int) -> bool:
-    wl = int(db.wishlist_total_filled(user_id))
-    top = int(db.anime_top_count_filled(user_id, PERFIL_TOP_CAP))
-    hat = int(db.hated_total_filled(user_id))
+def inicial_perfil_max_ready(db: Any, user_id: int, snap: Optional[UserProgressSnapshot] = None) -> bool:
+    wl, top, hat = _profile_counts(db, user_id, PERFIL_TOP_CAP, snap)
     return wl >= PERFIL_WISHLIST_CAP and top >= PERFIL_TOP_CAP and hat >= PERFIL_HATED_CAP
 
 
@@ -439,7 +447,8 @@ def _diaria_sub_claimed(prog: Dict[str, Any], col: str) -> bool:
 def build_reclaim_status_block(db: Any, _task_config: Dict[str, Any], user_id: int) -> str:
     """Resumen legible: iniciación (3), diario (2), semanales (3)."""
     lines: List[str] = []
-    pi = db.get_progress_inicial(user_id)
+    snap = db.get_progress_snapshot(user_id)
+    pi = snap.inicial
     if _inicial_sub_claimed(pi, "completado_inicial_comunidad"):
         lines.append("✅ **Inicial 1 — Comunidad (Discord)** — ya cobrado.")
     elif _inicial_discord_done(pi):
@@ -448,17 +457,17 @@ def build_reclaim_status_block(db: Any, _task_config: Dict[str, Any], user_id: i
         lines.append("☐ **Inicial 1 — Comunidad** — incompleto (`?inicial`).")
     if _inicial_sub_claimed(pi, "completado_inicial_perfil_min"):
         lines.append("✅ **Inicial 2 — Perfil mínimo** (wishlist/top/odiados) — ya cobrado.")
-    elif inicial_profile_ready(db, user_id):
+    elif inicial_profile_ready(db, user_id, snap):
         lines.append("☑ **Inicial 2 — Perfil mínimo** — listo · `?reclamar inicial 2`")
     else:
         lines.append("☐ **Inicial 2 — Perfil mínimo** — incompleto.")
     if _inicial_sub_claimed(pi, "completado_inicial_perfil_max"):
         lines.append("✅ **Inicial 3 — Perfil completo** (topes) — ya cobrado.")
-    elif inicial_perfil_max_ready(db, user_id):
+    elif inicial_perfil_max_ready(db, user_id, snap):
         lines.append("☑ **Inicial 3 — Perfil completo** — listo · `?reclamar inicial 3`")
     else:
         lines.append("☐ **Inicial 3 — Perfil completo** — incompleto.")
-    pd = db.get_progress_diaria(user_id)
+    pd = snap.diaria
     if _diaria_sub_claimed(pd, "completado_diaria_actividad"):
         lines.append("✅ **Diario 1 — Actividad + oráculo** — ya cobrado hoy.")
     elif _diaria_actividad_ready(pd):
@@ -489,7 +498,7 @@ def build_reclaim_status_block(db: Any, _task_config: Dict[str, Any], user_id: i
         lines.append("☑ **Diario 5 — Ahorcado** — listo · `?reclamar diaria 5`")
     else:
         lines.append("☐ **Diario 5 — Ahorcado** — incompleto.")
-    ps = db.get_progress_semanal(user_id)
+    ps = snap.semanal
     if int(ps.get("completado") or 0) == 1:
         lines.append("✅ **Semanal base (ref. 1)** (*weekly*) — ya reclamado.")
     elif int(ps.get("debate_post") or 0) >= 1 and int(ps.get("videos_reaccion") or 0) >= 1 and int(ps.get("media_escrito") or 0) >= 1:
@@ -519,14 +528,15 @@ def build_reclaim_status_block(db: Any, _task_config: Dict[str, Any], user_id: i
 
 def build_inicial_reclaim_hint(db: Any, user_id: int) -> Optional[str]:
     """Si la iniciación sigue pendiente, resume Discord vs perfil (y sugerencia de verificar)."""
-    prog = db.get_progress_inicial(user_id)
+    snap = db.get_progress_snapshot(user_id)
+    prog = snap.inicial
     if inicial_all_claimed(prog):
         return None
     disc = _inicial_discord_done(prog)
-    wl_full = min(int(db.wishlist_total_filled(user_id)), PERFIL_WISHLIST_CAP)
-    top_full = int(db.anime_top_count_filled(user_id, PERFIL_TOP_CAP))
-    hat_full = min(int(db.hated_total_filled(user_id)), PERFIL_HATED_CAP)
-    wl_i, top_i, hat_i = _inicial_profile_counts(db, user_id)
+    wl_full = min(snap.wishlist_filled, PERFIL_WISHLIST_CAP)
+    top_full = snap.top_filled(PERFIL_TOP_CAP)
+    hat_full = min(snap.hated_filled, PERFIL_HATED_CAP)
+    wl_i, top_i, hat_i = _inicial_profile_counts(db, user_id, snap)
     prof_ok = wl_i >= INICIAL_WISHLIST_MIN and top_i >= INICIAL_TOP_MIN and hat_i >= INICIAL_HATED_MIN
 
     lines: List[str] = ["📋 **Iniciación:**"]
@@ -562,17 +572,29 @@ def reclaim_rewards(
     Devuelve (hubo_reclamo, mensajes_exito, mensajes_error).
     Con `tipo=None` intenta **cada** recompensa por separado: cobra las que estén listas
     aunque falte el resto (inicial / diario / semanal no tienen que estar todos juntos).
+    Todo el reclamo es una transacción; si un objetivo falla, solo se deshace ese objetivo.
     """
+    with db.transaction():
+        return _reclaim_rewards_tx(db, task_config, user_id, tipo)
+
+
+def _reclaim_rewards_tx(
+    db: Any,
+    task_config: Dict[str, Any],
+    user_id: int,
+    tipo: TipoReclamo,
+) -> Tuple[bool, List[str], List[str]]:
+    snap = db.get_progress_snapshot(user_id)
     if tipo == "inicial":
-        p0 = db.get_progress_inicial(user_id)
+        p0 = snap.inicial
         if inicial_all_claimed(p0):
             return False, [], ["Inicial: las tres partes ya están cobradas."]
     if tipo == "diaria":
-        d0 = db.get_progress_diaria(user_id)
+        d0 = snap.diaria
         if diaria_all_claimed(d0):
             return False, [], ["Diaria: las cuatro partes de hoy ya están cobradas."]
     if tipo == "semanal_all":
-        s0 = db.get_progress_semanal(user_id)
+        s0 = snap.semanal
         if (
             _claimed(s0.get("completado"))
             and _claimed(s0.get("completado_especial"))
@@ -589,299 +611,302 @@ def reclaim_rewards(
     mensajes_error: List[str] = []
 
     for objetivo in tipos_a_revisar:
+        n_ok = len(mensajes_exito)
         try:
-            if objetivo == "inicial_comunidad":
-                prog = db.get_progress_inicial(user_id)
-                if _inicial_sub_claimed(prog, "completado_inicial_comunidad"):
-                    if not mute_claimed:
-                        mensajes_error.append("Inicial 1 (comunidad): ya cobrado.")
-                    continue
-                if _inicial_discord_done(prog):
-                    pts = int(rewards.get("inicial_comunidad") or 0)
-                    bl = int(rewards.get("inicial_comunidad_blisters") or 1)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Inicial 1: falta configuración de recompensa.")
-                        continue
-                    if pts:
-                        db.modify_points(user_id, pts)
-                    if bl > 0:
-                        _, bcol = db.modify_blisters(user_id, "trampa", bl)
-                        mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "inicial_comunidad"):
-                        continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Inicial 1 — Comunidad (Discord):** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                elif tipo == "inicial_comunidad":
-                    mensajes_error.append(
-                        "Inicial 1: incompleto — Discord (presentación, autorol, #general, etc.). "
-                        + MSG_TIP_INICIACION_AL_RECLAMAR
-                    )
-
-            elif objetivo == "inicial_perfil_min":
-                prog = db.get_progress_inicial(user_id)
-                if _inicial_sub_claimed(prog, "completado_inicial_perfil_min"):
-                    if not mute_claimed:
-                        mensajes_error.append("Inicial 2 (perfil mínimo): ya cobrado.")
-                    continue
-                if inicial_profile_ready(db, user_id):
-                    pts = int(rewards.get("inicial_perfil_min") or 0)
-                    bl = int(rewards.get("inicial_perfil_min_blisters") or 1)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Inicial 2: falta configuración de recompensa.")
+            with db.transaction():
+                if objetivo == "inicial_comunidad":
+                    prog = snap.inicial
+                    if _inicial_sub_claimed(prog, "completado_inicial_comunidad"):
+                        if not mute_claimed:
+                            mensajes_error.append("Inicial 1 (comunidad): ya cobrado.")
                         continue
-                    if pts:
-                        db.modify_points(user_id, pts)
-                    if bl > 0:
-                        _, bcol = db.modify_blisters(user_id, "trampa", bl)
-                        mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "inicial_perfil_min"):
+                    if _inicial_discord_done(prog):
+                        pts = int(rewards.get("inicial_comunidad") or 0)
+                        bl = int(rewards.get("inicial_comunidad_blisters") or 1)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Inicial 1: falta configuración de recompensa.")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "inicial_comunidad"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Inicial 1 — Comunidad (Discord):** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                    elif tipo == "inicial_comunidad":
+                        mensajes_error.append(
+                            "Inicial 1: incompleto — Discord (presentación, autorol, #general, etc.). "
+                            + MSG_TIP_INICIACION_AL_RECLAMAR
+                        )
+
+                elif objetivo == "inicial_perfil_min":
+                    prog = snap.inicial
+                    if _inicial_sub_claimed(prog, "completado_inicial_perfil_min"):
+                        if not mute_claimed:
+                            mensajes_error.append("Inicial 2 (perfil mínimo): ya cobrado.")
                         continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Inicial 2 — Perfil mínimo:** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                elif tipo == "inicial_perfil_min":
-                    wl_i, top_i, hat_i = _inicial_profile_counts(db, user_id)
-                    mensajes_error.append(
-                        "Inicial 2: incompleto — "
-                        f"wishlist {wl_i}/{INICIAL_WISHLIST_MIN}, top {top_i}/{INICIAL_TOP_MIN}, odiados {hat_i}/{INICIAL_HATED_MIN}."
-                    )
-
-            elif objetivo == "inicial_perfil_max":
-                prog = db.get_progress_inicial(user_id)
-                if _inicial_sub_claimed(prog, "completado_inicial_perfil_max"):
-                    if not mute_claimed:
-                        mensajes_error.append("Inicial 3 (perfil completo): ya cobrado.")
-                    continue
-                if inicial_perfil_max_ready(db, user_id):
-                    pts = int(rewards.get("inicial_perfil_max") or 0)
-                    bl = int(rewards.get("inicial_perfil_max_blisters") or 1)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Inicial 3: falta configuración de recompensa.")
+                    if inicial_profile_ready(db, user_id, snap):
+                        pts = int(rewards.get("inicial_perfil_min") or 0)
+                        bl = int(rewards.get("inicial_perfil_min_blisters") or 1)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Inicial 2: falta configuración de recompensa.")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "inicial_perfil_min"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Inicial 2 — Perfil mínimo:** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                    elif tipo == "inicial_perfil_min":
+                        wl_i, top_i, hat_i = _inicial_profile_counts(db, user_id, snap)
+                        mensajes_error.append(
+                            "Inicial 2: incompleto — "
+                            f"wishlist {wl_i}/{INICIAL_WISHLIST_MIN}, top {top_i}/{INICIAL_TOP_MIN}, odiados {hat_i}/{INICIAL_HATED_MIN}."
+                        )
+
+                elif objetivo == "inicial_perfil_max":
+                    prog = snap.inicial
+                    if _inicial_sub_claimed(prog, "completado_inicial_perfil_max"):
+                        if not mute_claimed:
+                            mensajes_error.append("Inicial 3 (perfil completo): ya cobrado.")
                         continue
-                    if pts:
-                        db.modify_points(user_id, pts)
-                    if bl > 0:
-                        _, bcol = db.modify_blisters(user_id, "trampa", bl)
-                        mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "inicial_perfil_max"):
+                    if inicial_perfil_max_ready(db, user_id, snap):
+                        pts = int(rewards.get("inicial_perfil_max") or 0)
+                        bl = int(rewards.get("inicial_perfil_max_blisters") or 1)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Inicial 3: falta configuración de recompensa.")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "inicial_perfil_max"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Inicial 3 — Perfil completo:** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                    elif tipo == "inicial_perfil_max":
+                        mensajes_error.append("Inicial 3: incompleto — falta llenar wishlist/top/odiados a los topes del perfil.")
+
+                elif objetivo == "diaria_actividad":
+                    prog = snap.diaria
+                    if _diaria_sub_claimed(prog, "completado_diaria_actividad"):
+                        if not mute_claimed:
+                            mensajes_error.append("Diario 1 (actividad): ya cobrado hoy.")
                         continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Inicial 3 — Perfil completo:** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                elif tipo == "inicial_perfil_max":
-                    mensajes_error.append("Inicial 3: incompleto — falta llenar wishlist/top/odiados a los topes del perfil.")
-
-            elif objetivo == "diaria_actividad":
-                prog = db.get_progress_diaria(user_id)
-                if _diaria_sub_claimed(prog, "completado_diaria_actividad"):
-                    if not mute_claimed:
-                        mensajes_error.append("Diario 1 (actividad): ya cobrado hoy.")
-                    continue
-                if _diaria_actividad_ready(prog):
-                    pts = int(rewards.get("diaria_actividad") or rewards.get("diaria") or 0)
-                    bl = int(rewards.get("diaria_actividad_blisters") or 0)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Diario 1: falta configuración de recompensa (rewards.diaria_actividad).")
+                    if _diaria_actividad_ready(prog):
+                        pts = int(rewards.get("diaria_actividad") or rewards.get("diaria") or 0)
+                        bl = int(rewards.get("diaria_actividad_blisters") or 0)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Diario 1: falta configuración de recompensa (rewards.diaria_actividad).")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "diaria_actividad"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Diario 1 — Actividad + oráculo:** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                        mensajes_exito.extend(db.finalize_daily_streak_reward(user_id, task_config))
+                    elif tipo == "diaria_actividad":
+                        mensajes_error.append(
+                            "**Diario 1:** no se puede cobrar todavía.\n" + format_diaria_actividad_reclaim_blocked(prog)
+                        )
+
+                elif objetivo == "diaria_trampa":
+                    prog = snap.diaria
+                    if _diaria_sub_claimed(prog, "completado_diaria_trampa"):
+                        if not mute_claimed:
+                            mensajes_error.append("Diario 2 (trampa): ya cobrado hoy.")
                         continue
-                    if pts:
-                        db.modify_points(user_id, pts)
-                    if bl > 0:
-                        _, bcol = db.modify_blisters(user_id, "trampa", bl)
-                        mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "diaria_actividad"):
+                    if _diaria_trampa_ready(prog):
+                        pts = int(rewards.get("diaria_trampa") or 0)
+                        bl = int(rewards.get("diaria_trampa_blisters") or 0)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Diario 2: falta configuración de recompensa (rewards.diaria_trampa).")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "diaria_trampa"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Diario 2 — Trampa:** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                        mensajes_exito.extend(db.finalize_daily_streak_reward(user_id, task_config))
+                    elif tipo == "diaria_trampa":
+                        mensajes_error.append(
+                            "**Diario 2:** no se puede cobrar todavía.\n" + format_diaria_trampa_reclaim_blocked(prog)
+                        )
+
+                elif objetivo == "diaria_rolls":
+                    prog = snap.diaria
+                    if _diaria_sub_claimed(prog, "completado_diaria_rolls"):
+                        if not mute_claimed:
+                            mensajes_error.append("Diario 3 (rolls): ya cobrado hoy.")
                         continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Diario 1 — Actividad + oráculo:** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                    mensajes_exito.extend(db.finalize_daily_streak_reward(user_id, task_config))
-                elif tipo == "diaria_actividad":
-                    mensajes_error.append(
-                        "**Diario 1:** no se puede cobrar todavía.\n" + format_diaria_actividad_reclaim_blocked(prog)
-                    )
-
-            elif objetivo == "diaria_trampa":
-                prog = db.get_progress_diaria(user_id)
-                if _diaria_sub_claimed(prog, "completado_diaria_trampa"):
-                    if not mute_claimed:
-                        mensajes_error.append("Diario 2 (trampa): ya cobrado hoy.")
-                    continue
-                if _diaria_trampa_ready(prog):
-                    pts = int(rewards.get("diaria_trampa") or 0)
-                    bl = int(rewards.get("diaria_trampa_blisters") or 0)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Diario 2: falta configuración de recompensa (rewards.diaria_trampa).")
+                    if _diaria_rolls_ready(prog):
+                        pts = int(rewards.get("diaria_rolls") or 0)
+                        bl = int(rewards.get("diaria_rolls_blisters") or 0)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Diario 3: falta configuración de recompensa (rewards.diaria_rolls).")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "diaria_rolls"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Diario 3 — Rolls (casual + batalla):** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                    elif tipo == "diaria_rolls":
+                        rc = _pv(prog.get("dia_roll_casual"))
+                        rb = _pv(prog.get("dia_roll_bet"))
+                        mensajes_error.append(
+                            "**Diario 3:** faltan marcas — roll casual "
+                            f"**{rc}/1** y batalla con apuesta **{rb}/1** (`/aat-roll`, `/aat-roll-retar`)."
+                        )
+
+                elif objetivo == "diaria_rps":
+                    prog = snap.diaria
+                    if _diaria_sub_claimed(prog, "completado_diaria_rps"):
+                        if not mute_claimed:
+                            mensajes_error.append("Diario 4 (PPT): ya cobrado hoy.")
                         continue
-                    if pts:
-                        db.modify_points(user_id, pts)
-                    if bl > 0:
-                        _, bcol = db.modify_blisters(user_id, "trampa", bl)
-                        mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "diaria_trampa"):
+                    if _diaria_rps_ready(prog):
+                        pts = int(rewards.get("diaria_rps") or 0)
+                        bl = int(rewards.get("diaria_rps_blisters") or 0)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Diario 4: falta configuración de recompensa (rewards.diaria_rps).")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "diaria_rps"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Diario 4 — Piedra / papel / tijera:** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                    elif tipo == "diaria_rps":
+                        mensajes_error.append(
+                            "**Diario 4:** todavía no jugaste una partida de PPT hoy (`/aat-rps-retar` …)."
+                        )
+
+                elif objetivo == "diaria_ahorcado":
+                    prog = snap.diaria
+                    if _diaria_sub_claimed(prog, "completado_diaria_ahorcado"):
+                        if not mute_claimed:
+                            mensajes_error.append("Diario 5 (ahorcado): ya cobrado hoy.")
                         continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Diario 2 — Trampa:** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                    mensajes_exito.extend(db.finalize_daily_streak_reward(user_id, task_config))
-                elif tipo == "diaria_trampa":
-                    mensajes_error.append(
-                        "**Diario 2:** no se puede cobrar todavía.\n" + format_diaria_trampa_reclaim_blocked(prog)
-                    )
-
-            elif objetivo == "diaria_rolls":
-                prog = db.get_progress_diaria(user_id)
-                if _diaria_sub_claimed(prog, "completado_diaria_rolls"):
-                    if not mute_claimed:
-                        mensajes_error.append("Diario 3 (rolls): ya cobrado hoy.")
-                    continue
-                if _diaria_rolls_ready(prog):
-                    pts = int(rewards.get("diaria_rolls") or 0)
-                    bl = int(rewards.get("diaria_rolls_blisters") or 0)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Diario 3: falta configuración de recompensa (rewards.diaria_rolls).")
+                    if _diaria_ahorcado_ready(prog):
+                        pts = int(rewards.get("diaria_ahorcado") or 0)
+                        bl = int(rewards.get("diaria_ahorcado_blisters") or 0)
+                        if pts <= 0 and bl <= 0:
+                            mensajes_error.append("Diario 5: falta configuración de recompensa (rewards.diaria_ahorcado).")
+                            continue
+                        if pts:
+                            db.modify_points(user_id, pts)
+                        if bl > 0:
+                            _, bcol = db.modify_blisters(user_id, "trampa", bl)
+                            mensajes_exito.extend(bcol)
+                        if not db.claim_reward(user_id, "diaria_ahorcado"):
+                            continue
+                        extra = f" + {bl} Blister(s) 🃏" if bl else ""
+                        mensajes_exito.append(f"**Diario 5 — Ahorcado del día:** {fmt_toque_sentence(pts)}{extra}")
+                        reclamado_algo = True
+                    elif tipo == "diaria_ahorcado":
+                        mensajes_error.append("**Diario 5:** completá el ahorcado del día en `animealtoque.com/ahorcado` y enviá tu resultado.")
+
+                elif objetivo == "semanal":
+                    prog = snap.semanal
+                    if _claimed(prog.get("completado")):
+                        if tipo:
+                            mensajes_error.append("Semanal: Ya reclamado esta semana.")
                         continue
-                    if pts:
-                        db.modify_points(user_id, pts)
-                    if bl > 0:
-                        _, bcol = db.modify_blisters(user_id, "trampa", bl)
+
+                    if (
+                        _pv(prog.get("debate_post")) >= 1
+                        and _pv(prog.get("videos_reaccion")) >= 1
+                        and _pv(prog.get("media_escrito")) >= 1
+                    ):
+                        recompensa = rewards.get("semanal")
+                        if recompensa is None:
+                            mensajes_error.append("Semanal: falta configuración de recompensa (rewards.semanal).")
+                            continue
+                        db.modify_points(user_id, recompensa)
+                        _, bcol = db.modify_blisters(user_id, "trampa", 1)
                         mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "diaria_rolls"):
+                        db.claim_reward(user_id, "semanal")
+                        mensajes_exito.append(f"**Semanal:** {fmt_toque_sentence(int(recompensa))} + 1 Blister 🃏")
+                        reclamado_algo = True
+                    else:
+                        if tipo:
+                            mensajes_error.append("Semanal: Tareas incompletas.")
+
+                elif objetivo == "semanal_especial":
+                    prog = snap.semanal
+                    if _claimed(prog.get("completado_especial")):
+                        if tipo:
+                            mensajes_error.append("Especial semanal: Ya reclamado.")
                         continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Diario 3 — Rolls (casual + batalla):** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                elif tipo == "diaria_rolls":
-                    rc = _pv(prog.get("dia_roll_casual"))
-                    rb = _pv(prog.get("dia_roll_bet"))
-                    mensajes_error.append(
-                        "**Diario 3:** faltan marcas — roll casual "
-                        f"**{rc}/1** y batalla con apuesta **{rb}/1** (`/aat-roll`, `/aat-roll-retar`)."
-                    )
-
-            elif objetivo == "diaria_rps":
-                prog = db.get_progress_diaria(user_id)
-                if _diaria_sub_claimed(prog, "completado_diaria_rps"):
-                    if not mute_claimed:
-                        mensajes_error.append("Diario 4 (PPT): ya cobrado hoy.")
-                    continue
-                if _diaria_rps_ready(prog):
-                    pts = int(rewards.get("diaria_rps") or 0)
-                    bl = int(rewards.get("diaria_rps_blisters") or 0)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Diario 4: falta configuración de recompensa (rewards.diaria_rps).")
-                        continue
-                    if pts:
+                    ip = _pv(prog.get("impostor_partidas"))
+                    iv = _pv(prog.get("impostor_victorias"))
+                    if ip >= 3 and iv >= 1:
+                        pts = int(rewards.get("especial_semanal", 400))
+                        bl = int(rewards.get("especial_semanal_blisters", 2))
                         db.modify_points(user_id, pts)
-                    if bl > 0:
                         _, bcol = db.modify_blisters(user_id, "trampa", bl)
                         mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "diaria_rps"):
-                        continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Diario 4 — Piedra / papel / tijera:** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                elif tipo == "diaria_rps":
-                    mensajes_error.append(
-                        "**Diario 4:** todavía no jugaste una partida de PPT hoy (`/aat-rps-retar` …)."
-                    )
-
-            elif objetivo == "diaria_ahorcado":
-                prog = db.get_progress_diaria(user_id)
-                if _diaria_sub_claimed(prog, "completado_diaria_ahorcado"):
-                    if not mute_claimed:
-                        mensajes_error.append("Diario 5 (ahorcado): ya cobrado hoy.")
-                    continue
-                if _diaria_ahorcado_ready(prog):
-                    pts = int(rewards.get("diaria_ahorcado") or 0)
-                    bl = int(rewards.get("diaria_ahorcado_blisters") or 0)
-                    if pts <= 0 and bl <= 0:
-                        mensajes_error.append("Diario 5: falta configuración de recompensa (rewards.diaria_ahorcado).")
+                        db.claim_reward(user_id, "semanal_especial")
+                        mensajes_exito.append(f"**Especial semanal:** {fmt_toque_sentence(pts)} + {bl} Blisters 🃏")
+                        reclamado_algo = True
+                    else:
+                        if tipo:
+                            mensajes_error.append("Especial semanal: Necesitás 3 partidas Impostor y 1 victoria como impostor.")
+
+                elif objetivo == "semanal_minijuegos":
+                    prog = snap.semanal
+                    if _claimed(prog.get("completado_minijuegos")):
+                        if tipo:
+                            mensajes_error.append("Minijuegos semanal: Ya reclamado.")
                         continue
-                    if pts:
+                    if (
+                        _pv(prog.get("mg_ret_roll_apuesta")) >= 1
+                        and _pv(prog.get("mg_roll_casual")) >= 1
+                        and _pv(prog.get("mg_duelo")) >= 1
+                        and _pv(prog.get("mg_voto_dom")) >= 1
+                    ):
+                        pts = int(rewards.get("minijuegos_semanal", 150))
+                        bl = int(rewards.get("minijuegos_semanal_blisters", 1))
                         db.modify_points(user_id, pts)
-                    if bl > 0:
                         _, bcol = db.modify_blisters(user_id, "trampa", bl)
                         mensajes_exito.extend(bcol)
-                    if not db.claim_reward(user_id, "diaria_ahorcado"):
-                        continue
-                    extra = f" + {bl} Blister(s) 🃏" if bl else ""
-                    mensajes_exito.append(f"**Diario 5 — Ahorcado del día:** {fmt_toque_sentence(pts)}{extra}")
-                    reclamado_algo = True
-                elif tipo == "diaria_ahorcado":
-                    mensajes_error.append("**Diario 5:** completá el ahorcado del día en `animealtoque.com/ahorcado` y enviá tu resultado.")
-
-            elif objetivo == "semanal":
-                prog = db.get_progress_semanal(user_id)
-                if _claimed(prog.get("completado")):
-                    if tipo:
-                        mensajes_error.append("Semanal: Ya reclamado esta semana.")
-                    continue
-
-                if (
-                    _pv(prog.get("debate_post")) >= 1
-                    and _pv(prog.get("videos_reaccion")) >= 1
-                    and _pv(prog.get("media_escrito")) >= 1
-                ):
-                    recompensa = rewards.get("semanal")
-                    if recompensa is None:
-                        mensajes_error.append("Semanal: falta configuración de recompensa (rewards.semanal).")
-                        continue
-                    db.modify_points(user_id, recompensa)
-                    _, bcol = db.modify_blisters(user_id, "trampa", 1)
-                    mensajes_exito.extend(bcol)
-                    db.claim_reward(user_id, "semanal")
-                    mensajes_exito.append(f"**Semanal:** {fmt_toque_sentence(int(recompensa))} + 1 Blister 🃏")
-                    reclamado_algo = True
-                else:
-                    if tipo:
-                        mensajes_error.append("Semanal: Tareas incompletas.")
-
-            elif objetivo == "semanal_especial":
-                prog = db.get_progress_semanal(user_id)
-                if _claimed(prog.get("completado_especial")):
-                    if tipo:
-                        mensajes_error.append("Especial semanal: Ya reclamado.")
-                    continue
-                ip = _pv(prog.get("impostor_partidas"))
-                iv = _pv(prog.get("impostor_victorias"))
-                if ip >= 3 and iv >= 1:
-                    pts = int(rewards.get("especial_semanal", 400))
-                    bl = int(rewards.get("especial_semanal_blisters", 2))
-                    db.modify_points(user_id, pts)
-                    _, bcol = db.modify_blisters(user_id, "trampa", bl)
-                    mensajes_exito.extend(bcol)
-                    db.claim_reward(user_id, "semanal_especial")
-                    mensajes_exito.append(f"**Especial semanal:** {fmt_toque_sentence(pts)} + {bl} Blisters 🃏")
-                    reclamado_algo = True
-                else:
-                    if tipo:
-                        mensajes_error.append("Especial semanal: Necesitás 3 partidas Impostor y 1 victoria como impostor.")
-
-            elif objetivo == "semanal_minijuegos":
-                prog = db.get_progress_semanal(user_id)
-                if _claimed(prog.get("completado_minijuegos")):
-                    if tipo:
-                        mensajes_error.append("Minijuegos semanal: Ya reclamado.")
-                    continue
-                if (
-                    _pv(prog.get("mg_ret_roll_apuesta")) >= 1
-                    and _pv(prog.get("mg_roll_casual")) >= 1
-                    and _pv(prog.get("mg_duelo")) >= 1
-                    and _pv(prog.get("mg_voto_dom")) >= 1
-                ):
-                    pts = int(rewards.get("minijuegos_semanal", 150))
-                    bl = int(rewards.get("minijuegos_semanal_blisters", 1))
-                    db.modify_points(user_id, pts)
-                    _, bcol = db.modify_blisters(user_id, "trampa", bl)
-                    mensajes_exito.extend(bcol)
-                    db.claim_reward(user_id, "semanal_minijuegos")
-                    mensajes_exito.append(f"**Minijuegos semanal:** {fmt_toque_sentence(pts)} + {bl} Blister(s) 🃏")
-                    reclamado_algo = True
-                else:
-                    if tipo:
-                        mensajes_error.append("Minijuegos: faltan reto con apuesta, roll casual, duelo y voto.")
+                        db.claim_reward(user_id, "semanal_minijuegos")
+                        mensajes_exito.append(f"**Minijuegos semanal:** {fmt_toque_sentence(pts)} + {bl} Blister(s) 🃏")
+                        reclamado_algo = True
+                    else:
+                        if tipo:
+                            mensajes_error.append("Minijuegos: faltan reto con apuesta, roll casual, duelo y voto.")
         except Exception:
             log.exception("reclaim_rewards falló en objetivo=%s user=%s", objetivo, user_id)
+            del mensajes_exito[n_ok:]  # el savepoint deshizo puntos/blisters de este objetivo
             mensajes_error.append(f"{objetivo}: error interno al cobrar (avisá al staff).")
 
     return reclamado_algo, mensajes_exito, mensajes_error
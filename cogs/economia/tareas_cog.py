@@ -47,7 +47,7 @@ class TareasCog(commands.Cog, name="Economia Tareas"):
             return
         await interaction.response.defer(ephemeral=True)
         cfg = self.task_config or {}
-        pages = build_pages_inicial(self.db, cfg, interaction.user.id)
+        pages = await self.db.aio.run(build_pages_inicial, self.db, cfg, interaction.user.id)
         await self._send_progress_pages(interaction, pages)
 
     @app_commands.command(
@@ -59,7 +59,7 @@ class TareasCog(commands.Cog, name="Economia Tareas"):
             return
         await interaction.response.defer(ephemeral=True)
         cfg = self.task_config or {}
-        pages = build_pages_diaria(self.db, cfg, interaction.user.id)
+        pages = await self.db.aio.run(build_pages_diaria, self.db, cfg, interaction.user.id)
         await self._send_progress_pages(interaction, pages)
 
     @app_commands.command(
@@ -71,7 +71,7 @@ class TareasCog(commands.Cog, name="Economia Tareas"):
             return
         await interaction.response.defer(ephemeral=True)
         cfg = self.task_config or {}
-        pages = build_pages_semanal(self.db, cfg, interaction.user.id)
+        pages = await self.db.aio.run(build_pages_semanal, self.db, cfg, interaction.user.id)
         await self._send_progress_pages(interaction, pages)
 
     @app_commands.command(
@@ -181,8 +181,8 @@ class TareasCog(commands.Cog, name="Economia Tareas"):
                     return
                 resolved = tipo
 
-        ok, mensajes_exito, mensajes_error = reclaim_rewards(self.db, cfg, user_id, resolved)
-        snap = build_reclaim_status_block(self.db, cfg, user_id)
+        ok, mensajes_exito, mensajes_error = await self.db.aio.run(reclaim_rewards, self.db, cfg, user_id, resolved)
+        snap = await self.db.aio.run(build_reclaim_status_block, self.db, cfg, user_id)
         parts: List[str] = []
         if mensajes_exito:
             parts.append("**Reclamado:**\n" + "\n".join(mensajes_exito))
@@ -195,12 +195,12 @@ class TareasCog(commands.Cog, name="Economia Tareas"):
         desc = "\n\n".join(parts)[:4000]
         color = discord.Color.green() if ok else (discord.Color.orange() if mensajes_error else discord.Color.blurple())
         embed = discord.Embed(title="Reclamar", description=desc, color=color)
-        prog_ini = self.db.get_progress_inicial(user_id)
+        prog_ini = await self.db.aio.get_progress_inicial(user_id)
         if not inicial_all_claimed(prog_ini):
             embed.set_footer(text=MSG_TIP_INICIACION_AL_RECLAMAR[:2048])
         await interaction.followup.send(embed=embed, ephemeral=True)
         if not ok and not mensajes_error and tipo is None:
-            extra = build_inicial_reclaim_hint(self.db, user_id)
+            extra = await self.db.aio.run(build_inicial_reclaim_hint, self.db, user_id)
             if extra:
                 await interaction.followup.send(
                     extra + "\n\n`/aat-progreso-*` · `/aat-progreso-ayuda` o `?progreso` / `?progresoayuda` en el canal del bot.",
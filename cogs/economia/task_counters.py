@@ -0,0 +1,124 @@
+# cogs/economia/task_counters.py
+"""
+Buffer write-behind para contadores de tareas (mensajes / reacciones / semanales).
+
+Los listeners suman acá en memoria; `EconomiaDBManagerV2.flush_task_counters` vuelca todo
+en una sola transacción. Las lecturas de progreso mezclan lo pendiente (read-your-writes).
+"""
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, Dict, Set, Tuple
+
+_COLUMN_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+DiariaKey = Tuple[int, str, str]  # (user_id, fecha, columna)
+SemanalKey = Tuple[int, str, str]  # (user_id, semana, columna)
+InicialKey = Tuple[int, str]  # (user_id, columna)
+
+
+def _check_column(column: str) -> str:
+    if not _COLUMN_RE.match(column or ""):
+        raise ValueError(f"columna inválida: {column!r}")
+    return column
+
+
+class TaskCounterBuffer:
+    """Agrega incrementos por (usuario, fecha/semana, columna). Thread-safe (loop + executor de la DB)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._diaria: Dict[DiariaKey, int] = {}
+        self._semanal: Dict[SemanalKey, int] = {}
+        self._inicial: Set[InicialKey] = set()
+        self._pending_events = 0
+        self.events_total = 0
+        self.flushes_total = 0
+        self.rows_flushed_total = 0
+
+    @property
+    def pending_events(self) -> int:
+        return self._pending_events
+
+    def add_diaria(self, user_id: int, column: str, fecha: str, amount: int = 1) -> int:
+        key = (int(user_id), str(fecha), _check_column(column))
+        with self._lock:
+            self._diaria[key] = self._diaria.get(key, 0) + int(amount)
+            return self._bump()
+
+    def add_semanal(self, user_id: int, column: str, semana: str, amount: int = 1) -> int:
+        key = (int(user_id), str(semana), _check_column(column))
+        with self._lock:
+            self._semanal[key] = self._semanal.get(key, 0) + int(amount)
+            return self._bump()
+
+    def add_inicial(self, user_id: int, column: str) -> int:
+        key = (int(user_id), _check_column(column))
+        with self._lock:
+            self._inicial.add(key)
+            return self._bump()
+
+    def _bump(self) -> int:
+        self._pending_events += 1
+        self.events_total += 1
+        return self._pending_events
+
+    def drain(self) -> Tuple[Dict[DiariaKey, int], Dict[SemanalKey, int], Set[InicialKey]]:
+        """Saca todo lo pendiente (el llamador lo escribe o lo devuelve con `restore` si falla)."""
+        with self._lock:
+            out = (self._diaria, self._semanal, self._inicial)
+            self._diaria, self._semanal, self._inicial = {}, {}, set()
+            self._pending_events = 0
+            return out
+
+    def restore(
+        self,
+        diaria: Dict[DiariaKey, int],
+        semanal: Dict[SemanalKey, int],
+        inicial: Set[InicialKey],
+    ) -> None:
+        """Vuelve a encolar un lote cuyo flush falló (se suma a lo que llegó mientras tanto)."""
+        with self._lock:
+            for k, v in diaria.items():
+                self._diaria[k] = self._diaria.get(k, 0) + v
+            for k, v in semanal.items():
+                self._semanal[k] = self._semanal.get(k, 0) + v
+            self._inicial |= inicial
+            self._pending_events += len(diaria) + len(semanal) + len(inicial)
+
+    def mark_flushed(self, rows: int) -> None:
+        with self._lock:
+            self.flushes_total += 1
+            self.rows_flushed_total += int(rows)
+
+    def merge_diaria(self, user_id: int, fecha: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            for (uid, f, col), n in self._diaria.items():
+                if uid == user_id and f == fecha and col in row:
+                    row[col] = int(row[col] or 0) + n
+        return row
+
+    def merge_semanal(self, user_id: int, semana: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            for (uid, s, col), n in self._semanal.items():
+                if uid == user_id and s == semana and col in row:
+                    row[col] = int(row[col] or 0) + n
+        return row
+
+    def merge_inicial(self, user_id: int, row: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            for uid, col in self._inicial:
+                if uid == user_id and col in row:
+                    row[col] = 1
+        return row
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending_keys": len(self._diaria) + len(self._semanal) + len(self._inicial),
+                "pending_events": self._pending_events,
+                "events_total": self.events_total,
+                "flushes_total": self.flushes_total,
+                "rows_flushed_total": self.rows_flushed_total,
+            }
@@ -7,7 +7,9 @@ from typing import Any, Dict, Literal, Optional
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
+
+from cogs.scheduler import get_scheduler
 
 from .db_manager import EconomiaDBManagerV2
 from .toque_labels import fmt_toque_line, guia_toque_explicacion, toque_emote
@@ -17,6 +19,13 @@ log = logging.getLogger(__name__)
 PollDuracion = Literal["10 Minutos", "20 Minutos", "30 Minutos", "60 Minutos"]
 _DURATION_MAP = {"10 Minutos": 10, "20 Minutos": 20, "30 Minutos": 30, "60 Minutos": 60}
 
+# Trabajo del scheduler: vencimiento de cada rol temporal (clave = id de temp_roles_shop; tienda o carta).
+TEMP_ROLE_EXPIRY_JOB = "tienda.temp_role_expiry"
+
+
+def schedule_temp_role_expiry(row_id: int, expires_ts: float) -> None:
+    get_scheduler().schedule(TEMP_ROLE_EXPIRY_JOB, row_id, expires_ts)
+
 
 class TiendaCog(commands.Cog, name="Economia Tienda"):
     def __init__(self, bot: commands.Bot):
@@ -26,13 +35,15 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
         self.task_config = getattr(bot, "task_config", None) or {}
         super().__init__()
 
-    def cog_unload(self):
-        self._expire_temp_roles.cancel()
+    async def cog_load(self) -> None:
+        sch = get_scheduler()
+        sch.register(TEMP_ROLE_EXPIRY_JOB, self._on_temp_role_due)
+        # Roles registrados antes del scheduler: se agendan una vez al cargar (los ya agendados no cambian).
+        for row_id, expires_ts in await self.economia_db.aio.temp_shop_role_expiries():
+            sch.schedule(TEMP_ROLE_EXPIRY_JOB, row_id, expires_ts, earliest=True)
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        if not self._expire_temp_roles.is_running():
-            self._expire_temp_roles.start()
+    def cog_unload(self):
+        get_scheduler().unregister(TEMP_ROLE_EXPIRY_JOB)
 
     def _cfg(self, key: str, default: int = 0) -> int:
         if not self.config:
@@ -118,8 +129,8 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
         if not self.config:
             await interaction.response.send_message("La tienda no está configurada.", ephemeral=True)
             return
-        self.economia_db.ensure_user_exists(interaction.user.id)
-        eco = self.economia_db.get_user_economy(interaction.user.id)
+        await self.economia_db.aio.ensure_user_exists(interaction.user.id)
+        eco = await self.economia_db.aio.get_user_economy(interaction.user.id)
         await interaction.response.send_message(embed=self._build_tienda_embed(eco), ephemeral=True)
 
     @app_commands.command(name="aat-tienda-canjear", description="Comprá un ítem de la tienda con puntos.")
@@ -137,7 +148,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             await interaction.followup.send("La tienda no está configurada.", ephemeral=True)
             return
 
-        user_data = self.economia_db.get_user_economy(interaction.user.id)
+        user_data = await self.economia_db.aio.get_user_economy(interaction.user.id)
         item_id = item_id.lower()
         precio = 0
         try:
@@ -164,13 +175,13 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             )
             return
 
-        self.economia_db.modify_points(interaction.user.id, precio, gastar=True)
+        await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=True)
 
         if item_id in ("akatsuki", "jonin"):
             role_id_key = "akatsuki_role_id" if item_id == "akatsuki" else "jonin_role_id"
             role_id = self.config.get(role_id_key)
             if not role_id or not interaction.guild:
-                self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+                await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
                 await interaction.followup.send(
                     "Se devolvieron los puntos: falta ID del rol o no estás en un servidor.",
                     ephemeral=True,
@@ -181,7 +192,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
                 if jonin_rid:
                     jr = interaction.guild.get_role(int(jonin_rid))
                     if jr and jr not in interaction.user.roles:
-                        self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+                        await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
                         await interaction.followup.send(
                             "Para canjear **Akatsuki** necesitás tener antes el rol **Jōnin** "
                             "(canjealo o conseguilo según las reglas del servidor). **Puntos devueltos.**",
@@ -190,26 +201,26 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
                         return
             role = interaction.guild.get_role(int(role_id))
             if not role:
-                self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+                await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
                 await interaction.followup.send("Se devolvieron los puntos: no encontré ese rol en el servidor.", ephemeral=True)
                 return
             try:
                 await interaction.user.add_roles(role, reason="Tienda Anime al Toque")
                 await interaction.followup.send(f"✅ Listo: te asigné **{role.name}**.", ephemeral=True)
             except discord.Forbidden:
-                self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+                await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
                 await interaction.followup.send(
                     "Se devolvieron los puntos: el bot no puede asignar ese rol (jerarquía / permisos).",
                     ephemeral=True,
                 )
         elif item_id == "pin":
-            self.economia_db.set_credits(interaction.user.id, user_data["creditos_pin"] + 1)
+            await self.economia_db.aio.set_credits(interaction.user.id, user_data["creditos_pin"] + 1)
             await interaction.followup.send(
                 "✅ **+1 crédito de pin.** Usalo con `/aat-tienda-fijar` (ID del mensaje en el canal correspondiente).",
                 ephemeral=True,
             )
         elif item_id == "blister_trampa":
-            _, bcol = self.economia_db.modify_blisters(interaction.user.id, "trampa", 1)
+            _, bcol = await self.economia_db.aio.modify_blisters(interaction.user.id, "trampa", 1)
             extra = ("\n\n" + "\n".join(bcol)) if bcol else ""
             await interaction.followup.send(
                 "✅ **+1 sobre Trampa.** Abrilo con `/aat-abrirblister` eligiendo tipo **trampa**." + extra,
@@ -227,7 +238,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
         if not id_mensaje.isdigit():
             await interaction.followup.send("La ID tiene que ser solo números.", ephemeral=True)
             return
-        if not self.economia_db.use_credit(interaction.user.id):
+        if not await self.economia_db.aio.use_credit(interaction.user.id):
             await interaction.followup.send(
                 "No tenés créditos. Comprá con `/aat-tienda-canjear` → **pin**.",
                 ephemeral=True,
@@ -241,24 +252,24 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
                 ephemeral=True,
             )
         except discord.NotFound:
-            self.economia_db.set_credits(
-                interaction.user.id, self.economia_db.get_user_economy(interaction.user.id)["creditos_pin"] + 1
+            await self.economia_db.aio.set_credits(
+                interaction.user.id, (await self.economia_db.aio.get_user_economy(interaction.user.id))["creditos_pin"] + 1
             )
             await interaction.followup.send(
                 "No encontré ese mensaje **en este canal**. Se te devolvió el crédito.",
                 ephemeral=True,
             )
         except discord.Forbidden:
-            self.economia_db.set_credits(
-                interaction.user.id, self.economia_db.get_user_economy(interaction.user.id)["creditos_pin"] + 1
+            await self.economia_db.aio.set_credits(
+                interaction.user.id, (await self.economia_db.aio.get_user_economy(interaction.user.id))["creditos_pin"] + 1
             )
             await interaction.followup.send(
                 "No pude fijar (permisos). Se te devolvió el crédito.",
                 ephemeral=True,
             )
         except Exception as e:
-            self.economia_db.set_credits(
-                interaction.user.id, self.economia_db.get_user_economy(interaction.user.id)["creditos_pin"] + 1
+            await self.economia_db.aio.set_credits(
+                interaction.user.id, (await self.economia_db.aio.get_user_economy(interaction.user.id))["creditos_pin"] + 1
             )
             await interaction.followup.send(f"Error: {e}. Crédito devuelto.", ephemeral=True)
 
@@ -282,7 +293,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             await interaction.followup.send("La ID tiene que ser numérica.", ephemeral=True)
             return
 
-        eco = self.economia_db.get_user_economy(interaction.user.id)
+        eco = await self.economia_db.aio.get_user_economy(interaction.user.id)
         if eco["puntos_actuales"] < precio:
             await interaction.followup.send(
                 f"Necesitás **{precio}** pts (tenés {eco['puntos_actuales']}).",
@@ -295,7 +306,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             await interaction.followup.send("El canal general configurado no es de texto.", ephemeral=True)
             return
 
-        self.economia_db.modify_points(interaction.user.id, precio, gastar=True)
+        await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=True)
         try:
             msg = await ch.fetch_message(int(id_mensaje))
             await msg.pin(reason=f"Pin general tienda — {interaction.user} ({interaction.user.id})")
@@ -304,19 +315,19 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
                 ephemeral=True,
             )
         except discord.NotFound:
-            self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+            await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
             await interaction.followup.send(
                 "No encontré ese mensaje en #general. **Puntos devueltos.**",
                 ephemeral=True,
             )
         except discord.Forbidden:
-            self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+            await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
             await interaction.followup.send(
                 "Sin permiso para fijar ahí. **Puntos devueltos.**",
                 ephemeral=True,
             )
         except Exception as e:
-            self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+            await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
             await interaction.followup.send(f"Error: {e}. **Puntos devueltos.**", ephemeral=True)
 
     @app_commands.command(
@@ -356,7 +367,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             await interaction.followup.send("Solo en servidor.", ephemeral=True)
             return
 
-        eco = self.economia_db.get_user_economy(interaction.user.id)
+        eco = await self.economia_db.aio.get_user_economy(interaction.user.id)
         if eco["puntos_actuales"] < precio:
             await interaction.followup.send(
                 f"Necesitás **{precio}** pts (tenés {eco['puntos_actuales']}).",
@@ -379,7 +390,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             await interaction.followup.send("Módulo de votaciones no disponible.", ephemeral=True)
             return
 
-        self.economia_db.modify_points(interaction.user.id, precio, gastar=True)
+        await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=True)
         minutes = _DURATION_MAP[duracion]
         ok, err, _msg = await vot.create_shop_poll(
             ch,
@@ -395,7 +406,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             url_imagen=url_imagen,
         )
         if not ok:
-            self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+            await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
             await interaction.followup.send(f"No se pudo publicar. **Puntos devueltos.**\n{err}", ephemeral=True)
             return
         await interaction.followup.send(
@@ -431,7 +442,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             await interaction.followup.send("Solo en servidor.", ephemeral=True)
             return
 
-        eco = self.economia_db.get_user_economy(interaction.user.id)
+        eco = await self.economia_db.aio.get_user_economy(interaction.user.id)
         if eco["puntos_actuales"] < precio:
             await interaction.followup.send(
                 f"Necesitás **{precio}** pts (tenés {eco['puntos_actuales']}).",
@@ -461,7 +472,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             except (ValueError, TypeError):
                 colour = None
 
-        self.economia_db.modify_points(interaction.user.id, precio, gastar=True)
+        await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=True)
         role = None
         try:
             create_kw: Dict[str, Any] = dict(
@@ -480,7 +491,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             await usuario.add_roles(role, reason="Rol temporal tienda")
             now = time.time()
             exp = now + days * 86400
-            self.economia_db.register_temp_shop_role(
+            row_id = await self.economia_db.aio.register_temp_shop_role(
                 interaction.guild.id,
                 role.id,
                 usuario.id,
@@ -490,12 +501,13 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
                 exp,
                 kind="shop",
             )
+            schedule_temp_role_expiry(row_id, exp)
             await interaction.followup.send(
                 f"✅ **-{precio}** pts. Rol {role.mention} → {usuario.mention} por **{days}** días.",
                 ephemeral=True,
             )
         except discord.Forbidden:
-            self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+            await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
             if role:
                 try:
                     await role.delete()
@@ -506,7 +518,7 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
                 ephemeral=True,
             )
         except Exception as e:
-            self.economia_db.modify_points(interaction.user.id, precio, gastar=False)
+            await self.economia_db.aio.modify_points(interaction.user.id, precio, gastar=False)
             if role:
                 try:
                     await role.delete()
@@ -515,42 +527,40 @@ class TiendaCog(commands.Cog, name="Economia Tienda"):
             log.exception("rol_temporal: %s", e)
             await interaction.followup.send(f"Error: {e}. **Puntos devueltos.**", ephemeral=True)
 
-    @tasks.loop(hours=1)
-    async def _expire_temp_roles(self):
-        try:
-            now = time.time()
-            rows = self.economia_db.get_expired_temp_shop_roles(now)
-            for row in rows:
-                rid = int(row["id"])
-                guild_id = int(row["guild_id"])
-                role_id = int(row["role_id"])
-                user_id = int(row["user_id"])
-                kind = str(row.get("kind") or "shop")
-                g = self.bot.get_guild(guild_id)
-                if g:
-                    role = g.get_role(role_id)
-                    mem = g.get_member(user_id)
-                    if mem and role and role in mem.roles:
-                        try:
-                            await mem.remove_roles(
-                                role,
-                                reason="Rol temporal — vencido (tienda o carta)",
-                            )
-                        except Exception:
-                            pass
-                    if kind == "shop" and role:
-                        try:
-                            await role.delete(reason="Rol temporal tienda — vencido")
-                        except Exception:
-                            pass
-                self.economia_db.delete_temp_shop_role_row(rid)
-        except Exception:
-            log.exception("_expire_temp_roles")
-
-    @_expire_temp_roles.before_loop
-    async def _before_expire(self):
-        await self.bot.wait_until_ready()
-
+    async def _on_temp_role_due(self, key: str, payload: Dict[str, Any]) -> Optional[float]:
+        row = await self.economia_db.aio.get_temp_shop_role(int(key))
+        if not row:
+            return None
+        expires_ts = float(row.get("expires_ts") or 0)
+        if expires_ts > time.time():
+            return expires_ts
+        await self._expire_temp_role(row)
+        return None
+
+    async def _expire_temp_role(self, row: Dict[str, Any]) -> None:
+        """Saca el rol vencido al usuario (y lo borra si era de tienda) y elimina la fila."""
+        guild_id = int(row["guild_id"])
+        role_id = int(row["role_id"])
+        user_id = int(row["user_id"])
+        kind = str(row.get("kind") or "shop")
+        g = self.bot.get_guild(guild_id)
+        if g:
+            role = g.get_role(role_id)
+            mem = g.get_member(user_id)
+            if mem and role and role in mem.roles:
+                try:
+                    await mem.remove_roles(
+                        role,
+                        reason="Rol temporal — vencido (tienda o carta)",
+                    )
+                except Exception:
+                    pass
+            if kind == "shop" and role:
+                try:
+                    await role.delete(reason="Rol temporal tienda — vencido")
+                except Exception:
+                    pass
+        await self.economia_db.aio.delete_temp_shop_role_row(int(row["id"]))
 
 async def setup(bot):
     await bot.add_cog(TiendaCog(bot))
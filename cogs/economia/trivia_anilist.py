@@ -1,16 +1,19 @@
 # Preguntas trivia desde AniList (GraphQL público), para variedad casi infinita.
+# `AniListTriviaBuffer` las genera de antemano: la ronda toma una ya lista y nunca espera a la red.
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import random
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
-import aiohttp
+from cogs.anilist_client import get_client as get_anilist_client
 
-log = logging.getLogger(__name__)
+from .trivia_bank import TriviaQuestion, compile_question
 
-ANILIST_URL = "https://graphql.anilist.co"
+log = logging.getLogger(__name__)
 
 QUERY_PAGE = """
 query ($page: Int, $perPage: Int) {
@@ -32,26 +35,18 @@ query ($page: Int, $perPage: Int) {
 """
 
 
-async def try_fetch_anilist_trivia_question(
-    *,
-    session: Optional[aiohttp.ClientSession] = None,
-) -> Optional[Dict[str, Any]]:
+async def try_fetch_anilist_trivia_question() -> Optional[Dict[str, Any]]:
     """
     Devuelve {"q": str, "answers": [str, ...]} o None si falla / datos incompletos.
+    Las páginas quedan en la caché del cliente AniList: repetir (page, perPage) no gasta otro request.
     """
-    close_after = False
-    if session is None:
-        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=12))
-        close_after = True
     try:
         page = random.randint(1, 12)
         per_page = random.randint(24, 48)
-        payload = {"query": QUERY_PAGE, "variables": {"page": page, "perPage": per_page}}
-        async with session.post(ANILIST_URL, json=payload, headers={"Content-Type": "application/json"}) as resp:
-            if resp.status != 200:
-                return None
-            data = await resp.json()
-        media_list = (((data or {}).get("data") or {}).get("Page") or {}).get("media") or []
+        data = await get_anilist_client().query(
+            QUERY_PAGE, {"page": page, "perPage": per_page}, ttl=6 * 3600, timeout=12
+        )
+        media_list = ((data or {}).get("Page") or {}).get("media") or []
         if not isinstance(media_list, list) or not media_list:
             return None
         m = random.choice(media_list)
@@ -100,10 +95,71 @@ async def try_fetch_anilist_trivia_question(
     except Exception:
         log.debug("trivia anilist: fallo al generar", exc_info=True)
         return None
-    finally:
-        if close_after:
-            try:
-                await session.close()
-            except Exception:
-                pass
     return None
+
+
+class AniListTriviaBuffer:
+    """Unas pocas preguntas de AniList ya compiladas, listas antes del horario de la ronda."""
+
+    def __init__(self, size: Optional[int] = None):
+        if size is None:
+            try:
+                size = int((os.getenv("TRIVIA_ANILIST_BUFFER") or "3").strip())
+            except ValueError:
+                size = 3
+        self.size = max(1, min(20, size))
+        self._items: Deque[TriviaQuestion] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self.fetched = 0
+        self.failed = 0
+        self.served = 0
+        self.empty = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def pop(self) -> Optional[TriviaQuestion]:
+        """Pregunta lista (sin red) o None si el buffer está vacío; después conviene `kick()`."""
+        if not self._items:
+            self.empty += 1
+            return None
+        self.served += 1
+        return self._items.popleft()
+
+    def kick(self) -> None:
+        """Rellena en segundo plano hasta `size` (idempotente mientras haya un relleno en curso)."""
+        if len(self._items) >= self.size or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self.fill(), name="trivia_anilist_prefetch")
+
+    async def fill(self) -> int:
+        added = 0
+        # Tope de intentos: AniList caído o datos incompletos no deben girar en vacío.
+        for _ in range(self.size * 3):
+            if len(self._items) >= self.size:
+                break
+            raw = await try_fetch_anilist_trivia_question()
+            tq = compile_question(raw["q"], raw["answers"]) if raw else None
+            if tq is None:
+                self.failed += 1
+                continue
+            if any(x.key == tq.key for x in self._items):
+                continue
+            self._items.append(tq)
+            self.fetched += 1
+            added += 1
+        return added
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": len(self._items),
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "served": self.served,
+            "empty": self.empty,
+        }
@@ -0,0 +1,223 @@
+# Banco compilado de trivia: data/anime_trivia.json se parsea una vez (y de nuevo sólo si cambia el mtime/tamaño)
+# a tuplas inmutables con el conjunto de respuestas aceptadas ya normalizado, en vez de expandirlo en cada ronda.
+# El orden de salida es una permutación aleatoria persistida en bot_meta: ninguna pregunta se repite hasta
+# agotar el banco (sobrevive reinicios y ediciones del JSON: las nuevas se suman a lo que queda del ciclo).
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+# Clave de bot_meta del cursor: {"left": [...], "done": [...]} con claves de pregunta (lo que falta del ciclo
+# en orden de salida y lo ya preguntado).
+CURSOR_META_KEY = "trivia_bank_cursor"
+
+
+def norm_answer(s: str) -> str:
+    s = unicodedata.normalize("NFKD", (s or "").strip().lower())
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return "".join(s.split())
+
+
+def expand_accepted_norms_for_one(answer: str) -> Set[str]:
+    """
+    Acepta la frase completa sin espacios y también tokens sueltos (nombre, apellido,
+    primer+último pegado) para que cuente `?r Nombre` o solo el apellido.
+    """
+    out: Set[str] = set()
+    a = str(answer or "").strip()
+    if not a:
+        return out
+    for chunk in re.split(r"[,;|/]+", a):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        full = norm_answer(chunk)
+        if full:
+            out.add(full)
+        words = re.findall(r"[\wáéíóúÁÉÍÓÚñÑ]+", chunk, flags=re.I)
+        meaningful: List[str] = []
+        for w in words:
+            nw = norm_answer(w)
+            if len(nw) >= 2:
+                meaningful.append(w)
+                out.add(nw)
+        if len(meaningful) >= 2:
+            out.add(norm_answer(meaningful[0]))
+            out.add(norm_answer(meaningful[-1]))
+            # "Nombre Apellido" o "Apellido Nombre" pegado (mismo resultado que sin espacios)
+            out.add(norm_answer(meaningful[0] + meaningful[-1]))
+            out.add(norm_answer(meaningful[-1] + meaningful[0]))
+    return out
+
+
+def expand_all_accepted_norms(answers: Iterable[str]) -> Set[str]:
+    acc: Set[str] = set()
+    for a in answers:
+        acc.update(expand_accepted_norms_for_one(a))
+    return {x for x in acc if x}
+
+
+class TriviaQuestion(NamedTuple):
+    q: str
+    answers: Tuple[str, ...]
+    accepted: FrozenSet[str]
+    key: str
+
+
+def question_key(q: str) -> str:
+    """Identidad estable de la pregunta (para el cursor): no cambia si se reordena el JSON."""
+    return hashlib.sha1(" ".join(q.lower().split()).encode("utf-8")).hexdigest()[:12]
+
+
+def compile_question(q: str, answers: Iterable[str]) -> Optional[TriviaQuestion]:
+    q = str(q or "").strip()
+    ans = tuple(str(a).strip() for a in answers if str(a).strip())
+    if not q or not ans:
+        return None
+    accepted = frozenset(expand_all_accepted_norms(ans))
+    if not accepted:
+        return None
+    return TriviaQuestion(q, ans, accepted, question_key(q))
+
+
+def compile_questions(data: Any) -> Tuple[TriviaQuestion, ...]:
+    """Lista JSON (`q`/`question` + `a`/`answers`/`answer`) → preguntas compiladas, sin duplicados."""
+    if not isinstance(data, list):
+        return ()
+    out: List[TriviaQuestion] = []
+    seen: Set[str] = set()
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        a_raw = item.get("a", item.get("answers", item.get("answer")))
+        if isinstance(a_raw, str):
+            a_raw = [a_raw]
+        if not isinstance(a_raw, list):
+            continue
+        tq = compile_question(item.get("q") or item.get("question") or "", a_raw)
+        if tq is None or tq.key in seen:
+            continue
+        seen.add(tq.key)
+        out.append(tq)
+    return tuple(out)
+
+
+class TriviaBank:
+    """Preguntas del JSON compiladas + recarga por mtime + cursor sin repetición en bot_meta."""
+
+    def __init__(self, path: Path, *, rng: Optional[random.Random] = None):
+        self.path = Path(path)
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._items: Tuple[TriviaQuestion, ...] = ()
+        self._by_key: Dict[str, TriviaQuestion] = {}
+        self._stamp: Optional[Tuple[float, int]] = None
+        self._missing = False
+        # Último cursor leído/escrito (texto de bot_meta → listas): si bot_meta no cambió por fuera no se re-parsea.
+        self._cursor: Optional[Tuple[str, List[str], List[str]]] = None
+        self.loads = 0
+        self.draws = 0
+        self.cycles = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def items(self) -> Tuple[TriviaQuestion, ...]:
+        return self._items
+
+    def reload_if_needed(self) -> bool:
+        """Re-compila si el archivo cambió (mtime o tamaño). True si recargó."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            # Se sigue con lo último cargado; avisa una vez por desaparición.
+            if not self._missing:
+                log.warning("Archivo de trivia no encontrado: %s", self.path)
+                self._missing = True
+            return False
+        self._missing = False
+        stamp = (st.st_mtime, st.st_size)
+        if stamp == self._stamp:
+            return False
+        try:
+            items = compile_questions(json.loads(self.path.read_text(encoding="utf-8")))
+        except Exception as e:
+            # JSON a medio guardar / inválido: se sigue con lo que había y se reintenta en la próxima ronda.
+            log.exception("Error leyendo trivia JSON: %s", e)
+            return False
+        with self._lock:
+            self._items = items
+            self._by_key = {tq.key: tq for tq in items}
+            self._stamp = stamp
+            self._cursor = None
+            self.loads += 1
+        log.info("Trivia: cargadas %s preguntas desde %s", len(items), self.path)
+        return True
+
+    @staticmethod
+    def _load_cursor(raw: Optional[str]) -> Tuple[List[str], List[str]]:
+        """(lo que falta del ciclo, lo ya preguntado en el ciclo) desde bot_meta."""
+        try:
+            data = json.loads(raw or "{}")
+        except (TypeError, ValueError):
+            return [], []
+        if not isinstance(data, dict):
+            return [], []
+        left, done = data.get("left"), data.get("done")
+        return (
+            [str(k) for k in left] if isinstance(left, list) else [],
+            [str(k) for k in done] if isinstance(done, list) else [],
+        )
+
+    def draw(
+        self, meta_get: Callable[[str], Optional[str]], meta_set: Callable[[str, str], None]
+    ) -> Optional[TriviaQuestion]:
+        """
+        Próxima pregunta del ciclo (y avanza el cursor persistido). None si el banco está vacío.
+        Llamar desde el executor de la DB: lee y escribe bot_meta.
+        """
+        with self._lock:
+            by_key = self._by_key
+            if not by_key:
+                return None
+            raw = meta_get(CURSOR_META_KEY)
+            if self._cursor is not None and self._cursor[0] == raw:
+                left, done = self._cursor[1], self._cursor[2]
+            else:
+                left, done = self._load_cursor(raw)
+                # Preguntas borradas del JSON salen del ciclo; las nuevas entran en lugares al azar de lo que queda.
+                left = [k for k in left if k in by_key]
+                done = [k for k in done if k in by_key]
+                seen = set(left) | set(done)
+                for k in by_key:
+                    if k not in seen:
+                        left.insert(self._rng.randint(0, len(left)), k)
+            if not left:
+                last = done[-1] if done else None
+                left = list(by_key)
+                self._rng.shuffle(left)
+                # Que el ciclo nuevo no arranque con la última del anterior.
+                if len(left) > 1 and left[0] == last:
+                    left.append(left.pop(0))
+                done = []
+                self.cycles += 1
+            key = left.pop(0)
+            done.append(key)
+            raw = json.dumps({"left": left, "done": done}, separators=(",", ":"))
+            meta_set(CURSOR_META_KEY, raw)
+            self._cursor = (raw, left, done)
+            self.draws += 1
+            return by_key[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"questions": len(self._items), "loads": self.loads, "draws": self.draws, "cycles": self.cycles}
@@ -8,16 +8,20 @@ import logging
 import os
 import random
 import re
-import unicodedata
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, List, Optional
 
 import discord
 from discord.ext import commands
 
+from cogs.message_router import MessageContext, get_router
+from cogs.scheduler import get_scheduler
+
 from .db_manager import EconomiaDBManagerV2
+from .trivia_anilist import AniListTriviaBuffer
+from .trivia_bank import TriviaBank, TriviaQuestion, norm_answer
 
 log = logging.getLogger(__name__)
 
@@ -28,6 +32,10 @@ try:
 except Exception:  # pragma: no cover
     UY = None
 
+# Trabajo del scheduler: próxima ronda de trivia (horarios del día en bot_meta).
+TRIVIA_JOB = "trivia.round"
+_TRIVIA_RETRY_SECONDS = 5.0
+
 
 def _uy_now() -> datetime:
     if UY:
@@ -35,12 +43,6 @@ def _uy_now() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
-def _norm_answer(s: str) -> str:
-    s = unicodedata.normalize("NFKD", (s or "").strip().lower())
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    return "".join(s.split())
-
-
 def _strip_trivia_answer_prefixes(text: str) -> str:
     """Quita `responder …` / `respuesta …` al inicio (con o sin `?`)."""
     s = (text or "").strip()
@@ -55,45 +57,6 @@ def _strip_trivia_answer_prefixes(text: str) -> str:
     return s
 
 
-def _expand_accepted_norms_for_one(answer: str) -> Set[str]:
-    """
-    Acepta la frase completa sin espacios y también tokens sueltos (nombre, apellido,
-    primer+último pegado) para que cuente `?r Nombre` o solo el apellido.
-    """
-    out: Set[str] = set()
-    a = str(answer or "").strip()
-    if not a:
-        return out
-    for chunk in re.split(r"[,;|/]+", a):
-        chunk = chunk.strip()
-        if not chunk:
-            continue
-        full = _norm_answer(chunk)
-        if full:
-            out.add(full)
-        words = re.findall(r"[\wáéíóúÁÉÍÓÚñÑ]+", chunk, flags=re.I)
-        meaningful: List[str] = []
-        for w in words:
-            nw = _norm_answer(w)
-            if len(nw) >= 2:
-                meaningful.append(w)
-                out.add(nw)
-        if len(meaningful) >= 2:
-            out.add(_norm_answer(meaningful[0]))
-            out.add(_norm_answer(meaningful[-1]))
-            # "Nombre Apellido" o "Apellido Nombre" pegado (mismo resultado que sin espacios)
-            out.add(_norm_answer(meaningful[0] + meaningful[-1]))
-            out.add(_norm_answer(meaningful[-1] + meaningful[0]))
-    return out
-
-
-def _expand_all_accepted_norms(answers: List[str]) -> Set[str]:
-    acc: Set[str] = set()
-    for a in answers:
-        acc.update(_expand_accepted_norms_for_one(a))
-    return {x for x in acc if x}
-
-
 def _plain_line_as_trivia_guess(content: str) -> Optional[str]:
     """
     Mensaje sin `?`: una línea corta o que empiece por `responder`/`respuesta`.
@@ -115,41 +78,11 @@ def _plain_line_as_trivia_guess(content: str) -> Optional[str]:
     return raw
 
 
-def _load_questions(path: Path) -> List[Dict[str, Any]]:
-    if not path.is_file():
-        log.warning("Archivo de trivia no encontrado: %s", path)
-        return []
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        if not isinstance(data, list):
-            return []
-        out: List[Dict[str, Any]] = []
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            q = str(item.get("q") or item.get("question") or "").strip()
-            if not q:
-                continue
-            a_raw = item.get("a", item.get("answers", item.get("answer")))
-            accepts: List[str] = []
-            if isinstance(a_raw, list):
-                accepts = [str(x).strip() for x in a_raw if str(x).strip()]
-            elif isinstance(a_raw, str) and a_raw.strip():
-                accepts = [a_raw.strip()]
-            if not accepts:
-                continue
-            out.append({"q": q, "answers": accepts})
-        return out
-    except Exception as e:
-        log.exception("Error leyendo trivia JSON: %s", e)
-        return []
-
-
 @dataclass
 class ActiveRound:
     channel_id: int
     question: str
-    answers_norm: Set[str]
+    answers_norm: FrozenSet[str]
     display_answers: str
     deadline: datetime
     winner_id: Optional[int] = None
@@ -159,9 +92,8 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.db: EconomiaDBManagerV2 = bot.economia_db
-        self._questions: List[Dict[str, Any]] = []
-        self._questions_path_mtime: float = 0.0
-        self._runner_task: Optional[asyncio.Task] = None
+        self._bank = TriviaBank(self._questions_path())
+        self._anilist = AniListTriviaBuffer()
         self._timeout_task: Optional[asyncio.Task] = None
         self._round: Optional[ActiveRound] = None
         self._start_lock = asyncio.Lock()
@@ -176,14 +108,13 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
 
     def _reload_questions_if_needed(self) -> None:
         path = self._questions_path()
-        try:
-            m = path.stat().st_mtime
-        except OSError:
-            return
-        if m != self._questions_path_mtime or not self._questions:
-            self._questions = _load_questions(path)
-            self._questions_path_mtime = m
-            log.info("Trivia: cargadas %s preguntas desde %s", len(self._questions), path)
+        if path != self._bank.path:
+            self._bank = TriviaBank(path)
+        self._bank.reload_if_needed()
+
+    def _anilist_enabled(self) -> bool:
+        raw = (os.getenv("TRIVIA_USE_ANILIST", "1") or "1").strip().lower()
+        return raw not in ("0", "false", "no", "off")
 
     def _general_channel_id(self) -> int:
         """La trivia solo se publica en #general (GENERAL_CHANNEL_ID / task_config)."""
@@ -215,16 +146,23 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
         return raw not in ("0", "false", "no", "off")
 
     async def cog_load(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.register("trivia.respuesta", self._on_round_message, owner=self, predicate=self._is_round_guess)
         self._reload_questions_if_needed()
-        self._runner_task = asyncio.create_task(self._scheduler_loop(), name="trivia_scheduler")
+        if self._anilist_enabled():
+            self._anilist.kick()
+        sch = get_scheduler()
+        sch.register(TRIVIA_JOB, self._on_trivia_due)
+        sch.schedule(TRIVIA_JOB, "daily", _uy_now().timestamp(), earliest=True)
 
     async def cog_unload(self) -> None:
-        if self._runner_task:
-            self._runner_task.cancel()
-            try:
-                await self._runner_task
-            except asyncio.CancelledError:
-                pass
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+        get_scheduler().unregister(TRIVIA_JOB)
+        self._anilist.close()
+        log.info("Trivia: banco %s · AniList precargadas %s", self._bank.stats(), self._anilist.stats())
         if self._timeout_task:
             self._timeout_task.cancel()
             try:
@@ -284,40 +222,46 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
         n = min(r, self._done_count(day) + 1)
         self.db.bot_meta_set(f"trivia_uy_done_{day.isoformat()}", str(n))
 
-    async def _scheduler_loop(self) -> None:
-        await self.bot.wait_until_ready()
-        while True:
-            try:
-                await asyncio.sleep(5)
-                if not UY:
-                    continue
-                now = _uy_now()
-                day = now.date()
-                if self._round:
-                    continue
-                r = self._rounds_per_day()
-                done = self._done_count(day)
-                if done >= r:
-                    continue
-                fires = self._ensure_daily_schedule(day)
-                if len(fires) < r:
-                    continue
-                next_fire = fires[done]
-                if now >= next_fire:
+    async def _on_trivia_due(self, key: str, payload: Dict[str, Any]) -> Optional[float]:
+        if not UY:
+            return None
+        now = _uy_now()
+        day = now.date()
+        if not self._round:
+            r = self._rounds_per_day()
+            done = await self.db.aio.run(self._done_count, day)
+            if done < r:
+                fires = await self.db.aio.run(self._ensure_daily_schedule, day)
+                if len(fires) >= r and now >= fires[done]:
                     async with self._start_lock:
-                        if self._round:
-                            continue
-                        await self._start_round(day)
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                log.exception("trivia scheduler")
+                        if not self._round:
+                            await self._start_round(day)
+        return await self._next_trivia_check()
+
+    async def _next_trivia_check(self) -> float:
+        """Cuándo volver a mirar: fin de la ronda en curso, próximo horario del día o mañana a las 07:00."""
+        # Cada chequeo deja el buffer de AniList lleno antes del próximo horario.
+        if self._anilist_enabled():
+            self._anilist.kick()
+        now = _uy_now()
+        if self._round:
+            return self._round.deadline.timestamp() + 1
+        day = now.date()
+        r = self._rounds_per_day()
+        done = await self.db.aio.run(self._done_count, day)
+        if done < r:
+            fires = await self.db.aio.run(self._ensure_daily_schedule, day)
+            if len(fires) >= r:
+                # Horario ya pasado (no se pudo publicar o se juntaron rondas): reintento corto, como el loop viejo.
+                return max(fires[done].timestamp(), now.timestamp() + _TRIVIA_RETRY_SECONDS)
+        return datetime.combine(day + timedelta(days=1), time(7, 0), tzinfo=UY).timestamp()
 
     async def _start_round(self, day: date) -> None:
         self._reload_questions_if_needed()
-        if not self._questions:
+        ani_on = self._anilist_enabled()
+        if not len(self._bank) and not (ani_on and len(self._anilist)):
             log.warning("Trivia: sin preguntas; se marca ronda como hecha.")
-            self._inc_done(day)
+            await self.db.aio.run(self._inc_done, day)
             return
 
         ch_id = self._general_channel_id()
@@ -335,42 +279,20 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
         if not isinstance(channel, discord.TextChannel):
             return
 
-        pick: Optional[Dict[str, Any]] = None
-        ani_on = (os.getenv("TRIVIA_USE_ANILIST", "1") or "1").strip().lower() not in (
-            "0",
-            "false",
-            "no",
-            "off",
-        )
-        mix = float(os.getenv("TRIVIA_ANILIST_MIX", "0.65") or 0.65)
-        if ani_on:
-            try:
-                from .trivia_anilist import try_fetch_anilist_trivia_question
-
-                if mix >= 1 or random.random() < mix or not self._questions:
-                    pick = await try_fetch_anilist_trivia_question()
-            except Exception:
-                log.debug("trivia anilist opcional falló", exc_info=True)
-
-        if not pick:
-            if not self._questions:
-                log.warning("Trivia: sin preguntas; se marca ronda como hecha.")
-                self._inc_done(day)
-                return
-            pick = random.choice(self._questions)
-        q = pick["q"]
-        answers: List[str] = pick["answers"]
-        norm_set = _expand_all_accepted_norms(answers)
-        if not norm_set:
-            self._inc_done(day)
+        pick = await self._pick_question()
+        if pick is None:
+            log.warning("Trivia: sin preguntas; se marca ronda como hecha.")
+            await self.db.aio.run(self._inc_done, day)
             return
+        q = pick.q
+        answers = pick.answers
 
         sec = self._seconds()
         now = _uy_now()
         deadline = now + timedelta(seconds=sec)
         pts = self._win_points()
         rday = self._rounds_per_day()
-        hecho = self._done_count(day)
+        hecho = await self.db.aio.run(self._done_count, day)
 
         plain = self._plain_messages_allowed()
         formas = (
@@ -411,16 +333,32 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
         self._round = ActiveRound(
             channel_id=channel.id,
             question=q,
-            answers_norm=norm_set,
+            answers_norm=pick.accepted,
             display_answers=answers[0],
             deadline=deadline,
         )
-        self._inc_done(day)
+        await self.db.aio.run(self._inc_done, day)
 
         if self._timeout_task:
             self._timeout_task.cancel()
         self._timeout_task = asyncio.create_task(self._timeout_after(sec), name="trivia_timeout")
 
+    async def _pick_question(self) -> Optional[TriviaQuestion]:
+        """AniList (sólo lo ya precargado) según TRIVIA_ANILIST_MIX; si no hay, la próxima del banco local."""
+        pick: Optional[TriviaQuestion] = None
+        if self._anilist_enabled():
+            try:
+                mix = float(os.getenv("TRIVIA_ANILIST_MIX", "0.65") or 0.65)
+            except ValueError:
+                mix = 0.65
+            # Si el buffer está vacío sale una del banco local: la ronda no espera a AniList.
+            if mix >= 1 or random.random() < mix or not len(self._bank):
+                pick = self._anilist.pop()
+            self._anilist.kick()
+        if pick is None:
+            pick = await self.db.aio.run(self._bank.draw, self.db.bot_meta_get, self.db.bot_meta_set)
+        return pick
+
     async def _timeout_after(self, sec: float) -> None:
         try:
             await asyncio.sleep(sec + 0.5)
@@ -466,7 +404,7 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
                     mention_author=False,
                 )
                 return
-            g_norm = _norm_answer(guess_raw)
+            g_norm = norm_answer(guess_raw)
             if not g_norm:
                 await ctx.reply("Escribí una respuesta con letras o números.", mention_author=False)
                 return
@@ -478,9 +416,9 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
             rnd.winner_id = ctx.author.id
             pts = self._win_points()
             if pts > 0:
-                self.db.modify_points(ctx.author.id, pts)
-            self.db.trivia_wins_increment(ctx.author.id)
-            rank, wins = self.db.trivia_stats_rank_user(ctx.author.id)
+                await self.db.aio.modify_points(ctx.author.id, pts)
+            await self.db.aio.trivia_wins_increment(ctx.author.id)
+            rank, wins = await self.db.aio.trivia_stats_rank_user(ctx.author.id)
             if self._timeout_task:
                 self._timeout_task.cancel()
                 self._timeout_task = None
@@ -490,24 +428,20 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
         pts_part = f" Sumás **{pts}** {self._tq_emoji()}." if pts > 0 else ""
         await ctx.send(f"✅ **{ctx.author.mention}** respondió bien primero.{pts_part}{extra}")
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+    def _is_round_guess(self, ctx: MessageContext) -> bool:
+        rnd = self._round
+        return rnd is not None and ctx.channel_id == rnd.channel_id and bool(ctx.text) and ctx.prefix != "?"
+
+    async def _on_round_message(self, ctx: MessageContext):
         """En #general, durante la ronda: mensaje corto o `responder …` sin `?` (si TRIVIA_PLAIN_MESSAGE)."""
-        if message.author.bot or not message.guild:
-            return
         if not self._plain_messages_allowed():
             return
-        rnd = self._round
-        if not rnd or message.channel.id != rnd.channel_id:
-            return
-        raw = (message.content or "").strip()
-        if not raw or raw.lstrip().startswith("?"):
-            return
-        maybe = _plain_line_as_trivia_guess(raw)
+        message = ctx.message
+        maybe = _plain_line_as_trivia_guess(ctx.text)
         if not maybe:
             return
         guess_raw = _strip_trivia_answer_prefixes(maybe.strip())
-        g_norm = _norm_answer(guess_raw)
+        g_norm = norm_answer(guess_raw)
         if not g_norm:
             return
 
@@ -522,9 +456,9 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
             rnd.winner_id = message.author.id
             pts = self._win_points()
             if pts > 0:
-                self.db.modify_points(message.author.id, pts)
-            self.db.trivia_wins_increment(message.author.id)
-            rank, wins = self.db.trivia_stats_rank_user(message.author.id)
+                await self.db.aio.modify_points(message.author.id, pts)
+            await self.db.aio.trivia_wins_increment(message.author.id)
+            rank, wins = await self.db.aio.trivia_stats_rank_user(message.author.id)
             if self._timeout_task:
                 self._timeout_task.cancel()
                 self._timeout_task = None
@@ -551,7 +485,7 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
     async def trivia_top(self, ctx: commands.Context, lim: Optional[int] = None):
         if not ctx.guild:
             return
-        rows = self.db.trivia_stats_top(lim or 10)
+        rows = await self.db.aio.trivia_stats_top(lim or 10)
         if not rows:
             await ctx.reply(
                 "Todavía no hay victorias en trivia anime (hay que ser el **primero** en acertar cuando sale la pregunta).",
@@ -576,7 +510,7 @@ class AnimeTriviaCog(commands.Cog, name="Trivia anime"):
     async def trivia_me(self, ctx: commands.Context):
         if ctx.author.bot or not ctx.guild:
             return
-        rank, wins = self.db.trivia_stats_rank_user(ctx.author.id)
+        rank, wins = await self.db.aio.trivia_stats_rank_user(ctx.author.id)
         if wins <= 0:
             await ctx.reply(
                 "No tenés victorias en trivia todavía: cuando el bot publique la pregunta en **#general**, "
@@ -0,0 +1,112 @@
+# Mapa con vencimiento por clave: dict + min-heap de deadlines (borrado perezoso).
+# Para estado en memoria por usuario/canal (hilos del oráculo, ventanas de cooldown) que antes
+# sólo se limpiaba cuando el mismo usuario volvía. `sweep` cuesta O(k log n) con k = entradas vencidas
+# (más las entradas del heap que quedaron viejas por un `put` posterior sobre la misma clave).
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+log = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class ExpiringMap(Generic[K, V]):
+    """Claves con TTL propio. `get` ignora lo vencido; `sweep` (o el barrido periódico) lo libera."""
+
+    def __init__(self, name: str = "", *, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._clock = clock
+        self._data: Dict[K, Tuple[V, float]] = {}
+        self._heap: List[Tuple[float, int, K]] = []
+        self._seq = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.swept = 0
+        self.sweeps = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        item = self._data.get(key)  # type: ignore[arg-type]
+        return item is not None and item[1] > self._clock()
+
+    def get(self, key: K, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        if item[1] <= self._clock():
+            del self._data[key]
+            return default
+        return item[0]
+
+    def put(self, key: K, value: V, ttl: float) -> None:
+        """Guarda (o reemplaza) con vencimiento en `ttl` segundos desde ahora."""
+        deadline = self._clock() + max(0.0, float(ttl))
+        self._data[key] = (value, deadline)
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+        # Muchos `put` sobre las mismas claves dejan deadlines viejos en el heap: compactar de vez en cuando.
+        if len(self._heap) > 2 * len(self._data) + 64:
+            self._heap = [(d, next(self._seq), k) for k, (_v, d) in self._data.items()]
+            heapq.heapify(self._heap)
+
+    def pop(self, key: K, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        if item is None or item[1] <= self._clock():
+            return default
+        return item[0]
+
+    def items(self) -> List[Tuple[K, V, float]]:
+        """(clave, valor, deadline) de las entradas vigentes."""
+        now = self._clock()
+        return [(k, v, d) for k, (v, d) in self._data.items() if d > now]
+
+    def deadline(self, key: K) -> Optional[float]:
+        item = self._data.get(key)
+        return item[1] if item is not None else None
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Borra las entradas vencidas; devuelve cuántas claves se liberaron."""
+        now = self._clock() if now is None else now
+        heap, data = self._heap, self._data
+        removed = 0
+        while heap and heap[0][0] <= now:
+            deadline, _seq, key = heapq.heappop(heap)
+            item = data.get(key)
+            # Sólo borra si el deadline del heap es el vigente (si no, la clave se renovó después).
+            if item is not None and item[1] == deadline:
+                del data[key]
+                removed += 1
+        self.sweeps += 1
+        self.swept += removed
+        return removed
+
+    def start_sweeper(self, interval: float = 60.0) -> None:
+        """Barrido periódico en el loop actual (idempotente). Cortar con `stop_sweeper`."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._sweep_loop(max(0.01, float(interval))))
+
+    def stop_sweeper(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                n = self.sweep()
+                if n:
+                    log.debug("ExpiringMap %s: %s vencidas, quedan %s", self.name or "?", n, len(self._data))
+            except Exception:
+                log.exception("ExpiringMap %s: barrido falló", self.name or "?")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._data), "heap": len(self._heap), "swept": self.swept, "sweeps": self.sweeps}
@@ -9,13 +9,41 @@ from typing import Optional
 import discord
 from discord.ext import commands
 
+from cogs.scheduler import get_scheduler
+
 from .engine import GameState, PHASE_END, PHASE_IDLE
 
 log = logging.getLogger(__name__)
 
+# Trabajo del scheduler: próximo cierre por inactividad (uno solo para todos los lobbies en espera).
+IDLE_SWEEP_JOB = "impostor.idle_sweep"
+
 
 def touch_lobby_activity(lobby: GameState) -> None:
     lobby.last_activity_ts = time.time()
+    arm_idle_sweep(lobby)
+
+
+def arm_idle_sweep(lobby: GameState) -> None:
+    """Adelanta el barrido si este lobby vence antes que el agendado (si no, no toca nada)."""
+    idle_sec = get_lobby_idle_close_seconds()
+    if idle_sec > 0 and not lobby.in_progress and lobby.phase == PHASE_IDLE:
+        get_scheduler().schedule(IDLE_SWEEP_JOB, "lobbies", lobby.last_activity_ts + idle_sec, earliest=True)
+
+
+def next_idle_deadline() -> Optional[float]:
+    """Vencimiento por inactividad más cercano entre los lobbies en espera (None si no hay)."""
+    from . import core
+
+    idle_sec = get_lobby_idle_close_seconds()
+    if idle_sec <= 0:
+        return None
+    deadlines = [
+        (getattr(lobby, "last_activity_ts", 0) or 0) + idle_sec
+        for lobby in core.get_all_lobbies()
+        if not lobby.in_progress and lobby.phase == PHASE_IDLE
+    ]
+    return min(deadlines) if deadlines else None
 
 
 def get_lobby_idle_close_seconds() -> int:
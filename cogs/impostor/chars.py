@@ -7,8 +7,19 @@ import random
 from typing import List, NotRequired, Optional, TypedDict
 import asyncio  
 
+from cogs.anilist_client import get_client as get_anilist_client
+from cogs.expiring_map import ExpiringMap
+
 log = logging.getLogger(__name__)
 
+# Nombres que AniList no resolvió (sin resultado, error o límite): el cliente no cachea None, así que
+# sin esto cada lobby con ese personaje volvería a pedirlo. TTL corto: un fallo transitorio se reintenta pronto.
+try:
+    _UNRESOLVED_TTL_S = max(0.0, float(os.getenv("IMPOSTOR_ANILIST_MISS_TTL_S", "600") or 600))
+except ValueError:
+    _UNRESOLVED_TTL_S = 600.0
+_unresolved: ExpiringMap[str, bool] = ExpiringMap("impostor_anilist_miss")
+
 # --- Definición de Tipo ---
 
 class Character(TypedDict):
@@ -18,11 +29,6 @@ class Character(TypedDict):
     anime: NotRequired[str]
 
 
-_ANILIST_GQL_URL = "https://graphql.anilist.co"
-_anilist_cache: dict[str, Optional[str]] = {}
-_anilist_lock = asyncio.Lock()
-
-
 def _pick_best_title(title_obj: object) -> Optional[str]:
     if not isinstance(title_obj, dict):
         return None
@@ -36,14 +42,14 @@ def _pick_best_title(title_obj: object) -> Optional[str]:
 async def resolve_anime_for_character(name: str) -> Optional[str]:
     """
     Busca en AniList el anime más probable de un personaje.
-    Cachea por nombre para no spamear requests.
+    El cliente compartido cachea por nombre (24 h) para no spamear requests; los que no resuelven
+    quedan IMPOSTOR_ANILIST_MISS_TTL_S sin volver a consultarse.
     """
     n = (name or "").strip()
     if not n:
         return None
-    async with _anilist_lock:
-        if n in _anilist_cache:
-            return _anilist_cache[n]
+    if n in _unresolved:
+        return None
 
     query = """
     query ($search: String) {
@@ -54,25 +60,20 @@ async def resolve_anime_for_character(name: str) -> Optional[str]:
       }
     }
     """
-    payload = {"query": query, "variables": {"search": n}}
     out: Optional[str] = None
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(_ANILIST_GQL_URL, json=payload, timeout=8) as resp:
-                if resp.status != 200:
-                    out = None
-                else:
-                    data = await resp.json()
-                    char = (data or {}).get("data", {}).get("Character", {})
-                    media = (char or {}).get("media", {})
-                    nodes = (media or {}).get("nodes", []) or []
-                    if nodes and isinstance(nodes, list) and isinstance(nodes[0], dict):
-                        out = _pick_best_title(nodes[0].get("title"))
+        data = await get_anilist_client().query(query, {"search": n}, ttl=24 * 3600, timeout=8)
+        char = (data or {}).get("Character", {})
+        media = (char or {}).get("media", {})
+        nodes = (media or {}).get("nodes", []) or []
+        if nodes and isinstance(nodes, list) and isinstance(nodes[0], dict):
+            out = _pick_best_title(nodes[0].get("title"))
     except Exception:
         out = None
-
-    async with _anilist_lock:
-        _anilist_cache[n] = out
+    if out is None and _UNRESOLVED_TTL_S > 0:
+        if len(_unresolved) > 256:
+            _unresolved.sweep()
+        _unresolved.put(n, True, _UNRESOLVED_TTL_S)
     return out
 
 # --- Configuración y Fallback ---
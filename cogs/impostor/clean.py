@@ -1,6 +1,7 @@
 # cogs/impostor/clean.py
 
 import os
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -10,6 +11,10 @@ from typing import Set, Tuple, cast
 # Importaciones locales
 from . import core
 from . import feed
+from . import persist
+from . import chat_guard
+from .activity import arm_idle_sweep, touch_lobby_activity
+from .engine import GameState, PHASE_IDLE, PHASE_ROLES, PHASE_TURNS, PHASE_VOTE, PHASE_END
 
 log = logging.getLogger(__name__)
 
@@ -38,17 +43,20 @@ def get_startup_cleanup_mode() -> str | None:
 
 # --- Lógica de Limpieza ---
 
-async def _clean_channels_logic(bot: commands.Bot) -> Tuple[int, int]:
+async def _clean_channels_logic(bot: commands.Bot, *, clear_memory: bool = True) -> Tuple[int, int]:
     """
     Lógica centralizada para limpiar canales huérfanos y estado en memoria.
+    Con clear_memory=False (arranque con lobbies restaurados) conserva los lobbies registrados y sus canales.
     Devuelve (canales_borrados, lobbies_en_memoria_limpiados).
     """
     log.info("Iniciando lógica de limpieza de Impostor...")
     
     # 1. Limpiar estado en memoria
-    lobbies_in_memory = len(core.get_all_lobbies())
-    core.clear_all_lobbies()
-    log.info(f"Se limpiaron {lobbies_in_memory} lobbies del estado en memoria.")
+    lobbies_in_memory = 0
+    if clear_memory:
+        lobbies_in_memory = len(core.get_all_lobbies())
+        core.clear_all_lobbies()
+        log.info(f"Se limpiaron {lobbies_in_memory} lobbies del estado en memoria.")
 
     # 2. Limpiar canales huérfanos
     deleted_channels = 0
@@ -82,6 +90,10 @@ async def _clean_channels_logic(bot: commands.Bot) -> Tuple[int, int]:
             log.debug(f"Saltando canal '{channel.name}' (no es texto o no empieza con 'impostor-').")
             continue
 
+        if core.get_lobby_by_channel(channel.id):
+            log.debug(f"Canal '{channel.name}' tiene un lobby registrado, no es huérfano.")
+            continue
+
         log.debug(f"Revisando canal '{channel.name}' ({channel.id})...")
         is_orphaned = True # Asumir huérfano por defecto
         
@@ -155,6 +167,130 @@ async def _clean_channels_logic(bot: commands.Bot) -> Tuple[int, int]:
     return (deleted_channels, lobbies_in_memory)
 
 
+# --- Restauración de lobbies tras reinicio ---
+
+async def _resume_game(bot: commands.Bot, lobby: GameState, channel: discord.TextChannel) -> bool:
+    """Relanza la fase en curso. False si no se puede (el llamador cierra la partida)."""
+    phase = lobby.phase
+    if phase == PHASE_ROLES:
+        if not lobby.impostor_ids:
+            # Se cortó durante la cuenta regresiva: repartir de nuevo.
+            game_cog = bot.get_cog("ImpostorGameCore")
+            if not game_cog:
+                return False
+            asyncio.create_task(game_cog.start_game(lobby))
+            return True
+        if lobby.all_humans_ready_after_roles:
+            # Todos habían marcado "Listo": la cuenta regresiva de la ronda 1 se perdió.
+            game_cog = bot.get_cog("ImpostorGameCore")
+            if not game_cog:
+                return False
+            async with lobby._lock:
+                lobby.phase = PHASE_TURNS
+                lobby.round_num = 1
+            core.persist_lobby(lobby)
+            asyncio.create_task(game_cog.start_round(lobby))
+            return True
+        roles_cog = bot.get_cog("ImpostorRoles")
+        if not roles_cog:
+            return False
+        for p in lobby.human_players:
+            p.ready_after_roles = False
+        core.persist_lobby(lobby)
+        asyncio.create_task(roles_cog.send_role_assignment_ui(lobby))
+        return True
+    if phase == PHASE_TURNS and lobby.round_num >= 1:
+        # La ronda se repite desde el primer turno (las pistas a medias no se conservan).
+        game_cog = bot.get_cog("ImpostorGameCore")
+        if not game_cog:
+            return False
+        asyncio.create_task(game_cog.start_round(lobby))
+        return True
+    if phase == PHASE_VOTE:
+        # Se vuelve a publicar la votación con las mismas pistas; los votos ya emitidos se conservan.
+        votes_cog = bot.get_cog("ImpostorVotes")
+        if not votes_cog:
+            return False
+        asyncio.create_task(votes_cog.start_vote_phase(lobby))
+        return True
+    return False
+
+
+async def _resume_lobby(bot: commands.Bot, lobby: GameState, channel: discord.TextChannel) -> None:
+    from .lobby import queue_hud_update
+
+    cid = lobby.channel_id
+    if lobby.phase == PHASE_IDLE and not lobby.in_progress:
+        touch_lobby_activity(lobby)
+        await queue_hud_update(cid)
+        return
+
+    if lobby.phase == PHASE_END:
+        endgame_cog = bot.get_cog("ImpostorEndgame")
+        if endgame_cog:
+            # EndgameView es persistente: los botones siguen andando; solo falta el auto-cleanup.
+            lobby._endgame_task = asyncio.create_task(endgame_cog._endgame_cleanup_task(cid))
+            return
+    elif persist.resume_games_enabled():
+        if await _resume_game(bot, lobby, channel):
+            log.info(f"Partida C:{cid} reanudada en fase '{lobby.phase}' (ronda {lobby.round_num}).")
+            try:
+                await channel.send(
+                    f"♻️ **El bot se reinició.** Se retoma la partida (ronda **{max(1, lobby.round_num)}**)."
+                )
+            except (discord.Forbidden, discord.HTTPException):
+                pass
+            return
+
+    # Cierre limpio: la partida se cancela y el lobby vuelve a la espera con los mismos jugadores.
+    async with lobby._lock:
+        lobby.reset_for_rematch()
+    arm_idle_sweep(lobby)
+    await chat_guard.restore_channel_chat(bot, lobby)
+    core.persist_lobby(lobby)
+    log.info(f"Partida C:{cid} cancelada tras reinicio; lobby vuelve a espera.")
+    try:
+        await channel.send(
+            "⚠️ **El bot se reinició** y la partida en curso se canceló. "
+            "El lobby sigue abierto: todos en **Ready** → host **Comenzar**."
+        )
+    except (discord.Forbidden, discord.HTTPException):
+        pass
+    await queue_hud_update(cid)
+
+
+async def restore_persisted_lobbies(bot: commands.Bot) -> Tuple[int, int]:
+    """
+    Reconstruye los lobbies del journal (persist.py) y reanuda o cierra sus partidas.
+    Devuelve (restaurados, descartados).
+    """
+    journal = persist.journal()
+    restored = dropped = 0
+    for data in journal.load():
+        try:
+            lobby = persist.restore_lobby(data)
+        except (KeyError, TypeError, ValueError) as e:
+            log.warning(f"Foto de lobby inválida en el journal ({data.get('c')}): {e}")
+            if data.get("c"):
+                journal.forget(int(data["c"]))
+            dropped += 1
+            continue
+
+        channel = bot.get_channel(lobby.channel_id)
+        if not isinstance(channel, discord.TextChannel) or not core.register_restored_lobby(lobby):
+            log.info(f"Lobby C:{lobby.channel_id} ({lobby.lobby_name}) descartado: canal inexistente o jugadores ocupados.")
+            journal.forget(lobby.channel_id)
+            dropped += 1
+            continue
+
+        restored += 1
+        try:
+            await _resume_lobby(bot, lobby, channel)
+        except Exception as e:
+            log.exception(f"Error reanudando lobby C:{lobby.channel_id}: {e}")
+    return restored, dropped
+
+
 # --- Cog: Comandos y Listeners ---
 
 class ImpostorCleanCog(commands.Cog, name="ImpostorClean"):
@@ -165,25 +301,37 @@ class ImpostorCleanCog(commands.Cog, name="ImpostorClean"):
 
     @commands.Cog.listener()
     async def on_ready(self):
-        """Ejecuta la limpieza al arrancar si está configurado."""
+        """Restaura los lobbies persistidos y ejecuta la limpieza al arrancar si está configurado."""
         if self._startup_cleanup_done:
             return
             
         await self.bot.wait_until_ready() # Esperar a que el bot esté listo
-        
+        self._startup_cleanup_done = True
+
+        restore = persist.restore_enabled()
+        if restore:
+            try:
+                restored, dropped = await restore_persisted_lobbies(self.bot)
+                log.info(f"Lobbies restaurados del journal: {restored} (descartados: {dropped}).")
+                if restored:
+                    await feed.update_feed(self.bot)
+            except Exception as e:
+                log.exception(f"Error restaurando lobbies de Impostor: {e}")
+        else:
+            persist.journal().clear()
+
         mode = get_startup_cleanup_mode()
         log.info(f"Modo de limpieza de arranque: {mode}")
         if mode == "all":
             log.info("IMPOSTOR_STARTUP_CLEANUP=all detectado. Ejecutando limpieza...")
             try:
-                 await _clean_channels_logic(self.bot)
+                 await _clean_channels_logic(self.bot, clear_memory=not restore)
                  # Actualizar el feed DESPUÉS de limpiar
                  await feed.update_feed(self.bot)
                  log.info("Limpieza de arranque y actualización de feed completadas.")
             except Exception as e:
                  log.exception(f"Error durante la limpieza de arranque: {e}")
         
-        self._startup_cleanup_done = True
         log.info("Proceso de limpieza de arranque finalizado.")
 
     @app_commands.command(name="cleanimpostor", description="[Admin Server] Limpia lobbies memoria y canales impostor-* huérfanos.")
@@ -4,6 +4,7 @@ import logging
 import time
 from typing import Dict, Optional, List, Set
 from .engine import GameState
+from . import persist
 
 log = logging.getLogger(__name__)
 
@@ -57,6 +58,7 @@ def create_lobby(
     lobby.created_at_ts = now
     lobby.last_activity_ts = now
     log.info(f"Lobby creado: {lobby_name} (Canal: {channel_id}) por Host: {host_id}")
+    persist_lobby(lobby)
     return lobby
 
 
@@ -93,6 +95,7 @@ def add_user_to_lobby(user_id: int, channel_id: int) -> Optional[GameState]:
     lobby.add_player(user_id, is_bot=False)
     _USER_LOBBY_MAP[user_id] = channel_id
     log.debug(f"Usuario {user_id} agregado a lobby C:{channel_id}")
+    persist_lobby(lobby)
     return lobby
 
 
@@ -109,7 +112,7 @@ def remove_user_from_lobby(user_id: int) -> Optional[GameState]:
     # Quitar del GameState
     lobby.remove_player(user_id)
     log.debug(f"Usuario {user_id} quitado del lobby C:{lobby.channel_id}")
-    
+    persist_lobby(lobby)
     return lobby
     
 
@@ -129,7 +132,8 @@ def remove_lobby(channel_id: int) -> Optional[GameState]:
         # Solo lo borramos si el mapa apunta a ESTE lobby
         if _USER_LOBBY_MAP.get(user_id) == channel_id:
             _USER_LOBBY_MAP.pop(user_id, None)
-            
+
+    persist.journal().forget(channel_id)
     log.info(f"Lobby C:{channel_id} (Nombre: {lobby.lobby_name}) eliminado y limpiado.")
     return lobby
 
@@ -143,4 +147,30 @@ def clear_all_lobbies():
     """Limpia todos los lobbies y usuarios. Usado para /cleanimpostor."""
     _LOBBIES.clear()
     _USER_LOBBY_MAP.clear()
-    log.info("Todos los lobbies y mapas de usuarios han sido limpiados.")
\ No newline at end of file
+    persist.journal().clear()
+    log.info("Todos los lobbies y mapas de usuarios han sido limpiados.")
+
+
+# --- Persistencia (journal en disco, ver persist.py) ---
+
+def persist_lobby(lobby: GameState) -> None:
+    """Guarda la foto del lobby si sigue registrado. Llamar tras cada transición de fase / cambio de roster."""
+    if _LOBBIES.get(lobby.channel_id) is not lobby:
+        return
+    try:
+        persist.journal().save(lobby)
+    except Exception as e:
+        log.warning(f"No se pudo persistir el lobby C:{lobby.channel_id}: {e}")
+
+
+def register_restored_lobby(lobby: GameState) -> bool:
+    """Registra un lobby reconstruido del journal. False si el canal o algún jugador ya están ocupados."""
+    if lobby.channel_id in _LOBBIES:
+        return False
+    humans = [uid for uid, p in lobby.players.items() if not p.is_bot]
+    if any(uid in _USER_LOBBY_MAP for uid in humans):
+        return False
+    _LOBBIES[lobby.channel_id] = lobby
+    for uid in humans:
+        _USER_LOBBY_MAP[uid] = lobby.channel_id
+    return True
@@ -248,6 +248,7 @@ class ImpostorEndgameCog(commands.Cog, name="ImpostorEndgame"):
             lobby.phase = PHASE_END
             lobby.in_progress = False
             lobby.rematch_votes = set()
+            core.persist_lobby(lobby)
             log.debug(f"[Endgame C:{lobby.channel_id}] Estado actualizado a PHASE_END. Actualizando feed...")
             try:
                 await feed.update_feed(self.bot) 
@@ -364,9 +365,7 @@ class ImpostorEndgameCog(commands.Cog, name="ImpostorEndgame"):
         eco = getattr(self.bot, "economia_db", None)
         if eco:
             try:
-                eco.record_impostor_game_end(lobby, winner_role)
-                eco.record_impostor_ranked_stats(lobby, winner_role)
-                eco.record_impostor_game_log(lobby, winner_role, reason)
+                await eco.aio.record_impostor_game_result(lobby, winner_role, reason)
             except Exception as e:
                 log.warning(f"[Endgame C:{lobby.channel_id}] No se pudo registrar stats Impostor: {e}")
 
@@ -415,6 +414,7 @@ class ImpostorEndgameCog(commands.Cog, name="ImpostorEndgame"):
         if user_id in lobby.rematch_votes:
             return False, f"✅ Ya votaste revancha. {rematch_vote_status(lobby)}."
         lobby.rematch_votes.add(user_id)
+        core.persist_lobby(lobby)
         needed = rematch_votes_needed(lobby)
         have = len(lobby.rematch_votes)
         return True, f"👍 Voto registrado ({have}/{needed}). Si llegan a **{needed}**, arranca la revancha."
@@ -469,6 +469,7 @@ class ImpostorEndgameCog(commands.Cog, name="ImpostorEndgame"):
             pass
 
         touch_lobby_activity(lobby)
+        core.persist_lobby(lobby)
         await feed.update_feed(self.bot)
         await queue_hud_update(lobby.channel_id)
 
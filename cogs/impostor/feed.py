@@ -12,6 +12,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from cogs.message_router import MessageContext, get_router
+
 from . import core
 from .engine import GameState, PHASE_END
 from .slots import format_slots_label
@@ -287,6 +289,20 @@ class ImpostorFeedCog(commands.Cog, name="ImpostorFeed"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            # También mensajes de otros bots: la cartelera solo admite los nuestros y los de admins.
+            router.register(
+                "impostor.feed", self._on_feed_message, owner=self,
+                channels=(get_feed_channel_id(),), include_bots=True,
+            )
+
+    async def cog_unload(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+
     @commands.Cog.listener()
     async def on_ready(self):
         """Asegura que el feed esté publicado al iniciar el bot."""
@@ -319,18 +335,10 @@ class ImpostorFeedCog(commands.Cog, name="ImpostorFeed"):
                 ephemeral=True
             )
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        feed_channel_id = get_feed_channel_id()
-        
-        # No procesar DMs o mensajes de otros canales
-        if not message.guild or message.channel.id != feed_channel_id:
-            return
-        
-        # No borrar al bot
-        if message.author.id == self.bot.user.id:
-            return
-        
+    async def _on_feed_message(self, ctx: MessageContext):
+        # El router solo entrega mensajes del canal de feed y nunca los del propio bot.
+        message = ctx.message
+
         # No borrar a los admins
         try:
             # Asegurarse de que el autor es un Miembro (para obtener roles)
@@ -83,6 +83,7 @@ class ImpostorGameCore(commands.Cog, name="ImpostorGameCore"):
                 await channel.send("❌ No hay jugadores humanos. No se puede empezar.")
                 lobby.in_progress = False
                 lobby.phase = PHASE_IDLE
+                core.persist_lobby(lobby)
                 await feed.update_feed(self.bot)
                 await lobby_cog.queue_hud_update(lobby.channel_id)
                 return
@@ -105,6 +106,7 @@ class ImpostorGameCore(commands.Cog, name="ImpostorGameCore"):
                 )
                 player.ready_after_roles = player.is_bot
             log.debug(f"[StartGame C:{lobby.channel_id}] Roles asignados.")
+            core.persist_lobby(lobby)
 
         # --- Lock liberado ---
         log.debug(f"[StartGame C:{lobby.channel_id}] Lock liberado.")
@@ -127,6 +129,7 @@ class ImpostorGameCore(commands.Cog, name="ImpostorGameCore"):
             await channel.send("❌ ERROR FATAL: Módulo 'roles' no cargado.")
             # Intentar resetear
             async with lobby._lock: lobby.in_progress = False; lobby.phase = PHASE_IDLE
+            core.persist_lobby(lobby)
             await feed.update_feed(self.bot)
             return
         
@@ -161,6 +164,7 @@ class ImpostorGameCore(commands.Cog, name="ImpostorGameCore"):
             await channel.send("❌ ERROR FATAL: Módulo 'endgame' no cargado.")
             # Intentar resetear
             async with lobby._lock: lobby.in_progress = False; lobby.phase = PHASE_IDLE
+            core.persist_lobby(lobby)
             await feed.update_feed(self.bot)
             return
 
@@ -212,6 +216,7 @@ class ImpostorGameCore(commands.Cog, name="ImpostorGameCore"):
                 lobby.reset_turn_state() # Limpia palabras
                 lobby.reset_vote_state() # Limpia votos
                 should_start_turns = True
+                core.persist_lobby(lobby)
             
         # --- Lock liberado ---
         log.debug(f"[StartRound C:{lobby.channel_id}] Lock liberado.")
@@ -229,6 +234,7 @@ class ImpostorGameCore(commands.Cog, name="ImpostorGameCore"):
                 await channel.send("❌ ERROR FATAL: Módulo 'turns' no cargado.")
                 # Intentar resetear
                 async with lobby._lock: lobby.in_progress = False; lobby.phase = PHASE_IDLE
+                core.persist_lobby(lobby)
                 await feed.update_feed(self.bot)
                 return
             await turns_cog.start_turn_phase(lobby)
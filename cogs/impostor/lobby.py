@@ -9,13 +9,23 @@ import re
 import asyncio
 from typing import Optional, List, Set
 
+from cogs.message_router import MessageContext, get_router
+from cogs.scheduler import get_scheduler
+
 # Importaciones locales (de nuestros otros archivos)
 from . import core
 from . import feed
 from . import notify as impostor_notify
 from .engine import GameState, PHASE_IDLE, PHASE_ROLES, PHASE_END
 from . import rules
-from .activity import touch_lobby_activity, sweep_idle_lobbies, get_lobby_idle_close_seconds
+from .activity import (
+    IDLE_SWEEP_JOB,
+    arm_idle_sweep,
+    get_lobby_idle_close_seconds,
+    next_idle_deadline,
+    sweep_idle_lobbies,
+    touch_lobby_activity,
+)
 from .slots import UNLIMITED_SLOTS, format_slots_label, parse_max_players_env, _env_unlimited
 from .config import get_min_impo_players
 from .leave_guard import leave_block_reason
@@ -73,6 +83,14 @@ def _after_roster_change(lobby: GameState) -> None:
     touch_lobby_activity(lobby)
     if not lobby.in_progress:
         rules.clamp_impostor_count(lobby)
+    core.persist_lobby(lobby)
+
+
+def _is_idle_lobby_chat(ctx: MessageContext) -> bool:
+    """Charla en un lobby que todavía espera jugadores (cuenta como actividad para el idle sweeper)."""
+    lobby = core.get_lobby_by_channel(ctx.channel_id)
+    return lobby is not None and not lobby.in_progress and lobby.phase == PHASE_IDLE
+
 
 def get_admin_role_ids() -> Set[int]:
     ids_str = os.getenv("IMPOSTOR_ADMIN_ROLE_IDS", "")
@@ -354,6 +372,7 @@ async def _process_hud_updates(bot: commands.Bot):
 
                 new_msg = await channel.send(embed=embed, view=view)
                 lobby.hud_message_id = new_msg.id
+                core.persist_lobby(lobby)
         
         except discord.Forbidden:
             log.error(f"No tengo permisos para editar/enviar HUD en C:{channel_id}")
@@ -416,6 +435,7 @@ class LobbyButton(discord.ui.Button):
         # Verificar si el lobby todavía existe después del handler
         if core.get_lobby_by_channel(lobby.channel_id):
             touch_lobby_activity(lobby)
+            core.persist_lobby(lobby)
             if not lobby.in_progress:
                 await queue_hud_update(lobby.channel_id)
 
@@ -526,6 +546,7 @@ async def _begin_match_after_countdown(
         log.error("¡¡FATAL: No se pudo encontrar el Cog 'ImpostorGameCore'!!")
         lobby.in_progress = False
         lobby.phase = PHASE_IDLE
+        core.persist_lobby(lobby)
         await feed.update_feed(bot)
         await channel.send("❌ ERROR FATAL: Módulo 'game_core' no cargado.")
         return
@@ -569,6 +590,7 @@ async def _handle_start(
 
     lobby.in_progress = True
     lobby.phase = PHASE_ROLES
+    core.persist_lobby(lobby)
     await feed.update_feed(bot)
 
     from .roles import get_prestart_seconds
@@ -786,11 +808,24 @@ class ImpostorLobbyCog(commands.Cog, name="ImpostorLobby"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.hud_updater_task.start()
-        self.idle_sweeper_task.start()
+        sch = get_scheduler()
+        sch.register(IDLE_SWEEP_JOB, self._on_idle_sweep_due)
+        nxt = next_idle_deadline()
+        if nxt is not None:
+            sch.schedule(IDLE_SWEEP_JOB, "lobbies", nxt, earliest=True)
+        router = get_router(bot)
+        if router:
+            router.register(
+                "impostor.lobby_activity", self._on_idle_lobby_message, owner=self,
+                predicate=_is_idle_lobby_chat, inline=True,
+            )
 
     def cog_unload(self):
         self.hud_updater_task.cancel()
-        self.idle_sweeper_task.cancel()
+        get_scheduler().unregister(IDLE_SWEEP_JOB)
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
 
     @tasks.loop(seconds=get_hud_update_interval())
     async def hud_updater_task(self):
@@ -805,29 +840,17 @@ class ImpostorLobbyCog(commands.Cog, name="ImpostorLobby"):
         await self.bot.wait_until_ready()
         log.info(f"Iniciando loop de actualización de HUD (Intervalo: {get_hud_update_interval()}s)")
 
-    @tasks.loop(seconds=45)
-    async def idle_sweeper_task(self):
-        try:
-            n = await sweep_idle_lobbies(self.bot)
-            if n:
-                log.info("Idle sweeper: %s lobby(s) cerrados.", n)
-        except Exception:
-            log.exception("idle_sweeper_task")
-
-    @idle_sweeper_task.before_loop
-    async def before_idle_sweeper(self):
-        await self.bot.wait_until_ready()
+    async def _on_idle_sweep_due(self, key: str, payload: dict) -> Optional[float]:
+        n = await sweep_idle_lobbies(self.bot)
+        if n:
+            log.info("Idle sweeper: %s lobby(s) cerrados.", n)
+        # La actividad sólo atrasa los vencimientos: se recalcula el más cercano en vez de agendar en cada mensaje.
+        return next_idle_deadline()
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
-            return
-        lobby = core.get_lobby_by_channel(message.channel.id)
-        if not lobby or lobby.in_progress:
-            return
-        if lobby.phase != PHASE_IDLE:
-            return
-        touch_lobby_activity(lobby)
+    async def _on_idle_lobby_message(self, ctx: MessageContext):
+        lobby = core.get_lobby_by_channel(ctx.channel_id)
+        if lobby is not None:
+            touch_lobby_activity(lobby)
 
     # --- Lógica de Salida ---
     async def handle_leave_logic(
@@ -993,12 +1016,14 @@ class ImpostorLobbyCog(commands.Cog, name="ImpostorLobby"):
             is_open=is_open,
             max_slots=cupo,
         )
+        arm_idle_sweep(lobby)
 
         try:
             embed = _generate_lobby_embed(lobby, self.bot.user)
             view = _generate_lobby_view(lobby)
             msg = await channel.send(embed=embed, view=view)
             lobby.hud_message_id = msg.id
+            core.persist_lobby(lobby)
             await channel.send(_lobby_howto_text())
         except Exception as e:
             log.exception("Error al publicar HUD en C:%s: %s", channel.id, e)
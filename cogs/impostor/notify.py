@@ -6,16 +6,16 @@
 #   publica el @rol ahí (p. ej. #general-impostor). Si no, el mensaje va al canal del lobby.
 
 import os
-import time
 from typing import Optional
 import discord
 from discord.ext import commands
 import logging
 
+from cogs.rate_limit import SlidingWindowLimiter, get_rate_limits
+
 log = logging.getLogger(__name__)
 
 LOBBY_PING_COOLDOWN_SEC = 5.0
-_last_lobby_ping_ts: dict[int, float] = {}
 
 
 def get_notify_role_id() -> int:
@@ -34,16 +34,18 @@ def get_notify_ping_broadcast_channel_id() -> Optional[int]:
         return None
 
 
+def _lobby_ping_limiter() -> SlidingWindowLimiter:
+    # Un ping por canal cada LOBBY_PING_COOLDOWN_SEC.
+    return get_rate_limits().sliding_window("impostor_lobby_ping", limit=1, window=LOBBY_PING_COOLDOWN_SEC)
+
+
 def lobby_ping_cooldown_remaining(channel_id: int) -> float:
     """Segundos restantes de cooldown, o 0 si se puede pinguear."""
-    now = time.monotonic()
-    last = _last_lobby_ping_ts.get(channel_id, 0.0)
-    wait = LOBBY_PING_COOLDOWN_SEC - (now - last)
-    return max(0.0, wait)
+    return _lobby_ping_limiter().retry_after(channel_id)
 
 
 def register_lobby_ping(channel_id: int) -> None:
-    _last_lobby_ping_ts[channel_id] = time.monotonic()
+    _lobby_ping_limiter().hit(channel_id)
 
 
 class NotifyToggleButton(discord.ui.Button):
@@ -0,0 +1,280 @@
+# cogs/impostor/persist.py
+"""
+Journal en disco del estado de los lobbies de Impostor (sobrevive a update.sh / crash).
+
+Cada cambio relevante (fase, roster, HUD, votos) agrega una línea JSON compacta con la foto del lobby
+(`{"c": channel_id, ...}`) o una baja (`{"c": channel_id, "del": 1}`). Al arrancar se reproduce el archivo
+(la última línea de cada canal gana), se descarta una línea final cortada y se compacta.
+No guarda tareas asyncio ni el lock: el arranque decide cómo reanudar cada fase (ver clean.py).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .engine import GameState
+
+log = logging.getLogger(__name__)
+
+# Flags de jugador empaquetados en un int (la foto se escribe en cada transición, conviene que sea chica).
+_F_BOT = 1
+_F_ALIVE = 2
+_F_READY_LOBBY = 4
+_F_READY_ROLES = 8
+
+# Con pocos lobbies vivos no vale reescribir el archivo cada par de líneas: mínimo de líneas muertas para compactar.
+_COMPACT_MIN_DEAD = 32
+
+
+def get_state_path() -> Path:
+    raw = (os.getenv("IMPOSTOR_STATE_PATH") or "").strip()
+    if raw:
+        return Path(raw)
+    return Path(__file__).resolve().parent.parent.parent / ".run" / "impostor_lobbies.jsonl"
+
+
+def restore_enabled() -> bool:
+    return (os.getenv("IMPOSTOR_RESTORE_LOBBIES", "1") or "").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def resume_games_enabled() -> bool:
+    return (os.getenv("IMPOSTOR_RESUME_GAMES", "1") or "").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _fsync_enabled() -> bool:
+    return (os.getenv("IMPOSTOR_STATE_FSYNC", "0") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+# --- Serialización ---
+
+def snapshot_lobby(lobby: GameState) -> Dict[str, Any]:
+    """Foto compacta (solo datos; sin tareas ni lock)."""
+    players = []
+    for p in lobby.players.values():
+        flags = (
+            (_F_BOT if p.is_bot else 0)
+            | (_F_ALIVE if p.alive else 0)
+            | (_F_READY_LOBBY if p.ready_in_lobby else 0)
+            | (_F_READY_ROLES if p.ready_after_roles else 0)
+        )
+        players.append([p.user_id, flags, p.role, p.word, p.voted_for, round(p.joined_at_ts, 1)])
+    return {
+        "c": lobby.channel_id,
+        "g": lobby.guild_id,
+        "n": lobby.lobby_name,
+        "h": lobby.host_id,
+        "o": int(lobby.is_open),
+        "ms": lobby.max_slots,
+        "hud": lobby.hud_message_id,
+        "feed": lobby.feed_message_id,
+        "ct": round(lobby.created_at_ts, 1),
+        "la": round(lobby.last_activity_ts, 1),
+        "ip": int(lobby.in_progress),
+        "ph": lobby.phase,
+        "r": lobby.round_num,
+        "sec": [
+            lobby.character_name,
+            lobby.character_slug,
+            lobby.character_anime,
+            lobby.secret_theme,
+            lobby.secret_detalle,
+        ],
+        "p": players,
+        "ic": lobby.impostor_count,
+        "mt": round(lobby.match_started_at_ts, 1),
+        "imp": sorted(lobby.impostor_ids),
+        "el": sorted(lobby.eliminated_user_ids),
+        "eth": lobby.eliminated_thread_id,
+        "ao": list(lobby.alive_order),
+        "ti": lobby.current_turn_idx,
+        "vo": int(lobby.votes_open),
+        "rv": sorted(lobby.rematch_votes),
+    }
+
+
+def restore_lobby(data: Dict[str, Any]) -> GameState:
+    """Inversa de `snapshot_lobby` (las tareas quedan en None)."""
+    lobby = GameState(
+        lobby_name=str(data["n"]),
+        guild_id=int(data["g"]),
+        channel_id=int(data["c"]),
+        host_id=int(data["h"]),
+        is_open=bool(data.get("o", 1)),
+        max_slots=int(data.get("ms", 5)),
+    )
+    lobby.hud_message_id = data.get("hud")
+    lobby.feed_message_id = data.get("feed")
+    lobby.created_at_ts = float(data.get("ct") or time.time())
+    lobby.last_activity_ts = float(data.get("la") or time.time())
+    lobby.in_progress = bool(data.get("ip", 0))
+    lobby.phase = str(data.get("ph") or lobby.phase)
+    lobby.round_num = int(data.get("r", 0))
+    (
+        lobby.character_name,
+        lobby.character_slug,
+        lobby.character_anime,
+        lobby.secret_theme,
+        lobby.secret_detalle,
+    ) = (list(data.get("sec") or []) + [None] * 5)[:5]
+    for uid, flags, role, word, voted_for, joined in data.get("p") or []:
+        lobby.players[int(uid)] = GameState.Player(
+            user_id=int(uid),
+            is_bot=bool(flags & _F_BOT),
+            joined_at_ts=float(joined or 0.0),
+            ready_in_lobby=bool(flags & _F_READY_LOBBY),
+            role=role,
+            alive=bool(flags & _F_ALIVE),
+            word=word,
+            voted_for=voted_for,
+            ready_after_roles=bool(flags & _F_READY_ROLES),
+        )
+    lobby.impostor_count = int(data.get("ic", 1))
+    lobby.match_started_at_ts = float(data.get("mt") or 0.0)
+    lobby.impostor_ids = {int(u) for u in data.get("imp") or []}
+    lobby.eliminated_user_ids = {int(u) for u in data.get("el") or []}
+    lobby.eliminated_thread_id = data.get("eth")
+    lobby.alive_order = [int(u) for u in data.get("ao") or []]
+    lobby.current_turn_idx = int(data.get("ti", -1))
+    lobby.votes_open = bool(data.get("vo", 0))
+    lobby.rematch_votes = {int(u) for u in data.get("rv") or []}
+    return lobby
+
+
+# --- Journal ---
+
+class LobbyJournal:
+    """
+    Archivo append-only de fotos de lobbies. `save` es una línea + flush (fsync opcional con
+    IMPOSTOR_STATE_FSYNC=1); cuando las líneas muertas superan a las vivas se reescribe con os.replace.
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, fsync: Optional[bool] = None):
+        self.path = Path(path) if path is not None else get_state_path()
+        self.fsync = _fsync_enabled() if fsync is None else bool(fsync)
+        self._lock = threading.Lock()
+        self._fh = None
+        self._live: Dict[int, str] = {}
+        self._records = 0
+        self.writes = 0
+        self.write_s = 0.0
+        self.compactions = 0
+
+    def _open(self):
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        return self._fh
+
+    def _append(self, channel_id: int, line: Optional[str]) -> None:
+        t0 = time.perf_counter()
+        with self._lock:
+            if line is None:
+                if self._live.pop(channel_id, None) is None:
+                    return
+                line = json.dumps({"c": channel_id, "del": 1}, separators=(",", ":"))
+            else:
+                if self._live.get(channel_id) == line:
+                    return
+                self._live[channel_id] = line
+            try:
+                fh = self._open()
+                fh.write(line + "\n")
+                fh.flush()
+                if self.fsync:
+                    os.fsync(fh.fileno())
+                self._records += 1
+                dead = self._records - len(self._live)
+                if dead > max(_COMPACT_MIN_DEAD, len(self._live)):
+                    self._compact_locked()
+            except OSError as e:
+                log.warning("No se pudo escribir el estado de Impostor en %s: %s", self.path, e)
+            self.writes += 1
+            self.write_s += time.perf_counter() - t0
+
+    def save(self, lobby: GameState) -> None:
+        line = json.dumps(snapshot_lobby(lobby), separators=(",", ":"), ensure_ascii=False)
+        self._append(lobby.channel_id, line)
+
+    def forget(self, channel_id: int) -> None:
+        self._append(int(channel_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._live.clear()
+            self._compact_locked()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Reproduce el journal y lo compacta. Devuelve las fotos vivas."""
+        live: Dict[int, str] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for raw in fh:
+                    raw = raw.strip()
+                    if not raw:
+                        continue
+                    try:
+                        rec = json.loads(raw)
+                        cid = int(rec["c"])
+                    except (ValueError, KeyError, TypeError):
+                        # Línea cortada por un corte a mitad de escritura: se ignora.
+                        continue
+                    if rec.get("del"):
+                        live.pop(cid, None)
+                    else:
+                        live[cid] = raw
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.warning("No se pudo leer el estado de Impostor en %s: %s", self.path, e)
+        with self._lock:
+            self._live = live
+            self._compact_locked()
+        return [json.loads(line) for line in live.values()]
+
+    def _compact_locked(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                for line in self._live.values():
+                    fh.write(line + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.path)
+            self._records = len(self._live)
+            self.compactions += 1
+        except OSError as e:
+            log.warning("No se pudo compactar el estado de Impostor en %s: %s", self.path, e)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "lobbies": len(self._live),
+            "records": self._records,
+            "writes": self.writes,
+            "compactions": self.compactions,
+            "avg_write_us": (self.write_s / self.writes * 1e6) if self.writes else 0.0,
+        }
+
+
+_JOURNAL: Optional[LobbyJournal] = None
+
+
+def journal() -> LobbyJournal:
+    global _JOURNAL
+    if _JOURNAL is None:
+        _JOURNAL = LobbyJournal()
+    return _JOURNAL
@@ -204,6 +204,7 @@ class RoleAssignmentView(discord.ui.View):
         async with lobby._lock:
             lobby.phase = PHASE_TURNS
             lobby.round_num = 1
+            core.persist_lobby(lobby)
         
         # Llamar al Cog 'game_core' para que maneje la primera ronda
         game_cog = self.bot.get_cog("ImpostorGameCore")
@@ -78,7 +78,7 @@ class ImpostorStatsCog(commands.Cog, name="ImpostorStats"):
         if not db:
             return await ctx.send("❌ Base de datos no disponible.")
         target = miembro or ctx.author
-        s = db.get_impostor_stats(target.id)
+        s = await db.aio.get_impostor_stats(target.id)
         await ctx.send(embed=self._embed_stats(target, s))
 
     @app_commands.command(name="impostor-stats", description="Tus estadísticas en Impostor.")
@@ -94,7 +94,7 @@ class ImpostorStatsCog(commands.Cog, name="ImpostorStats"):
                 "❌ Base de datos no disponible.", ephemeral=True
             )
         target = usuario or interaction.user
-        s = db.get_impostor_stats(target.id)
+        s = await db.aio.get_impostor_stats(target.id)
         await interaction.response.send_message(
             embed=self._embed_stats(target, s), ephemeral=True
         )
@@ -123,7 +123,7 @@ class ImpostorStatsCog(commands.Cog, name="ImpostorStats"):
                 "❌ Base de datos no disponible.", ephemeral=True
             )
         col = tipo.value
-        rows = db.get_impostor_leaderboard(col, limit=15)
+        rows = await db.aio.get_impostor_leaderboard(col, limit=15)
         labels = {
             "wins_impostor": "Victorias como impostor",
             "wins_social": "Victorias como social",
@@ -176,7 +176,7 @@ class ImpostorStatsCog(commands.Cog, name="ImpostorStats"):
             return await ctx.send(
                 "Uso: `?impostorrang` [wins_impostor|wins_social|games_played|games_impostor|games_social]"
             )
-        rows = db.get_impostor_leaderboard(col, limit=15)
+        rows = await db.aio.get_impostor_leaderboard(col, limit=15)
         if not rows:
             return await ctx.send("Aún no hay datos para ese ranking.")
         await ctx.send(embed=self._embed_ranking(col, rows))
@@ -231,7 +231,7 @@ class ImpostorStatsCog(commands.Cog, name="ImpostorStats"):
             return await interaction.response.send_message(
                 "❌ Base de datos no disponible.", ephemeral=True
             )
-        rows = db.get_impostor_game_log_recent(limite or 10)
+        rows = await db.aio.get_impostor_game_log_recent(limite or 10)
         await interaction.response.send_message(
             embed=self._embed_historial(rows), ephemeral=True
         )
@@ -241,7 +241,7 @@ class ImpostorStatsCog(commands.Cog, name="ImpostorStats"):
         db = self._db()
         if not db:
             return await ctx.send("❌ Base de datos no disponible.")
-        rows = db.get_impostor_game_log_recent(limite)
+        rows = await db.aio.get_impostor_game_log_recent(limite)
         await ctx.send(embed=self._embed_historial(rows))
 
 
@@ -10,6 +10,8 @@ import random
 import re
 from typing import Dict, Optional
 
+from cogs.message_router import MessageContext, get_router
+
 # Importaciones locales
 from . import core
 from . import chat_guard
@@ -30,6 +32,15 @@ WORD_REGEX = re.compile(
 )
 
 
+
+def _is_game_chat(ctx: MessageContext) -> bool:
+    """Mensaje de texto (no `/…`) en el canal de un lobby que no terminó."""
+    if not ctx.text or ctx.prefix == "/":
+        return False
+    lobby = core.get_lobby_by_channel(ctx.channel_id)
+    return lobby is not None and lobby.phase != PHASE_END
+
+
 # --- Cog: Fase de Turnos ---
 
 class ImpostorTurnsCog(commands.Cog, name="ImpostorTurns"):
@@ -41,6 +52,16 @@ class ImpostorTurnsCog(commands.Cog, name="ImpostorTurns"):
         # Diccionario para sincronizar el /palabra con el _turn_loop
         self._turn_events: Dict[int, asyncio.Event] = {} # {channel_id: Event}
 
+    async def cog_load(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.register("impostor.turns", self._on_lobby_message, owner=self, predicate=_is_game_chat)
+
+    async def cog_unload(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+
     async def start_turn_phase(self, lobby: GameState):
         """Inicia el bucle de turnos como una tarea de fondo."""
         
@@ -69,6 +90,7 @@ class ImpostorTurnsCog(commands.Cog, name="ImpostorTurns"):
                 random.shuffle(alive_ids)
                 lobby.alive_order = alive_ids
                 lobby.current_turn_idx = -1
+                core.persist_lobby(lobby)
             
             turn_seconds = get_turn_seconds()
             
@@ -149,6 +171,7 @@ class ImpostorTurnsCog(commands.Cog, name="ImpostorTurns"):
                 lobby.phase = PHASE_VOTE
                 lobby.current_turn_idx = -1
                 lobby.alive_order.clear()
+                core.persist_lobby(lobby)
             
             # 5. Llamar al Cog de Votaciones
             votes_cog = self.bot.get_cog("ImpostorVotes")
@@ -236,16 +259,12 @@ class ImpostorTurnsCog(commands.Cog, name="ImpostorTurns"):
             event.set()
         return True
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        if message.author.bot or not message.guild:
-            return
-        lobby = core.get_lobby_by_channel(message.channel.id)
+    async def _on_lobby_message(self, ctx: MessageContext) -> None:
+        message = ctx.message
+        lobby = core.get_lobby_by_channel(ctx.channel_id)
         if not lobby or lobby.phase == PHASE_END:
             return
-        content = (message.content or "").strip()
-        if not content or content.startswith("/"):
-            return
+        content = ctx.text
 
         author_id = message.author.id
         if author_id in lobby.eliminated_user_ids:
@@ -198,6 +198,7 @@ class ImpostorVotesCog(commands.Cog, name="ImpostorVotes"):
                 return
             
             lobby.round_num += 1
+            core.persist_lobby(lobby)
             log.info(f"Transición a Ronda {lobby.round_num} en C:{lobby.channel_id}")
         
         # Llamar a GameCore para chequear condiciones de victoria y empezar ronda
@@ -295,6 +296,8 @@ class ImpostorVotesCog(commands.Cog, name="ImpostorVotes"):
             player.voted_for = target_id
             await interaction.response.send_message(f"✅ Has votado por <@{target_id}>.", ephemeral=True)
 
+        core.persist_lobby(lobby)
+
         # --- Chequear si todos votaron ---
         if self._all_humans_voted(lobby):
             event = self._vote_events.get(lobby.channel_id)
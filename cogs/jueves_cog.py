@@ -4,16 +4,22 @@ from __future__ import annotations
 import logging
 import os
 import random
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from typing import List, Optional
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+
+from cogs.message_router import MessageContext, get_router
+from cogs.scheduler import get_scheduler
 
 log = logging.getLogger(__name__)
 
 _JUEVES_URL = "https://www.youtube.com/shorts/QfGJSCMWMzU"
 
+# Trabajo del scheduler: post del jueves 08:00 (hora de Montevideo).
+JUEVES_JOB = "jueves.post"
+
 try:
     from zoneinfo import ZoneInfo
 
@@ -82,6 +88,14 @@ def _uy_now() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
+def _next_post_dt(now: datetime) -> datetime:
+    """Jueves 08:00 de esta semana (si todavía no pasó la hora del post) o el de la que viene."""
+    target = datetime.combine(now.date(), time(8, 0), tzinfo=now.tzinfo) + timedelta(days=(3 - now.weekday()) % 7)
+    if target + timedelta(hours=1) <= now:
+        target += timedelta(days=7)
+    return target
+
+
 def _general_channel_id() -> int:
     try:
         return int(os.getenv("GENERAL_CHANNEL_ID", "0") or 0)
@@ -95,11 +109,23 @@ class JuevesCog(commands.Cog, name="Jueves"):
         self._db = getattr(bot, "economia_db", None)
 
     async def cog_load(self) -> None:
-        if UY and not self._jueves_loop.is_running():
-            self._jueves_loop.start()
+        if UY:
+            sch = get_scheduler()
+            sch.register(JUEVES_JOB, self._on_jueves_due)
+            sch.schedule(JUEVES_JOB, "weekly", _next_post_dt(_uy_now()).timestamp(), earliest=True)
+        router = get_router(self.bot)
+        if router and self._db:
+            # El "Feliz jueves" se publica en #general: solo ahí miramos replies.
+            router.register(
+                "jueves.reply", self._on_reply, owner=self,
+                channels=(_general_channel_id(),), predicate=lambda ctx: ctx.reply_to is not None,
+            )
 
     async def cog_unload(self) -> None:
-        self._jueves_loop.cancel()
+        get_scheduler().unregister(JUEVES_JOB)
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
 
     def _meta_key_post(self, week: str) -> str:
         return f"jueves_post_{week}"
@@ -120,51 +146,39 @@ class JuevesCog(commands.Cog, name="Jueves"):
             return
         now = _uy_now()
         week = self._week_id(now.date())
-        if self._db and self._db.bot_meta_get(self._meta_key_post(week)):
+        if self._db and await self._db.aio.bot_meta_get(self._meta_key_post(week)):
             return
         text = f"**FELIZ JUEVES!** 🎉\n{_JUEVES_URL}"
         try:
             msg = await ch.send(text)
             if self._db:
-                self._db.bot_meta_set(self._meta_key_post(week), "1")
-                self._db.bot_meta_set(self._meta_key_msg(week), str(msg.id))
+                await self._db.aio.bot_meta_set(self._meta_key_post(week), "1")
+                await self._db.aio.bot_meta_set(self._meta_key_msg(week), str(msg.id))
         except discord.HTTPException as e:
             log.warning("No se pudo publicar Feliz Jueves: %s", e)
 
-    @tasks.loop(minutes=1)
-    async def _jueves_loop(self) -> None:
-        if not UY:
-            return
+    async def _on_jueves_due(self, key: str, payload: dict) -> Optional[float]:
         now = _uy_now()
-        if now.weekday() != 3:  # jueves
-            return
-        if now.hour != 8 or now.minute != 0:
-            return
-        for guild in self.bot.guilds:
-            try:
-                await self._post_feliz_jueves(guild)
-            except Exception:
-                log.exception("jueves post guild %s", guild.id)
-
-    @_jueves_loop.before_loop
-    async def _before_jueves(self) -> None:
-        await self.bot.wait_until_ready()
-
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        if message.author.bot or not message.guild or not message.reference:
-            return
-        if not self._db:
-            return
-        ref = message.reference
-        if not ref or not ref.message_id:
-            return
+        # El post sale en la hora de las 08 (si el bot arrancó tarde también); bot_meta evita duplicarlo.
+        if now.weekday() == 3 and now.hour == 8:
+            for guild in self.bot.guilds:
+                try:
+                    await self._post_feliz_jueves(guild)
+                except Exception:
+                    log.exception("jueves post guild %s", guild.id)
+        nxt = _next_post_dt(now)
+        if nxt <= now:
+            nxt += timedelta(days=7)
+        return nxt.timestamp()
+
+    async def _on_reply(self, ctx: MessageContext) -> None:
+        message = ctx.message
         now = _uy_now()
         if now.weekday() != 3:
             return
         week = self._week_id(now.date())
-        stored = self._db.bot_meta_get(self._meta_key_msg(week))
-        if not stored or str(ref.message_id) != stored:
+        stored = await self._db.aio.bot_meta_get(self._meta_key_msg(week))
+        if not stored or str(ctx.reply_to) != stored:
             return
         try:
             await message.reply(random.choice(_FELIZ_JUEVES_REPLIES), mention_author=True)
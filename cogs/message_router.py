@@ -0,0 +1,257 @@
+# Router único de `on_message`: `MiBot.on_message` clasifica cada mensaje una sola vez (canal, hilo,
+# prefijo, mención al bot, reply) y despacha solo a los handlers registrados para ese canal o cuyo
+# predicado acepta el contexto. Reemplaza a los `@commands.Cog.listener() on_message` de cada cog
+# (antes discord.py creaba una tarea por listener y por mensaje, aunque casi todos salían en el guard).
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# Teclados que mandan el signo de pregunta de ancho completo o un BOM delante del prefijo.
+_PREFIX_ALIASES = {"\uff1f": "?"}
+
+
+@dataclass(frozen=True, slots=True)
+class MessageContext:
+    """Datos de un mensaje que varios handlers miraban por su cuenta."""
+
+    message: discord.Message
+    channel_id: int
+    # Canal padre si es un hilo (None en canales normales).
+    parent_id: Optional[int]
+    guild_id: Optional[int]
+    author_id: int
+    author_is_bot: bool
+    from_self: bool
+    # Texto sin espacios ni BOM alrededor; `？` de ancho completo normalizado a `?` al inicio.
+    text: str
+    # "?" (comando de prefijo), "/" (texto tipo slash) o "" si el mensaje no arranca con ninguno.
+    prefix: str
+    mentions_bot: bool
+    # Id del mensaje al que responde (None si no es reply).
+    reply_to: Optional[int]
+    is_text_channel: bool
+
+    @property
+    def is_command_like(self) -> bool:
+        return bool(self.prefix)
+
+    @classmethod
+    def from_message(cls, message: discord.Message, me: Optional[discord.abc.User]) -> "MessageContext":
+        raw = message.content or ""
+        text = raw.strip()
+        if text.startswith("\ufeff"):
+            text = text.lstrip("\ufeff").strip()
+        if text[:1] in _PREFIX_ALIASES:
+            text = _PREFIX_ALIASES[text[0]] + text[1:]
+        first = text[:1]
+        prefix = first if first in ("?", "/") else ""
+
+        channel = message.channel
+        is_thread = isinstance(channel, discord.Thread)
+        author = message.author
+        me_id = me.id if me is not None else None
+        mentions_bot = False
+        if me_id is not None:
+            # Algunos clientes no rellenan `mentions` igual; `raw_mentions` y el texto `<@…>` son respaldo.
+            mentions_bot = (
+                any(u.id == me_id for u in message.mentions)
+                or me_id in (message.raw_mentions or ())
+                or f"<@{me_id}>" in raw
+                or f"<@!{me_id}>" in raw
+            )
+        ref = message.reference
+        return cls(
+            message=message,
+            channel_id=channel.id,
+            parent_id=getattr(channel, "parent_id", None) if is_thread else None,
+            guild_id=message.guild.id if message.guild else None,
+            author_id=author.id,
+            author_is_bot=bool(author.bot),
+            from_self=me_id is not None and author.id == me_id,
+            text=text,
+            prefix=prefix,
+            mentions_bot=mentions_bot,
+            reply_to=ref.message_id if ref is not None else None,
+            is_text_channel=is_thread or isinstance(channel, discord.TextChannel),
+        )
+
+
+Handler = Callable[[MessageContext], Awaitable[Any]]
+Predicate = Callable[[MessageContext], bool]
+
+
+@dataclass(slots=True)
+class _Route:
+    name: str
+    handler: Handler
+    owner: Any
+    seq: int
+    channels: Optional[frozenset]
+    predicate: Optional[Predicate]
+    include_bots: bool
+    inline: bool
+    calls: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+
+class MessageRouter:
+    """Registro de handlers de mensajes con índice por canal y métricas de latencia por handler."""
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, _Route] = {}
+        self._by_channel: Dict[int, List[_Route]] = {}
+        self._anywhere: List[_Route] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self._seq = 0
+        self.messages = 0
+        self.dispatched = 0
+        self.classify_s = 0.0
+
+    def register(
+        self,
+        name: str,
+        handler: Handler,
+        *,
+        owner: Any = None,
+        channels: Optional[Iterable[int]] = None,
+        predicate: Optional[Predicate] = None,
+        include_bots: bool = False,
+        inline: bool = False,
+    ) -> None:
+        """
+        `channels`: ids de canal donde corre; None = todos los canales del servidor.
+        `predicate`: filtro barato sobre el contexto (sin I/O). `include_bots`: también mensajes de otros bots.
+        `inline`: el handler no espera I/O y corre dentro del despacho, sin crear tarea.
+        """
+        if name in self._routes:
+            self.unregister(name)
+        chans = None
+        if channels is not None:
+            chans = frozenset(int(c) for c in channels if c)
+        self._seq += 1
+        route = _Route(
+            name=name,
+            handler=handler,
+            owner=owner,
+            seq=self._seq,
+            channels=chans,
+            predicate=predicate,
+            include_bots=include_bots,
+            inline=inline,
+        )
+        self._routes[name] = route
+        self._reindex()
+
+    def unregister(self, name: str) -> None:
+        if self._routes.pop(name, None) is not None:
+            self._reindex()
+
+    def unregister_owner(self, owner: Any) -> None:
+        names = [n for n, r in self._routes.items() if r.owner is owner]
+        for n in names:
+            del self._routes[n]
+        if names:
+            self._reindex()
+
+    def _reindex(self) -> None:
+        by_channel: Dict[int, List[_Route]] = {}
+        anywhere: List[_Route] = []
+        for route in sorted(self._routes.values(), key=lambda r: r.seq):
+            if route.channels is None:
+                anywhere.append(route)
+            else:
+                for cid in route.channels:
+                    by_channel.setdefault(cid, []).append(route)
+        self._by_channel = by_channel
+        self._anywhere = anywhere
+
+    def _candidates(self, ctx: MessageContext) -> List[_Route]:
+        # Igual que los listeners originales: el canal exacto (un hilo no hereda los handlers del padre).
+        scoped = self._by_channel.get(ctx.channel_id)
+        if not scoped:
+            return self._anywhere
+        if not self._anywhere:
+            return scoped
+        return sorted(self._anywhere + scoped, key=lambda r: r.seq)
+
+    async def dispatch(self, message: discord.Message, me: Optional[discord.abc.User]) -> int:
+        """Clasifica y despacha; devuelve cuántos handlers aceptaron el mensaje."""
+        # Todos los handlers del bot son de servidor: los DM no pasan por el router.
+        if not self._routes or message.guild is None:
+            return 0
+        t0 = time.perf_counter()
+        ctx = MessageContext.from_message(message, me)
+        self.messages += 1
+        self.classify_s += time.perf_counter() - t0
+        if ctx.from_self:
+            return 0
+
+        matched = 0
+        for route in self._candidates(ctx):
+            if ctx.author_is_bot and not route.include_bots:
+                continue
+            if route.predicate is not None:
+                try:
+                    if not route.predicate(ctx):
+                        continue
+                except Exception:
+                    log.exception("router: falló el predicado de %s", route.name)
+                    continue
+            matched += 1
+            if route.inline:
+                await self._run(route, ctx)
+            else:
+                task = asyncio.create_task(self._run(route, ctx), name=f"on_message:{route.name}")
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        self.dispatched += matched
+        return matched
+
+    @staticmethod
+    async def _run(route: _Route, ctx: MessageContext) -> None:
+        t0 = time.perf_counter()
+        try:
+            await route.handler(ctx)
+        except Exception:
+            route.errors += 1
+            log.exception("router: el handler %s falló (canal=%s msg=%s)", route.name, ctx.channel_id, ctx.message.id)
+        finally:
+            dt = time.perf_counter() - t0
+            route.calls += 1
+            route.total_s += dt
+            if dt > route.max_s:
+                route.max_s = dt
+
+    def stats(self) -> Dict[str, Any]:
+        handlers = {
+            r.name: {
+                "calls": r.calls,
+                "errors": r.errors,
+                "avg_ms": round(r.total_s / r.calls * 1000, 3) if r.calls else 0.0,
+                "max_ms": round(r.max_s * 1000, 3),
+            }
+            for r in sorted(self._routes.values(), key=lambda r: r.seq)
+        }
+        return {
+            "messages": self.messages,
+            "dispatched": self.dispatched,
+            "classify_avg_us": round(self.classify_s / self.messages * 1e6, 2) if self.messages else 0.0,
+            "in_flight": len(self._tasks),
+            "handlers": handlers,
+        }
+
+
+def get_router(bot: Any) -> Optional[MessageRouter]:
+    """Router del bot (None en bots de prueba sin `message_router`)."""
+    router = getattr(bot, "message_router", None)
+    return router if isinstance(router, MessageRouter) else None
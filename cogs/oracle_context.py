@@ -0,0 +1,148 @@
+# Caché en disco (SQLite) del contexto que el oráculo trae de afuera: búsquedas y resúmenes de
+# Wikipedia (oracle_wiki) y snippets de DuckDuckGo (oracle_llm). Clave = (tipo, consulta normalizada);
+# los resultados vacíos también se guardan (caché negativa, TTL más corto). Los errores de red no.
+# Desde código async usar `aget` / `aput`: el SQLite corre en un hilo y no frena el loop de discord.
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Valor centinela: "consultado y vacío" (distinto de "no está en caché" = None).
+NEGATIVE: Any = object()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+def get_cache_path() -> Path:
+    raw = (os.getenv("ORACLE_CONTEXT_CACHE_PATH") or "").strip()
+    if raw:
+        return Path(raw)
+    return Path(__file__).resolve().parent.parent / ".run" / "oracle_context_cache.db"
+
+
+def normalize_query(text: str) -> str:
+    """Minúsculas y espacios colapsados: 'Naruto  Shippuden' y 'naruto shippuden' comparten entrada."""
+    return " ".join((text or "").lower().split())
+
+
+class ContextCache:
+    """Tabla clave/valor JSON con vencimiento; lecturas y escrituras cortas en el hilo que llama."""
+
+    def __init__(self, path: Optional[Path] = None, *, negative_ttl: Optional[float] = None):
+        self.path = Path(path) if path is not None else get_cache_path()
+        self.negative_ttl = _env_float("ORACLE_CONTEXT_NEG_TTL_S", 1800.0) if negative_ttl is None else float(negative_ttl)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._puts = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Es una caché: perder la última escritura ante un corte no importa, el fsync por put sí.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS context_cache ("
+                " kind TEXT NOT NULL, qkey TEXT NOT NULL, value TEXT, expires REAL NOT NULL,"
+                " PRIMARY KEY (kind, qkey))"
+            )
+            conn.execute("DELETE FROM context_cache WHERE expires < ?", (time.time(),))
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _key(kind: str, query: str) -> Tuple[str, str]:
+        return kind, normalize_query(query)
+
+    def get(self, kind: str, query: str) -> Any:
+        """Valor guardado, `NEGATIVE` si se guardó vacío, o None si no hay entrada vigente."""
+        k, q = self._key(kind, query)
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value, expires FROM context_cache WHERE kind = ? AND qkey = ?", (k, q)
+                ).fetchone()
+        except sqlite3.Error:
+            log.debug("oracle_context: lectura falló", exc_info=True)
+            return None
+        if row is None or row[1] < time.time():
+            self.misses += 1
+            return None
+        if row[0] is None:
+            self.negative_hits += 1
+            return NEGATIVE
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, kind: str, query: str, value: Any, ttl: float) -> None:
+        """Guarda `value` (JSON); None / vacío se guarda como negativo con el TTL negativo."""
+        k, q = self._key(kind, query)
+        empty = value is None or value == [] or value == ""
+        ttl = self.negative_ttl if empty else float(ttl)
+        if ttl <= 0:
+            return
+        payload = None if empty else json.dumps(value, ensure_ascii=False)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO context_cache (kind, qkey, value, expires) VALUES (?, ?, ?, ?)",
+                    (k, q, payload, time.time() + ttl),
+                )
+                self._puts += 1
+                if self._puts % 200 == 0:
+                    conn.execute("DELETE FROM context_cache WHERE expires < ?", (time.time(),))
+            self.stores += 1
+        except sqlite3.Error:
+            log.debug("oracle_context: escritura falló", exc_info=True)
+
+    async def aget(self, kind: str, query: str) -> Any:
+        """`get` en un hilo (para llamar desde el loop)."""
+        return await asyncio.to_thread(self.get, kind, query)
+
+    async def aput(self, kind: str, query: str, value: Any, ttl: float) -> None:
+        """`put` en un hilo (para llamar desde el loop)."""
+        await asyncio.to_thread(self.put, kind, query, value, ttl)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+        }
+
+
+_CACHE: Optional[ContextCache] = None
+
+
+def context_cache() -> ContextCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ContextCache()
+    return _CACHE
@@ -0,0 +1,224 @@
+# Preproceso de imágenes para el oráculo con visión (adjuntos, stickers, emotes custom).
+# Antes cada sticker/emote abría su propia ClientSession y la imagen llegaba a Ollama tal cual
+# (hasta ORACLE_MEDIA_MAX_BYTES): prefill lento y memoria del modelo atada a lo que suba cada uno.
+# Acá: una sesión HTTP compartida, reducción a ORACLE_MEDIA_MAX_EDGE px de lado mayor + re-encode JPEG
+# (decode/resize en un pool de hilos, fuera del loop) y una LRU por hash del contenido (y por URL
+# para el CDN de Discord, que sirve siempre lo mismo en la misma URL).
+# Pillow es opcional: sin él las imágenes pasan sin tocar (igual se aprovechan la sesión y la caché).
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - depende del entorno
+    Image = None  # type: ignore[assignment]
+    ImageOps = None  # type: ignore[assignment]
+
+log = logging.getLogger(__name__)
+
+_UA = "AnimeAlToque-Oracle/1.0"
+
+
+def _env_int(name: str, default: int, lo: int, hi: int) -> int:
+    try:
+        return max(lo, min(hi, int((os.getenv(name) or "").strip() or default)))
+    except ValueError:
+        return default
+
+
+def pillow_available() -> bool:
+    return Image is not None
+
+
+def downscale_image(data: bytes, *, max_edge: int, quality: int) -> Optional[bytes]:
+    """
+    Reduce la imagen a `max_edge` px de lado mayor y la re-codifica como JPEG (primer frame si es animada;
+    la transparencia se aplana sobre blanco). None si no hace falta tocarla o no se pudo decodificar:
+    el que llama se queda con los bytes originales. Corre en un hilo (CPU).
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as im:
+            small = max(im.size) <= max_edge
+            if small and im.format == "JPEG":
+                return None
+            # JPEG: el decoder puede escalar por 1/2, 1/4, 1/8 directamente (mucho más barato que decodificar todo).
+            im.draft("RGB", (max_edge, max_edge))
+            im.seek(0)
+            frame = ImageOps.exif_transpose(im)
+            if frame.mode in ("RGBA", "LA", "P"):
+                rgba = frame.convert("RGBA")
+                frame = Image.new("RGB", rgba.size, (255, 255, 255))
+                frame.paste(rgba, mask=rgba.getchannel("A"))
+            elif frame.mode != "RGB":
+                frame = frame.convert("RGB")
+            if not small:
+                frame.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            out = io.BytesIO()
+            frame.save(out, format="JPEG", quality=quality, optimize=True)
+    except Exception:
+        log.debug("oracle_images: no se pudo decodificar la imagen (%s bytes)", len(data), exc_info=True)
+        return None
+    b = out.getvalue()
+    # Un PNG chico ya comprimido puede quedar más grande como JPEG: sólo vale si achica o si se redujo.
+    return b if (not small or len(b) < len(data)) else None
+
+
+class OracleImagePrep:
+    """Sesión compartida + reducción en pool de hilos + LRU de imágenes ya procesadas."""
+
+    def __init__(
+        self,
+        *,
+        max_edge: Optional[int] = None,
+        quality: Optional[int] = None,
+        cache_max: Optional[int] = None,
+        workers: Optional[int] = None,
+    ):
+        self.max_edge = max_edge or _env_int("ORACLE_MEDIA_MAX_EDGE", 768, 128, 4096)
+        self.quality = quality or _env_int("ORACLE_MEDIA_JPEG_QUALITY", 82, 30, 95)
+        self.cache_max = cache_max or _env_int("ORACLE_MEDIA_CACHE_SIZE", 64, 1, 4096)
+        self._workers = workers or _env_int("ORACLE_MEDIA_WORKERS", 2, 1, 8)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # sha256(original) → procesada; url → sha256(original).
+        self._by_hash: "OrderedDict[str, bytes]" = OrderedDict()
+        self._by_url: "OrderedDict[str, str]" = OrderedDict()
+        self.fetches = 0
+        self.url_hits = 0
+        self.hits = 0
+        self.processed = 0
+        self.passthrough = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=8.0, connect=4.0, sock_read=6.0),
+                headers={"User-Agent": _UA},
+            )
+            self._session_loop = loop
+        return self._session
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="oracle-images")
+        return self._pool
+
+    def _remember(self, digest: str, data: bytes) -> None:
+        self._by_hash[digest] = data
+        self._by_hash.move_to_end(digest)
+        while len(self._by_hash) > self.cache_max:
+            self._by_hash.popitem(last=False)
+
+    async def prepare(self, data: bytes) -> bytes:
+        """Versión reducida de `data` (o `data` tal cual si ya es chica / no se pudo decodificar)."""
+        digest = hashlib.sha256(data).hexdigest()
+        return await self._prepare(digest, data)
+
+    async def _prepare(self, digest: str, data: bytes) -> bytes:
+        cached = self._by_hash.get(digest)
+        if cached is not None:
+            self._by_hash.move_to_end(digest)
+            self.hits += 1
+            return cached
+        out = await asyncio.get_running_loop().run_in_executor(
+            self._executor(),
+            lambda: downscale_image(data, max_edge=self.max_edge, quality=self.quality),
+        )
+        if out is None:
+            out = data
+            self.passthrough += 1
+        else:
+            self.processed += 1
+        self.bytes_in += len(data)
+        self.bytes_out += len(out)
+        self._remember(digest, out)
+        return out
+
+    async def fetch(self, url: str, *, max_bytes: int, label: str) -> Tuple[Optional[bytes], str]:
+        """Descarga + preproceso de una imagen por URL. (None, motivo) si no se pudo."""
+        u = (url or "").strip()
+        if not u.startswith("http"):
+            return None, "url inválida"
+        info = f"{label}: {u.split('?')[0][-64:]}"
+        digest = self._by_url.get(u)
+        if digest is not None and digest in self._by_hash:
+            self._by_url.move_to_end(u)
+            self.url_hits += 1
+            return await self._prepare(digest, b""), info
+        try:
+            async with self._get_session().get(u) as resp:
+                if resp.status != 200:
+                    return None, f"{label} HTTP {resp.status}"
+                ctype = (resp.headers.get("Content-Type") or "").lower()
+                if not ctype.startswith("image/"):
+                    return None, f"{label} no es imagen"
+                # `content.read(n)` devuelve lo que haya en el buffer (puede cortar la imagen): leer hasta EOF o tope.
+                buf = bytearray()
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    buf += chunk
+                    if len(buf) > max_bytes:
+                        break
+                data = bytes(buf)
+        except Exception:
+            return None, f"{label} no descargable"
+        self.fetches += 1
+        if len(data) > max_bytes:
+            return None, f"{label} muy grande"
+        digest = hashlib.sha256(data).hexdigest()
+        self._by_url[u] = digest
+        while len(self._by_url) > self.cache_max:
+            self._by_url.popitem(last=False)
+        return await self._prepare(digest, data), info
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pillow": pillow_available(),
+            "cached": len(self._by_hash),
+            "fetches": self.fetches,
+            "url_hits": self.url_hits,
+            "hits": self.hits,
+            "processed": self.processed,
+            "passthrough": self.passthrough,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+_PREP: Optional[OracleImagePrep] = None
+
+
+def image_prep() -> OracleImagePrep:
+    global _PREP
+    if _PREP is None:
+        _PREP = OracleImagePrep()
+    return _PREP
+
+
+async def close_image_prep() -> None:
+    if _PREP is not None:
+        await _PREP.close()
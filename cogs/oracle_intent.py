@@ -0,0 +1,134 @@
+# Clasificador de intención del oráculo en una sola pasada.
+# La pregunta se normaliza una vez (strip, espacios colapsados, minúsculas, tokens \w+) y un índice
+# token → reglas marca qué reglas pueden aplicar; sólo esas se verifican, en orden de prioridad
+# (como la cadena if/elif que reemplaza). El costo de descartar una intención es una búsqueda en dict,
+# no un regex más por regla.
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+_TOKEN_RE = re.compile(r"\w+")
+_DIGIT_RE = re.compile(r"\d")
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionView:
+    """Pregunta normalizada una sola vez; las reglas leen de acá en vez de re-normalizar."""
+
+    text: str  # strip()
+    flat: str  # espacios colapsados
+    low: str  # flat en minúsculas
+    tokens: Tuple[str, ...]
+    has_digit: bool
+
+    @classmethod
+    def of(cls, text: str) -> "QuestionView":
+        t = (text or "").strip()
+        flat = " ".join(t.split())
+        low = flat.lower()
+        return cls(t, flat, low, tuple(_TOKEN_RE.findall(low)), bool(_DIGIT_RE.search(flat)))
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """
+    Una intención y su verificación. `tokens` / `prefixes` son disparadores *necesarios*
+    (si ninguno aparece, la regla no puede dar True y ni se evalúa); sin disparadores se evalúa siempre.
+    """
+
+    name: str
+    check: Callable[[QuestionView], bool]
+    tokens: FrozenSet[str] = field(default_factory=frozenset)
+    prefixes: Tuple[str, ...] = ()
+    needs_digit: bool = False
+    min_len: int = 0
+    max_len: Optional[int] = None
+
+
+class IntentClassifier:
+    """
+    Tabla de reglas ordenada. `classify` devuelve la primera intención que verifica o `default`.
+    Las verificaciones pueden asumir que las reglas anteriores de la tabla ya dieron False.
+    """
+
+    def __init__(self, rules: Sequence[IntentRule], *, default: str = "yesno"):
+        self.rules: Tuple[IntentRule, ...] = tuple(rules)
+        self.default = default
+        self._bit: Dict[str, int] = {}
+        self._by_token: Dict[str, int] = {}
+        self._prefix_bits: List[Tuple[str, int]] = []
+        self._always = 0
+        self._digit = 0
+        for i, r in enumerate(self.rules):
+            if r.name in self._bit:
+                raise ValueError(f"Intención duplicada: {r.name}")
+            bit = 1 << i
+            self._bit[r.name] = bit
+            if r.needs_digit:
+                self._digit |= bit
+            if not (r.tokens or r.prefixes or r.needs_digit):
+                self._always |= bit
+            for tok in r.tokens:
+                self._by_token[tok] = self._by_token.get(tok, 0) | bit
+            for p in r.prefixes:
+                self._prefix_bits.append((p, bit))
+        self._prefixes = tuple(p for p, _ in self._prefix_bits)
+        self.calls = 0
+        self.checks = 0
+        self.total_s = 0.0
+        self.hits: Dict[str, int] = {}
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Máscara para `classify(only=...)`; nombres desconocidos son un error de programación."""
+        m = 0
+        for n in names:
+            m |= self._bit[n]
+        return m
+
+    def _candidates(self, view: QuestionView) -> int:
+        cand = self._always
+        if view.has_digit:
+            cand |= self._digit
+        by_token = self._by_token
+        prefixes = self._prefixes
+        for tok in view.tokens:
+            cand |= by_token.get(tok, 0)
+            if prefixes and tok.startswith(prefixes):
+                for p, bit in self._prefix_bits:
+                    if tok.startswith(p):
+                        cand |= bit
+        return cand
+
+    def classify(self, text: Union[str, QuestionView], *, only: Optional[int] = None) -> str:
+        t0 = time.perf_counter()
+        view = text if isinstance(text, QuestionView) else QuestionView.of(text)
+        cand = self._candidates(view)
+        if only is not None:
+            cand &= only
+        n = len(view.text)
+        out = self.default
+        while cand:
+            low_bit = cand & -cand
+            cand ^= low_bit
+            rule = self.rules[low_bit.bit_length() - 1]
+            if n < rule.min_len or (rule.max_len is not None and n > rule.max_len):
+                continue
+            self.checks += 1
+            if rule.check(view):
+                out = rule.name
+                break
+        self.calls += 1
+        self.hits[out] = self.hits.get(out, 0) + 1
+        self.total_s += time.perf_counter() - t0
+        return out
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "calls": self.calls,
+            "checks_per_call": round(self.checks / self.calls, 2) if self.calls else 0.0,
+            "avg_us": round(self.total_s / self.calls * 1e6, 1) if self.calls else 0.0,
+            "hits": dict(self.hits),
+        }
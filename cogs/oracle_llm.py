@@ -3,15 +3,24 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
+import heapq
+import json
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
 from duckduckgo_search import DDGS
 
+from cogs.oracle_context import NEGATIVE, context_cache
+
 log = logging.getLogger(__name__)
 
 _oracle_http_lock: Optional[asyncio.Lock] = None
@@ -68,6 +77,7 @@ async def _oracle_http_session_get() -> aiohttp.ClientSession:
             )
         return _oracle_http_session
 
+
 # Defaults (sobreescribibles con env: ORACLE_MAX_WORDS, ORACLE_MAX_CHARS, ORACLE_FOLLOWUP_*).
 _DEF_MAX_WORDS = 20
 _DEF_MAX_CHARS = 340
@@ -82,6 +92,13 @@ def _env_int(key: str, default: int, *, lo: int, hi: int) -> int:
         return default
 
 
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float((os.getenv(key) or str(default)).strip())
+    except ValueError:
+        return default
+
+
 def oracle_max_words_primary() -> int:
     return _env_int("ORACLE_MAX_WORDS", _DEF_MAX_WORDS, lo=5, hi=40)
 
@@ -358,14 +375,23 @@ def _format_web_context(results: list[dict[str, str]]) -> str:
     return txt[:1400].rstrip()
 
 
+# Un solo cliente DDGS (mantiene su pool HTTP); se usa desde to_thread, así que va con lock.
+_ddgs_client: Optional[DDGS] = None
+_ddgs_lock = threading.Lock()
+
+
 def _duckduckgo_text_sync(query: str, *, max_results: int) -> list[dict[str, str]]:
     # duckduckgo_search es sync; lo corremos en thread con to_thread.
+    global _ddgs_client
     q = " ".join((query or "").split()).strip()
     if not q or len(q) < 3:
         return []
     out: list[dict[str, str]] = []
-    with DDGS() as ddgs:
-        for r in ddgs.text(q, max_results=max_results, region="es-es", safesearch="moderate"):
+    with _ddgs_lock:
+        if _ddgs_client is None:
+            _ddgs_client = DDGS()
+        results = _ddgs_client.text(q, max_results=max_results, region="es-es", safesearch="moderate")
+        for r in results or ():
             if not isinstance(r, dict):
                 continue
             # r suele traer: title, href, body
@@ -397,6 +423,13 @@ async def _duckduckgo_context_async(query: str) -> str:
     except ValueError:
         timeout_sec = 3.5
         max_results = 4
+    cache = context_cache()
+    kind = f"ddg:{max_results}"
+    hit = await cache.aget(kind, q0)
+    if hit is NEGATIVE:
+        return ""
+    if hit is not None:
+        return _format_web_context(hit if isinstance(hit, list) else [])
     try:
         res = await asyncio.wait_for(
             asyncio.to_thread(_duckduckgo_text_sync, query, max_results=max_results),
@@ -407,13 +440,347 @@ async def _duckduckgo_context_async(query: str) -> str:
     except Exception:
         log.debug("DuckDuckGo search falló (ignorado).", exc_info=True)
         return ""
-    return _format_web_context(res if isinstance(res, list) else [])
+    res = res if isinstance(res, list) else []
+    await cache.aput(kind, q0, res, _env_float("ORACLE_WEB_CACHE_TTL_S", 86400.0))
+    return _format_web_context(res)
+
+
+# --- Caché de respuestas ---
+# Preguntas repetidas ("¿quién es Goku?" cinco veces en una hora) no vuelven a pasar por Ollama:
+# clave = (estilo, modelo, pregunta normalizada, hash del contexto KB/web/imagen), TTL + LRU,
+# y un solo POST para preguntas idénticas en vuelo. Solo se guardan respuestas válidas.
+
+_NORM_DROP_RE = re.compile(r"[¿?¡!.,;:…\"'«»“”()\[\]*_~`]+")
+
+
+def _normalize_question(text: str) -> str:
+    """Minúsculas, sin acentos ni puntuación suelta y espacios colapsados."""
+    nk = unicodedata.normalize("NFKD", text or "")
+    folded = "".join(ch for ch in nk if not unicodedata.combining(ch)).lower()
+    return " ".join(_NORM_DROP_RE.sub(" ", folded).split())
+
+
+class OracleReplyCache:
+    def __init__(self, *, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        if ttl is None:
+            ttl = _env_float("ORACLE_LLM_CACHE_TTL_S", 3600.0)
+        self.ttl = max(0.0, float(ttl))
+        self.max_entries = (
+            _env_int("ORACLE_LLM_CACHE_MAX", 256, lo=0, hi=20000) if max_entries is None else max(0, int(max_entries))
+        )
+        self._entries: "OrderedDict[Tuple[str, ...], Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, ...], asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stored = 0
+
+    @staticmethod
+    def make_key(style: str, model: str, question: str, context: str = "") -> Tuple[str, ...]:
+        ctx_hash = hashlib.sha1(context.encode("utf-8")).hexdigest()[:16] if context else ""
+        return (style, model, _normalize_question(question), ctx_hash)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Tuple[str, ...]) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Tuple[str, ...], value: str) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        self.stored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self, key: Tuple[str, ...], compute: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        if not self.enabled:
+            return await compute()
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight = {}
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            return await asyncio.shield(fut)
+
+        self.misses += 1
+        fut = loop.create_future()
+        self._inflight[key] = fut
+        out: Optional[str] = None
+        try:
+            out = await compute()
+            if out:
+                self.put(key, out)
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+            if not fut.done():
+                fut.set_result(out)
+        return out
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "stored": self.stored,
+        }
+
+
+_REPLY_CACHE: Optional[OracleReplyCache] = None
+
+
+def oracle_reply_cache() -> OracleReplyCache:
+    global _REPLY_CACHE
+    if _REPLY_CACHE is None:
+        _REPLY_CACHE = OracleReplyCache()
+    return _REPLY_CACHE
+
+
+def oracle_llm_cache_stats() -> Dict[str, Any]:
+    return oracle_reply_cache().stats()
+
+
+# --- Cola de trabajo hacia Ollama ---
+# Un modelo local con N consultas a la vez se arrastra y todas vencen juntas: acá se limita la
+# concurrencia y se atiende por prioridad (consulta > seguimiento > visión > quip). Si un pedido no
+# puede empezar antes de su plazo se descarta enseguida (None) y el cog usa sus plantillas.
+
+PRIORITIES: Dict[str, int] = {"primary": 0, "followup": 1, "vision": 2, "quip": 3}
+
+
+class OracleLLMScheduler:
+    def __init__(
+        self,
+        *,
+        concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        quip_max_wait: Optional[float] = None,
+    ):
+        self.concurrency = (
+            _env_int("ORACLE_LLM_CONCURRENCY", 2, lo=1, hi=16) if concurrency is None else max(1, int(concurrency))
+        )
+        self.max_queue = _env_int("ORACLE_LLM_MAX_QUEUE", 16, lo=0, hi=500) if max_queue is None else max(0, int(max_queue))
+        self.max_wait = {
+            p: (_env_float("ORACLE_LLM_MAX_WAIT_S", 10.0) if max_wait is None else float(max_wait))
+            for p in ("primary", "followup", "vision")
+        }
+        self.max_wait["quip"] = _env_float("ORACLE_LLM_QUIP_MAX_WAIT_S", 3.0) if quip_max_wait is None else float(quip_max_wait)
+        # Duración media (EWMA) de un POST: estima la espera de la cola para descartar sin encolar.
+        self.service_s = _env_float("ORACLE_LLM_EST_SERVICE_S", 4.0)
+        self._active = 0
+        self._heap: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.granted = 0
+        self.dropped_full = 0
+        self.dropped_deadline = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+        self.max_depth = 0
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._heap = []
+            self._active = 0
+
+    def _ahead_of(self, prio: int) -> int:
+        return sum(1 for p, _s, _d, f in self._heap if p <= prio and not f.done())
+
+    def _record_wait(self, waited: float) -> None:
+        self.granted += 1
+        self.wait_total_s += waited
+        if waited > self.wait_max_s:
+            self.wait_max_s = waited
+
+    async def acquire(self, priority: str = "primary") -> bool:
+        """True = hay turno (llamar a `release` al terminar); False = descartado."""
+        self._bind_loop()
+        prio = PRIORITIES.get(priority, PRIORITIES["primary"])
+        now = time.monotonic()
+        if self._active < self.concurrency and not self._heap:
+            self._active += 1
+            self._record_wait(0.0)
+            return True
+        if len(self._heap) >= self.max_queue:
+            self.dropped_full += 1
+            log.debug("Oracle LLM: cola llena (%s), %s descartado", len(self._heap), priority)
+            return False
+        budget = max(0.0, self.max_wait.get(priority, self.max_wait["primary"]))
+        expected = (self._ahead_of(prio) // self.concurrency + 1) * self.service_s
+        if expected > budget:
+            self.dropped_deadline += 1
+            log.debug("Oracle LLM: %s descartado (espera estimada %.1fs > %.1fs)", priority, expected, budget)
+            return False
+
+        deadline = now + budget
+        fut = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._heap, (prio, self._seq, deadline, fut))
+        self.max_depth = max(self.max_depth, len(self._heap))
+        try:
+            granted = await asyncio.wait_for(fut, timeout=budget)
+        except asyncio.TimeoutError:
+            granted = False
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled() and fut.result():
+                self.release(None)
+            raise
+        if not granted:
+            self.dropped_deadline += 1
+            log.debug("Oracle LLM: %s venció en cola (%.1fs)", priority, budget)
+            return False
+        self._record_wait(time.monotonic() - now)
+        return True
+
+    def release(self, service_s: Optional[float]) -> None:
+        if service_s is not None:
+            self.service_s = 0.8 * self.service_s + 0.2 * max(0.05, service_s)
+        self._active = max(0, self._active - 1)
+        now = time.monotonic()
+        while self._heap and self._active < self.concurrency:
+            _prio, _seq, deadline, fut = heapq.heappop(self._heap)
+            if fut.done():
+                continue
+            if deadline <= now:
+                fut.set_result(False)
+                continue
+            self._active += 1
+            fut.set_result(True)
+
+    def stats(self) -> Dict[str, Any]:
+        depth: Dict[str, int] = {}
+        names = {v: k for k, v in PRIORITIES.items()}
+        for p, _s, _d, f in self._heap:
+            if not f.done():
+                depth[names[p]] = depth.get(names[p], 0) + 1
+        return {
+            "active": self._active,
+            "queued": sum(depth.values()),
+            "queued_by_priority": depth,
+            "max_depth": self.max_depth,
+            "granted": self.granted,
+            "dropped_full": self.dropped_full,
+            "dropped_deadline": self.dropped_deadline,
+            "avg_wait_ms": round(self.wait_total_s / self.granted * 1000, 1) if self.granted else 0.0,
+            "max_wait_ms": round(self.wait_max_s * 1000, 1),
+            "est_service_s": round(self.service_s, 2),
+        }
+
+
+_SCHEDULER: Optional[OracleLLMScheduler] = None
 
 
-async def _ollama_post_generate(url: str, payload: Dict[str, Any], timeout_sec: float) -> Optional[Dict[str, Any]]:
+def oracle_llm_scheduler() -> OracleLLMScheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = OracleLLMScheduler()
+    return _SCHEDULER
+
+
+def oracle_llm_scheduler_stats() -> Dict[str, Any]:
+    return oracle_llm_scheduler().stats()
+
+
+def _oracle_stream_enabled() -> bool:
+    return (os.getenv("ORACLE_LLM_STREAM") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _stream_limit_reached(text: str, *, max_words: int, max_chars: int) -> bool:
+    """True cuando `_truncate_response` ya cortaría: una palabra de más o más caracteres que el tope."""
+    words = text.split()
+    # La palabra N+1 empezada confirma que la N está completa.
+    if max_words > 0 and len(words) > max_words:
+        return True
+    return max_chars > 0 and len(" ".join(words)) > max_chars
+
+
+async def _read_ollama_stream(
+    resp: aiohttp.ClientResponse,
+    *,
+    max_words: int,
+    max_chars: int,
+    on_partial: Optional[Callable[[str], None]],
+) -> Optional[Dict[str, Any]]:
+    """Lee el NDJSON de `/api/generate` y corta apenas se llega al tope de palabras/caracteres."""
+    parts: List[str] = []
+    stopped = False
+    async for raw in resp.content:
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            chunk = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(chunk, dict):
+            continue
+        if chunk.get("error"):
+            log.warning("Oracle LLM (stream): %s", str(chunk.get("error"))[:300])
+            return None
+        tok = chunk.get("response")
+        if isinstance(tok, str) and tok:
+            parts.append(tok)
+            text = "".join(parts)
+            if on_partial is not None:
+                try:
+                    on_partial(_truncate_response(text, max_words=max_words or 9999, max_chars=max_chars or 9999))
+                except Exception:
+                    log.debug("Oracle LLM: on_partial falló (ignorado).", exc_info=True)
+            if _stream_limit_reached(text, max_words=max_words, max_chars=max_chars):
+                stopped = True
+                break
+        if chunk.get("done"):
+            break
+    if stopped:
+        # Cerrar la conexión hace que Ollama cancele la generación (no gasta tokens que se tiran).
+        resp.close()
+    return {"response": "".join(parts), "done": True, "stopped_early": stopped}
+
+
+async def _ollama_post_generate(
+    url: str,
+    payload: Dict[str, Any],
+    timeout_sec: float,
+    *,
+    max_words: int = 0,
+    max_chars: int = 0,
+    on_partial: Optional[Callable[[str], None]] = None,
+) -> Optional[Dict[str, Any]]:
     # total + sock_read: evita colgarse si Ollama tarda más de lo esperado.
     t = max(5.0, float(timeout_sec))
     timeout = aiohttp.ClientTimeout(total=t + 4.0, connect=8.0, sock_read=t + 3.0)
+    stream = _oracle_stream_enabled()
+    if stream:
+        payload = {**payload, "stream": True}
     try:
         session = await _oracle_http_session_get()
         async with session.post(url, json=payload, timeout=timeout) as resp:
@@ -421,6 +788,10 @@ async def _ollama_post_generate(url: str, payload: Dict[str, Any], timeout_sec:
                 body = (await resp.text())[:300]
                 log.warning("Oracle LLM HTTP %s: %s", resp.status, body)
                 return None
+            if stream:
+                return await _read_ollama_stream(
+                    resp, max_words=max_words, max_chars=max_chars, on_partial=on_partial
+                )
             try:
                 return await resp.json(content_type=None)
             except Exception:
@@ -438,24 +809,47 @@ async def _ollama_post_generate(url: str, payload: Dict[str, Any], timeout_sec:
 
 
 async def _ollama_post_generate_guarded(
-    url: str, payload: Dict[str, Any], timeout_sec: float
+    url: str,
+    payload: Dict[str, Any],
+    timeout_sec: float,
+    *,
+    priority: str = "primary",
+    max_words: int = 0,
+    max_chars: int = 0,
+    on_partial: Optional[Callable[[str], None]] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Capa extra: nunca dejamos colgado el event loop más de timeout+6s."""
+    """Capa extra: turno en la cola de Ollama y nunca más de timeout+6s colgados en el POST."""
+    sched = oracle_llm_scheduler()
+    if not await sched.acquire(priority):
+        return None
     cap = max(12.0, float(timeout_sec) + 6.0)
+    t0 = time.monotonic()
     try:
         return await asyncio.wait_for(
-            _ollama_post_generate(url, payload, timeout_sec),
+            _ollama_post_generate(
+                url, payload, timeout_sec, max_words=max_words, max_chars=max_chars, on_partial=on_partial
+            ),
             timeout=cap,
         )
     except asyncio.TimeoutError:
         log.warning("Oracle LLM: cortado por wait_for (>%ss)", cap)
         return None
+    finally:
+        sched.release(time.monotonic() - t0)
 
 
-async def oracle_local_reply(user_question: str, *, style: str = "open") -> Optional[str]:
+async def oracle_local_reply(
+    user_question: str,
+    *,
+    style: str = "open",
+    priority: str = "primary",
+    on_partial: Optional[Callable[[str], None]] = None,
+) -> Optional[str]:
     """
     Llama a Ollama si hay URL configurada (el cog decide si la IA está activada).
     style: \"open\" (opinión / charla) o \"yesno\" (una frase tipo adivinación).
+    priority: clase en la cola de Ollama (ver `PRIORITIES`).
+    on_partial: con streaming, recibe el texto parcial ya recortado (para ir editando el embed).
     """
     url = _normalize_generate_url(os.getenv("ORACLE_LLM_URL") or "")
     if not url:
@@ -504,20 +898,26 @@ async def oracle_local_reply(user_question: str, *, style: str = "open") -> Opti
     if ka:
         payload["keep_alive"] = ka
 
-    data = await _ollama_post_generate_guarded(url, payload, timeout_sec)
-    if not isinstance(data, dict):
-        return None
+    async def _generate() -> Optional[str]:
+        data = await _ollama_post_generate_guarded(
+            url, payload, timeout_sec, priority=priority, max_words=mw, max_chars=mc, on_partial=on_partial
+        )
+        if not isinstance(data, dict):
+            return None
 
-    text = data.get("response")
-    if not text or not isinstance(text, str):
-        return None
-    out = _truncate_response(text, max_words=mw, max_chars=mc)
-    if not out:
-        return None
-    if _response_echoes_instructions(out):
-        log.info("Oracle LLM: respuesta parece eco del prompt; se usa fallback del oráculo.")
-        return None
-    return out
+        text = data.get("response")
+        if not text or not isinstance(text, str):
+            return None
+        out = _truncate_response(text, max_words=mw, max_chars=mc)
+        if not out:
+            return None
+        if _response_echoes_instructions(out):
+            log.info("Oracle LLM: respuesta parece eco del prompt; se usa fallback del oráculo.")
+            return None
+        return out
+
+    key = OracleReplyCache.make_key(st, model, q, "\n".join((system, kb_ctx, web_ctx)))
+    return await oracle_reply_cache().get_or_compute(key, _generate)
 
 
 async def oracle_local_reply_with_images(user_question: str, *, images_bytes: List[bytes], style: str = "open") -> Optional[str]:
@@ -588,18 +988,26 @@ async def oracle_local_reply_with_images(user_question: str, *, images_bytes: Li
     if ka:
         payload["keep_alive"] = ka
 
-    data = await _ollama_post_generate_guarded(url, payload, timeout_sec)
-    if not isinstance(data, dict):
-        return None
-    text = data.get("response")
-    if not text or not isinstance(text, str):
-        return None
-    out = _truncate_response(text, max_words=mw, max_chars=mc)
-    if not out:
-        return None
-    if _response_echoes_instructions(out):
-        return None
-    return out
+    async def _generate() -> Optional[str]:
+        data = await _ollama_post_generate_guarded(
+            url, payload, timeout_sec, priority="vision", max_words=mw, max_chars=mc
+        )
+        if not isinstance(data, dict):
+            return None
+        text = data.get("response")
+        if not text or not isinstance(text, str):
+            return None
+        out = _truncate_response(text, max_words=mw, max_chars=mc)
+        if not out:
+            return None
+        if _response_echoes_instructions(out):
+            return None
+        return out
+
+    # El mismo emote / imagen con la misma pregunta (típico en captions) reusa la respuesta.
+    img_hash = hashlib.sha1(images_bytes[0]).hexdigest()
+    key = OracleReplyCache.make_key(st, model, q, "\n".join((system, kb_ctx, img_hash)))
+    return await oracle_reply_cache().get_or_compute(key, _generate)
 
 
 async def oracle_local_reply_followup(
@@ -655,7 +1063,9 @@ async def oracle_local_reply_followup(
     if ka:
         payload["keep_alive"] = ka
 
-    data = await _ollama_post_generate_guarded(url, payload, timeout_sec)
+    data = await _ollama_post_generate_guarded(
+        url, payload, timeout_sec, priority="followup", max_words=mw, max_chars=mc
+    )
     if not isinstance(data, dict):
         return None
 
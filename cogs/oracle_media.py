@@ -2,34 +2,22 @@
 # Listas curadas = fallback si la API falla. Definiciones → Wikipedia es (oracle_wiki).
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
 import random
 import re
-import time
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-import aiohttp
+from cogs.anilist_client import get_client as get_anilist_client
 
 log = logging.getLogger(__name__)
 
-_ANILIST_GQL = "https://graphql.anilist.co"
-# Evita ráfagas: mínimo espacio entre POST (por si muchos usuarios preguntan a la vez).
-_anilist_last_post: float = 0.0
-_ANILIST_MIN_INTERVAL = 0.35
-
 
 def anilist_enabled() -> bool:
     v = (os.getenv("ORACLE_ANILIST") or "1").strip().lower()
     return v not in ("0", "false", "no", "off")
 
 
-def _anilist_ua() -> str:
-    u = (os.getenv("ORACLE_ANILIST_UA") or "").strip()
-    return u or "AnimeAlToqueOracle/1.0 (Discord bot) Python/aiohttp — AniList GraphQL"
-
-
 # Pistas → listas locales si AniList no responde.
 _ORACLE_ANIME_POOLS: Dict[str, Tuple[str, ...]] = {
     "isekai": (
@@ -312,46 +300,13 @@ def _curated_recommendation_line(q: str) -> str:
 async def _anilist_post(query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
     if not anilist_enabled():
         return None
-    global _anilist_last_post
-    now = time.monotonic()
-    gap = _ANILIST_MIN_INTERVAL - (now - _anilist_last_post)
-    if gap > 0:
-        await asyncio.sleep(gap)
-    _anilist_last_post = time.monotonic()
-
-    payload = {"query": query, "variables": variables or {}}
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "User-Agent": _anilist_ua(),
-    }
     # Más rápido por defecto; configurable por env.
     try:
         total = float((os.getenv("ORACLE_ANILIST_TIMEOUT") or "5.5").strip())
     except ValueError:
         total = 5.5
     total = max(3.0, min(12.0, total))
-    timeout = aiohttp.ClientTimeout(total=total, connect=min(4.0, total), sock_read=min(4.0, total))
-    try:
-        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-            async with session.post(_ANILIST_GQL, json=payload) as resp:
-                if resp.status != 200:
-                    log.debug("oracle_media: AniList HTTP %s", resp.status)
-                    return None
-                data = await resp.json(content_type=None)
-    except aiohttp.ClientError:
-        log.debug("oracle_media: AniList red", exc_info=True)
-        return None
-    except Exception:
-        log.debug("oracle_media: AniList error", exc_info=True)
-        return None
-
-    if not isinstance(data, dict):
-        return None
-    if data.get("errors"):
-        log.debug("oracle_media: AniList errors=%s", data.get("errors")[:1])
-        return None
-    return data.get("data")
+    return await get_anilist_client().query(query, variables, timeout=total)
 
 
 def _pick_title_anilist(m: Dict[str, Any]) -> str:
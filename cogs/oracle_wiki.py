@@ -1,18 +1,26 @@
 # Resumen corto desde Wikipedia (es) para el oráculo sin Ollama.
 # Requiere User-Agent descriptivo (política de Wikimedia).
+# Búsquedas y resúmenes quedan en la caché de contexto (oracle_context); la sesión HTTP es compartida.
 from __future__ import annotations
 
+import asyncio
 import html
 import json
 import logging
+import os
 import re
 from typing import Any, List, Optional
 from urllib.parse import quote, urlencode
 
 import aiohttp
 
+from cogs.oracle_context import NEGATIVE, context_cache
+
 log = logging.getLogger(__name__)
 
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
 _API = "https://es.wikipedia.org/w/api.php"
 _SUMMARY = "https://es.wikipedia.org/api/rest_v1/page/summary/{title}"
 _DEFAULT_UA = (
@@ -22,12 +30,37 @@ _DEFAULT_UA = (
 
 
 def _ua() -> str:
-    import os
-
     u = (os.getenv("ORACLE_WIKI_UA") or "").strip()
     return u if u else _DEFAULT_UA
 
 
+def _cache_ttl() -> float:
+    try:
+        return float((os.getenv("ORACLE_WIKI_CACHE_TTL_S") or "604800").strip())
+    except ValueError:
+        return 604800.0
+
+
+def _get_session() -> aiohttp.ClientSession:
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10.0, connect=6.0, sock_read=6.0),
+            headers={"User-Agent": _ua(), "Accept": "application/json"},
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_wiki_http() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
 def _strip_html(s: str) -> str:
     t = re.sub(r"<[^>]+>", " ", s)
     t = html.unescape(t)
@@ -38,7 +71,8 @@ def _title_for_rest(title: str) -> str:
     return quote(title.replace(" ", "_"), safe="()%'")
 
 
-async def _wiki_search(session: aiohttp.ClientSession, q: str) -> List[str]:
+async def _wiki_search(session: aiohttp.ClientSession, q: str) -> Optional[List[str]]:
+    """Títulos encontrados ([] = sin resultados; None = error HTTP, no se cachea)."""
     params = {
         "action": "query",
         "list": "search",
@@ -50,7 +84,7 @@ async def _wiki_search(session: aiohttp.ClientSession, q: str) -> List[str]:
     url = f"{_API}?{urlencode(params)}"
     async with session.get(url) as resp:
         if resp.status != 200:
-            return []
+            return None
         data: Any = await resp.json(content_type=None)
     hits = (((data or {}).get("query") or {}).get("search")) or []
     out: List[str] = []
@@ -62,9 +96,12 @@ async def _wiki_search(session: aiohttp.ClientSession, q: str) -> List[str]:
 
 
 async def _wiki_summary(session: aiohttp.ClientSession, title: str) -> Optional[str]:
+    """Extract limpio, "" si la página no sirve (desambiguación, corta) o None si falló el pedido."""
     path = _title_for_rest(title)
     url = _SUMMARY.format(title=path)
     async with session.get(url) as resp:
+        if resp.status == 404:
+            return ""
         if resp.status != 200:
             return None
         try:
@@ -72,18 +109,46 @@ async def _wiki_summary(session: aiohttp.ClientSession, title: str) -> Optional[
         except (json.JSONDecodeError, aiohttp.ContentTypeError):
             return None
     if not isinstance(data, dict):
-        return None
+        return ""
     if (data.get("type") or "").lower() in ("disambiguation", "not_found", "redir"):
-        return None
+        return ""
     ext = data.get("extract")
     if not isinstance(ext, str) or not ext.strip():
-        return None
+        return ""
     text = _strip_html(ext)
     if len(text) < 40:
-        return None
+        return ""
     return text
 
 
+async def _cached_search(q: str) -> List[str]:
+    cache = context_cache()
+    hit = await cache.aget("wiki_search", q)
+    if hit is NEGATIVE:
+        return []
+    if hit is not None:
+        return list(hit)
+    titles = await _wiki_search(_get_session(), q)
+    if titles is None:
+        return []
+    await cache.aput("wiki_search", q, titles, _cache_ttl())
+    return titles
+
+
+async def _cached_summary(title: str) -> Optional[str]:
+    cache = context_cache()
+    hit = await cache.aget("wiki_summary", title)
+    if hit is NEGATIVE:
+        return None
+    if hit is not None:
+        return str(hit)
+    body = await _wiki_summary(_get_session(), title)
+    if body is None:
+        return None
+    await cache.aput("wiki_summary", title, body, _cache_ttl())
+    return body or None
+
+
 async def wikipedia_es_snippet(query: str, *, max_chars: int = 400) -> Optional[str]:
     """
     Devuelve un párrafo breve (extract) o None.
@@ -92,22 +157,19 @@ async def wikipedia_es_snippet(query: str, *, max_chars: int = 400) -> Optional[
     q = (query or "").strip()
     if len(q) < 4:
         return None
-    timeout = aiohttp.ClientTimeout(total=10.0, connect=6.0, sock_read=6.0)
-    headers = {"User-Agent": _ua(), "Accept": "application/json"}
     try:
-        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-            titles = await _wiki_search(session, q)
-            for title in titles:
-                body = await _wiki_summary(session, title)
-                if body:
-                    if len(body) > max_chars:
-                        cut = body[: max_chars - 1].rsplit(" ", 1)[0]
-                        body = (cut or body[:max_chars]).rstrip(",;:") + "…"
-                    return (
-                        f"{body}\n\n"
-                        f"_Resumen tomado de **Wikipedia** (es); comprobá en la fuente si es para un examen._"
-                    )
-    except aiohttp.ClientError:
+        titles = await _cached_search(q)
+        for title in titles:
+            body = await _cached_summary(title)
+            if body:
+                if len(body) > max_chars:
+                    cut = body[: max_chars - 1].rsplit(" ", 1)[0]
+                    body = (cut or body[:max_chars]).rstrip(",;:") + "…"
+                return (
+                    f"{body}\n\n"
+                    f"_Resumen tomado de **Wikipedia** (es); comprobá en la fuente si es para un examen._"
+                )
+    except (aiohttp.ClientError, asyncio.TimeoutError):
         log.debug("oracle_wiki: error de red", exc_info=True)
     except Exception:
         log.debug("oracle_wiki: error inesperado", exc_info=True)
@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import ast
+import asyncio
 import base64
 import logging
 import math
@@ -14,9 +15,8 @@ import random
 import re
 import time
 import string
-from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Any, Deque, Dict, Literal, Optional, Tuple, List
+from typing import Any, Callable, Dict, Literal, Optional, Tuple, List
 
 _OracleResponseKind = Literal["yesno", "open", "llm", "math"]
 
@@ -24,7 +24,11 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-import aiohttp
+from cogs.expiring_map import ExpiringMap
+from cogs.message_router import MessageContext, get_router
+from cogs.oracle_images import close_image_prep, image_prep
+from cogs.rate_limit import SlidingWindowLimiter, get_rate_limits
+from cogs.oracle_intent import IntentClassifier, IntentRule, QuestionView
 
 log = logging.getLogger(__name__)
 
@@ -272,6 +276,18 @@ def _oracle_llm_yesno_via_model() -> bool:
     return (os.getenv("ORACLE_LLM_YESNO") or "").strip().lower() in ("1", "true", "yes", "on")
 
 
+def _oracle_stream_edits_enabled() -> bool:
+    """Con streaming de Ollama, publicar la respuesta parcial y editarla mientras llega (ORACLE_STREAM_EDITS=1)."""
+    return (os.getenv("ORACLE_STREAM_EDITS") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _oracle_stream_edit_interval() -> float:
+    try:
+        return max(0.8, min(5.0, float((os.getenv("ORACLE_STREAM_EDIT_INTERVAL_S") or "1.5").strip())))
+    except ValueError:
+        return 1.5
+
+
 def _oracle_env_show_errors() -> bool:
     """Si es true, en Discord se muestra tipo + mensaje del error (solo en entornos de confianza)."""
     return (os.getenv("ORACLE_SHOW_ERRORS") or "").strip().lower() in ("1", "true", "yes", "on")
@@ -293,21 +309,6 @@ def _oracle_user_visible_internal_error(exc: BaseException) -> str:
     )
 
 
-def _message_pings_bot(message: discord.Message, me: discord.abc.User) -> bool:
-    """Algunos clientes no rellenan `mentions` igual; `raw_mentions` y el texto `<@…>` son respaldo."""
-    if me in message.mentions:
-        return True
-    try:
-        if me.id in (message.raw_mentions or ()):
-            return True
-    except Exception:
-        pass
-    c = message.content or ""
-    if f"<@{me.id}>" in c or f"<@!{me.id}>" in c:
-        return True
-    return False
-
-
 # Preguntas que no son un sí/no claro: mejor “charla” que un porcentaje místico.
 # Tras reemplazar √n y sqrt(n) por un dígito, solo deben quedar dígitos y operadores básicos.
 _ARITH_FLATTENED_OK_RE = re.compile(r"^[\d\s\+\-\*\/x×÷.,\(\)=%^]+$", re.IGNORECASE)
@@ -1009,6 +1010,11 @@ def _is_open_ended_question(pregunta: str) -> bool:
         return False
     if _is_multi_option_or_recommendation(q):
         return False
+    return _open_ended_core(q)
+
+
+def _open_ended_core(q: str) -> bool:
+    """Parte de `_is_open_ended_question` que queda una vez descartadas ruleta y opciones múltiples."""
     if _is_anime_recommendation_request(q):
         return True
     return bool(_OPEN_QUESTION_RE.search(q))
@@ -1115,6 +1121,11 @@ def _is_multi_option_or_recommendation(q: str) -> bool:
         return False
     if _is_poker_push_decision_question(s):
         return False
+    return _multi_option_core(s)
+
+
+def _multi_option_core(s: str) -> bool:
+    """Parte de `_is_multi_option_or_recommendation` que queda una vez descartadas ruleta y póker."""
     if _is_anime_recommendation_request(s):
         return False
     if _SERIOUS_FACT_RE.search(s):
@@ -1259,6 +1270,85 @@ def _roll_oracle() -> Tuple[str, str, int]:
     return "Probabilidad", prob_msg, dado
 
 
+def _derivative_resolves(v: QuestionView) -> bool:
+    d_expr = _parse_derivative_expression(v.text)
+    return bool(d_expr) and _derive_simple(d_expr) is not None
+
+
+# Ruteo de `_build_oracle_embed`, en el orden del viejo if/elif. Los tokens/prefijos son condiciones
+# necesarias de cada predicado (palabras que su regex exige), así que descartar una regla no cuesta un regex.
+# `multi_option` y `open` usan la versión “core”: ruleta y póker ya dieron False más arriba en la tabla.
+_ORACLE_INTENTS = IntentClassifier(
+    [
+        IntentRule(
+            "greeting",
+            lambda v: _is_oracle_greeting(v.text),
+            tokens=frozenset({"saludos", "que", "q", "qonda", "qhaces", "como", "cómo", "todo", "tas"}),
+            prefixes=("hol", "wen", "buen", "hey", "hell", "hi"),
+        ),
+        IntentRule("derivative", _derivative_resolves, prefixes=("derivad",)),
+        IntentRule(
+            "roulette",
+            lambda v: _is_roulette_color_question(v.text),
+            tokens=frozenset({"rojo", "negro", "verde"}),
+            min_len=6,
+        ),
+        IntentRule(
+            "poker",
+            lambda v: _is_poker_push_decision_question(v.text),
+            tokens=frozenset(
+                {"poker", "holdem", "hold", "texas", "omaha", "blackjack", "baraja", "naipe", "naipes", "all", "allin"}
+            ),
+            min_len=12,
+        ),
+        IntentRule("multi_option", lambda v: _multi_option_core(v.text), tokens=frozenset({"o"}), min_len=9),
+        IntentRule(
+            "fast_opinion",
+            lambda v: _oracle_is_fast_opinion_yesno(v.text),
+            tokens=frozenset({"es", "esta", "está"}),
+            min_len=6,
+        ),
+        IntentRule("arithmetic", lambda v: _is_simple_arithmetic_question(v.text), needs_digit=True),
+        IntentRule("open", lambda v: _open_ended_core(v.text), min_len=4),
+    ]
+)
+_ROLL_INTENTS = _ORACLE_INTENTS.mask(("roulette", "poker", "multi_option", "open"))
+
+# Seguimientos en el hilo: halagos y reacciones cortas antes que IA.
+_ORACLE_FOLLOWUP_INTENTS = IntentClassifier(
+    [
+        IntentRule(
+            "praise",
+            lambda v: bool(_ORACLE_PRAISE_RE.match(v.text)),
+            tokens=frozenset({"que", "q", "te", "tremendo", "based"}),
+            prefixes=("genio", "crack", "capo", "god", "goat", "graci", "grax", "ty", "thx", "buen", "incre", "epic", "basad"),
+        ),
+        IntentRule(
+            "smalltalk",
+            lambda v: bool(_ORACLE_FAST_SMALLTALK_RE.match(v.text)),
+            tokens=frozenset(
+                {"no", "odio", "meh", "malo", "dale", "ok", "oka", "oki", "listo", "decile", "díselo", "diselo", "lmao", "lol"}
+            ),
+            prefixes=("mal", "jaj", "xd"),
+            max_len=80,
+        ),
+        IntentRule("arithmetic", lambda v: _is_simple_arithmetic_question(v.text), needs_digit=True),
+    ],
+    default="other",
+)
+
+
+def _classify_oracle_question(pq_plain: str, pq_user: Optional[str] = None) -> str:
+    """
+    Intención de la consulta: greeting, derivative, roulette, poker, multi_option, fast_opinion,
+    arithmetic, open o yesno. `pq_user` (pregunta con contexto del reply) sólo decide open vs yesno.
+    """
+    intent = _ORACLE_INTENTS.classify(pq_plain)
+    if pq_user is not None and pq_user.strip() != pq_plain.strip() and intent in ("open", "yesno"):
+        intent = "open" if _is_open_ended_question(pq_user) else "yesno"
+    return intent
+
+
 async def _roll_oracle_for_question_async(pregunta: str) -> Tuple[str, str, int]:
     """
     Si la pregunta parece abierta (cuántas, cuándo, temporadas…), contesta en modo ‘opinión’.
@@ -1269,13 +1359,14 @@ async def _roll_oracle_for_question_async(pregunta: str) -> Tuple[str, str, int]
     low = pq.lower()
     if low in ("hola", "holi", "buenas", "buenas!", "hello", "hey", "buen día", "buen dia", "buenas tardes", "buenas noches"):
         return "open", await _oracle_open_answer_async(pq), random.randint(1, 100)
-    if _is_roulette_color_question(pq):
+    intent = _ORACLE_INTENTS.classify(pq, only=_ROLL_INTENTS)
+    if intent == "roulette":
         return "yesno", _oracle_roulette_pick(pq), random.randint(1, 100)
-    if _is_poker_push_decision_question(pq):
+    if intent == "poker":
         return "yesno", _oracle_poker_push_answer(), random.randint(1, 100)
-    if _is_multi_option_or_recommendation(pq):
+    if intent == "multi_option":
         return "yesno", _oracle_multi_option_pick(pq), random.randint(1, 100)
-    if _is_open_ended_question(pq):
+    if intent == "open":
         return "open", await _oracle_open_answer_async(pq), random.randint(1, 100)
     cat, body, dado = _roll_oracle()
     return cat, body, dado
@@ -1418,6 +1509,88 @@ def _template_followup_no_llm(user_line: str) -> str:
     )
 
 
+class _OracleStreamEdits:
+    """
+    Embed que se publica con el primer texto parcial del modelo y se edita como mucho cada
+    `interval` segundos (Discord limita las ediciones); `finish` deja el embed definitivo.
+    """
+
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        *,
+        reference: Optional[discord.Message],
+        make_embed: Callable[[str], discord.Embed],
+        interval: float,
+    ):
+        self.channel = channel
+        self.reference = reference
+        self.make_embed = make_embed
+        self.interval = interval
+        self.message: Optional[discord.Message] = None
+        self._latest = ""
+        self._last_edit = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def push(self, text: str) -> None:
+        if self._closed or not text:
+            return
+        self._latest = text
+        if self._task is not None and not self._task.done():
+            return
+        if time.monotonic() - self._last_edit < self.interval:
+            return
+        self._task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        self._last_edit = time.monotonic()
+        emb = self.make_embed(self._latest + " …")
+        try:
+            if self.message is None:
+                self.message = await self.channel.send(embed=emb, reference=self.reference, mention_author=False)
+            else:
+                await self.message.edit(embed=emb)
+        except discord.HTTPException:
+            log.debug("Oráculo: edición parcial rechazada; se publica al final.", exc_info=True)
+            self._closed = True
+
+    async def _settle(self) -> None:
+        self._closed = True
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                pass
+
+    async def finish(self, embed: discord.Embed) -> Optional[discord.Message]:
+        """
+        Edita el mensaje parcial con el embed final. None si nunca se publicó nada o si la edición
+        falló (el parcial se borra y el que llama manda el embed como mensaje nuevo).
+        """
+        await self._settle()
+        if self.message is None:
+            return None
+        try:
+            await self.message.edit(embed=embed)
+        except discord.HTTPException:
+            log.debug("Oráculo: edición final rechazada; se envía como mensaje nuevo.", exc_info=True)
+            await self.abort()
+            return None
+        return self.message
+
+    async def abort(self) -> None:
+        """Borra el parcial "…" publicado (si hay) cuando la respuesta no se completa."""
+        await self._settle()
+        msg, self.message = self.message, None
+        if msg is None:
+            return
+        try:
+            await msg.delete()
+        except discord.HTTPException:
+            log.debug("Oráculo: no se pudo borrar el parcial %s.", msg.id, exc_info=True)
+
+
 @dataclass
 class OraclePending:
     """Estado para seguir la charla respondiendo al último mensaje del oráculo en un canal."""
@@ -1467,23 +1640,32 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         self.db = getattr(bot, "economia_db", None)
         self.task_config = getattr(bot, "task_config", None) or {}
         super().__init__()
-        self._oracle_times: dict[int, Deque[float]] = defaultdict(deque)
-        # Seguimiento: (guild_id, channel_id, user_id) → última consulta respondible
-        self._oracle_pending: Dict[Tuple[int, int, int], OraclePending] = {}
-        self._followup_times: dict[int, Deque[float]] = defaultdict(deque)
+        self._limits = get_rate_limits()
+        # Seguimiento: (guild_id, channel_id, user_id) → última consulta respondible.
+        # Vive `ORACLE_PENDING_GRACE_SECONDS` más que el hilo, para poder avisar “se cerró la ventana”.
+        self._oracle_pending: ExpiringMap[Tuple[int, int, int], OraclePending] = ExpiringMap("oracle_pending")
+
+    def state_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Tamaño del estado en memoria (hilos pendientes y limitadores del oráculo)."""
+        out = {self._oracle_pending.name: self._oracle_pending.stats()}
+        for name in ("oracle_question", "oracle_followup", "oracle_media_daily", "oracle_media_cooldown"):
+            lim = self._limits.get(name)
+            if lim is not None:
+                out[name] = lim.stats()
+        return out
+
+    def _question_limiter(self) -> SlidingWindowLimiter:
+        return self._limits.sliding_window(
+            "oracle_question", limit=self._COOLDOWN_RATE, window=self._COOLDOWN_PER_SEC
+        )
 
     def _oracle_cooldown_retry_after(self, user_id: int) -> float:
         """Si está en cooldown, devuelve segundos restantes; si no, 0."""
-        now = time.monotonic()
-        dq = self._oracle_times[user_id]
-        while dq and dq[0] < now - self._COOLDOWN_PER_SEC:
-            dq.popleft()
-        if len(dq) >= self._COOLDOWN_RATE:
-            return max(0.1, self._COOLDOWN_PER_SEC - (now - dq[0]))
-        return 0.0
+        wait = self._question_limiter().retry_after(user_id)
+        return max(0.1, wait) if wait > 0 else 0.0
 
     def _oracle_mark_use(self, user_id: int) -> None:
-        self._oracle_times[user_id].append(time.monotonic())
+        self._question_limiter().hit(user_id)
 
     # --- Media / visión (adjuntos, stickers, emotes) ---
     def _oracle_media_cooldown_sec(self) -> int:
@@ -1548,7 +1730,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                 b = await attachment.read()
                 if len(b) > self._oracle_media_max_bytes():
                     return None, "la imagen es muy pesada"
-                return b, f"adjunto: {attachment.filename}"
+                return await image_prep().prepare(b), f"adjunto: {attachment.filename}"
             except Exception:
                 return None, "no pude leer el adjunto"
 
@@ -1564,7 +1746,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                     b = await att.read()
                     if len(b) > self._oracle_media_max_bytes():
                         continue
-                    return b, f"adjunto: {att.filename}"
+                    return await image_prep().prepare(b), f"adjunto: {att.filename}"
                 except Exception:
                     continue
 
@@ -1590,25 +1772,8 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         return None, "no encontré imagen/sticker/emote descargable"
 
     async def _download_image_url(self, url: str, *, label: str) -> Tuple[Optional[bytes], str]:
-        u = (url or "").strip()
-        if not u.startswith("http"):
-            return None, "url inválida"
-        maxb = self._oracle_media_max_bytes()
-        try:
-            timeout = aiohttp.ClientTimeout(total=8.0, connect=4.0, sock_read=6.0)
-            async with aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": "AnimeAlToque-Oracle/1.0"}) as s:
-                async with s.get(u) as resp:
-                    if resp.status != 200:
-                        return None, f"{label} HTTP {resp.status}"
-                    ctype = (resp.headers.get("Content-Type") or "").lower()
-                    if not ctype.startswith("image/"):
-                        return None, f"{label} no es imagen"
-                    data = await resp.content.read(maxb + 1)
-                    if len(data) > maxb:
-                        return None, f"{label} muy grande"
-                    return data, f"{label}: {u.split('?')[0][-64:]}"
-        except Exception:
-            return None, f"{label} no descargable"
+        # Sesión compartida + caché por URL/contenido; devuelve la imagen ya reducida para el modelo.
+        return await image_prep().fetch(url, max_bytes=self._oracle_media_max_bytes(), label=label)
 
     def _conversation_ttl_seconds(self) -> int:
         try:
@@ -1616,20 +1781,29 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         except ValueError:
             return 300
 
+    def _state_sweep_seconds(self) -> int:
+        try:
+            return max(5, min(3600, int(os.getenv("ORACLE_STATE_SWEEP_SECONDS", "60") or 60)))
+        except ValueError:
+            return 60
+
+    def _pending_grace_seconds(self) -> int:
+        try:
+            return max(0, min(86400, int(os.getenv("ORACLE_PENDING_GRACE_SECONDS", "1800") or 1800)))
+        except ValueError:
+            return 1800
+
+    def _followup_limiter(self) -> SlidingWindowLimiter:
+        # Más suave que la consulta inicial: 10 mensajes cada 40s.
+        return self._limits.sliding_window("oracle_followup", limit=10, window=40.0)
+
     def _followup_cooldown_retry_after(self, user_id: int) -> float:
         """Evita spam en el hilo del oráculo (más suave que la consulta inicial)."""
-        window = 40.0
-        max_msgs = 10
-        now = time.monotonic()
-        dq = self._followup_times[user_id]
-        while dq and dq[0] < now - window:
-            dq.popleft()
-        if len(dq) >= max_msgs:
-            return max(0.5, window - (now - dq[0]))
-        return 0.0
+        wait = self._followup_limiter().retry_after(user_id)
+        return max(0.5, wait) if wait > 0 else 0.0
 
     def _followup_mark(self, user_id: int) -> None:
-        self._followup_times[user_id].append(time.monotonic())
+        self._followup_limiter().hit(user_id)
 
     def _quip_llm_enabled(self) -> bool:
         return (os.getenv("ORACLE_QUIP_USE_LLM") or "1").strip().lower() not in ("0", "false", "no", "off")
@@ -1680,7 +1854,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             "Tu respuesta (1 frase):"
         )
         try:
-            out = await oracle_local_reply(prompt, style="open")
+            out = await oracle_local_reply(prompt, style="open", priority="quip")
             out_s = " ".join((out or "").split()).strip()
             if out_s:
                 # límite extra (no queremos párrafos)
@@ -1706,12 +1880,17 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         if not g:
             return
         key = (g.id, bot_message.channel.id, user.id)
-        self._oracle_pending[key] = OraclePending(
-            bot_message_id=bot_message.id,
-            original_question=(original_question or "").strip()[:900],
-            last_answer=(last_answer or "").strip()[:900],
-            response_kind=response_kind,
-            deadline_monotonic=time.monotonic() + float(self._conversation_ttl_seconds()),
+        ttl = float(self._conversation_ttl_seconds())
+        self._oracle_pending.put(
+            key,
+            OraclePending(
+                bot_message_id=bot_message.id,
+                original_question=(original_question or "").strip()[:900],
+                last_answer=(last_answer or "").strip()[:900],
+                response_kind=response_kind,
+                deadline_monotonic=time.monotonic() + ttl,
+            ),
+            ttl + self._pending_grace_seconds(),
         )
 
     def _refresh_oracle_pending(
@@ -1724,12 +1903,17 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         cur = self._oracle_pending.get(key)
         if not cur:
             return
-        self._oracle_pending[key] = OraclePending(
-            bot_message_id=new_bot_message.id,
-            original_question=cur.original_question,
-            last_answer=(new_last_answer or "").strip()[:900],
-            response_kind=cur.response_kind,
-            deadline_monotonic=time.monotonic() + float(self._conversation_ttl_seconds()),
+        ttl = float(self._conversation_ttl_seconds())
+        self._oracle_pending.put(
+            key,
+            OraclePending(
+                bot_message_id=new_bot_message.id,
+                original_question=cur.original_question,
+                last_answer=(new_last_answer or "").strip()[:900],
+                response_kind=cur.response_kind,
+                deadline_monotonic=time.monotonic() + ttl,
+            ),
+            ttl + self._pending_grace_seconds(),
         )
 
     @staticmethod
@@ -1773,6 +1957,13 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             log.warning("Oráculo: no se pudo enviar el aviso de fallo: %s", re)
 
     async def cog_load(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.register(
+                "oraculo", self._on_oracle_message, owner=self,
+                predicate=lambda ctx: ctx.mentions_bot or ctx.reply_to is not None,
+            )
+        self._oracle_pending.start_sweeper(self._state_sweep_seconds())
         if _oracle_use_llm():
             try:
                 from cogs.oracle_llm import oracle_log_host
@@ -1802,12 +1993,30 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             )
 
     async def cog_unload(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+        self._oracle_pending.stop_sweeper()
+        log.info("Oráculo: estado en memoria %s", self.state_stats())
+        log.info("Oráculo: clasificador de intención %s", _ORACLE_INTENTS.stats())
         try:
-            from cogs.oracle_llm import close_oracle_http
+            from cogs.oracle_llm import close_oracle_http, oracle_llm_cache_stats, oracle_llm_scheduler_stats
 
+            log.info("Oráculo: caché de respuestas LLM %s", oracle_llm_cache_stats())
+            log.info("Oráculo: cola de Ollama %s", oracle_llm_scheduler_stats())
             await close_oracle_http()
         except Exception:
             log.debug("Oráculo: no se pudo cerrar sesión HTTP de oracle_llm (ignorado).", exc_info=True)
+        try:
+            from cogs.oracle_context import context_cache
+            from cogs.oracle_wiki import close_wiki_http
+
+            log.info("Oráculo: caché de contexto web/Wikipedia %s", context_cache().stats())
+            await close_wiki_http()
+        except Exception:
+            log.debug("Oráculo: no se pudo cerrar sesión HTTP de oracle_wiki (ignorado).", exc_info=True)
+        log.info("Oráculo: preproceso de imágenes %s", image_prep().stats())
+        await close_image_prep()
 
     async def _build_oracle_embed(
         self,
@@ -1819,15 +2028,17 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         pregunta_para_modelo: Optional[str] = None,
         media_image_bytes: Optional[bytes] = None,
         media_note: Optional[str] = None,
+        on_partial: Optional[Callable[[str], None]] = None,
     ) -> Tuple[discord.Embed, str, _OracleResponseKind]:
         assert self.db is not None
-        self.db.ensure_user_exists(author_id)
+        await self.db.aio.ensure_user_exists(author_id)
         pq_plain = pregunta.strip()
         pq_user = (pregunta_para_modelo or pregunta).strip()
         use_llm = _oracle_use_llm()
+        intent = _classify_oracle_question(pq_plain, pq_user)
 
         # Saludos / mensajes ultra cortos: responder directo, sin IA ni plantillas raras.
-        if _is_oracle_greeting(pq_plain):
+        if intent == "greeting":
             body = _oracle_greeting_answer(nombre_visible)
             emb = self._embed_respuesta(
                 nombre_visible=nombre_visible,
@@ -1839,21 +2050,20 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             return emb, body, "open"
 
         # Derivadas simples: responder local (rápido y correcto) en vez de IA/dado.
-        d_expr = _parse_derivative_expression(pq_plain)
-        if d_expr:
+        if intent == "derivative":
+            d_expr = _parse_derivative_expression(pq_plain)
             d = _derive_simple(d_expr)
-            if d is not None:
-                body = f"`d/dx ({d_expr})` → **{d}**"
-                emb = self._embed_respuesta(
-                    nombre_visible=nombre_visible,
-                    mencion=mencion,
-                    pregunta=pregunta.strip(),
-                    body=body,
-                    response_kind="math",
-                )
-                return emb, body, "math"
+            body = f"`d/dx ({d_expr})` → **{d}**"
+            emb = self._embed_respuesta(
+                nombre_visible=nombre_visible,
+                mencion=mencion,
+                pregunta=pregunta.strip(),
+                body=body,
+                response_kind="math",
+            )
+            return emb, body, "math"
         # Ruleta (negro/rojo/verde): siempre pick local; el LLM en modo sí/no no entiende el contexto.
-        if _is_roulette_color_question(pq_plain):
+        if intent == "roulette":
             rb = _oracle_roulette_pick(pq_plain)
             emb = self._embed_respuesta(
                 nombre_visible=nombre_visible,
@@ -1863,7 +2073,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                 response_kind="yesno",
             )
             return emb, rb, "yesno"
-        if _is_poker_push_decision_question(pq_plain):
+        if intent == "poker":
             pb = _oracle_poker_push_answer()
             emb = self._embed_respuesta(
                 nombre_visible=nombre_visible,
@@ -1873,7 +2083,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                 response_kind="yesno",
             )
             return emb, pb, "yesno"
-        if _is_multi_option_or_recommendation(pq_plain):
+        if intent == "multi_option":
             mb = _oracle_multi_option_pick(pq_plain)
             emb = self._embed_respuesta(
                 nombre_visible=nombre_visible,
@@ -1885,7 +2095,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             return emb, mb, "yesno"
 
         # Opinión sí/no ultra común: responder rápido, sin IA ni web.
-        if _oracle_is_fast_opinion_yesno(pq_plain):
+        if intent == "fast_opinion":
             _, body, _ = _roll_oracle()
             emb = self._embed_respuesta(
                 nombre_visible=nombre_visible,
@@ -1896,7 +2106,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             )
             return emb, body, "yesno"
         # Cuenta resuelta en el bot primero (rápido): evita que una regex “abierta” fuerce IA antes que `2+2`.
-        if _is_simple_arithmetic_question(pq_plain):
+        if intent == "arithmetic":
             expr = _extract_arithmetic_expression_for_eval(pq_plain)
             val = _safe_eval_arithmetic(expr) if expr else None
             if val is not None:
@@ -1919,7 +2129,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                                 pq_llm = (pq_llm + "\n\n[Contexto visual]\n" + media_note).strip()
                             llm = await oracle_local_reply_with_images(pq_llm, images_bytes=[media_image_bytes], style="open")
                     else:
-                        llm = await oracle_local_reply(pq_user, style="open") if use_llm else None
+                        llm = await oracle_local_reply(pq_user, style="open", on_partial=on_partial) if use_llm else None
                     if llm:
                         body, response_kind = llm, "llm"
                     elif _is_open_ended_question(pq_user):
@@ -1935,7 +2145,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                             "probá con `+ - * / % ^ ( )` y números simples."
                         )
                         response_kind = "open"
-        elif _is_open_ended_question(pq_user):
+        elif intent == "open":
             media_first = await oracle_media_open_reply_async(pq_user)
             if media_first:
                 body, response_kind = media_first, "open"
@@ -1953,7 +2163,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                             pq_llm = (pq_llm + "\n\n[Contexto visual]\n" + media_note).strip()
                         llm = await oracle_local_reply_with_images(pq_llm, images_bytes=[media_image_bytes], style="open")
                 else:
-                    llm = await oracle_local_reply(pq_user, style="open") if use_llm else None
+                    llm = await oracle_local_reply(pq_user, style="open", on_partial=on_partial) if use_llm else None
                 if llm:
                     body, response_kind = llm, "llm"
                 else:
@@ -2010,6 +2220,20 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         gid = getattr(getattr(channel, "guild", None), "id", None)
         cid = getattr(channel, "id", None)
         typing_fn = getattr(channel, "typing", None)
+        stream: Optional[_OracleStreamEdits] = None
+        if _oracle_stream_edits_enabled() and _oracle_use_llm():
+            stream = _OracleStreamEdits(
+                channel,
+                reference=reference,
+                make_embed=lambda partial: self._embed_respuesta(
+                    nombre_visible=nombre_visible,
+                    mencion=author.mention,
+                    pregunta=pregunta.strip(),
+                    body=partial,
+                    response_kind="llm",
+                ),
+                interval=_oracle_stream_edit_interval(),
+            )
 
         async def _build() -> Tuple[discord.Embed, str, _OracleResponseKind]:
             media_b: Optional[bytes] = None
@@ -2018,20 +2242,28 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             if self._oracle_media_enabled() and _oracle_use_llm():
                 # Rate limits (solo para media)
                 if self.db:
-                    lim = self.db.get_oracle_media_limits(author.id)
-                    now = int(time.time())
+                    # En memoria (servicio de rate limit, persistido en .run/): nada de SQLite por pregunta.
                     cd = self._oracle_media_cooldown_sec()
                     maxd = self._oracle_media_max_per_day()
-                    if maxd > 0 and int(lim.get("uses_today") or 0) >= maxd:
+                    fecha, _ = self.db.get_current_date_keys()
+                    day_key = f"{author.id}:{fecha}"
+                    daily = self._limits.sliding_window(
+                        "oracle_media_daily", limit=max(1, maxd), window=86400.0, persist=True
+                    )
+                    cooldown = self._limits.sliding_window(
+                        "oracle_media_cooldown", limit=1, window=float(cd), persist=True
+                    )
+                    if maxd > 0 and daily.retry_after(day_key) > 0:
                         media_note = "(Media) Límite diario alcanzado: hoy ya no puedo analizar más imágenes."
-                    elif cd > 0 and now - int(lim.get("last_ts") or 0) < cd:
+                    elif cd > 0 and cooldown.retry_after(author.id) > 0:
                         media_note = "(Media) Estás en cooldown de imágenes; probá en unos segundos."
                     else:
                         media_b, info = await self._pick_first_image_source(message=reference, attachment=media_attachment)
                         if media_b:
                             # Nota SOLO para el modelo; no queremos meter URLs en el “tema” del fallback.
                             media_note = f"Media: {info}. Si ayuda, describí lo que ves."
-                            self.db.bump_oracle_media_use(author.id)
+                            daily.hit(day_key)
+                            cooldown.hit(author.id)
                         else:
                             # Si había intención de media pero no se pudo bajar, dejamos una nota corta.
                             if info and "no encontré" not in info:
@@ -2045,16 +2277,25 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                 pregunta_para_modelo=pregunta_para_modelo,
                 media_image_bytes=media_b,
                 media_note=media_note,
+                on_partial=stream.push if stream else None,
             )
 
         try:
-            if callable(typing_fn):
-                async with typing_fn():
+            try:
+                if callable(typing_fn):
+                    async with typing_fn():
+                        embed, body, response_kind = await _build()
+                else:
                     embed, body, response_kind = await _build()
-            else:
-                embed, body, response_kind = await _build()
-            sent = await channel.send(embed=embed, reference=reference, mention_author=False)
-            self._record_oracle_use(author.id)
+            except Exception:
+                # Si ya se publicó un parcial, no dejarlo colgado con "…" al lado del aviso de error.
+                if stream is not None:
+                    await stream.abort()
+                raise
+            sent = await stream.finish(embed) if stream else None
+            if sent is None:
+                sent = await channel.send(embed=embed, reference=reference, mention_author=False)
+            await self.db.aio.run(self._record_oracle_use, author.id)
             log.info(
                 "Oráculo: consulta publicada guild=%s channel=%s user=%s kind=%s",
                 gid,
@@ -2126,14 +2367,15 @@ class OraculoCog(commands.Cog, name="Oraculo"):
         self, pending: OraclePending, user_line: str
     ) -> Tuple[str, _OracleResponseKind]:
         """Cuenta local → (opcional IA) → dado / plantilla."""
+        fu_intent = _ORACLE_FOLLOWUP_INTENTS.classify(user_line)
         # Halagos / thanks: responder rápido, jocoso, con emote.
-        if _ORACLE_PRAISE_RE.match(user_line or ""):
+        if fu_intent == "praise":
             return _oracle_praise_quip(nombre_visible="amigo"), "open"
 
         # Smalltalk / reacciones cortas: evitar IA (rápido).
-        if _ORACLE_FAST_SMALLTALK_RE.match(user_line or "") and len((user_line or "").strip()) <= 80:
+        if fu_intent == "smalltalk":
             return _oracle_smalltalk_quip(user_line), "open"
-        if _is_simple_arithmetic_question(user_line):
+        if fu_intent == "arithmetic":
             expr = _extract_arithmetic_expression_for_eval(user_line)
             val = _safe_eval_arithmetic(expr) if expr else None
             if val is not None:
@@ -2160,10 +2402,10 @@ class OraculoCog(commands.Cog, name="Oraculo"):
             )
             if llm:
                 return llm, "llm"
-            llm2 = await oracle_local_reply(user_line, style="open")
+            llm2 = await oracle_local_reply(user_line, style="open", priority="followup")
             if llm2:
                 return llm2, "llm"
-        if _is_simple_arithmetic_question(user_line):
+        if fu_intent == "arithmetic":
             return (
                 "No pude resolver esa cuenta; probá solo la expresión (ej. `3*4`) o `?pregunta …`.",
                 "open",
@@ -2437,7 +2679,7 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                 pregunta=pregunta.strip(),
                 author_id=interaction.user.id,
             )
-            self._record_oracle_use(interaction.user.id)
+            await self.db.aio.run(self._record_oracle_use, interaction.user.id)
             log.info(
                 "Oráculo: slash /aat-consulta publicada user=%s kind=%s",
                 interaction.user.id,
@@ -2609,7 +2851,11 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                     )
                 else:
                     # Si no se pudo parsear el embed, contestamos como fallback.
-                    llm = await oracle_local_reply(user_text, style="open") if _oracle_use_llm() else None
+                    llm = (
+                        await oracle_local_reply(user_text, style="open", priority="followup")
+                        if _oracle_use_llm()
+                        else None
+                    )
                     if llm:
                         esc = discord.utils.escape_markdown(user_text)[:500]
                         esc_r = discord.utils.escape_markdown(llm)
@@ -2684,7 +2930,11 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                         persist_pending=False,
                     )
                 else:
-                    llm = await oracle_local_reply(user_text, style="open") if _oracle_use_llm() else None
+                    llm = (
+                        await oracle_local_reply(user_text, style="open", priority="followup")
+                        if _oracle_use_llm()
+                        else None
+                    )
                     if llm:
                         esc = discord.utils.escape_markdown(user_text)[:500]
                         esc_r = discord.utils.escape_markdown(llm)
@@ -2775,23 +3025,20 @@ class OraculoCog(commands.Cog, name="Oraculo"):
                 pass
             return True
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
-            return
+    async def _on_oracle_message(self, ctx: MessageContext):
+        message = ctx.message
         me = self.bot.user
         if not me:
             return
 
-        if message.reference:
+        if ctx.reply_to is not None:
             if await self._maybe_handle_oracle_thread_reply(message):
                 return
 
-        if not _message_pings_bot(message, me):
+        if not ctx.mentions_bot:
             return
         # Evitar doble respuesta si usaron comando con prefijo (el propio handler ya contestó / falló).
-        raw = (message.content or "").lstrip()
-        if raw.startswith("?"):
+        if ctx.prefix == "?":
             return
 
         pregunta = self._strip_mentions_for_question(message.content)
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import random
 import re
-import time
-from collections import defaultdict, deque
-from typing import Deque, Dict, List
+from typing import List
 
 import discord
 from discord.ext import commands
 
+from cogs.message_router import MessageContext, get_router
+from cogs.rate_limit import get_rate_limits
+
 try:
     from data.pala_respuestas import PALA_FUNNY, PALA_QUESTIONS
 except ImportError:
@@ -71,35 +72,32 @@ class PalaCog(commands.Cog, name="Pala"):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self._times: Dict[int, Deque[float]] = defaultdict(deque)  # user_id → timestamps
+        # Máx 2 respuestas por 25s por usuario.
+        self._limiter = get_rate_limits().sliding_window("pala", limit=2, window=25.0)
+
+    async def cog_load(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            # Evitar disparar por comandos (`?` / `/`).
+            router.register(
+                "pala", self._on_pala, owner=self,
+                predicate=lambda ctx: not ctx.prefix and _PALA_RE.search(ctx.text) is not None,
+            )
+
+    async def cog_unload(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
 
     def _cooldown_retry_after(self, user_id: int) -> float:
-        # Máx 2 respuestas por 25s por usuario.
-        window = 25.0
-        rate = 2
-        now = time.monotonic()
-        dq = self._times[user_id]
-        while dq and dq[0] < now - window:
-            dq.popleft()
-        if len(dq) >= rate:
-            return max(0.1, window - (now - dq[0]))
-        return 0.0
+        wait = self._limiter.retry_after(user_id)
+        return max(0.1, wait) if wait > 0 else 0.0
 
     def _mark(self, user_id: int) -> None:
-        self._times[user_id].append(time.monotonic())
+        self._limiter.hit(user_id)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        if message.author.bot or not message.guild:
-            return
-        content = message.content or ""
-        if not content:
-            return
-        # Evitar disparar por comandos.
-        if content.lstrip().startswith(("?", "/")):
-            return
-        if not _PALA_RE.search(content):
-            return
+    async def _on_pala(self, ctx: MessageContext) -> None:
+        message = ctx.message
         wait = self._cooldown_retry_after(message.author.id)
         if wait > 0:
             return
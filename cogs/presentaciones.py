@@ -12,6 +12,8 @@ from discord.ext import commands
 from dotenv import load_dotenv
 import os
 
+from cogs.message_router import MessageContext, get_router
+
 load_dotenv()
 log = logging.getLogger(__name__)
 
@@ -77,6 +79,18 @@ class PresentacionesCog(commands.Cog):
         self.bot = bot
         self._startup_sync_started = False
 
+    async def cog_load(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.register(
+                "presentaciones.post", self._on_presentacion, owner=self, channels=(CHANNEL_ID_PRESENTACION,)
+            )
+
+    async def cog_unload(self) -> None:
+        router = get_router(self.bot)
+        if router:
+            router.unregister_owner(self)
+
     @staticmethod
     def _tiene_bypass(member: discord.Member) -> bool:
         return bool(HOKAGE_ROLE_ID and any(r.id == HOKAGE_ROLE_ID for r in member.roles))
@@ -284,13 +298,9 @@ class PresentacionesCog(commands.Cog):
 
         asyncio.create_task(_run())
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or message.guild is None:
-            return
-        if not CHANNEL_ID_PRESENTACION or message.channel.id != CHANNEL_ID_PRESENTACION:
-            return
-
+    async def _on_presentacion(self, ctx: MessageContext):
+        # El router ya filtra bots y el canal de presentaciones.
+        message = ctx.message
         member: discord.Member = message.author  # type: ignore
 
         if self._tiene_bypass(member):
@@ -0,0 +1,299 @@
+# Servicio de rate limit compartido por los cogs (reemplaza deques y timestamps sueltos por cog).
+# Políticas: ventana deslizante (N usos por ventana) y token bucket (ritmo sostenido + ráfaga).
+# Estado en memoria por clave sobre ExpiringMap (se libera solo cuando la clave ya no limita);
+# los limitadores con `persist=True` se vuelcan a .run/rate_limits.json cada tanto y al cerrar.
+# Chequeos O(1): la ventana guarda como mucho `limit` timestamps (deque con maxlen).
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+from cogs.expiring_map import ExpiringMap
+
+log = logging.getLogger(__name__)
+
+# Claves persistibles: int / str (JSON). Las claves tupla sirven sólo en memoria.
+Key = Union[int, str]
+
+
+def get_rate_limits_path() -> Path:
+    raw = (os.getenv("RATE_LIMITS_PATH") or "").strip()
+    if raw:
+        return Path(raw)
+    return Path(__file__).resolve().parent.parent / ".run" / "rate_limits.json"
+
+
+class SlidingWindowLimiter:
+    """Como mucho `limit` usos en los últimos `window` segundos, por clave."""
+
+    kind = "window"
+
+    def __init__(
+        self, name: str, *, limit: int, window: float, persist: bool = False, clock: Callable[[], float] = time.time
+    ):
+        self.name = name
+        self.limit = max(1, int(limit))
+        self.window = float(window)
+        self.persist = persist
+        self._clock = clock
+        self._state: ExpiringMap[Any, Deque[float]] = ExpiringMap(name, clock=clock)
+        self.dirty = False
+        self.allowed = 0
+        self.limited = 0
+
+    def configure(self, *, limit: int, window: float) -> None:
+        """Cambia los parámetros (p. ej. si el .env cambió); el historial por clave se conserva."""
+        self.limit = max(1, int(limit))
+        self.window = float(window)
+
+    def retry_after(self, key: Any) -> float:
+        """Segundos hasta poder usar de nuevo; 0 si ya se puede."""
+        dq = self._state.get(key)
+        if not dq or len(dq) < self.limit:
+            return 0.0
+        # Con `limit` usos guardados, se libera cuando el más viejo de los últimos `limit` sale de la ventana.
+        return max(0.0, dq[-self.limit] + self.window - self._clock())
+
+    def hit(self, key: Any) -> None:
+        now = self._clock()
+        dq = self._state.get(key)
+        if dq is None or dq.maxlen != self.limit:
+            dq = deque(dq or (), maxlen=self.limit)
+        dq.append(now)
+        self._state.put(key, dq, self.window)
+        self.dirty = self.dirty or self.persist
+
+    def acquire(self, key: Any) -> float:
+        """Registra el uso si se puede y devuelve 0; si no, devuelve la espera (sin registrar)."""
+        wait = self.retry_after(key)
+        if wait > 0:
+            self.limited += 1
+            return wait
+        self.hit(key)
+        self.allowed += 1
+        return 0.0
+
+    def count(self, key: Any) -> int:
+        """Usos dentro de la ventana actual."""
+        dq = self._state.get(key)
+        if not dq:
+            return 0
+        edge = self._clock() - self.window
+        return sum(1 for t in dq if t > edge)
+
+    def reset(self, key: Any) -> None:
+        self._state.pop(key)
+        self.dirty = self.dirty or self.persist
+
+    def sweep(self) -> int:
+        return self._state.sweep()
+
+    def snapshot(self) -> List[List[Any]]:
+        return [[k, list(dq)] for k, dq, _d in self._state.items()]
+
+    def restore(self, rows: List[List[Any]]) -> None:
+        now = self._clock()
+        for k, stamps in rows:
+            fresh = [float(t) for t in stamps if float(t) + self.window > now]
+            if fresh:
+                dq = deque(fresh, maxlen=self.limit)
+                self._state.put(k, dq, dq[-1] + self.window - now)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self._state), "allowed": self.allowed, "limited": self.limited}
+
+
+class TokenBucketLimiter:
+    """`capacity` fichas por clave que se recargan a `rate` por segundo; cada uso gasta `cost`."""
+
+    kind = "bucket"
+
+    def __init__(
+        self, name: str, *, rate: float, capacity: float, persist: bool = False, clock: Callable[[], float] = time.time
+    ):
+        self.name = name
+        self.rate = max(1e-9, float(rate))
+        self.capacity = max(1.0, float(capacity))
+        self.persist = persist
+        self._clock = clock
+        # clave → [fichas, instante de la última actualización]; sin entrada = balde lleno.
+        self._state: ExpiringMap[Any, List[float]] = ExpiringMap(name, clock=clock)
+        self.dirty = False
+        self.allowed = 0
+        self.limited = 0
+
+    def configure(self, *, rate: float, capacity: float) -> None:
+        self.rate = max(1e-9, float(rate))
+        self.capacity = max(1.0, float(capacity))
+
+    def _level(self, key: Any, now: float) -> float:
+        st = self._state.get(key)
+        if st is None:
+            return self.capacity
+        return min(self.capacity, st[0] + (now - st[1]) * self.rate)
+
+    def retry_after(self, key: Any, cost: float = 1.0) -> float:
+        level = self._level(key, self._clock())
+        return 0.0 if level >= cost else (cost - level) / self.rate
+
+    def hit(self, key: Any, cost: float = 1.0) -> None:
+        now = self._clock()
+        level = self._level(key, now) - cost
+        # La entrada sólo hace falta hasta que el balde vuelva a estar lleno.
+        self._state.put(key, [level, now], (self.capacity - level) / self.rate)
+        self.dirty = self.dirty or self.persist
+
+    def acquire(self, key: Any, cost: float = 1.0) -> float:
+        wait = self.retry_after(key, cost)
+        if wait > 0:
+            self.limited += 1
+            return wait
+        self.hit(key, cost)
+        self.allowed += 1
+        return 0.0
+
+    def reset(self, key: Any) -> None:
+        self._state.pop(key)
+        self.dirty = self.dirty or self.persist
+
+    def sweep(self) -> int:
+        return self._state.sweep()
+
+    def snapshot(self) -> List[List[Any]]:
+        return [[k, st[0], st[1]] for k, st, _d in self._state.items()]
+
+    def restore(self, rows: List[List[Any]]) -> None:
+        now = self._clock()
+        for k, tokens, ts in rows:
+            level = min(self.capacity, float(tokens) + (now - float(ts)) * self.rate)
+            if level < self.capacity:
+                self._state.put(k, [level, now], (self.capacity - level) / self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self._state), "allowed": self.allowed, "limited": self.limited}
+
+
+Limiter = Union[SlidingWindowLimiter, TokenBucketLimiter]
+
+
+class RateLimitService:
+    """Registro de limitadores por nombre + barrido y guardado periódicos."""
+
+    def __init__(self, path: Optional[Path] = None, *, clock: Callable[[], float] = time.time):
+        self.path = Path(path) if path is not None else get_rate_limits_path()
+        self._clock = clock
+        self._limiters: Dict[str, Limiter] = {}
+        self._saved: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.saves = 0
+
+    def _load_saved(self) -> Dict[str, Any]:
+        if self._saved is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._saved = data if isinstance(data, dict) else {}
+            except (OSError, json.JSONDecodeError, TypeError):
+                self._saved = {}
+        return self._saved
+
+    def _register(self, lim: Limiter) -> Limiter:
+        if lim.persist:
+            saved = self._load_saved().get(lim.name)
+            if isinstance(saved, dict) and saved.get("kind") == lim.kind:
+                try:
+                    lim.restore(saved.get("rows") or [])
+                except (TypeError, ValueError):
+                    log.warning("rate_limit: estado guardado de %s ilegible; se ignora", lim.name)
+        self._limiters[lim.name] = lim
+        return lim
+
+    def sliding_window(self, name: str, *, limit: int, window: float, persist: bool = False) -> SlidingWindowLimiter:
+        """Limitador de ventana `name` (lo crea la primera vez; después actualiza límite y ventana)."""
+        lim = self._limiters.get(name)
+        if isinstance(lim, SlidingWindowLimiter):
+            if lim.limit != limit or lim.window != window:
+                lim.configure(limit=limit, window=window)
+            return lim
+        return self._register(  # type: ignore[return-value]
+            SlidingWindowLimiter(name, limit=limit, window=window, persist=persist, clock=self._clock)
+        )
+
+    def token_bucket(self, name: str, *, rate: float, capacity: float, persist: bool = False) -> TokenBucketLimiter:
+        lim = self._limiters.get(name)
+        if isinstance(lim, TokenBucketLimiter):
+            if lim.rate != rate or lim.capacity != capacity:
+                lim.configure(rate=rate, capacity=capacity)
+            return lim
+        return self._register(  # type: ignore[return-value]
+            TokenBucketLimiter(name, rate=rate, capacity=capacity, persist=persist, clock=self._clock)
+        )
+
+    def get(self, name: str) -> Optional[Limiter]:
+        return self._limiters.get(name)
+
+    def sweep(self) -> int:
+        return sum(lim.sweep() for lim in self._limiters.values())
+
+    def save(self, *, force: bool = False) -> bool:
+        """Vuelca los limitadores persistentes si cambiaron. Devuelve True si escribió."""
+        persisted = [lim for lim in self._limiters.values() if lim.persist]
+        if not persisted or not (force or any(lim.dirty for lim in persisted)):
+            return False
+        data = dict(self._load_saved())
+        for lim in persisted:
+            data[lim.name] = {"kind": lim.kind, "rows": lim.snapshot()}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log.warning("rate_limit: no se pudo guardar %s: %s", self.path, e)
+            return False
+        self._saved = data
+        for lim in persisted:
+            lim.dirty = False
+        self.saves += 1
+        return True
+
+    def start(self, interval: float = 60.0) -> None:
+        """Barrido + guardado cada `interval` segundos en el loop actual (idempotente)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop(max(0.01, float(interval))))
+
+    async def _loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.sweep()
+                self.save()
+            except Exception:
+                log.exception("rate_limit: barrido/guardado falló")
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.save()
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {name: lim.stats() for name, lim in self._limiters.items()}
+        out["saves"] = self.saves
+        return out
+
+
+_SERVICE: Optional[RateLimitService] = None
+
+
+def get_rate_limits() -> RateLimitService:
+    global _SERVICE
+    if _SERVICE is None:
+        _SERVICE = RateLimitService()
+    return _SERVICE
@@ -0,0 +1,291 @@
+# Scheduler compartido de vencimientos (reemplaza los tasks.loop que consultaban SQLite cada N segundos).
+# Cada cog registra un handler por `kind` y agenda trabajos (kind, key) con su instante de vencimiento.
+# Los trabajos viven en un min-heap en memoria respaldado por la tabla `jobs` (.run/scheduler.db): el loop
+# duerme exactamente hasta el próximo vencimiento (o hasta que alguien agende algo antes) y sobrevive reinicios.
+# Handler: `async (key, payload) -> Optional[float]`; si devuelve un timestamp, el trabajo se reagenda ahí.
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[[str, Dict[str, Any]], Awaitable[Optional[float]]]
+JobId = Tuple[str, str]
+
+# Tope de cada siesta: si el reloj de pared salta (suspensión, NTP) el loop se reacomoda igual.
+_MAX_SLEEP = 3600.0
+# Un handler que pide volver a correr "ya" (o en el pasado) espera al menos esto: evita girar en vacío.
+_MIN_RESCHEDULE = 1.0
+# Reintento tras una excepción del handler.
+_RETRY_SECONDS = 60.0
+
+
+def get_scheduler_path() -> Path:
+    raw = (os.getenv("SCHEDULER_DB_PATH") or "").strip()
+    if raw:
+        return Path(raw)
+    return Path(__file__).resolve().parent.parent / ".run" / "scheduler.db"
+
+
+class Scheduler:
+    """Vencimientos persistentes por (kind, key). Agendar de nuevo la misma clave reemplaza el vencimiento."""
+
+    def __init__(self, path: Optional[Path] = None, *, clock: Callable[[], float] = time.time):
+        self.path = Path(path) if path is not None else get_scheduler_path()
+        self._clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._jobs: Dict[JobId, Tuple[float, Dict[str, Any]]] = {}
+        self._heap: List[Tuple[float, int, str, str]] = []
+        self._seq = itertools.count()
+        self._handlers: Dict[str, Handler] = {}
+        # Vencidos sin handler todavía (el cog no cargó): se disparan al registrarlo.
+        self._parked: Dict[str, List[JobId]] = {}
+        # En ejecución: id → True si se canceló mientras corría.
+        self._inflight: Dict[JobId, bool] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self.fired = 0
+        self.failed = 0
+        self.wakeups = 0
+        self._load()
+
+    # --- Persistencia ---
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, isolation_level=None)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    due REAL NOT NULL,
+                    payload TEXT NOT NULL DEFAULT '{}',
+                    PRIMARY KEY (kind, key)
+                )
+                """
+            )
+        return self._conn
+
+    def _load(self) -> None:
+        try:
+            rows = self._db().execute("SELECT kind, key, due, payload FROM jobs").fetchall()
+        except sqlite3.Error as e:
+            log.warning("scheduler: no se pudo leer %s: %s", self.path, e)
+            return
+        for kind, key, due, raw in rows:
+            try:
+                payload = json.loads(raw or "{}")
+            except (TypeError, ValueError):
+                payload = {}
+            self._put(str(kind), str(key), float(due), payload if isinstance(payload, dict) else {})
+
+    def _persist(self, kind: str, key: str, due: float, payload: Dict[str, Any]) -> None:
+        try:
+            self._db().execute(
+                """
+                INSERT INTO jobs (kind, key, due, payload) VALUES (?, ?, ?, ?)
+                ON CONFLICT(kind, key) DO UPDATE SET due = excluded.due, payload = excluded.payload
+                """,
+                (kind, key, due, json.dumps(payload, separators=(",", ":"))),
+            )
+        except sqlite3.Error as e:
+            log.warning("scheduler: no se pudo guardar %s/%s: %s", kind, key, e)
+
+    def _forget(self, kind: str, key: str) -> None:
+        try:
+            self._db().execute("DELETE FROM jobs WHERE kind = ? AND key = ?", (kind, key))
+        except sqlite3.Error as e:
+            log.warning("scheduler: no se pudo borrar %s/%s: %s", kind, key, e)
+
+    # --- API ---
+
+    def _put(self, kind: str, key: str, due: float, payload: Dict[str, Any]) -> None:
+        self._jobs[(kind, key)] = (due, payload)
+        heapq.heappush(self._heap, (due, next(self._seq), kind, key))
+        if len(self._heap) > 2 * len(self._jobs) + 64:
+            self._heap = [(d, next(self._seq), k, kk) for (k, kk), (d, _p) in self._jobs.items()]
+            heapq.heapify(self._heap)
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Handler del tipo de trabajo (un cog por `kind`; re-registrar lo reemplaza)."""
+        self._handlers[kind] = handler
+        for kind_key in self._parked.pop(kind, ()):
+            item = self._jobs.get(kind_key)
+            if item is not None:
+                heapq.heappush(self._heap, (item[0], next(self._seq), kind_key[0], kind_key[1]))
+        self._poke()
+
+    def unregister(self, kind: str) -> None:
+        """Saca el handler; los trabajos quedan agendados (y persistidos) para cuando vuelva."""
+        self._handlers.pop(kind, None)
+
+    def schedule(
+        self, kind: str, key: Any, due: float, payload: Optional[Dict[str, Any]] = None, *, earliest: bool = False
+    ) -> None:
+        """
+        Agenda (o reagenda) el trabajo para el timestamp `due`.
+        Con `earliest=True` sólo adelanta: si ya vence antes, no toca nada (ni la DB).
+        """
+        key = str(key)
+        due = float(due)
+        cur = self._jobs.get((kind, key))
+        if cur is not None and (cur[0] == due or (earliest and cur[0] <= due)):
+            if payload is None or payload == cur[1]:
+                return
+        data = dict(payload) if payload is not None else (cur[1] if cur is not None else {})
+        self._put(kind, key, due, data)
+        self._persist(kind, key, due, data)
+        if not self._heap or self._heap[0][0] >= due:
+            self._poke()
+
+    def cancel(self, kind: str, key: Any) -> bool:
+        kind_key = (kind, str(key))
+        running = kind_key in self._inflight
+        if running:
+            self._inflight[kind_key] = True
+        if self._jobs.pop(kind_key, None) is None and not running:
+            return False
+        self._forget(*kind_key)
+        return True
+
+    def due(self, kind: str, key: Any) -> Optional[float]:
+        item = self._jobs.get((kind, str(key)))
+        return item[0] if item is not None else None
+
+    def jobs(self, kind: Optional[str] = None) -> List[Tuple[str, str, float]]:
+        return sorted(
+            (k, kk, d) for (k, kk), (d, _p) in self._jobs.items() if kind is None or k == kind
+        )
+
+    # --- Loop ---
+
+    def _poke(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _pop_due(self, now: float) -> List[Tuple[str, str, float, Dict[str, Any]]]:
+        out: List[Tuple[str, str, float, Dict[str, Any]]] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due, _seq, kind, key = heapq.heappop(heap)
+            kind_key = (kind, key)
+            item = self._jobs.get(kind_key)
+            # Entrada vieja del heap (la clave se reagendó o canceló) o trabajo que ya está corriendo.
+            if item is None or item[0] != due or kind_key in self._inflight:
+                continue
+            if kind not in self._handlers:
+                self._parked.setdefault(kind, []).append(kind_key)
+                continue
+            del self._jobs[kind_key]
+            self._inflight[kind_key] = False
+            out.append((kind, key, due, item[1]))
+        return out
+
+    def _next_delay(self, now: float) -> Optional[float]:
+        heap = self._heap
+        while heap:
+            due, _seq, kind, key = heap[0]
+            item = self._jobs.get((kind, key))
+            if item is None or item[0] != due or kind not in self._handlers:
+                heapq.heappop(heap)
+                if item is not None and item[0] == due:
+                    self._parked.setdefault(kind, []).append((kind, key))
+                continue
+            return min(_MAX_SLEEP, max(0.0, due - now))
+        return None
+
+    async def _fire(self, kind: str, key: str, due: float, payload: Dict[str, Any]) -> None:
+        kind_key = (kind, key)
+        nxt: Optional[float] = None
+        try:
+            nxt = await self._handlers[kind](key, payload)
+            self.fired += 1
+        except Exception:
+            self.failed += 1
+            log.exception("scheduler: trabajo %s/%s falló; se reintenta", kind, key)
+            nxt = self._clock() + _RETRY_SECONDS
+        finally:
+            cancelled = self._inflight.pop(kind_key, False)
+        if nxt is not None:
+            nxt = max(float(nxt), self._clock() + _MIN_RESCHEDULE)
+        cur = self._jobs.get(kind_key)
+        if cur is not None:
+            # Lo reagendaron mientras corría: gana el vencimiento más cercano (y vuelve al heap,
+            # porque `_pop_due` descarta las entradas de trabajos en ejecución).
+            due_cur = cur[0] if cancelled or nxt is None else min(cur[0], nxt)
+            self._put(kind, key, due_cur, cur[1])
+            self._persist(kind, key, due_cur, cur[1])
+            self._poke()
+            return
+        if cancelled:
+            return
+        if nxt is None:
+            self._forget(kind, key)
+        else:
+            self.schedule(kind, key, nxt, payload)
+
+    async def _run(self, ready: Optional[Callable[[], Awaitable[Any]]]) -> None:
+        if ready is not None:
+            await ready()
+        assert self._wake is not None
+        while True:
+            self._wake.clear()
+            now = self._clock()
+            for kind, key, due, payload in self._pop_due(now):
+                t = asyncio.create_task(self._fire(kind, key, due, payload), name=f"job:{kind}:{key}")
+                self._running.add(t)
+                t.add_done_callback(self._running.discard)
+            delay = self._next_delay(now)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeups += 1
+
+    def start(self, ready: Optional[Callable[[], Awaitable[Any]]] = None) -> None:
+        """Arranca el loop en el loop de asyncio actual (idempotente); `ready` se espera antes del primer disparo."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(ready), name="scheduler")
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for t in list(self._running):
+            t.cancel()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": len(self._jobs),
+            "running": len(self._inflight),
+            "fired": self.fired,
+            "failed": self.failed,
+            "wakeups": self.wakeups,
+        }
+
+
+_SCHEDULER: Optional[Scheduler] = None
+
+
+def get_scheduler() -> Scheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = Scheduler()
+    return _SCHEDULER
@@ -4,21 +4,28 @@ from __future__ import annotations
 import logging
 import os
 import random
+import time
 import urllib.parse
 from datetime import date, datetime, time as dtime, timedelta
 from typing import List, Optional, Tuple
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 from zoneinfo import ZoneInfo
 
 from cogs.impostor.chars import fetch_characters, resolve_anime_for_character
+from cogs.scheduler import get_scheduler
 
 from .db import VersusDB
 
 log = logging.getLogger(__name__)
 
+# Trabajo del scheduler: cierre del versus de la semana y publicación del siguiente (vence domingo 21:00).
+WEEKLY_JOB = "versus.weekly"
+# Si no se pudo publicar el versus de la semana (canal no resuelto, API caída), se reintenta en este plazo.
+_PUBLISH_RETRY_SECONDS = 120.0
+
 
 def _tz() -> ZoneInfo:
     name = os.getenv("VERSUS_TIMEZONE", "Europe/Madrid")
@@ -114,8 +121,8 @@ class VersusVoteView(discord.ui.View):
         poll = cog.db.get_poll(week)
         if not poll or poll.get("closed"):
             return await interaction.response.send_message("Esta votación ya cerró o no existe.", ephemeral=True)
-        cog.db.set_vote(week, interaction.user.id, side)
-        counts = cog._count_sides(week)
+        # set_vote devuelve el conteo ya actualizado (versus_tally + espejo en memoria): sin releer votos.
+        counts = cog.db.set_vote(week, interaction.user.id, side)
         label = self.label_a if side == 0 else self.label_b
         total_v = counts[0] + counts[1]
         if total_v <= 0:
@@ -130,18 +137,27 @@ class VersusVoteView(discord.ui.View):
             lead_pct = p0 if counts[0] > counts[1] else p1
             lead = f"Va ganando: **{lead_side}** (**{lead_pct:.1f}%**)"
 
-        poll_row = cog.db.get_poll(week)
+        await interaction.response.defer(ephemeral=True)
         end_dt = _week_end_from_key(week)
-        if poll_row and end_dt is not None:
-            char_a, char_b = poll_row["char_a"], poll_row["char_b"]
-            public_embed = _versus_embed(week, char_a, char_b, end_dt, counts)
-            await interaction.response.defer(ephemeral=True)
-            try:
-                await interaction.message.edit(embed=public_embed, view=self)
-            except Exception:
-                log.exception("No se pudo actualizar el embed público del VERSUS")
-        else:
-            await interaction.response.defer(ephemeral=True)
+        if end_dt is not None and interaction.message is not None:
+            message = interaction.message
+
+            async def _render_public() -> None:
+                # Se arma al editar: publica el marcador más reciente aunque se hayan juntado varios votos.
+                row = cog.db.get_poll(week)
+                if not row or row.get("closed"):
+                    return
+                embed = _versus_embed(week, row["char_a"], row["char_b"], end_dt, cog._count_sides(week))
+                try:
+                    await message.edit(embed=embed, view=self)
+                except Exception:
+                    log.exception("No se pudo actualizar el embed público del VERSUS")
+
+            renderer = getattr(interaction.client, "poll_renderer", None)
+            if renderer is not None:
+                renderer.schedule(message.id, _render_public)
+            else:
+                await _render_public()
 
         await interaction.followup.send(
             f"✅ Voto: **{label}**\n"
@@ -228,14 +244,14 @@ class SemanalVersusCog(commands.Cog, name="SemanalVersus"):
         self.general_announce_id = int(os.getenv("GENERAL_CHANNEL_ID", "0") or 0)
         self.log = logging.getLogger(self.__class__.__name__)
 
+    async def cog_load(self) -> None:
+        get_scheduler().register(WEEKLY_JOB, self._on_weekly_due)
+
     def cog_unload(self):
-        self.versus_tick.cancel()
+        get_scheduler().unregister(WEEKLY_JOB)
 
     def _count_sides(self, week_key: str) -> Tuple[int, int]:
-        rows = self.db.get_votes(week_key)
-        c0 = sum(1 for r in rows if r["side"] == 0)
-        c1 = len(rows) - c0
-        return c0, c1
+        return self.db.get_counts(week_key)
 
     def _register_view_safe(self, view: discord.ui.View) -> None:
         try:
@@ -302,20 +318,23 @@ class SemanalVersusCog(commands.Cog, name="SemanalVersus"):
     @commands.Cog.listener()
     async def on_ready(self):
         await self._register_persistent_views()
-        if not self.versus_tick.is_running():
-            self.versus_tick.start()
-
-    @tasks.loop(minutes=2)
-    async def versus_tick(self):
-        try:
-            await self._close_due_polls()
-            await self._ensure_current_poll()
-        except Exception:
-            self.log.exception("versus_tick error")
+        # Al arrancar: cerrar lo vencido y asegurar el versus de la semana ya mismo.
+        get_scheduler().schedule(WEEKLY_JOB, "week", time.time(), earliest=True)
 
-    @versus_tick.before_loop
-    async def versus_tick_before(self):
-        await self.bot.wait_until_ready()
+    async def _on_weekly_due(self, key: str, payload: dict) -> Optional[float]:
+        await self._close_due_polls()
+        await self._ensure_current_poll()
+        now = datetime.now(_tz())
+        week_key, end = _active_week_and_close(now)
+        if self.channel_id and not self.db.get_poll(week_key):
+            return time.time() + _PUBLISH_RETRY_SECONDS
+        # Próximo cierre: el de la semana activa o el de un versus viejo que siga abierto (si es antes).
+        due = end.timestamp()
+        for p in self.db.get_open_polls():
+            wk_end = _week_end_from_key(p["week_key"])
+            if wk_end is not None:
+                due = min(due, wk_end.timestamp())
+        return due
 
     async def _close_due_polls(self) -> None:
         tz = _tz()
@@ -357,6 +376,9 @@ class SemanalVersusCog(commands.Cog, name="SemanalVersus"):
             winner, win_votes, loser_name, lose_votes = char_b, c1, char_a, c0
             resumen = f"El ganador de la votación fue **{winner}** con **{win_votes}** votos frente a **{lose_votes}** de **{loser_name}**."
         self.db.mark_closed(week_key)
+        renderer = getattr(self.bot, "poll_renderer", None)
+        if renderer is not None:
+            renderer.cancel(int(poll["message_id"]))
         if msg:
             try:
                 await msg.edit(view=None)
@@ -1,7 +1,8 @@
 # cogs/semanal_versus/db.py
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 DB_FILE = Path(__file__).parent / "versus.db"
 
@@ -9,6 +10,10 @@ DB_FILE = Path(__file__).parent / "versus.db"
 class VersusDB:
     def __init__(self, db_path: Path = DB_FILE):
         self.db_path = db_path
+        # Espejo en memoria por semana: fila de versus_polls y conteo [A, B] (se arma en el primer acceso).
+        self._polls: Dict[str, Dict[str, Any]] = {}
+        self._counts: Dict[str, List[int]] = {}
+        self._lock = threading.RLock()
         self._init()
 
     def _conn(self):
@@ -38,6 +43,25 @@ class VersusDB:
                 )
                 """
             )
+            c.execute(
+                """
+                CREATE TABLE IF NOT EXISTS versus_tally (
+                    week_key TEXT NOT NULL,
+                    side INTEGER NOT NULL,
+                    votes INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (week_key, side)
+                )
+                """
+            )
+            # DBs viejas: arma el conteo de las semanas que todavía no lo tienen.
+            c.execute(
+                """
+                INSERT OR IGNORE INTO versus_tally (week_key, side, votes)
+                SELECT week_key, side, COUNT(*) FROM versus_votes
+                WHERE week_key NOT IN (SELECT DISTINCT week_key FROM versus_tally)
+                GROUP BY week_key, side
+                """
+            )
 
     def insert_poll_new(self, week_key: str, message_id: int, channel_id: int, char_a: str, char_b: str) -> bool:
         """Devuelve True si insertó fila nueva."""
@@ -49,14 +73,27 @@ class VersusDB:
                 """,
                 (week_key, message_id, channel_id, char_a, char_b),
             )
-            return cur.rowcount > 0
+            inserted = cur.rowcount > 0
+        if inserted:
+            with self._lock:
+                self._polls.pop(week_key, None)
+        return inserted
 
     def get_poll(self, week_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._polls.get(week_key)
+            if row is not None:
+                return dict(row)
         with self._conn() as c:
             c.row_factory = sqlite3.Row
             cur = c.execute("SELECT * FROM versus_polls WHERE week_key = ?", (week_key,))
-            row = cur.fetchone()
-            return dict(row) if row else None
+            found = cur.fetchone()
+        if not found:
+            return None
+        row = dict(found)
+        with self._lock:
+            self._polls[week_key] = row
+        return dict(row)
 
     def get_open_polls(self) -> List[Dict[str, Any]]:
         with self._conn() as c:
@@ -64,15 +101,63 @@ class VersusDB:
             cur = c.execute("SELECT * FROM versus_polls WHERE closed = 0")
             return [dict(r) for r in cur.fetchall()]
 
-    def set_vote(self, week_key: str, user_id: int, side: int) -> None:
-        with self._conn() as c:
-            c.execute(
-                """
-                INSERT INTO versus_votes (week_key, user_id, side) VALUES (?, ?, ?)
-                ON CONFLICT(week_key, user_id) DO UPDATE SET side = excluded.side
-                """,
-                (week_key, user_id, side),
-            )
+    def set_vote(self, week_key: str, user_id: int, side: int) -> Tuple[int, int]:
+        """
+        Registra (o cambia) el voto y ajusta versus_tally en la misma transacción.
+        Devuelve el conteo (A, B) ya actualizado.
+        """
+        side = 1 if side else 0
+        with self._lock:
+            with self._conn() as c:
+                c.execute("BEGIN IMMEDIATE")
+                cur = c.execute(
+                    "SELECT side FROM versus_votes WHERE week_key = ? AND user_id = ?", (week_key, user_id)
+                )
+                found = cur.fetchone()
+                prev = int(found[0]) if found else None
+                if prev != side:
+                    c.execute(
+                        """
+                        INSERT INTO versus_votes (week_key, user_id, side) VALUES (?, ?, ?)
+                        ON CONFLICT(week_key, user_id) DO UPDATE SET side = excluded.side
+                        """,
+                        (week_key, user_id, side),
+                    )
+                    c.execute(
+                        """
+                        INSERT INTO versus_tally (week_key, side, votes) VALUES (?, ?, 1)
+                        ON CONFLICT(week_key, side) DO UPDATE SET votes = votes + 1
+                        """,
+                        (week_key, side),
+                    )
+                    if prev is not None:
+                        # Cambio de bando: el voto sale del otro lado.
+                        c.execute(
+                            "UPDATE versus_tally SET votes = MAX(0, votes - 1) WHERE week_key = ? AND side = ?",
+                            (week_key, prev),
+                        )
+            counts = self._counts.get(week_key)
+            if counts is None:
+                return self.get_counts(week_key)
+            if prev != side:
+                counts[side] += 1
+                if prev is not None:
+                    counts[prev] = max(0, counts[prev] - 1)
+            return counts[0], counts[1]
+
+    def get_counts(self, week_key: str) -> Tuple[int, int]:
+        """Votos (A, B) de la semana: del espejo en memoria o, la primera vez, de versus_tally."""
+        with self._lock:
+            counts = self._counts.get(week_key)
+            if counts is None:
+                counts = [0, 0]
+                with self._conn() as c:
+                    for side, votes in c.execute(
+                        "SELECT side, votes FROM versus_tally WHERE week_key = ?", (week_key,)
+                    ):
+                        counts[1 if side else 0] = int(votes)
+                self._counts[week_key] = counts
+            return counts[0], counts[1]
 
     def get_votes(self, week_key: str) -> List[Dict[str, Any]]:
         with self._conn() as c:
@@ -83,6 +168,10 @@ class VersusDB:
     def mark_closed(self, week_key: str) -> None:
         with self._conn() as c:
             c.execute("UPDATE versus_polls SET closed = 1 WHERE week_key = ?", (week_key,))
+        # Cerrada ya no recibe votos: sale del espejo (el conteo queda en versus_tally).
+        with self._lock:
+            self._polls.pop(week_key, None)
+            self._counts.pop(week_key, None)
 
     def update_poll_message(self, week_key: str, message_id: int, channel_id: Optional[int] = None) -> None:
         """Tras reinicio: mismo versus pero nuevo message_id (ej. mensaje borrado)."""
@@ -94,3 +183,5 @@ class VersusDB:
                 )
             else:
                 c.execute("UPDATE versus_polls SET message_id = ? WHERE week_key = ?", (message_id, week_key))
+        with self._lock:
+            self._polls.pop(week_key, None)
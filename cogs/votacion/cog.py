@@ -1,7 +1,7 @@
 # cogs/votacion/cog.py
 import os
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from typing import Optional, List, Literal, TYPE_CHECKING, Set
 import logging
@@ -11,9 +11,14 @@ import datetime
 if TYPE_CHECKING:
     from .db_manager import PollDBManagerV5
 
+from cogs.scheduler import get_scheduler
+
 from .poll_view import PollView, create_poll_embed
 from .poll_modal import PollEditModal
 
+# Trabajo del scheduler: cierre automático de cada votación (clave = message_id, vence en end_timestamp).
+POLL_END_JOB = "votacion.poll_end"
+
 VoteDisplayFormat = Literal["Ambos (Números y %)", "Solo Números", "Solo Porcentaje", "Ocultar hasta el cierre"]
 UserPollDuration = Literal["10 Minutos", "20 Minutos", "30 Minutos", "60 Minutos"]
 
@@ -173,10 +178,31 @@ class VotacionCog(commands.Cog):
         self.bot = bot
         self.db: "PollDBManagerV5" = bot.db_manager
         self.log = logging.getLogger(self.__class__.__name__)
-        self.check_expired_polls.start()
+
+    async def cog_load(self) -> None:
+        sch = get_scheduler()
+        sch.register(POLL_END_JOB, self._on_poll_end_due)
+        # Votaciones con cierre creadas antes del scheduler: se agendan una vez al cargar.
+        for poll in self.db.get_active_polls():
+            if poll.get("end_timestamp"):
+                sch.schedule(POLL_END_JOB, poll["message_id"], float(poll["end_timestamp"]), earliest=True)
 
     def cog_unload(self):
-        self.check_expired_polls.cancel()
+        get_scheduler().unregister(POLL_END_JOB)
+
+    def _arm_poll_end(self, message_id: int, end_timestamp: Optional[int]) -> None:
+        if end_timestamp:
+            get_scheduler().schedule(POLL_END_JOB, message_id, float(end_timestamp))
+
+    async def _on_poll_end_due(self, key: str, payload: dict) -> Optional[float]:
+        poll_data = self.db.get_poll_data(int(key))
+        if not poll_data or not poll_data.get("is_active") or not poll_data.get("end_timestamp"):
+            return None
+        if int(poll_data["end_timestamp"]) > time.time():
+            return float(poll_data["end_timestamp"])
+        self.log.info(f"Votación {poll_data['message_id']} ha expirado. Cerrando automáticamente...")
+        await self._close_poll_and_update_message(poll_data)
+        return None
 
     async def votacion_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         polls = self.db.get_active_polls_by_title(current)
@@ -210,6 +236,9 @@ class VotacionCog(commands.Cog):
         message_id = poll_data['message_id']
         channel_id = poll_data['channel_id']
         self.db.close_poll(message_id)
+        get_scheduler().cancel(POLL_END_JOB, message_id)
+        # Un re-render de voto pendiente pisaría el embed final (con botones habilitados).
+        self.bot.poll_renderer.cancel(message_id)
         try:
             channel = self.bot.get_channel(channel_id)
             if not channel:
@@ -242,6 +271,13 @@ class VotacionCog(commands.Cog):
             return False
             
     async def _update_poll_message(self, message_id: int, channel_id: int):
+        """Re-render del mensaje pasando por el scheduler (se junta con los votos pendientes del mismo mensaje)."""
+        result = await self.bot.poll_renderer.schedule(
+            message_id, lambda: self._render_poll_message(message_id, channel_id), structural=True
+        )
+        return result if result is not None else (False, "No se pudo actualizar el mensaje.")
+
+    async def _render_poll_message(self, message_id: int, channel_id: int):
         try:
             channel = self.bot.get_channel(channel_id)
             if not channel:
@@ -331,6 +367,7 @@ class VotacionCog(commands.Cog):
                 formato_votos="ambos",
                 end_timestamp=end_timestamp,
             )
+            self._arm_poll_end(poll_message.id, end_timestamp)
         except Exception as e:
             self.log.exception("create_shop_poll DB: %s", e)
             try:
@@ -412,6 +449,7 @@ class VotacionCog(commands.Cog):
                 formato_votos="ambos",
                 end_timestamp=end_timestamp
             )
+            self._arm_poll_end(poll_message.id, end_timestamp)
         except Exception as e:
             self.log.exception(f"Error al guardar votacion (basica) en DB: {e}")
             await poll_message.delete()
@@ -551,6 +589,7 @@ class VotacionCog(commands.Cog):
                 formato_votos=formato_db,
                 end_timestamp=end_timestamp
             )
+            self._arm_poll_end(poll_message.id, end_timestamp)
         except Exception as e:
             self.log.exception(f"Error al guardar votacion (admin) en DB: {e}")
             await poll_message.delete()
@@ -790,24 +829,6 @@ class VotacionCog(commands.Cog):
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 
-    @tasks.loop(minutes=1.0)
-    async def check_expired_polls(self):
-        try:
-            current_time = int(time.time())
-            expired_polls = self.db.get_expired_polls(current_time)
-            
-            for poll_data in expired_polls:
-                self.log.info(f"Votación {poll_data['message_id']} ha expirado. Cerrando automáticamente...")
-                await self._close_poll_and_update_message(poll_data)
-                
-        except Exception as e:
-            self.log.error(f"Error en el loop de expirar votaciones: {e}")
-
-    @check_expired_polls.before_loop
-    async def before_check_expired_polls(self):
-        await self.bot.wait_until_ready()
-        self.log.info("Iniciando loop de revisión de votaciones expiradas.")
-        
     @crear_votacion.error
     @crear_votacion_admin.error
     @finalizar_votacion.error
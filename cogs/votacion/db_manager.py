@@ -1,15 +1,52 @@
 # cogs/votacion/db_manager.py
 import sqlite3
 import datetime
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 
 DB_FILE = Path(__file__).parent / "votacion.db"
 
+
+class _PollTally:
+    """Encuesta en memoria: fila de `polls`, opciones, conteo por opción y votos de cada usuario."""
+
+    __slots__ = ("poll", "options", "counts", "user_votes")
+
+    def __init__(self, poll: Dict[str, Any], options: List[Dict[str, Any]]):
+        self.poll = poll
+        self.options = options  # [{option_id, label}] en orden de option_id
+        self.counts: Dict[int, int] = {int(o["option_id"]): 0 for o in options}
+        self.user_votes: Dict[int, Set[int]] = {}
+
+    def add(self, user_id: int, option_id: int) -> None:
+        self.user_votes.setdefault(user_id, set()).add(option_id)
+        self.counts[option_id] = self.counts.get(option_id, 0) + 1
+
+    def remove(self, user_id: int, option_id: int) -> None:
+        votes = self.user_votes.get(user_id)
+        if votes is not None:
+            votes.discard(option_id)
+            if not votes:
+                del self.user_votes[user_id]
+        self.counts[option_id] = max(0, self.counts.get(option_id, 0) - 1)
+
+    def as_poll_data(self) -> Dict[str, Any]:
+        data = dict(self.poll)
+        data["options"] = [
+            {"option_id": o["option_id"], "label": o["label"], "vote_count": self.counts.get(int(o["option_id"]), 0)}
+            for o in self.options
+        ]
+        return data
+
+
 class PollDBManagerV5:
     def __init__(self, db_path: Path = DB_FILE):
         self.db_path = db_path
+        # Conteos por encuesta (se cargan en el primer clic y se mantienen con add_vote / remove_vote).
+        self._tallies: Dict[int, _PollTally] = {}
+        self._tally_lock = threading.RLock()
         self._create_tables()
         self._check_and_update_schema()
 
@@ -81,6 +118,9 @@ class PollDBManagerV5:
                     cursor.execute("ALTER TABLE polls RENAME COLUMN vote_limit TO vote_limit_old_2")
                     print("DATABASE MIGRATED: Renamed old 'vote_limit' column.")
 
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_poll_votes_option ON poll_votes (option_id)")
+                conn.commit()
+
             except Exception as e:
                 print(f"Error actualizando el schema de la DB: {e}")
 
@@ -119,9 +159,13 @@ class PollDBManagerV5:
                 VALUES (?, ?, ?)
                 """, (message_id, option_id, user_id))
                 conn.commit()
-                return True
             except sqlite3.IntegrityError:
                 return False
+        with self._tally_lock:
+            tally = self._tallies.get(message_id)
+            if tally is not None:
+                tally.add(user_id, option_id)
+        return True
 
     def remove_vote(self, message_id: int, user_id: int, option_id: int) -> bool:
         with self._get_connection() as conn:
@@ -131,43 +175,67 @@ class PollDBManagerV5:
             WHERE message_id = ? AND user_id = ? AND option_id = ?
             """, (message_id, user_id, option_id))
             conn.commit()
-            return cursor.rowcount > 0
+            removed = cursor.rowcount > 0
+        if removed:
+            with self._tally_lock:
+                tally = self._tallies.get(message_id)
+                if tally is not None:
+                    tally.remove(user_id, option_id)
+        return removed
 
     # --- ¡¡¡LA FUNCIÓN QUE FALTABA!!! ---
     def get_user_votes_for_poll(self, message_id: int, user_id: int) -> List[int]:
         """Obtiene las option_id por las que un usuario ya votó en esta encuesta."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT option_id FROM poll_votes 
-                WHERE message_id = ? AND user_id = ?
-            """, (message_id, user_id))
-            return [row[0] for row in cursor.fetchall()]
+        tally = self._get_tally(message_id)
+        if tally is None:
+            return []
+        with self._tally_lock:
+            return sorted(tally.user_votes.get(user_id, ()))
+
+    def _get_tally(self, message_id: int) -> Optional[_PollTally]:
+        """
+        Conteo en memoria de la encuesta; la primera vez lo arma con un solo pase sobre poll_votes.
+        Las cerradas se arman pero no se guardan (ya no reciben votos; sólo se leen para el embed final).
+        """
+        with self._tally_lock:
+            tally = self._tallies.get(message_id)
+            if tally is not None:
+                return tally
+            with self._get_connection() as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute("SELECT *, rowid as poll_id FROM polls WHERE message_id = ?", (message_id,))
+                poll_row = cursor.fetchone()
+                if not poll_row:
+                    return None
+                cursor.execute(
+                    "SELECT option_id, label FROM poll_options WHERE message_id = ? ORDER BY option_id",
+                    (message_id,),
+                )
+                tally = _PollTally(dict(poll_row), [dict(row) for row in cursor.fetchall()])
+                cursor.execute("SELECT user_id, option_id FROM poll_votes WHERE message_id = ?", (message_id,))
+                for row in cursor.fetchall():
+                    if int(row["option_id"]) in tally.counts:
+                        tally.add(int(row["user_id"]), int(row["option_id"]))
+            if int(tally.poll.get("is_active") or 0):
+                self._tallies[message_id] = tally
+            return tally
+
+    def _invalidate_tally(self, message_id: Optional[int] = None, option_id: Optional[int] = None) -> None:
+        with self._tally_lock:
+            if message_id is not None:
+                self._tallies.pop(message_id, None)
+            if option_id is not None:
+                for mid, tally in list(self._tallies.items()):
+                    if option_id in tally.counts:
+                        del self._tallies[mid]
 
     def get_poll_data(self, message_id: int) -> Optional[Dict[str, Any]]:
-        with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT *, rowid as poll_id FROM polls WHERE message_id = ?", (message_id,))
-            poll_row = cursor.fetchone()
-            
-            if not poll_row:
-                return None
-                
-            poll_data = dict(poll_row)
-            
-            cursor.execute("""
-            SELECT o.option_id, o.label, COUNT(v.vote_id) as vote_count
-            FROM poll_options o
-            LEFT JOIN poll_votes v ON o.option_id = v.option_id
-            WHERE o.message_id = ?
-            GROUP BY o.option_id, o.label
-            ORDER BY o.option_id
-            """, (message_id,))
-            
-            poll_data['options'] = [dict(row) for row in cursor.fetchall()]
-            return poll_data
+        tally = self._get_tally(message_id)
+        if tally is None:
+            return None
+        with self._tally_lock:
+            return tally.as_poll_data()
 
     def get_active_polls(self) -> List[Dict[str, Any]]:
         with self._get_connection() as conn:
@@ -192,14 +260,16 @@ class PollDBManagerV5:
             UPDATE polls SET is_active = 0 WHERE message_id = ?
             """, (message_id,))
             conn.commit()
-            return cursor.rowcount > 0
+        self._invalidate_tally(message_id)
+        return cursor.rowcount > 0
 
     def delete_poll(self, message_id: int) -> bool:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM polls WHERE message_id = ?", (message_id,))
             conn.commit()
-            return cursor.rowcount > 0
+        self._invalidate_tally(message_id)
+        return cursor.rowcount > 0
 
     def get_active_polls_by_title(self, query: str) -> List[Dict[str, Any]]:
         with self._get_connection() as conn:
@@ -223,7 +293,8 @@ class PollDBManagerV5:
                 WHERE message_id = ?
             """, (title, description, link_url, image_url, message_id))
             conn.commit()
-            return cursor.rowcount > 0
+        self._invalidate_tally(message_id)
+        return cursor.rowcount > 0
 
     def add_poll_option(self, message_id: int, option_label: str) -> bool:
         with self._get_connection() as conn:
@@ -234,9 +305,10 @@ class PollDBManagerV5:
                     VALUES (?, ?)
                 """, (message_id, option_label.strip()))
                 conn.commit()
-                return True
             except Exception:
                 return False
+        self._invalidate_tally(message_id)
+        return True
 
     def get_option_by_label_v2(self, message_id: int, option_label: str) -> Optional[Dict[str, Any]]:
         with self._get_connection() as conn:
@@ -260,7 +332,8 @@ class PollDBManagerV5:
             
             cursor.execute("DELETE FROM poll_options WHERE option_id = ?", (option_id,))
             conn.commit()
-            
+            self._invalidate_tally(option_id=option_id)
+
             if cursor.rowcount > 0:
                 return "Opción borrada con éxito."
             else:
@@ -279,18 +352,6 @@ class PollDBManagerV5:
             """, (message_id,))
             return [dict(row) for row in cursor.fetchall()]
 
-    def get_expired_polls(self, current_timestamp: int) -> List[Dict[str, Any]]:
-        with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM polls
-                WHERE is_active = 1 
-                  AND end_timestamp IS NOT NULL
-                  AND end_timestamp < ?
-            """, (current_timestamp,))
-            return [dict(row) for row in cursor.fetchall()]
-
     def get_active_polls_by_creator_and_title(self, creator_id: int, query: str) -> List[Dict[str, Any]]:
         with self._get_connection() as conn:
             conn.row_factory = sqlite3.Row
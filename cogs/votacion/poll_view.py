@@ -221,10 +221,26 @@ class PollButton(discord.ui.Button):
 
                 author = FakeAuthor()
 
-        new_public_embed = create_poll_embed(updated_poll_data, author=author)
-
         await interaction.response.defer(ephemeral=True)
-        await interaction.message.edit(embed=new_public_embed, view=view)
+
+        # Embed público: con debounce por mensaje (una ráfaga de votos = una edición con el último conteo).
+        message = interaction.message
+
+        async def _render_public() -> None:
+            latest = db.get_poll_data(message_id)
+            if not latest or not latest.get('is_active', False):
+                return  # cerrada: el cierre ya dejó el embed final
+            # Botones desde la DB: la vista que atendió el clic puede ser anterior a /agregaropcion o /quitaropcion.
+            await message.edit(
+                embed=create_poll_embed(latest, author=author),
+                view=PollView(poll_options=latest.get('options'), db_manager=db),
+            )
+
+        renderer = getattr(interaction.client, "poll_renderer", None)
+        if renderer is not None:
+            renderer.schedule(message_id, _render_public)
+        else:
+            await _render_public()
 
         # --- Respuesta privada de confirmación ---
         user_votes_final: List[int] = db.get_user_votes_for_poll(message_id, user_id)
@@ -0,0 +1,121 @@
+# cogs/votacion/render_scheduler.py
+"""
+Re-render con debounce de mensajes de votación (encuestas y VERSUS semanal).
+
+Cada voto pide `schedule(message_id, render)`; por message_id se hace como mucho una edición cada `window`
+segundos y siempre con el último `render` pedido (que lee el conteo en el momento de editar).
+El primer voto con el mensaje "quieto" edita enseguida; una ráfaga se colapsa en una edición al final de la ventana.
+Los re-render estructurales (opciones agregadas/quitadas: embed y botones desde la DB) no los reemplaza un voto
+posterior; el voto se suma a esa edición, que ya lee el conteo al momento de editar.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+RenderFn = Callable[[], Awaitable[Any]]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+POLL_RENDER_WINDOW_S = max(0.0, _env_float("POLL_RENDER_WINDOW_S", 2.5))
+
+
+class PollRenderScheduler:
+    def __init__(self, window: float = POLL_RENDER_WINDOW_S):
+        self.window = float(window)
+        # message_id → (render, ¿estructural?, futures de los pedidos que cubre).
+        self._pending: Dict[int, Tuple[RenderFn, bool, List[asyncio.Future]]] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._last_edit: Dict[int, float] = {}
+        self.requested = 0
+        self.coalesced = 0
+        self.rendered = 0
+        self.failed = 0
+
+    def schedule(self, message_id: int, render: RenderFn, *, structural: bool = False) -> "asyncio.Future[Any]":
+        """
+        Encola el re-render (reemplaza a uno pendiente del mismo mensaje, salvo que el pendiente sea
+        estructural y este no). Devuelve un future con el resultado de la edición que incluyó este pedido
+        (None si falló).
+        """
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        prev_render, prev_structural, waiters = self._pending.get(message_id, (None, False, []))
+        if waiters:
+            self.coalesced += 1
+        waiters.append(fut)
+        if prev_structural and not structural:
+            render, structural = prev_render, True
+        self._pending[message_id] = (render, structural, waiters)
+        self.requested += 1
+        task = self._tasks.get(message_id)
+        if task is None or task.done():
+            self._tasks[message_id] = asyncio.create_task(self._run(message_id))
+        if len(self._last_edit) > 512:
+            cutoff = time.monotonic() - self.window
+            self._last_edit = {k: t for k, t in self._last_edit.items() if t >= cutoff}
+        return fut
+
+    def cancel(self, message_id: int) -> None:
+        """Descarta lo pendiente (p. ej. la encuesta se cerró y ya se editó con el embed final)."""
+        _, _, waiters = self._pending.pop(message_id, (None, False, []))
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(None)
+        task = self._tasks.pop(message_id, None)
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+
+    def close(self) -> None:
+        for mid in list(self._tasks):
+            self.cancel(mid)
+
+    async def _run(self, message_id: int) -> None:
+        try:
+            while message_id in self._pending:
+                wait = self._last_edit.get(message_id, 0.0) + self.window - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                entry = self._pending.pop(message_id, None)
+                if entry is None:
+                    break
+                render, _, waiters = entry
+                result: Optional[Any] = None
+                try:
+                    result = await render()
+                    self.rendered += 1
+                except Exception:
+                    self.failed += 1
+                    log.exception("Re-render de votación %s falló", message_id)
+                finally:
+                    self._last_edit[message_id] = time.monotonic()
+                for fut in waiters:
+                    if not fut.done():
+                        fut.set_result(result)
+        finally:
+            if self._tasks.get(message_id) is asyncio.current_task():
+                del self._tasks[message_id]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requested": self.requested,
+            "rendered": self.rendered,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "pending": self.pending,
+        }
+
+    @property
+    def pending(self) -> int:
+        return sum(len(w) for _, _, w in self._pending.values())
@@ -15,11 +15,23 @@ from dotenv import load_dotenv
 # --- Importamos Votacion (V5) ---
 from cogs.votacion.db_manager import PollDBManagerV5, DB_FILE as POLL_DB_FILE
 from cogs.votacion.poll_view import PollView
+from cogs.votacion.render_scheduler import PollRenderScheduler
 
 # --- Importamos Economia (V2) y Cartas ---
 from cogs.economia.db_manager import EconomiaDBManagerV2, DB_FILE as ECON_DB_FILE
 from cogs.economia.card_db_manager import CardDBManager, DB_FILE as CARD_DB_FILE
 
+# --- Cliente AniList compartido (oráculo, trivia, impostor) ---
+from cogs.anilist_client import close_client as close_anilist_client, get_client as get_anilist_client
+
+# --- Router único de on_message ---
+from cogs.message_router import MessageRouter
+from cogs.rate_limit import get_rate_limits
+from cogs.scheduler import get_scheduler
+
+# --- Journal de lobbies de Impostor ---
+from cogs.impostor import persist as impostor_persist
+
 load_dotenv()
 
 from env_loader import load_task_and_shop_config
@@ -107,10 +119,15 @@ class MiBot(commands.Bot):
         # --- DB Votacion (ESTO ARREGLA EL ERROR DE LA IMAGEN) ---
         self.log.info("Inicializando el manejador de base de datos (DBManagerV5)...")
         self.db_manager = PollDBManagerV5(db_path=POLL_DB_FILE)
+        # Ediciones de embeds de votación (encuestas + VERSUS) con debounce por mensaje.
+        self.poll_renderer = PollRenderScheduler()
+        # Un solo on_message: los cogs registran sus handlers acá en vez de usar Cog.listener.
+        self.message_router = MessageRouter()
         
         # --- DB Economia ---
         self.log.info("Inicializando el manejador de base de datos (EconomiaDBManagerV2)...")
         self.economia_db = EconomiaDBManagerV2(db_path=ECON_DB_FILE)
+        self.log.info("Usuarios de economía en caché: %d", self.economia_db.known_users_stats()["known_users"])
         
         self.log.info("Inicializando el manejador de base de datos (CardDBManager)...")
         self.card_db = CardDBManager(db_path=CARD_DB_FILE)
@@ -237,6 +254,10 @@ class MiBot(commands.Bot):
             list(kwargs.keys()),
         )
 
+    async def on_message(self, message: discord.Message) -> None:
+        await self.message_router.dispatch(message, self.user)
+        await self.process_commands(message)
+
     async def setup_hook(self):
         # Gate global para slash: si no sos staff, no uses `/` (los usuarios van por `?`).
         async def _slash_interaction_check(interaction: discord.Interaction) -> bool:
@@ -278,6 +299,11 @@ class MiBot(commands.Bot):
                 self.log.warning(f"No se pudieron cargar opciones para la votación {poll['message_id']}")
         self.log.info(f"Cargadas {len(active_polls)} vistas de votación persistentes.")
 
+        # Barrido + guardado periódico de los rate limits (los de media del oráculo persisten en .run/).
+        get_rate_limits().start()
+        # Vencimientos de los cogs (retos, roles temporales, encuestas, versus, trivia...): disparan con el bot listo.
+        get_scheduler().start(ready=self.wait_until_ready)
+
         self.log.info("Iniciando carga de extensiones (cogs)...")
         for ext in INITIAL_EXTENSIONS:
             if ext in self.extensions:
@@ -350,6 +376,28 @@ class MiBot(commands.Bot):
         )
         self.log.info("Bot listo y operativo.")
 
+    async def close(self) -> None:
+        self.log.info("Re-render de votaciones: %s", self.poll_renderer.stats())
+        self.poll_renderer.close()
+        self.log.info("Router de mensajes: %s", self.message_router.stats())
+        self.log.info("Rate limits: %s", get_rate_limits().stats())
+        get_rate_limits().close()
+        self.log.info("Scheduler: %s", get_scheduler().stats())
+        get_scheduler().close()
+        self.log.info("Cliente AniList: %s", get_anilist_client().stats())
+        await close_anilist_client()
+        await super().close()
+        # Después de cerrar los cogs: el teardown de Impostor todavía puede escribir en el journal.
+        self.log.info("Journal de Impostor: %s", impostor_persist.journal().stats())
+        impostor_persist.journal().close()
+        # Espera escrituras pendientes del executor de economía y cierra sus conexiones SQLite.
+        self.log.info("Caché de usuarios de economía: %s", self.economia_db.known_users_stats())
+        self.log.info("Caché de progreso de economía: %s", self.economia_db.progress_cache.stats())
+        try:
+            await asyncio.to_thread(self.economia_db.close)
+        except Exception as e:
+            self.log.warning("No se pudo cerrar EconomiaDBManagerV2 limpiamente: %s", e)
+
 async def main():
     bot = MiBot()
     if bot.task_config is None or bot.shop_config is None:
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cogs.anilist_client import AniListClient
+from cogs.impostor import chars
+
+Q = "query ($search: String) { Character(search: $search) { id } }"
+
+
+class TestAniListClient(unittest.TestCase):
+    def _run(self, handler, scenario):
+        async def main():
+            app = web.Application()
+            app.router.add_post("/", handler)
+            server = TestServer(app)
+            await server.start_server()
+            client = AniListClient(
+                url=str(server.make_url("/")), cache_ttl=60, cache_max=2, rate_per_min=6000, burst=10
+            )
+            try:
+                return await scenario(client)
+            finally:
+                await client.close()
+                await server.close()
+
+        return asyncio.run(main())
+
+    def test_cache_and_coalescing(self):
+        hits = []
+
+        async def handler(request):
+            body = await request.json()
+            hits.append(body["variables"]["search"])
+            await asyncio.sleep(0.05)
+            return web.json_response({"data": {"Character": {"id": len(hits)}}})
+
+        async def scenario(client):
+            a, b = await asyncio.gather(client.query(Q, {"search": "Goku"}), client.query(Q, {"search": "Goku"}))
+            self.assertEqual(a, b)
+            # Misma query con otro espaciado: misma clave de caché.
+            c = await client.query("  " + Q.replace(" ", "  "), {"search": "Goku"})
+            self.assertEqual(c, a)
+            await client.query(Q, {"search": "Vegeta"})
+            await client.query(Q, {"search": "Gohan"})
+            # cache_max=2: Goku fue desalojado (LRU).
+            await client.query(Q, {"search": "Goku"})
+            return client.stats()
+
+        st = self._run(handler, scenario)
+        self.assertEqual(hits, ["Goku", "Vegeta", "Gohan", "Goku"])
+        self.assertEqual(st["coalesced"], 1)
+        self.assertEqual(st["hits"], 1)
+        self.assertEqual(st["requests"], 4)
+
+    def test_errors_are_not_cached(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            return web.json_response({"errors": [{"message": "boom"}], "data": None})
+
+        async def scenario(client):
+            self.assertIsNone(await client.query(Q, {"search": "x"}))
+            self.assertIsNone(await client.query(Q, {"search": "x"}))
+
+        self._run(handler, scenario)
+        self.assertEqual(len(calls), 2)
+
+    def test_retry_after_blocks_next_request(self):
+        stamps = []
+
+        async def handler(request):
+            stamps.append(time.monotonic())
+            if len(stamps) == 1:
+                return web.json_response({}, status=429, headers={"Retry-After": "0.3", "X-RateLimit-Remaining": "0"})
+            return web.json_response({"data": {"ok": True}})
+
+        async def scenario(client):
+            self.assertIsNone(await client.query(Q, {"search": "a"}))
+            self.assertEqual(await client.query(Q, {"search": "b"}), {"ok": True})
+            return client.stats()
+
+        st = self._run(handler, scenario)
+        self.assertGreaterEqual(stamps[1] - stamps[0], 0.28)
+        self.assertGreaterEqual(st["throttled"], 1)
+
+    def test_block_longer_than_timeout_returns_none_without_waiting(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            # 429 sin Retry-After: bloqueo por defecto de 60 s.
+            return web.json_response({}, status=429)
+
+        async def scenario(client):
+            self.assertIsNone(await client.query(Q, {"search": "a"}, timeout=2))
+            results = await asyncio.gather(*(client.query(Q, {"search": f"b{i}"}, timeout=2) for i in range(3)))
+            return results, client.stats()
+
+        results, st = self._run(handler, scenario)
+        self.assertEqual(results, [None, None, None])
+        self.assertEqual(st["throttled"], 0)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(st["shed"], 3)
+
+    def test_empty_bucket_within_deadline_waits_for_token(self):
+        async def handler(request):
+            return web.json_response({"data": {"ok": True}})
+
+        async def scenario(client):
+            client.capacity = client._tokens = 1.0
+            client.rate_per_s = 5.0  # un token cada 0,2 s
+            first = await client.query(Q, {"search": "a"})
+            # Plazo más corto que el próximo token: no se espera.
+            shed = await client.query(Q, {"search": "b"}, timeout=0.05)
+            waited = await client.query(Q, {"search": "c"}, timeout=2)
+            return first, shed, waited
+
+        self.assertEqual(self._run(handler, scenario), ({"ok": True}, None, {"ok": True}))
+
+
+class TestCharacterMissCache(unittest.TestCase):
+    def test_unresolved_name_is_not_requeried(self):
+        fake = mock.Mock()
+        fake.query = mock.AsyncMock(return_value=None)
+
+        async def main():
+            with mock.patch.object(chars, "get_anilist_client", return_value=fake):
+                return [await chars.resolve_anime_for_character("Nadie Nunca") for _ in range(3)]
+
+        chars._unresolved.pop("Nadie Nunca")
+        try:
+            self.assertEqual(asyncio.run(main()), [None, None, None])
+            self.assertEqual(fake.query.await_count, 1)
+        finally:
+            chars._unresolved.pop("Nadie Nunca")
+
+
+if __name__ == "__main__":
+    unittest.main()
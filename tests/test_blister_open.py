@@ -0,0 +1,88 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from cogs.economia.blister_open import open_blisters
+from cogs.economia.card_db_manager import CardDBManager
+from cogs.economia.db_manager import EconomiaDBManagerV2
+
+
+class _CardDB(CardDBManager):
+    # La migración de numeración usa group_concat(... ORDER BY), que pide SQLite >= 3.44.
+    def _migrate_numeracion_unique_index(self, conn) -> None:
+        pass
+
+
+class TestBlisterOpen(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self._tmp.name)
+        self.eco = EconomiaDBManagerV2(tmp / "eco.db")
+        self.cards = _CardDB(tmp / "cartas.db")
+        for i, (rareza, tipo) in enumerate(
+            [("común", "monstruo"), ("común", "trampa"), ("rara", "monstruo"), ("legendaria", "monstruo")], 1
+        ):
+            self.cards.add_carta_stock(f"C{i}", "", "", "", rareza, tipo, f"AAT-{i}")
+
+    def tearDown(self):
+        self.eco.close()
+        self._tmp.cleanup()
+
+    def _inventory(self, uid):
+        return {r["carta_id"]: r["cantidad"] for r in self.eco.get_cards_in_inventory(uid)}
+
+    def test_open_all_types_in_one_transaction(self):
+        self.eco.modify_blisters(1, "normal", 4)
+        self.eco.modify_blisters(1, "trampa", 2)
+        statements = []
+        self.eco._get_connection().set_trace_callback(statements.append)
+        res = open_blisters(self.eco, self.cards, 1, {"normal": 4, "trampa": 2})
+        self.eco._get_connection().set_trace_callback(None)
+        commits = [s for s in statements if s.strip().upper().startswith("COMMIT")]
+        self.assertEqual(len(commits), 1)
+
+        self.assertTrue(res.applied)
+        self.assertEqual((res.total_blisters, len(res.cards)), (6, 18))
+        self.assertEqual(sum(n for _c, n in res.resumen()), 18)
+        self.assertEqual(self._inventory(1), res.counts)
+        self.assertEqual(self.eco.get_blisters_for_user(1), [])
+
+    def test_no_stock_or_stale_inventory_changes_nothing(self):
+        self.eco.modify_blisters(2, "normal", 1)
+        empty = _CardDB(Path(self._tmp.name) / "vacio.db")
+        res = open_blisters(self.eco, empty, 2, {"normal": 1})
+        self.assertEqual((res.sin_stock, res.opened), (["normal"], {}))
+        res = open_blisters(self.eco, self.cards, 2, {"normal": 3})
+        self.assertFalse(res.applied)
+        self.assertEqual(self._inventory(2), {})
+        self.assertEqual(self.eco.get_blisters_for_user(2), [{"blister_tipo": "normal", "cantidad": 1}])
+
+    def test_1_10_100_blisters(self):
+        for n in (1, 10, 100):
+            uid = 1000 + n
+            self.eco.modify_blisters(uid, "normal", n)
+            t0 = time.perf_counter()
+            res = open_blisters(self.eco, self.cards, uid, {"normal": n})
+            ms = (time.perf_counter() - t0) * 1000
+            # Camino viejo: un INSERT + commit por carta (sólo como referencia, no se asserta el tiempo).
+            t0 = time.perf_counter()
+            for c in res.cards:
+                self.eco.add_card_to_inventory(uid + 1, c["carta_id"], 1)
+            old_ms = (time.perf_counter() - t0) * 1000
+            print(f"\nabrir {n} blister(s): {ms:.2f} ms (antes ~{old_ms:.2f} ms sólo en inventario)")
+            self.assertTrue(res.applied)
+            self.assertEqual(sum(self._inventory(uid).values()), 3 * n)
+            self.assertEqual(self._inventory(uid + 1), self._inventory(uid))
+            self.assertEqual(self.eco.get_blisters_for_user(uid), [])
+
+    def test_partial_debit_rolls_back(self):
+        self.eco.modify_blisters(3, "normal", 1)
+        # Dos claves que normalizan al mismo tipo: cada chequeo ve 1, pero el segundo UPDATE no encuentra stock.
+        self.assertFalse(self.eco.apply_blister_opening(3, {"normal": 1, " Normal": 1}, {1: 3}))
+        self.assertEqual(self.eco.get_blisters_for_user(3), [{"blister_tipo": "normal", "cantidad": 1}])
+        self.assertEqual(self._inventory(3), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
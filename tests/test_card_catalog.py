@@ -0,0 +1,86 @@
+import random
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+from cogs.economia.card_catalog import AliasTable, CardCatalog
+from cogs.economia.card_db_manager import CardDBManager
+
+
+def _card(cid: int, rareza: str, tipo: str = "Monstruo") -> dict:
+    return {"carta_id": cid, "nombre": f"c{cid}", "rareza": rareza, "tipo_carta": tipo, "poder": None}
+
+
+class TestAliasTable(unittest.TestCase):
+    def test_frequencies_follow_weights(self):
+        rng = random.Random(7)
+        table = AliasTable([1, 0, 3, 6])
+        n = 100_000
+        counts = Counter(table.sample(rng) for _ in range(n))
+        self.assertEqual(counts[1], 0)
+        for i, w in ((0, 0.1), (2, 0.3), (3, 0.6)):
+            self.assertAlmostEqual(counts[i] / n, w, delta=0.01)
+
+    def test_rejects_empty(self):
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0])
+
+
+class TestCardCatalog(unittest.TestCase):
+    def test_rarity_split(self):
+        cat = CardCatalog([_card(1, "Común"), _card(2, "Común"), _card(3, "Rara"), _card(4, "Legendaria")])
+        rng = random.Random(1)
+        n = 60_000
+        counts = Counter(c["rareza"] for c in cat.draw_many("", n, rng))
+        self.assertAlmostEqual(counts["Común"] / n, 0.70, delta=0.01)
+        self.assertAlmostEqual(counts["Rara"] / n, 0.25, delta=0.01)
+        self.assertAlmostEqual(counts["Legendaria"] / n, 0.05, delta=0.005)
+        self.assertEqual(cat.draw("", rng)["poder"], 50)
+
+    def test_missing_rarity_falls_back_to_comun(self):
+        cat = CardCatalog([_card(1, "Común")])
+        self.assertEqual({c["carta_id"] for c in cat.draw_many("", 500)}, {1})
+
+    def test_without_comun_only_own_rarity_draws(self):
+        # Igual que el SQL original: si sale Común (o Legendaria → Común) y no hay, no hay carta.
+        cat = CardCatalog([_card(1, "Rara")])
+        rng = random.Random(3)
+        n = 20_000
+        got = cat.draw_many("", n, rng)
+        self.assertAlmostEqual(len(got) / n, 0.25, delta=0.01)
+        self.assertEqual(CardCatalog([]).draw_many("", 10), [])
+
+    def test_trampa_share(self):
+        cat = CardCatalog([_card(1, "Común"), _card(2, "Rara", "Trampa")])
+        rng = random.Random(5)
+        n = 50_000
+        counts = Counter(c["carta_id"] for c in cat.draw_many("trampa", n, rng))
+        # 70% trampa directa + 30% × 25% (Rara) del gacha normal.
+        self.assertAlmostEqual(counts[2] / n, 0.70 + 0.30 * 0.25, delta=0.01)
+
+
+class _CardDB(CardDBManager):
+    # La migración de numeración usa group_concat(... ORDER BY), que pide SQLite >= 3.44.
+    def _migrate_numeracion_unique_index(self, conn) -> None:
+        pass
+
+
+class TestCardDBCatalogInvalidation(unittest.TestCase):
+    def test_stock_changes_rebuild_catalog(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _CardDB(Path(tmp) / "cartas.db")
+            self.assertIsNone(db.get_random_card_by_rarity())
+            ok, _ = db.add_carta_stock("Uno", "", "", "", "común", "monstruo", "AAT-1")
+            self.assertTrue(ok)
+            self.assertEqual(db.get_random_card_by_rarity()["nombre"], "Uno")
+            cid = db.get_random_card_by_rarity()["carta_id"]
+            db.update_carta_stock(cid, "Uno bis", "", "", "", "común", "trampa", "AAT-1")
+            self.assertEqual(db.get_random_card_blister_trampa()["nombre"], "Uno bis")
+            self.assertEqual(len(db.draw_blister_cards("trampa", 4)), 12)
+            db.delete_carta_stock(cid)
+            self.assertEqual(db.draw_blister_cards("normal", 2), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
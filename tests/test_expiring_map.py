@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from cogs.expiring_map import ExpiringMap
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestExpiringMap(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.m = ExpiringMap("t", clock=self.clock)
+
+    def test_get_put_pop_and_expiry(self):
+        self.m.put("a", 1, ttl=10)
+        self.assertEqual(self.m.get("a"), 1)
+        self.assertIn("a", self.m)
+        self.clock.now += 10
+        self.assertIsNone(self.m.get("a"))
+        self.assertNotIn("a", self.m)
+        self.m.put("b", 2, ttl=5)
+        self.assertEqual(self.m.pop("b"), 2)
+        self.assertEqual(self.m.pop("b", "x"), "x")
+        self.assertEqual(len(self.m), 0)
+
+    def test_renewed_key_survives_old_deadline(self):
+        self.m.put("u", "v1", ttl=10)
+        self.clock.now += 8
+        self.m.put("u", "v2", ttl=10)
+        self.clock.now += 5
+        self.assertEqual(self.m.sweep(), 0)
+        self.assertEqual(self.m.get("u"), "v2")
+        self.clock.now += 5
+        self.assertEqual(self.m.sweep(), 1)
+        self.assertEqual(self.m.stats()["size"], 0)
+
+    def test_memory_bounded_and_sweep_touches_only_expired(self):
+        # 10k usuarios distintos de paso: sin barrido quedarían todos en memoria para siempre.
+        for uid in range(10_000):
+            self.m.put(uid, uid, ttl=25)
+        self.clock.now += 30
+        for uid in range(10):
+            self.m.put(("nuevo", uid), uid, ttl=25)
+        self.assertEqual(self.m.sweep(), 10_000)
+        st = self.m.stats()
+        self.assertEqual(st["size"], 10)
+        self.assertEqual(st["heap"], 10)
+        # Un mismo usuario renovado muchas veces no infla el heap.
+        for _ in range(5000):
+            self.m.put("spam", 1, ttl=25)
+        self.assertLessEqual(self.m.stats()["heap"], 2 * len(self.m) + 65)
+
+    def test_periodic_sweeper(self):
+        async def main():
+            m = ExpiringMap("s")
+            m.put("a", 1, ttl=0.01)
+            m.start_sweeper(interval=0.02)
+            await asyncio.sleep(0.1)
+            m.stop_sweeper()
+            return m.stats()
+
+        st = asyncio.run(main())
+        self.assertEqual(st["size"], 0)
+        self.assertGreaterEqual(st["sweeps"], 1)
+
+
+class TestOraclePendingGrace(unittest.TestCase):
+    def test_pending_outlives_thread_for_expired_notice(self):
+        from cogs.oraculo_cog import OraculoCog
+
+        cog = OraculoCog(SimpleNamespace())
+        clock = _Clock()
+        cog._oracle_pending._clock = clock
+        msg = SimpleNamespace(id=99, guild=SimpleNamespace(id=1), channel=SimpleNamespace(id=2))
+        cog._register_oracle_pending(
+            msg, SimpleNamespace(id=3), original_question="¿sí?", last_answer="Sí.", response_kind="yesno"
+        )
+        ttl = cog._conversation_ttl_seconds()
+        clock.now += ttl + 1
+        # Vencido el hilo, la entrada sigue para poder avisar “se cerró la ventana”…
+        self.assertEqual(cog._oracle_pending.get((1, 2, 3)).bot_message_id, 99)
+        # …y se libera después del margen de gracia.
+        clock.now += cog._pending_grace_seconds()
+        cog._oracle_pending.sweep()
+        self.assertEqual(cog.state_stats()["oracle_pending"]["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
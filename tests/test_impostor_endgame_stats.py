@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from cogs.economia.db_manager import EconomiaDBManagerV2
+from cogs.impostor.engine import ROLE_IMPOSTOR, ROLE_SOCIAL
+
+
+def _lobby(n=10, *, impostor_ids=(1, 2), impostor_id=None, bots=()):
+    players = {i: SimpleNamespace(user_id=i, is_bot=i in bots) for i in range(1, n + 1)}
+    return SimpleNamespace(
+        players=players,
+        impostor_ids=set(impostor_ids),
+        impostor_id=impostor_id,
+        guild_id=5,
+        channel_id=6,
+        lobby_name="Sala",
+        character_name="Goku",
+        secret_theme="anime",
+    )
+
+
+class TestImpostorGameResult(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = EconomiaDBManagerV2(Path(self._tmp.name) / "eco.db")
+        _, self.semana = self.db.get_current_date_keys()
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def test_ten_player_lobby_is_one_transaction(self):
+        statements = []
+        self.db._get_connection().set_trace_callback(statements.append)
+        self.db.record_impostor_game_result(_lobby(bots=(10,)), ROLE_IMPOSTOR, "ganaron los impostores")
+        self.db._get_connection().set_trace_callback(None)
+        tx = [s.strip().upper() for s in statements if s.strip().upper().startswith(("BEGIN", "COMMIT"))]
+        self.assertEqual(tx, ["BEGIN", "COMMIT"])
+
+        self.assertEqual(self.db.get_impostor_stats(1)["wins_impostor"], 1)
+        self.assertEqual(self.db.get_impostor_stats(3)["games_social"], 1)
+        self.assertEqual(self.db.get_impostor_stats(10)["games_played"], 0)  # bot
+        self.assertEqual(self.db.get_progress_semanal(2)["impostor_victorias"], 1)
+        self.assertEqual(self.db.get_progress_semanal(9)["impostor_partidas"], 1)
+        self.assertEqual(self.db.get_progress_semanal(9)["impostor_victorias"], 0)
+        log = self.db.get_impostor_game_log_recent(1)[0]
+        self.assertEqual((log["human_count"], log["impostor_count"], log["winner_role"]), (9, 2, ROLE_IMPOSTOR))
+
+    def test_social_win_and_legacy_impostor_id(self):
+        self.db.record_impostor_game_result(_lobby(4, impostor_ids=(), impostor_id=4), ROLE_SOCIAL, "votaron bien")
+        self.db.record_impostor_game_result(_lobby(4, impostor_ids=(), impostor_id=4), ROLE_IMPOSTOR, "revancha")
+        self.assertEqual(
+            self.db.get_impostor_stats(4),
+            {"games_played": 2, "games_social": 0, "games_impostor": 2, "wins_social": 0, "wins_impostor": 1},
+        )
+        self.assertEqual(self.db.get_impostor_stats(1)["wins_social"], 1)
+        self.assertEqual(self.db.get_progress_semanal(4)["impostor_victorias"], 1)
+        self.assertEqual(self.db.get_progress_semanal(1)["impostor_partidas"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Tests del journal de lobbies Impostor (sin instalar discord.py en el runner)."""
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_IMPOSTOR_DIR = os.path.join(_ROOT, "cogs", "impostor")
+
+
+def _load_impostor_module(name: str):
+    """Carga un .py de cogs/impostor sin ejecutar __init__.py (evita import discord)."""
+    if "cogs" not in sys.modules:
+        sys.modules["cogs"] = types.ModuleType("cogs")
+    if "cogs.impostor" not in sys.modules:
+        sys.modules["cogs.impostor"] = types.ModuleType("cogs.impostor")
+
+    full_name = f"cogs.impostor.{name}"
+    if full_name in sys.modules:
+        return sys.modules[full_name]
+    path = os.path.join(_IMPOSTOR_DIR, f"{name}.py")
+    spec = importlib.util.spec_from_file_location(full_name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No se pudo cargar {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[full_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+engine = _load_impostor_module("engine")
+persist = _load_impostor_module("persist")
+
+GameState = engine.GameState
+
+
+def _game_in_vote(channel_id: int = 100) -> "GameState":
+    lobby = GameState(lobby_name="Sala", guild_id=1, channel_id=channel_id, host_id=10, max_slots=6)
+    for uid in (10, 11, 12, 13):
+        lobby.add_player(uid)
+    lobby.add_player(-1, is_bot=True)
+    lobby.hud_message_id = 555
+    lobby.in_progress = True
+    lobby.phase = engine.PHASE_VOTE
+    lobby.round_num = 2
+    lobby.character_name = "Lelouch"
+    lobby.character_slug = "lelouch"
+    lobby.secret_theme = "personaje"
+    lobby.character_anime = "Code Geass"
+    lobby.impostor_ids = {12}
+    lobby.eliminated_user_ids = {13}
+    lobby.players[13].alive = False
+    lobby.players[11].word = "ajedrez"
+    lobby.players[10].voted_for = 12
+    lobby.players[11].role = engine.ROLE_SOCIAL
+    lobby.players[12].role = engine.ROLE_IMPOSTOR
+    return lobby
+
+
+class TestSnapshotRoundTrip(unittest.TestCase):
+    def test_restore_matches(self):
+        lobby = _game_in_vote()
+        back = persist.restore_lobby(persist.snapshot_lobby(lobby))
+        self.assertEqual(back.phase, engine.PHASE_VOTE)
+        self.assertEqual(back.round_num, 2)
+        self.assertEqual(back.hud_message_id, 555)
+        self.assertEqual(back.impostor_ids, {12})
+        self.assertEqual(back.character_anime, "Code Geass")
+        self.assertEqual(set(back.players), {10, 11, 12, 13, -1})
+        self.assertTrue(back.players[-1].is_bot)
+        self.assertFalse(back.players[13].alive)
+        self.assertEqual(back.players[10].voted_for, 12)
+        self.assertEqual(back.players[11].word, "ajedrez")
+        self.assertEqual(back.players[12].role, engine.ROLE_IMPOSTOR)
+        self.assertEqual(back.get_votes(), lobby.get_votes())
+        self.assertIsNone(back._vote_task)
+
+
+class TestLobbyJournal(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "lobbies.jsonl"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_last_write_wins_and_forget(self):
+        j = persist.LobbyJournal(self.path)
+        a, b = _game_in_vote(100), _game_in_vote(200)
+        j.save(a)
+        j.save(b)
+        a.round_num = 3
+        j.save(a)
+        j.forget(200)
+        j.close()
+
+        snaps = persist.LobbyJournal(self.path).load()
+        self.assertEqual([s["c"] for s in snaps], [100])
+        self.assertEqual(snaps[0]["r"], 3)
+        # load() compacta: queda una línea por lobby vivo.
+        self.assertEqual(len(self.path.read_text(encoding="utf-8").splitlines()), 1)
+
+    def test_torn_last_line_is_ignored(self):
+        j = persist.LobbyJournal(self.path)
+        j.save(_game_in_vote(100))
+        j.close()
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write('{"c":200,"g":1,"n":"Cor')
+        snaps = persist.LobbyJournal(self.path).load()
+        self.assertEqual([s["c"] for s in snaps], [100])
+
+    def test_unchanged_snapshot_is_not_rewritten(self):
+        j = persist.LobbyJournal(self.path)
+        lobby = _game_in_vote()
+        j.save(lobby)
+        j.save(lobby)
+        self.assertEqual(j.stats()["writes"], 1)
+        j.close()
+
+    def test_compacts_when_dead_records_pile_up(self):
+        j = persist.LobbyJournal(self.path)
+        lobby = _game_in_vote()
+        for r in range(200):
+            lobby.round_num = r
+            j.save(lobby)
+        self.assertGreaterEqual(j.stats()["compactions"], 1)
+        self.assertLessEqual(len(self.path.read_text(encoding="utf-8").splitlines()), persist._COMPACT_MIN_DEAD + 1)
+        j.close()
+        self.assertEqual(persist.LobbyJournal(self.path).load()[0]["r"], 199)
+
+    def test_compacts_once_dead_outnumber_live(self):
+        j = persist.LobbyJournal(self.path)
+        n = persist._COMPACT_MIN_DEAD + 8
+        lobbies = [_game_in_vote(channel_id=1000 + i) for i in range(n)]
+        for lobby in lobbies:
+            j.save(lobby)
+        # n vivas + n muertas: todavía no.
+        for lobby in lobbies:
+            lobby.round_num = 3
+            j.save(lobby)
+        self.assertEqual(j.stats()["compactions"], 0)
+        lobbies[0].round_num = 4
+        j.save(lobbies[0])
+        self.assertEqual(j.stats()["compactions"], 1)
+        self.assertEqual(len(self.path.read_text(encoding="utf-8").splitlines()), n)
+        j.close()
+
+    def test_transition_overhead_us(self):
+        # Medición informativa (pytest -s): µs por transición con 5 jugadores; sin assert de tiempo.
+        lobby = _game_in_vote()
+        for fsync, n in ((False, 2000), (True, 200)):
+            path = self.path.with_name(f"bench_{int(fsync)}.jsonl")
+            j = persist.LobbyJournal(path, fsync=fsync)
+            t0 = time.perf_counter()
+            for r in range(n):
+                lobby.round_num = r
+                j.save(lobby)
+            per_us = (time.perf_counter() - t0) / n * 1e6
+            st = j.stats()
+            j.close()
+            print(
+                f"\n[impostor persist] fsync={int(fsync)}: {per_us:.1f} µs por transición "
+                f"(avg_write_us={st['avg_write_us']:.1f}, compactaciones={st['compactions']})"
+            )
+            self.assertEqual(st["writes"], n)
+            self.assertEqual(persist.LobbyJournal(path).load()[0]["r"], n - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
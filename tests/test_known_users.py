@@ -0,0 +1,29 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cogs.economia.db_manager import EconomiaDBManagerV2
+
+
+class TestKnownUsersCache(unittest.TestCase):
+    def test_warm_and_skip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "eco.db"
+            db = EconomiaDBManagerV2(path)
+            db.get_user_economy(10)
+            db.get_user_economy(10)
+            db.get_progress_diaria(10)
+            st = db.known_users_stats()
+            self.assertEqual(st["round_trips_done"], 1)
+            self.assertEqual(st["round_trips_saved"], 2)
+            db.close()
+
+            db2 = EconomiaDBManagerV2(path)
+            self.assertEqual(db2.known_users_stats()["known_users"], 1)
+            db2.modify_points(10, 5)
+            self.assertEqual(db2.known_users_stats()["round_trips_done"], 0)
+            db2.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
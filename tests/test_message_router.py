@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from cogs.message_router import MessageContext, MessageRouter
+
+ME = SimpleNamespace(id=1)
+
+
+def _msg(content="hola", *, channel=10, author=5, bot=False, mentions=(), reply_to=None, guild=True, mid=100):
+    return SimpleNamespace(
+        id=mid,
+        content=content,
+        channel=SimpleNamespace(id=channel),
+        guild=SimpleNamespace(id=7) if guild else None,
+        author=SimpleNamespace(id=author, bot=bot),
+        mentions=list(mentions),
+        raw_mentions=[u.id for u in mentions],
+        reference=SimpleNamespace(message_id=reply_to) if reply_to else None,
+    )
+
+
+class TestMessageContext(unittest.TestCase):
+    def test_classification(self):
+        ctx = MessageContext.from_message(_msg("  \ufeff\uff1fping  ", reply_to=55), ME)
+        self.assertEqual(ctx.text, "?ping")
+        self.assertEqual(ctx.prefix, "?")
+        self.assertEqual(ctx.reply_to, 55)
+        self.assertFalse(ctx.mentions_bot)
+
+        ctx = MessageContext.from_message(_msg("<@!1> ¿llueve?"), ME)
+        self.assertTrue(ctx.mentions_bot)
+        self.assertEqual(ctx.prefix, "")
+        self.assertTrue(MessageContext.from_message(_msg("x", mentions=[ME]), ME).mentions_bot)
+        self.assertTrue(MessageContext.from_message(_msg("x", author=1, bot=True), ME).from_self)
+
+
+class TestMessageRouter(unittest.TestCase):
+    def _run(self, router, *messages):
+        async def main():
+            counts = [await router.dispatch(m, ME) for m in messages]
+            await asyncio.sleep(0)
+            while router._tasks:
+                await asyncio.gather(*router._tasks)
+            return counts
+
+        return asyncio.run(main())
+
+    def test_channel_index_predicates_and_bots(self):
+        seen = []
+
+        def rec(name):
+            async def handler(ctx):
+                seen.append((name, ctx.message.id))
+
+            return handler
+
+        r = MessageRouter()
+        r.register("todos", rec("todos"), inline=True)
+        r.register("canal", rec("canal"), channels=(10,))
+        r.register("sin_prefijo", rec("sin_prefijo"), predicate=lambda ctx: not ctx.prefix)
+        r.register("feed", rec("feed"), channels=(20,), include_bots=True)
+        r.register("nunca", rec("nunca"), channels=(0,))
+
+        counts = self._run(
+            r,
+            _msg("hola", channel=10, mid=1),
+            _msg("?cmd", channel=11, mid=2),
+            _msg("bip", channel=20, bot=True, mid=3),
+            _msg("dm", guild=False, mid=4),
+            _msg("eco", author=1, bot=True, channel=20, mid=5),
+        )
+        self.assertEqual(counts, [3, 1, 1, 0, 0])
+        self.assertEqual(
+            sorted(seen),
+            sorted([("todos", 1), ("canal", 1), ("sin_prefijo", 1), ("todos", 2), ("feed", 3)]),
+        )
+        st = r.stats()
+        self.assertEqual(st["messages"], 4)
+        self.assertEqual(st["handlers"]["todos"]["calls"], 2)
+        self.assertEqual(st["handlers"]["nunca"]["calls"], 0)
+
+    def test_errors_and_latency_are_tracked_per_handler(self):
+        async def slow(ctx):
+            await asyncio.sleep(0.02)
+
+        async def boom(ctx):
+            raise RuntimeError("x")
+
+        r = MessageRouter()
+        r.register("lento", slow)
+        r.register("roto", boom, inline=True)
+        with self.assertLogs("cogs.message_router", level="ERROR"):
+            self._run(r, _msg())
+        st = r.stats()["handlers"]
+        self.assertEqual(st["roto"]["errors"], 1)
+        self.assertEqual(st["lento"]["errors"], 0)
+        self.assertGreaterEqual(st["lento"]["max_ms"], 15.0)
+
+    def test_unregister_owner(self):
+        owner = object()
+
+        async def h(ctx):
+            pass
+
+        r = MessageRouter()
+        r.register("a", h, owner=owner, channels=(10,))
+        r.register("b", h, owner=owner)
+        r.register("c", h)
+        r.unregister_owner(owner)
+        self.assertEqual(list(r.stats()["handlers"]), ["c"])
+        self.assertEqual(self._run(r, _msg(channel=10)), [1])
+
+    def test_only_matching_handlers_run(self):
+        calls = []
+
+        async def h(ctx):
+            calls.append(ctx.message.id)
+
+        r = MessageRouter()
+        # Doce handlers como los cogs reales: la mayoría atados a un canal o con predicado que descarta.
+        for i in range(8):
+            r.register(f"canal{i}", h, channels=(1000 + i,))
+        for i in range(3):
+            r.register(f"pred{i}", h, predicate=lambda ctx: ctx.reply_to is not None)
+        r.register("todos", h, inline=True)
+        self.assertEqual(self._run(r, _msg("un mensaje cualquiera del chat", channel=42)), [1])
+        self.assertEqual(calls, [100])
+
+
+if __name__ == "__main__":
+    unittest.main()
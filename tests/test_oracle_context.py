@@ -0,0 +1,118 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cogs import oracle_context, oracle_llm, oracle_wiki
+from cogs.oracle_context import NEGATIVE, ContextCache
+
+EXTRACT = "Naruto es una serie de manga escrita e ilustrada por Masashi Kishimoto, publicada desde 1999."
+
+
+class _TmpCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = ContextCache(Path(self._tmp.name) / "ctx.db", negative_ttl=60)
+        patcher = mock.patch.object(oracle_context, "_CACHE", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.cache.close()
+        self._tmp.cleanup()
+
+
+class TestContextCache(_TmpCache):
+    def test_put_get_negative_and_expiry(self):
+        self.assertIsNone(self.cache.get("wiki_search", "Naruto"))
+        self.cache.put("wiki_search", "Naruto", ["Naruto"], ttl=60)
+        self.assertEqual(self.cache.get("wiki_search", "  naruto "), ["Naruto"])
+        self.cache.put("wiki_search", "zzz", [], ttl=60)
+        self.assertIs(self.cache.get("wiki_search", "zzz"), NEGATIVE)
+        self.cache.put("wiki_search", "viejo", ["x"], ttl=60)
+        with mock.patch.object(oracle_context.time, "time", return_value=oracle_context.time.time() + 120):
+            self.assertIsNone(self.cache.get("wiki_search", "viejo"))
+        # Persiste en disco: otra instancia sobre el mismo archivo ve las entradas.
+        other = ContextCache(self.cache.path)
+        self.assertEqual(other.get("wiki_search", "naruto"), ["Naruto"])
+        other.close()
+
+
+class TestWikipediaCached(_TmpCache):
+    def test_repeated_topic_skips_network(self):
+        calls = []
+
+        async def api(request):
+            calls.append(("search", request.query.get("srsearch")))
+            hits = [{"title": "Naruto"}] if "naruto" in request.query.get("srsearch", "").lower() else []
+            return web.json_response({"query": {"search": hits}})
+
+        async def summary(request):
+            calls.append(("summary", request.match_info["title"]))
+            return web.json_response({"type": "standard", "extract": EXTRACT})
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/w/api.php", api)
+            app.router.add_get("/summary/{title}", summary)
+            server = TestServer(app)
+            await server.start_server()
+            base = str(server.make_url("")).rstrip("/")
+            try:
+                with mock.patch.object(oracle_wiki, "_API", base + "/w/api.php"), mock.patch.object(
+                    oracle_wiki, "_SUMMARY", base + "/summary/{title}"
+                ):
+                    a = await oracle_wiki.wikipedia_es_snippet("Naruto anime")
+                    b = await oracle_wiki.wikipedia_es_snippet("naruto  ANIME")
+                    c = await oracle_wiki.wikipedia_es_snippet("palabra inexistente")
+                    d = await oracle_wiki.wikipedia_es_snippet("palabra inexistente")
+                    return a, b, c, d
+            finally:
+                await oracle_wiki.close_wiki_http()
+                await server.close()
+
+        a, b, c, d = asyncio.run(main())
+        self.assertIn("Kishimoto", a)
+        self.assertEqual(a, b)
+        self.assertIsNone(c)
+        self.assertIsNone(d)
+        self.assertEqual([k for k, _ in calls], ["search", "summary", "search"])
+        st = self.cache.stats()
+        self.assertEqual((st["hits"], st["negative_hits"]), (2, 1))
+
+
+class TestDuckDuckGoCached(_TmpCache):
+    def test_results_and_empty_results_are_cached(self):
+        fake = mock.Mock(
+            side_effect=[
+                [{"title": "Estreno", "href": "https://ejemplo", "body": "Sale en abril."}],
+                [],
+            ]
+        )
+
+        async def main():
+            with mock.patch.dict(os.environ, {"ORACLE_INTERNET_SEARCH": "1"}), mock.patch.object(
+                oracle_llm, "_duckduckgo_text_sync", fake
+            ):
+                q = "¿cuándo sale la temporada 2 de Frieren?"
+                first = await oracle_llm._duckduckgo_context_async(q)
+                again = await oracle_llm._duckduckgo_context_async(q)
+                empty_q = "¿cuándo sale la temporada 9 de nada?"
+                e1 = await oracle_llm._duckduckgo_context_async(empty_q)
+                e2 = await oracle_llm._duckduckgo_context_async(empty_q)
+                return first, again, e1, e2
+
+        first, again, e1, e2 = asyncio.run(main())
+        self.assertIn("Sale en abril.", first)
+        self.assertEqual(first, again)
+        self.assertEqual((e1, e2), ("", ""))
+        self.assertEqual(fake.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
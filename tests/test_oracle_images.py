@@ -0,0 +1,98 @@
+import asyncio
+import io
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cogs.oracle_images import OracleImagePrep, downscale_image, pillow_available
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def _png(w, h, mode="RGBA"):
+    im = Image.new(mode, (w, h), (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30))
+    # Algo de ruido para que no comprima a casi nada.
+    px = im.load()
+    for x in range(0, w, 7):
+        for y in range(0, h, 5):
+            px[x, y] = (x % 256, y % 256, (x * y) % 256) + ((255,) if mode == "RGBA" else ())
+    out = io.BytesIO()
+    im.save(out, format="PNG")
+    return out.getvalue()
+
+
+@unittest.skipUnless(pillow_available(), "Pillow no instalado")
+class TestDownscale(unittest.TestCase):
+    def test_large_image_is_bounded(self):
+        raw = _png(2400, 1600)
+        out = downscale_image(raw, max_edge=512, quality=80)
+        self.assertIsNotNone(out)
+        with Image.open(io.BytesIO(out)) as im:
+            self.assertEqual((im.format, im.size), ("JPEG", (512, 341)))
+        self.assertLess(len(out), len(raw))
+
+    def test_small_or_invalid_is_left_alone(self):
+        small_jpeg = io.BytesIO()
+        Image.new("RGB", (64, 64)).save(small_jpeg, format="JPEG")
+        self.assertIsNone(downscale_image(small_jpeg.getvalue(), max_edge=512, quality=80))
+        self.assertIsNone(downscale_image(b"no soy una imagen", max_edge=512, quality=80))
+
+
+class TestOracleImagePrep(unittest.TestCase):
+    def test_shared_session_and_caches(self):
+        hits = []
+        body = _png(1600, 1600) if pillow_available() else b"\x89PNG fake" * 100
+
+        async def img(request):
+            hits.append(request.path)
+            if request.path == "/txt":
+                return web.Response(text="hola")
+            return web.Response(body=body, content_type="image/png")
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/{name}", img)
+            server = TestServer(app)
+            await server.start_server()
+            prep = OracleImagePrep(max_edge=256, quality=70, cache_max=8, workers=1)
+            try:
+                a, info = await prep.fetch(str(server.make_url("/e1.png")) + "?quality=lossless", max_bytes=10**7, label="emoji")
+                session = prep._session
+                b, _ = await prep.fetch(str(server.make_url("/e1.png")) + "?quality=lossless", max_bytes=10**7, label="emoji")
+                # Otra URL con el mismo contenido: se descarga pero no se vuelve a procesar.
+                c, _ = await prep.fetch(str(server.make_url("/e2.png")), max_bytes=10**7, label="sticker")
+                too_big = await prep.fetch(str(server.make_url("/e3.png")), max_bytes=100, label="emoji")
+                not_img = await prep.fetch(str(server.make_url("/txt")), max_bytes=10**7, label="emoji")
+                d = await prep.prepare(body)
+                self.assertIs(prep._session, session)
+                return a, info, b, c, d, too_big, not_img, prep.stats()
+            finally:
+                await prep.close()
+                await server.close()
+
+        a, info, b, c, d, too_big, not_img, st = asyncio.run(main())
+        self.assertEqual(info, "emoji: " + info.split(": ", 1)[1])
+        self.assertTrue(info.endswith("/e1.png"))
+        self.assertEqual(a, b)
+        self.assertEqual(a, c)
+        self.assertEqual(a, d)
+        self.assertEqual(too_big, (None, "emoji muy grande"))
+        self.assertEqual(not_img, (None, "emoji no es imagen"))
+        self.assertEqual(hits, ["/e1.png", "/e2.png", "/e3.png", "/txt"])
+        self.assertEqual(st["url_hits"], 1)
+        self.assertEqual(st["hits"], 3)
+        self.assertEqual(st["cached"], 1)
+        if pillow_available():
+            self.assertEqual(st["processed"], 1)
+            with Image.open(io.BytesIO(a)) as im:
+                self.assertEqual(im.size, (256, 256))
+        else:
+            self.assertEqual(a, body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import time
+import unittest
+
+from cogs import oraculo_cog as oc
+from cogs.oracle_intent import IntentClassifier, IntentRule, QuestionView
+
+# Preguntas tal como llegan al oráculo (mezcla de todas las ramas).
+CORPUS = [
+    "hola",
+    "Holaaa!!",
+    "buenas noches",
+    "que onda",
+    "cómo estás?",
+    "hey",
+    "derivada de x^2 + 3x",
+    "derivada de 5x³",
+    "derivada de sin(x)",
+    "todo al rojo?",
+    "¿rojo o negro?",
+    "todo al negro o al verde",
+    "el semáforo está en rojo o verde?",
+    "en el poker le doy todo o no voy?",
+    "texas holdem all in con par de ases?",
+    "all-in en el torneo de poker con KQ?",
+    "baraja de poker: me la juego?",
+    "pizza, sushi o pasta?",
+    "naruto o one piece?",
+    "¿veo frieren o dandadan?",
+    "si o no?",
+    "voy al cine hoy o mañana?",
+    "lotm es el mejor?",
+    "esto es bueno?",
+    "chainsaw man es malísimo?",
+    "2+2",
+    "cuánto es 15*3?",
+    "te pregunte 2+2 jaja",
+    "raiz cuadrada de 144",
+    "√81",
+    "3^4 - 10",
+    "cuántos años tiene goku en dragon ball z?",
+    "cuándo sale la temporada 2 de frieren?",
+    "qué es un isekai?",
+    "explicame la primera ley de newton",
+    "recomendame un anime de terror",
+    "recomiendame un isekai",
+    "un anime romcom",
+    "por qué naruto es tan largo?",
+    "cuál es la mejor temporada de aot?",
+    "quien ganaría goku o saitama?",
+    "hablame de la revolución francesa",
+    "contame sobre evangelion",
+    "dónde ver one piece?",
+    "va a llover mañana?",
+    "me va a ir bien en el examen?",
+    "debería comprarme la switch 2?",
+    "apruebo matemática este año?",
+    "mi crush me va a hablar?",
+    "se viene temporada 3 de spy x family?",
+    "lo de hoy fue canon?",
+    "gano la lotería con el 27?",
+    "este server es el mejor de discord?",
+    "@oraculo sí?",
+    "🤔",
+    "me conviene dejar el anime por un mes o no?",
+]
+
+FOLLOWUPS = [
+    "gracias",
+    "que genio",
+    "crack!!",
+    "te amo",
+    "basado",
+    "ok",
+    "jaja buenísimo",
+    "xd",
+    "no me gusta el romcom",
+    "decile que sí",
+    "malísimo",
+    "2*8",
+    "cuánto es 9+10?",
+    "y por qué?",
+    "otro",
+    "no entendí nada, explicame mejor",
+]
+
+
+def _legacy_route(pq: str) -> str:
+    """La cadena if/elif original de `_build_oracle_embed` (sin contexto de reply)."""
+    if oc._is_oracle_greeting(pq):
+        return "greeting"
+    d_expr = oc._parse_derivative_expression(pq)
+    if d_expr and oc._derive_simple(d_expr) is not None:
+        return "derivative"
+    if oc._is_roulette_color_question(pq):
+        return "roulette"
+    if oc._is_poker_push_decision_question(pq):
+        return "poker"
+    if oc._is_multi_option_or_recommendation(pq):
+        return "multi_option"
+    if oc._oracle_is_fast_opinion_yesno(pq):
+        return "fast_opinion"
+    if oc._is_simple_arithmetic_question(pq):
+        return "arithmetic"
+    if oc._is_open_ended_question(pq):
+        return "open"
+    return "yesno"
+
+
+def _legacy_followup(line: str) -> str:
+    if oc._ORACLE_PRAISE_RE.match(line or ""):
+        return "praise"
+    if oc._ORACLE_FAST_SMALLTALK_RE.match(line or "") and len((line or "").strip()) <= 80:
+        return "smalltalk"
+    if oc._is_simple_arithmetic_question(line):
+        return "arithmetic"
+    return "other"
+
+
+class TestIntentClassifier(unittest.TestCase):
+    def test_only_triggered_rules_are_checked(self):
+        seen = []
+
+        def rule(name, **kw):
+            return IntentRule(name, lambda v: seen.append(name) or name in v.tokens, **kw)
+
+        clf = IntentClassifier(
+            [rule("rojo", tokens=frozenset({"rojo"})), rule("num", needs_digit=True), rule("cuant", prefixes=("cuant",))],
+            default="nada",
+        )
+        self.assertEqual(clf.classify("todo al ROJO"), "rojo")
+        self.assertEqual(clf.classify("cuantos 3"), "nada")
+        self.assertEqual(clf.classify("hola"), "nada")
+        self.assertEqual(seen, ["rojo", "num", "cuant"])
+        self.assertEqual(clf.classify("rojo", only=clf.mask(["num"])), "nada")
+        self.assertEqual(QuestionView.of("  A   b ").flat, "A b")
+
+
+class TestOracleRouting(unittest.TestCase):
+    def test_matches_legacy_chain_on_corpus(self):
+        for q in CORPUS:
+            with self.subTest(q=q):
+                self.assertEqual(oc._classify_oracle_question(q), _legacy_route(q))
+        for line in FOLLOWUPS:
+            with self.subTest(line=line):
+                self.assertEqual(oc._ORACLE_FOLLOWUP_INTENTS.classify(line), _legacy_followup(line))
+        intents = {oc._classify_oracle_question(q) for q in CORPUS}
+        self.assertEqual(
+            intents,
+            {"greeting", "derivative", "roulette", "poker", "multi_option", "fast_opinion", "arithmetic", "open", "yesno"},
+        )
+
+    def test_reply_context_only_decides_open(self):
+        ctx = "(Mensaje del chat al que respondés)\ncuándo sale la peli?\n\n(Pregunta)\nva a estar buena?"
+        self.assertEqual(oc._classify_oracle_question("va a estar buena?", ctx), "open")
+        self.assertEqual(oc._classify_oracle_question("todo al rojo?", ctx), "roulette")
+
+    def test_routing_cost_us(self):
+        # Medición informativa (pytest -s): sin assert de tiempo, depende de la máquina.
+        corpus = CORPUS * 30
+
+        t0 = time.perf_counter()
+        for q in corpus:
+            _legacy_route(q)
+        legacy_us = (time.perf_counter() - t0) / len(corpus) * 1e6
+
+        t0 = time.perf_counter()
+        routed = [oc._classify_oracle_question(q) for q in corpus]
+        new_us = (time.perf_counter() - t0) / len(corpus) * 1e6
+
+        print(f"\n[oracle intent] {new_us:.1f} µs por pregunta (cadena anterior {legacy_us:.1f} µs, {len(CORPUS)} preguntas)")
+        self.assertEqual(len(routed), len(corpus))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cogs import oracle_llm
+from cogs.oracle_llm import OracleReplyCache, _normalize_question
+
+
+class TestOracleReplyCache(unittest.TestCase):
+    def test_normalized_key(self):
+        self.assertEqual(_normalize_question("¿Quién es  GOKU?"), "quien es goku")
+        k1 = OracleReplyCache.make_key("open", "m", "¿quién es Goku?", "ctx")
+        self.assertEqual(k1, OracleReplyCache.make_key("open", "m", "quien es goku", "ctx"))
+        self.assertNotEqual(k1, OracleReplyCache.make_key("yesno", "m", "quien es goku", "ctx"))
+        self.assertNotEqual(k1, OracleReplyCache.make_key("open", "m", "quien es goku", "otro ctx"))
+
+    def test_ttl_lru_and_coalescing(self):
+        calls = []
+
+        async def main():
+            cache = OracleReplyCache(ttl=60, max_entries=2)
+
+            def compute(answer):
+                async def _c():
+                    calls.append(answer)
+                    await asyncio.sleep(0.02)
+                    return answer
+
+                return _c
+
+            a, b = await asyncio.gather(
+                cache.get_or_compute(("k1",), compute("uno")), cache.get_or_compute(("k1",), compute("uno"))
+            )
+            self.assertEqual((a, b), ("uno", "uno"))
+            self.assertEqual(await cache.get_or_compute(("k1",), compute("x")), "uno")
+            await cache.get_or_compute(("k2",), compute("dos"))
+            await cache.get_or_compute(("k3",), compute("tres"))
+            # max_entries=2: k1 fue desalojada.
+            self.assertEqual(await cache.get_or_compute(("k1",), compute("uno bis")), "uno bis")
+            with mock.patch.object(oracle_llm.time, "monotonic", return_value=oracle_llm.time.monotonic() + 61):
+                self.assertIsNone(cache.get(("k1",)))
+            return cache.stats()
+
+        st = asyncio.run(main())
+        self.assertEqual(calls, ["uno", "dos", "tres", "uno bis"])
+        self.assertEqual(st["coalesced"], 1)
+        self.assertEqual(st["hits"], 1)
+        self.assertEqual(st["misses"], 4)
+
+    def test_failures_are_not_cached(self):
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            return None
+
+        async def main():
+            cache = OracleReplyCache(ttl=60, max_entries=8)
+            self.assertIsNone(await cache.get_or_compute(("k",), fail))
+            self.assertIsNone(await cache.get_or_compute(("k",), fail))
+
+        asyncio.run(main())
+        self.assertEqual(len(calls), 2)
+
+
+class TestOracleLocalReplyCached(unittest.TestCase):
+    def test_repeated_question_hits_ollama_once(self):
+        prompts = []
+
+        async def generate(request):
+            body = await request.json()
+            prompts.append(body["prompt"])
+            await asyncio.sleep(0.02)
+            return web.json_response({"response": "Un saiyajin que entrena sin parar."})
+
+        async def main():
+            app = web.Application()
+            app.router.add_post("/api/generate", generate)
+            server = TestServer(app)
+            await server.start_server()
+            env = {"ORACLE_LLM_URL": str(server.make_url("/")), "ORACLE_INTERNET_SEARCH": "0"}
+            try:
+                with mock.patch.dict(os.environ, env), mock.patch.object(
+                    oracle_llm, "_REPLY_CACHE", OracleReplyCache(ttl=60, max_entries=16)
+                ):
+                    first = await asyncio.gather(*(oracle_llm.oracle_local_reply("¿Quién es Goku?") for _ in range(3)))
+                    again = await oracle_llm.oracle_local_reply("quien es goku")
+                    other = await oracle_llm.oracle_local_reply("¿Quién es Goku?", style="yesno")
+                    return first, again, other, oracle_llm.oracle_llm_cache_stats()
+            finally:
+                await oracle_llm.close_oracle_http()
+                await server.close()
+
+        first, again, other, st = asyncio.run(main())
+        self.assertEqual(len(set(first)), 1)
+        self.assertEqual(again, first[0])
+        self.assertEqual(other, first[0])
+        # Un POST para las 4 "open" (3 en vuelo + 1 repetida) y otro para el estilo sí/no.
+        self.assertEqual(len(prompts), 2)
+        self.assertEqual((st["misses"], st["coalesced"], st["hits"]), (2, 2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from cogs.oracle_llm import OracleLLMScheduler
+
+
+async def _job(sched, priority, order, *, hold=0.03):
+    if not await sched.acquire(priority):
+        order.append(("drop", priority))
+        return False
+    order.append(("run", priority))
+    try:
+        await asyncio.sleep(hold)
+    finally:
+        sched.release(hold)
+    return True
+
+
+class TestOracleLLMScheduler(unittest.TestCase):
+    def test_concurrency_and_priority_order(self):
+        order = []
+        peak = []
+
+        async def main():
+            sched = OracleLLMScheduler(concurrency=1, max_queue=10, max_wait=5, quip_max_wait=5)
+            sched.service_s = 0.01
+            first = asyncio.create_task(_job(sched, "primary", order))
+            await asyncio.sleep(0)
+            # Llegan en orden inverso a su prioridad mientras el primero ocupa el único turno.
+            rest = [asyncio.create_task(_job(sched, p, order)) for p in ("quip", "vision", "followup", "primary")]
+            await asyncio.sleep(0)
+            peak.append(sched.stats()["queued"])
+            await asyncio.gather(first, *rest)
+            return sched.stats()
+
+        st = asyncio.run(main())
+        self.assertEqual([p for _k, p in order], ["primary", "primary", "followup", "vision", "quip"])
+        self.assertEqual(peak, [4])
+        self.assertEqual(st["granted"], 5)
+        self.assertEqual(st["active"], 0)
+        self.assertGreater(st["avg_wait_ms"], 0)
+
+    def test_full_queue_drops_fast(self):
+        order = []
+
+        async def main():
+            sched = OracleLLMScheduler(concurrency=1, max_queue=1, max_wait=5, quip_max_wait=5)
+            sched.service_s = 0.01
+            tasks = [asyncio.create_task(_job(sched, "primary", order)) for _ in range(3)]
+            return await asyncio.gather(*tasks), sched.stats()
+
+        results, st = asyncio.run(main())
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(st["dropped_full"], 1)
+
+    def test_deadline_drops(self):
+        order = []
+
+        async def main():
+            sched = OracleLLMScheduler(concurrency=1, max_queue=10, max_wait=5, quip_max_wait=0.05)
+            sched.service_s = 0.01
+            busy = asyncio.create_task(_job(sched, "primary", order, hold=0.2))
+            await asyncio.sleep(0)
+            # La quip no llega a empezar antes de su plazo: se descarta sin esperar al primero.
+            quip_ok = await _job(sched, "quip", order)
+            # Con una estimación de servicio alta, la espera prevista supera el plazo: ni se encola.
+            sched.service_s = 1.0
+            quip_ok2 = await _job(sched, "quip", order)
+            await busy
+            return quip_ok, quip_ok2, sched.stats()
+
+        quip_ok, quip_ok2, st = asyncio.run(main())
+        self.assertFalse(quip_ok)
+        self.assertFalse(quip_ok2)
+        self.assertEqual(st["dropped_deadline"], 2)
+        self.assertEqual(st["queued"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import discord
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cogs import oracle_llm
+from cogs.oraculo_cog import _OracleStreamEdits
+from cogs.oracle_llm import OracleReplyCache, _stream_limit_reached
+
+WORDS = [f"palabra{i}" for i in range(200)]
+
+
+class TestStreamLimits(unittest.TestCase):
+    def test_limit_needs_one_extra_word_or_chars(self):
+        self.assertFalse(_stream_limit_reached("uno dos tres", max_words=3, max_chars=100))
+        self.assertTrue(_stream_limit_reached("uno dos tres cu", max_words=3, max_chars=100))
+        self.assertTrue(_stream_limit_reached("x" * 50, max_words=10, max_chars=40))
+        self.assertFalse(_stream_limit_reached("a  \n b", max_words=10, max_chars=3))
+
+
+class TestOllamaStreaming(unittest.TestCase):
+    def _serve(self, scenario, *, stream_env="1"):
+        sent = []
+        finished = []
+
+        async def generate(request):
+            body = await request.json()
+            if not body.get("stream"):
+                return web.json_response({"response": " ".join(WORDS[:40]), "done": True})
+            resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+            await resp.prepare(request)
+            try:
+                for w in WORDS:
+                    await resp.write((json.dumps({"response": w + " ", "done": False}) + "\n").encode())
+                    sent.append(w)
+                    await asyncio.sleep(0.005)
+                await resp.write((json.dumps({"response": "", "done": True}) + "\n").encode())
+                finished.append(True)
+            except (ConnectionResetError, asyncio.CancelledError):
+                pass
+            return resp
+
+        async def main():
+            app = web.Application()
+            app.router.add_post("/api/generate", generate)
+            server = TestServer(app)
+            await server.start_server()
+            env = {
+                "ORACLE_LLM_URL": str(server.make_url("/")),
+                "ORACLE_INTERNET_SEARCH": "0",
+                "ORACLE_LLM_STREAM": stream_env,
+                "ORACLE_MAX_WORDS": "12",
+            }
+            try:
+                with mock.patch.dict(os.environ, env), mock.patch.object(
+                    oracle_llm, "_REPLY_CACHE", OracleReplyCache(ttl=0, max_entries=0)
+                ):
+                    out = await scenario()
+                await asyncio.sleep(0.1)
+                return out
+            finally:
+                await oracle_llm.close_oracle_http()
+                await server.close()
+
+        out = asyncio.run(main())
+        return out, sent, finished
+
+    def test_stream_stops_at_word_limit(self):
+        partials = []
+
+        async def scenario():
+            return await oracle_llm.oracle_local_reply("¿qué anime veo hoy?", on_partial=partials.append)
+
+        out, sent, finished = self._serve(scenario)
+        self.assertEqual(out, " ".join(WORDS[:12]))
+        # Se cortó la conexión: el servidor no llegó a mandar todo ni el `done`.
+        self.assertLess(len(sent), 60)
+        self.assertEqual(finished, [])
+        self.assertTrue(partials)
+        self.assertTrue(all(len(p.split()) <= 12 for p in partials))
+
+    def test_non_stream_mode_still_works(self):
+        async def scenario():
+            return await oracle_llm.oracle_local_reply("¿qué anime veo hoy?")
+
+        out, sent, _ = self._serve(scenario, stream_env="0")
+        self.assertEqual(out, " ".join(WORDS[:12]))
+        self.assertEqual(sent, [])
+
+
+class _FakeMessage:
+    def __init__(self, fail_edit=False):
+        self.id = 1
+        self.embeds = []
+        self.deleted = False
+        self.fail_edit = fail_edit
+
+    async def edit(self, *, embed):
+        if self.fail_edit and embed.title == "final":
+            raise discord.HTTPException(SimpleNamespace(status=500, reason="x"), "boom")
+        self.embeds.append(embed.title)
+
+    async def delete(self):
+        self.deleted = True
+
+
+class _FakeChannel:
+    def __init__(self, fail_edit=False):
+        self.fail_edit = fail_edit
+        self.sent = []
+
+    async def send(self, *, embed, reference=None, mention_author=False):
+        msg = _FakeMessage(self.fail_edit)
+        msg.embeds.append(embed.title)
+        self.sent.append(msg)
+        return msg
+
+
+class TestStreamEdits(unittest.TestCase):
+    def _run(self, channel, scenario):
+        async def main():
+            stream = _OracleStreamEdits(
+                channel, reference=None, make_embed=lambda t: discord.Embed(title=t), interval=0.0
+            )
+            stream.push("parcial")
+            await asyncio.sleep(0)
+            return await scenario(stream)
+
+        return asyncio.run(main())
+
+    def test_final_edit_reuses_partial(self):
+        ch = _FakeChannel()
+        sent = self._run(ch, lambda stream: stream.finish(discord.Embed(title="final")))
+        self.assertIs(sent, ch.sent[0])
+        self.assertEqual(sent.embeds, ["parcial …", "final"])
+
+    def test_failed_final_edit_drops_partial(self):
+        ch = _FakeChannel(fail_edit=True)
+        sent = self._run(ch, lambda stream: stream.finish(discord.Embed(title="final")))
+        # None: el que llama manda el embed final como mensaje nuevo.
+        self.assertIsNone(sent)
+        self.assertTrue(ch.sent[0].deleted)
+
+    def test_abort_deletes_partial(self):
+        ch = _FakeChannel()
+        self._run(ch, lambda stream: stream.abort())
+        self.assertTrue(ch.sent[0].deleted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cogs.votacion.db_manager import PollDBManagerV5
+
+
+class TestPollTally(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "votacion.db"
+        self.db = PollDBManagerV5(self.path)
+        self.db.add_poll(100, 1, 2, 3, "¿Cuál?", ["A", "B", "C"], None, None, None, 2, "ambos", None)
+        self.opts = [o["option_id"] for o in self.db.get_poll_data(100)["options"]]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _counts(self, db):
+        return [o["vote_count"] for o in db.get_poll_data(100)["options"]]
+
+    def test_votes_kept_in_memory_and_match_db(self):
+        a, b, c = self.opts
+        for uid in range(1, 21):
+            self.assertTrue(self.db.add_vote(100, uid, a if uid % 2 else b))
+        self.assertFalse(self.db.add_vote(100, 1, a))
+        self.db.add_vote(100, 1, c)
+        self.assertTrue(self.db.remove_vote(100, 2, b))
+        self.assertFalse(self.db.remove_vote(100, 2, b))
+
+        self.assertEqual(self._counts(self.db), [10, 9, 1])
+        self.assertEqual(self.db.get_user_votes_for_poll(100, 1), sorted([a, c]))
+        self.assertEqual(self.db.get_user_votes_for_poll(100, 2), [])
+
+        # Un manager nuevo arma el conteo desde la DB y coincide.
+        fresh = PollDBManagerV5(self.path)
+        self.assertEqual(self._counts(fresh), [10, 9, 1])
+        self.assertEqual(fresh.get_user_votes_for_poll(100, 1), sorted([a, c]))
+
+    def test_option_and_state_changes_refresh_tally(self):
+        self.db.add_poll_option(100, "D")
+        self.assertEqual(len(self.db.get_poll_data(100)["options"]), 4)
+        d = self.db.get_poll_data(100)["options"][-1]["option_id"]
+        self.db.remove_poll_option(d)
+        self.assertEqual(len(self.db.get_poll_data(100)["options"]), 3)
+        self.db.close_poll(100)
+        self.assertEqual(self.db.get_poll_data(100)["is_active"], 0)
+        # Cerrada: el embed final se arma desde la DB y el conteo no queda en memoria.
+        self.assertNotIn(100, self.db._tallies)
+        self.db.delete_poll(100)
+        self.assertIsNone(self.db.get_poll_data(100))
+
+    def test_delete_evicts_tally(self):
+        self.db.add_vote(100, 1, self.opts[0])
+        self.assertIn(100, self.db._tallies)
+        self.db.delete_poll(100)
+        self.assertNotIn(100, self.db._tallies)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cogs.economia.db_manager import EconomiaDBManagerV2
+from cogs.economia.progress_snapshot import ProgressReadCache
+from cogs.economia.reclamar_service import reclaim_rewards
+
+
+class TestProgressSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = EconomiaDBManagerV2(Path(self._tmp.name) / "eco.db")
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def test_matches_individual_reads(self):
+        uid = 5
+        fecha, semana = self.db.get_current_date_keys()
+        for pos in range(1, 13):
+            self.db.anime_top_set(uid, pos, f"Anime {pos}")
+        self.db.wishlist_set(uid, 1, "Algo")
+        self.db.buffer_task_diaria(uid, "mensajes_servidor", fecha, 3)
+        self.db.buffer_task_semanal(uid, "media_escrito", semana, 1)
+
+        snap = self.db.get_progress_snapshot(uid)
+        self.assertEqual(snap.inicial, self.db.get_progress_inicial(uid))
+        self.assertEqual(snap.diaria, self.db.get_progress_diaria(uid))
+        self.assertEqual(snap.semanal, self.db.get_progress_semanal(uid))
+        self.assertEqual(snap.diaria["mensajes_servidor"], 3)
+        self.assertEqual(snap.top_filled(10), self.db.anime_top_count_filled(uid, 10))
+        self.assertEqual(snap.top_filled(33), 12)
+        self.assertEqual(snap.wishlist_filled, 1)
+        self.assertEqual((snap.cards_copies, snap.cards_kinds), self.db.inventory_cards_totals(uid))
+
+    def test_reclaim_objetivo_failure_rolls_back_its_points(self):
+        uid = 6
+        fecha, _ = self.db.get_current_date_keys()
+        self.db.buffer_task_diaria(uid, "mensajes_servidor", fecha, 10)
+        self.db.buffer_task_diaria(uid, "reacciones_servidor", fecha, 3)
+        self.db.buffer_task_diaria(uid, "oraculo_preguntas", fecha, 1)
+        self.db.flush_task_counters()
+
+        real_claim = self.db.claim_reward
+
+        def broken_claim(user_id, task_type):
+            real_claim(user_id, task_type)
+            raise RuntimeError("boom")
+
+        self.db.claim_reward = broken_claim
+        cfg = {"rewards": {"diaria_actividad": 25}}
+        ok, ok_msgs, err_msgs = reclaim_rewards(self.db, cfg, uid, "diaria_actividad")
+        self.assertFalse(ok)
+        self.assertEqual(ok_msgs, [])
+        self.assertTrue(err_msgs)
+        self.assertEqual(self.db.get_user_economy(uid)["puntos_actuales"], 0)
+        self.assertEqual(self.db.get_progress_diaria(uid)["completado_diaria_actividad"], 0)
+        self.assertEqual(self.db.count_ranked_users("actual"), 0)
+
+        self.db.claim_reward = real_claim
+        ok, _, _ = reclaim_rewards(self.db, cfg, uid, "diaria_actividad")
+        self.assertTrue(ok)
+        self.assertEqual(self.db.get_user_economy(uid)["puntos_actuales"], 25)
+        self.assertEqual(self.db.get_user_rank_info(uid, "actual")["rank"], 1)
+
+
+class TestProgressReadCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = EconomiaDBManagerV2(Path(self._tmp.name) / "eco.db")
+        self.fecha, self.semana = self.db.get_current_date_keys()
+        self.statements = []
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def _traced(self, fn, *args):
+        conn = self.db._get_connection()
+        self.statements.clear()
+        conn.set_trace_callback(self.statements.append)
+        try:
+            return fn(*args)
+        finally:
+            conn.set_trace_callback(None)
+
+    def test_repeat_reads_skip_sqlite_and_writes_invalidate(self):
+        uid = 7
+        first = self.db.get_progress_snapshot(uid)
+        again = self._traced(self.db.get_progress_snapshot, uid)
+        self.assertEqual(self.statements, [])
+        self.assertEqual(again, first)
+        self.assertIsNot(again.diaria, first.diaria)
+
+        for write in (
+            lambda: self.db.modify_points(uid, 10),
+            lambda: self.db.update_task_diaria(uid, "mensajes_servidor", self.fecha, 2),
+            lambda: self.db.update_task_semanal(uid, "media_escrito", self.semana, 1),
+            lambda: self.db.wishlist_set(uid, 1, "Frieren"),
+            lambda: self.db.add_card_to_inventory(uid, 3, 2),
+        ):
+            write()
+            self.db.get_progress_snapshot(uid)
+            self._traced(self.db.get_progress_snapshot, uid)
+            self.assertEqual(self.statements, [])
+        snap = self.db.get_progress_snapshot(uid)
+        self.assertEqual(snap.economy["puntos_actuales"], 10)
+        self.assertEqual(snap.diaria["mensajes_servidor"], 2)
+        self.assertEqual(snap.semanal["media_escrito"], 1)
+        self.assertEqual((snap.wishlist_filled, snap.cards_copies), (1, 2))
+
+        self.db.update_task_inicial(uid, "completado_inicial_comunidad")
+        self.db.claim_reward(uid, "inicial_comunidad")
+        self.assertEqual(self.db.get_progress_snapshot(uid).inicial, self.db.get_progress_inicial(uid))
+        self.assertGreaterEqual(self.db.progress_cache.stats()["invalidations"], 6)
+
+    def test_buffered_counters_and_flush(self):
+        uid = 8
+        self.db.get_progress_snapshot(uid)
+        # El buffer se mezcla sobre la foto cacheada (sin invalidar por cada mensaje).
+        self.db.buffer_task_diaria(uid, "mensajes_servidor", self.fecha, 4)
+        snap = self._traced(self.db.get_progress_snapshot, uid)
+        self.assertEqual(self.statements, [])
+        self.assertEqual(snap.diaria["mensajes_servidor"], 4)
+        self.assertEqual(self.db.get_progress_snapshot(uid).diaria["mensajes_servidor"], 4)
+        self.db.flush_task_counters()
+        self.assertEqual(self.db.get_progress_snapshot(uid).diaria["mensajes_servidor"], 4)
+        self.db.buffer_task_diaria(uid, "mensajes_servidor", self.fecha, 1)
+        self.assertEqual(self.db.get_progress_snapshot(uid).diaria["mensajes_servidor"], 5)
+
+    def test_transactions_bypass_and_invalidate_on_commit(self):
+        uid = 9
+        self.db.get_progress_snapshot(uid)
+        try:
+            with self.db.transaction():
+                self.db.modify_points(uid, 50)
+                self.assertEqual(self.db.get_progress_snapshot(uid).economy["puntos_actuales"], 50)
+                raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+        self.assertEqual(self.db.get_progress_snapshot(uid).economy["puntos_actuales"], 0)
+        with self.db.transaction():
+            self.db.modify_points(uid, 5)
+        self.assertEqual(self.db.get_progress_snapshot(uid).economy["puntos_actuales"], 5)
+
+    def test_read_racing_a_write_is_not_cached(self):
+        cache = ProgressReadCache(60)
+        snap = self.db.get_progress_snapshot(10)
+        token = cache.begin(10)
+        cache.invalidate(10)  # escritura que commitea mientras se leía
+        self.assertFalse(cache.put(10, token, snap))
+        self.assertIsNone(cache.get(10, snap.fecha, snap.semana))
+        token = cache.begin(10)
+        self.assertTrue(cache.put(10, token, snap))
+        self.assertIs(cache.get(10, snap.fecha, snap.semana), snap)
+        # Otro día: la foto no sirve.
+        self.assertIsNone(cache.get(10, "2000-01-01", snap.semana))
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = ProgressReadCache(15, clock=lambda: now[0])
+        snap = self.db.get_progress_snapshot(11)
+        cache.put(11, cache.begin(11), snap)
+        now[0] = 14.9
+        self.assertIsNotNone(cache.get(11, snap.fecha, snap.semana))
+        now[0] = 15.1
+        self.assertIsNone(cache.get(11, snap.fecha, snap.semana))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from cogs.economia.db_manager import EconomiaDBManagerV2
+from cogs.economia.rank_index import SortedScoreIndex
+
+
+class TestSortedScoreIndex(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rnd = random.Random(7)
+        idx = SortedScoreIndex()
+        ref = {}
+        for _ in range(2000):
+            uid = rnd.randrange(60)
+            val = max(0, rnd.randrange(-5, 40))
+            idx.set(uid, val)
+            ref[uid] = val
+        positives = sorted(((-v, u) for u, v in ref.items() if v > 0))
+        self.assertEqual(idx.count_positive(), len(positives))
+        self.assertEqual(idx.page(10, 5), [(u, -nv) for nv, u in positives[5:15]])
+        for uid, val in ref.items():
+            above = sum(1 for v in ref.values() if v > val)
+            self.assertEqual(idx.count_above(idx.score_of(uid)), above)
+
+
+class TestRankingFromDB(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "eco.db"
+        self.db = EconomiaDBManagerV2(self.path)
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def test_index_follows_point_writes(self):
+        self.db.modify_points(1, 100)
+        self.db.modify_points(2, 50)
+        self.db.modify_points(3, 70)
+        self.db.modify_points(1, 60, gastar=True)
+        self.db.remove_historic_points(3, 30)
+
+        top = self.db.get_top_users("actual", limit=10)
+        self.assertEqual([(r["user_id"], r["puntos_actuales"]) for r in top], [(2, 50), (1, 40), (3, 40)])
+        self.assertEqual(self.db.count_ranked_users("gastados"), 1)
+        info = self.db.get_user_rank_info(3, "conseguidos")
+        self.assertEqual(info, {"value": 40, "rank": 3, "with_positive": 3})
+        self.assertEqual(self.db.get_user_rank_info(99, "actual")["rank"], 4)
+
+        # El índice reconstruido al arrancar coincide con el fallback SQL.
+        db2 = EconomiaDBManagerV2(self.path)
+        try:
+            for mode in ("actual", "conseguidos", "gastados"):
+                warm = db2.get_top_users(mode, limit=10)
+                db2._rank_index_loaded = False
+                self.assertEqual(db2.get_top_users(mode, limit=10), warm)
+                self.assertEqual(db2.get_user_rank_info(1, mode)["rank"], self.db.get_user_rank_info(1, mode)["rank"])
+                db2._rank_index_loaded = True
+        finally:
+            db2.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
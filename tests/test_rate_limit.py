@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cogs.rate_limit import RateLimitService, SlidingWindowLimiter, TokenBucketLimiter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSlidingWindow(unittest.TestCase):
+    def test_limit_retry_after_and_expiry(self):
+        clock = _Clock()
+        lim = SlidingWindowLimiter("t", limit=2, window=25.0, clock=clock)
+        self.assertEqual(lim.acquire(1), 0.0)
+        clock.now += 5
+        self.assertEqual(lim.acquire(1), 0.0)
+        clock.now += 5
+        self.assertAlmostEqual(lim.acquire(1), 15.0)
+        self.assertEqual(lim.acquire(2), 0.0)
+        clock.now += 15
+        self.assertEqual(lim.retry_after(1), 0.0)
+        self.assertEqual(lim.count(1), 1)
+        self.assertEqual(lim.stats(), {"keys": 2, "allowed": 3, "limited": 1})
+        clock.now += 100
+        self.assertEqual(lim.sweep(), 2)
+
+    def test_state_is_bounded_by_limit(self):
+        clock = _Clock()
+        lim = SlidingWindowLimiter("t", limit=3, window=60.0, clock=clock)
+        for _ in range(1000):
+            lim.hit("k")
+            clock.now += 0.01
+        self.assertEqual(len(lim._state.get("k")), 3)
+        lim.configure(limit=1, window=60.0)
+        self.assertGreater(lim.retry_after("k"), 59.0)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_refill(self):
+        clock = _Clock()
+        lim = TokenBucketLimiter("b", rate=0.5, capacity=3, clock=clock)
+        self.assertEqual([lim.acquire("u") for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(lim.acquire("u"), 2.0)
+        clock.now += 2
+        self.assertEqual(lim.acquire("u"), 0.0)
+        clock.now += 6
+        # Balde lleno otra vez: la entrada ya no hace falta.
+        self.assertEqual(lim.sweep(), 1)
+        self.assertEqual(lim.stats()["keys"], 0)
+
+
+class TestRateLimitService(unittest.TestCase):
+    def test_persisted_limiters_survive_restart(self):
+        clock = _Clock()
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "rl.json"
+            svc = RateLimitService(path, clock=clock)
+            daily = svc.sliding_window("media_daily", limit=2, window=86400.0, persist=True)
+            svc.sliding_window("en_memoria", limit=1, window=10.0).hit(7)
+            bucket = svc.token_bucket("burst", rate=1.0, capacity=5, persist=True)
+            daily.hit("42:2024-05-01")
+            daily.hit("42:2024-05-01")
+            bucket.hit(42, cost=4)
+            self.assertTrue(svc.save())
+            self.assertFalse(svc.save())  # sin cambios no reescribe
+
+            clock.now += 60
+            svc2 = RateLimitService(path, clock=clock)
+            daily2 = svc2.sliding_window("media_daily", limit=2, window=86400.0, persist=True)
+            self.assertGreater(daily2.retry_after("42:2024-05-01"), 86000)
+            self.assertEqual(daily2.retry_after("42:2024-05-02"), 0.0)
+            self.assertEqual(svc2.token_bucket("burst", rate=1.0, capacity=5, persist=True).retry_after(42), 0.0)
+            self.assertEqual(svc2.sliding_window("en_memoria", limit=1, window=10.0).retry_after(7), 0.0)
+            # Mismo nombre con otros parámetros: se reconfigura, no se duplica.
+            self.assertIs(svc2.sliding_window("media_daily", limit=5, window=86400.0, persist=True), daily2)
+            self.assertEqual(daily2.retry_after("42:2024-05-01"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
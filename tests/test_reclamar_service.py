@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, call
 
+from cogs.economia.progress_snapshot import UserProgressSnapshot
 from cogs.economia.reclamar_service import (
     format_diaria_reclaim_blocked_explanation,
     parse_reclamo_prefijo_parts,
@@ -59,25 +60,43 @@ class TestParseReclamoPrefijo(unittest.TestCase):
         self.assertEqual(parse_reclamo_prefijo_parts(["todo"]), (None, None))
 
 
+def _snapshot(inicial=None, diaria=None, semanal=None, wishlist=0, top=0, hated=0):
+    return UserProgressSnapshot(
+        user_id=0,
+        fecha="2024-01-01",
+        semana="2024-00",
+        inicial=inicial or {},
+        diaria=diaria or {},
+        semanal=semanal or {},
+        economy={},
+        wishlist_filled=wishlist,
+        hated_filled=hated,
+        top_positions=list(range(1, top + 1)),
+    )
+
+
 class TestReclaimRewards(unittest.TestCase):
     def test_inicial_claim_three_parts(self):
         db = MagicMock()
         db.modify_blisters.return_value = (1, [])
-        db.get_progress_inicial.return_value = {
-            "completado": 0,
-            "completado_inicial_comunidad": 0,
-            "completado_inicial_perfil_min": 0,
-            "completado_inicial_perfil_max": 0,
-            "presentacion": 1,
-            "reaccion_pais": 1,
-            "reaccion_rol": 1,
-            "reaccion_social": 1,
-            "reaccion_reglas": 1,
-            "general_mensaje": 1,
-        }
-        db.wishlist_total_filled.return_value = 33
-        db.anime_top_count_filled.side_effect = lambda _uid, n: n
-        db.hated_total_filled.return_value = 10
+        db.claim_reward.return_value = True
+        db.get_progress_snapshot.return_value = _snapshot(
+            inicial={
+                "completado": 0,
+                "completado_inicial_comunidad": 0,
+                "completado_inicial_perfil_min": 0,
+                "completado_inicial_perfil_max": 0,
+                "presentacion": 1,
+                "reaccion_pais": 1,
+                "reaccion_rol": 1,
+                "reaccion_social": 1,
+                "reaccion_reglas": 1,
+                "general_mensaje": 1,
+            },
+            wishlist=33,
+            top=33,
+            hated=10,
+        )
         task_config = {
             "rewards": {
                 "inicial_comunidad": 300,
@@ -95,18 +114,18 @@ class TestReclaimRewards(unittest.TestCase):
 
         self.assertTrue(ok)
         self.assertEqual(len(err_msgs), 0)
-        self.assertEqual(db.claim_reward.call_count, 3)
-        db.claim_reward.assert_has_calls(
+        self.assertEqual(
+            db.claim_reward.call_args_list,
             [
                 call(12345, "inicial_comunidad"),
                 call(12345, "inicial_perfil_min"),
                 call(12345, "inicial_perfil_max"),
-            ]
+            ],
         )
 
     def test_inicial_all_done_bundle(self):
         db = MagicMock()
-        db.get_progress_inicial.return_value = {"completado": 1}
+        db.get_progress_snapshot.return_value = _snapshot(inicial={"completado": 1})
 
         ok, ok_msgs, err_msgs = reclaim_rewards(db, {"rewards": {"inicial_comunidad": 1}}, 1, "inicial")
 
@@ -117,15 +136,12 @@ class TestReclaimRewards(unittest.TestCase):
         """`tipo=None` debe cobrar lo listo aunque inicial siga incompleto."""
         db = MagicMock()
         db.modify_blisters.return_value = (1, [])
-        db.get_progress_inicial.return_value = {
+        inicial = {
             "completado": 0,
             "completado_inicial_comunidad": 0,
             "presentacion": 0,
         }
-        db.wishlist_total_filled.return_value = 0
-        db.anime_top_count_filled.return_value = 0
-        db.hated_total_filled.return_value = 0
-        db.get_progress_diaria.return_value = {
+        diaria = {
             "completado": 0,
             "completado_diaria_actividad": 0,
             "completado_diaria_trampa": 0,
@@ -143,7 +159,7 @@ class TestReclaimRewards(unittest.TestCase):
             "dia_ahorcado": 0,
             "dia_ahorcado_id": 0,
         }
-        db.get_progress_semanal.return_value = {
+        semanal = {
             "completado": 0,
             "debate_post": None,
             "videos_reaccion": None,
@@ -157,6 +173,7 @@ class TestReclaimRewards(unittest.TestCase):
             "mg_duelo": 0,
             "mg_voto_dom": 0,
         }
+        db.get_progress_snapshot.return_value = _snapshot(inicial=inicial, diaria=diaria, semanal=semanal)
         task_config = {
             "rewards": {
                 "inicial_comunidad": 1,
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from cogs.votacion.render_scheduler import PollRenderScheduler
+
+
+class TestPollRenderScheduler(unittest.TestCase):
+    def test_burst_collapses_and_publishes_latest(self):
+        async def scenario():
+            sched = PollRenderScheduler(window=0.05)
+            state = {"votes": 0}
+            seen = []
+
+            async def render():
+                seen.append(state["votes"])
+                return state["votes"]
+
+            futs = []
+            for _ in range(50):
+                state["votes"] += 1
+                futs.append(sched.schedule(1, render))
+                await asyncio.sleep(0)
+            results = await asyncio.gather(*futs)
+            return sched, seen, results
+
+        sched, seen, results = asyncio.run(scenario())
+        self.assertLessEqual(len(seen), 3)
+        self.assertEqual(seen[-1], 50)
+        self.assertEqual(results[-1], 50)
+        self.assertEqual(sched.stats()["pending"], 0)
+        self.assertEqual(sched.stats()["requested"], 50)
+
+    def test_messages_are_independent_and_cancel_drops_pending(self):
+        async def scenario():
+            sched = PollRenderScheduler(window=0.05)
+            calls = []
+
+            def make(mid):
+                async def render():
+                    calls.append(mid)
+                    return mid
+
+                return render
+
+            first = await sched.schedule(1, make(1))
+            second = await sched.schedule(2, make(2))
+            dropped = sched.schedule(1, make(1))
+            sched.cancel(1)
+            return first, second, await dropped, calls
+
+        first, second, dropped, calls = asyncio.run(scenario())
+        self.assertEqual((first, second, dropped), (1, 2, None))
+        self.assertEqual(calls, [1, 2])
+
+    def test_vote_does_not_replace_structural_render(self):
+        async def scenario():
+            sched = PollRenderScheduler(window=0.05)
+            calls = []
+
+            def make(name, result):
+                async def render():
+                    calls.append(name)
+                    return result
+
+                return render
+
+            await sched.schedule(1, make("voto", None))
+            # Ventana abierta: /agregaropcion queda pendiente y llega otro voto antes de editar.
+            admin = sched.schedule(1, make("opciones", (True, None)), structural=True)
+            vote = sched.schedule(1, make("voto", None))
+            return await admin, await vote, calls
+
+        admin, vote, calls = asyncio.run(scenario())
+        self.assertEqual(admin, (True, None))
+        self.assertEqual(vote, (True, None))
+        self.assertEqual(calls, ["voto", "opciones"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from cogs.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "jobs.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_fires_on_time_and_reschedules(self):
+        async def main():
+            sch = Scheduler(self.path)
+            fired = []
+
+            async def handler(key, payload):
+                fired.append((key, payload.get("n"), time.time()))
+                return None
+
+            sch.register("t", handler)
+            sch.start()
+            t0 = time.time()
+            sch.schedule("t", "b", t0 + 0.15, {"n": 2})
+            sch.schedule("t", "a", t0 + 0.05, {"n": 1})
+            sch.schedule("t", "c", t0 + 0.05)
+            sch.cancel("t", "c")
+            sch.schedule("t", "b", t0 + 10, earliest=True)  # no atrasa
+            await asyncio.sleep(0.3)
+            st = sch.stats()
+            sch.close()
+            return t0, fired, st
+
+        t0, fired, st = asyncio.run(main())
+        self.assertEqual([(k, n) for k, n, _ in fired], [("a", 1), ("b", 2)])
+        self.assertLess(fired[0][2] - t0, 0.1)
+        self.assertEqual(st["jobs"], 0)
+        # Dos disparos: el loop no se despertó de a ticks fijos.
+        self.assertLess(st["wakeups"], 10)
+
+    def test_jobs_survive_restart_and_wait_for_handler(self):
+        sch = Scheduler(self.path)
+        sch.schedule("versus", "semana", time.time() - 5, {"w": "2024-W18"})
+        sch.schedule("otro", "x", time.time() + 3600)
+        sch.close()
+
+        async def main():
+            sch2 = Scheduler(self.path)
+            self.assertEqual([j[:2] for j in sch2.jobs()], [("otro", "x"), ("versus", "semana")])
+            seen = []
+
+            async def handler(key, payload):
+                seen.append(payload["w"])
+                return time.time() + 3600  # recurrente
+
+            sch2.start()
+            await asyncio.sleep(0.05)
+            self.assertEqual(seen, [])  # sin handler queda estacionado
+            sch2.register("versus", handler)
+            await asyncio.sleep(0.05)
+            due = sch2.due("versus", "semana")
+            sch2.close()
+            return seen, due
+
+        seen, due = asyncio.run(main())
+        self.assertEqual(seen, ["2024-W18"])
+        self.assertGreater(due, time.time() + 3000)
+        self.assertGreater(Scheduler(self.path).due("versus", "semana"), time.time() + 3000)
+
+    def test_failing_handler_is_retried_later(self):
+        async def main():
+            sch = Scheduler(self.path)
+
+            async def boom(key, payload):
+                raise RuntimeError("x")
+
+            sch.register("t", boom)
+            sch.start()
+            sch.schedule("t", 1, time.time())
+            await asyncio.sleep(0.05)
+            due, st = sch.due("t", 1), sch.stats()
+            sch.close()
+            return due, st
+
+        due, st = asyncio.run(main())
+        self.assertEqual(st["failed"], 1)
+        self.assertGreater(due, time.time() + 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cogs.economia.db_manager import EconomiaDBManagerV2
+
+
+class TestTaskCounterWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = EconomiaDBManagerV2(Path(self._tmp.name) / "eco.db")
+        self.fecha, self.semana = self.db.get_current_date_keys()
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def _raw_diaria(self, uid: int) -> int:
+        with self.db._get_connection() as conn:
+            row = conn.execute(
+                "SELECT mensajes_servidor FROM tareas_diarias WHERE user_id = ? AND fecha = ?",
+                (uid, self.fecha),
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def test_increments_merge_and_flush_once(self):
+        for _ in range(50):
+            self.db.buffer_task_diaria(1, "mensajes_servidor", self.fecha, 1)
+        self.db.buffer_task_semanal(1, "media_escrito", self.semana, 2)
+        self.db.buffer_task_inicial(1, "presentacion")
+        self.assertEqual(self.db.task_counters.pending_events, 52)
+
+        # Read-your-writes antes del flush.
+        self.assertEqual(self.db.get_progress_diaria(1)["mensajes_servidor"], 50)
+        self.assertEqual(self.db.get_progress_semanal(1)["media_escrito"], 2)
+        self.assertEqual(self.db.get_progress_inicial(1)["presentacion"], 1)
+        self.assertEqual(self._raw_diaria(1), 0)
+
+        self.assertEqual(self.db.flush_task_counters(), 3)
+        self.assertEqual(self._raw_diaria(1), 50)
+        self.assertEqual(self.db.get_progress_diaria(1)["mensajes_servidor"], 50)
+        self.assertEqual(self.db.task_counters.stats()["flushes_total"], 1)
+        self.assertEqual(self.db.flush_task_counters(), 0)
+
+    def test_completed_week_ignores_pending(self):
+        self.db.get_progress_semanal(2)
+        self.db.claim_reward(2, "semanal")
+        self.db.buffer_task_semanal(2, "media_escrito", self.semana, 5)
+        self.assertEqual(self.db.get_progress_semanal(2)["media_escrito"], 0)
+        self.db.flush_task_counters()
+        self.assertEqual(self.db.get_progress_semanal(2)["media_escrito"], 0)
+
+    def test_close_flushes(self):
+        path = Path(self._tmp.name) / "eco2.db"
+        db = EconomiaDBManagerV2(path)
+        db.buffer_task_diaria(3, "mensajes_servidor", self.fecha, 4)
+        db.close()
+        db2 = EconomiaDBManagerV2(path)
+        self.assertEqual(db2.get_progress_diaria(3)["mensajes_servidor"], 4)
+        db2.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from cogs.economia import trivia_anilist
+from cogs.economia.db_manager import EconomiaDBManagerV2
+from cogs.economia.trivia_anilist import AniListTriviaBuffer
+from cogs.economia.trivia_bank import (
+    CURSOR_META_KEY,
+    TriviaBank,
+    TriviaQuestion,
+    compile_questions,
+    expand_all_accepted_norms,
+    norm_answer,
+)
+
+
+def _write(path, items, mtime=None):
+    path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+class TestCompile(unittest.TestCase):
+    def test_accepted_answers_are_precomputed(self):
+        items = compile_questions(
+            [
+                {"q": "¿Protagonista de Tokyo Ghoul?", "a": ["Ken Kaneki"]},
+                {"question": "¿Estudio de Totoro?", "answer": "Studio Ghibli"},
+                {"q": "sin respuesta", "a": []},
+                {"q": "  ¿Protagonista de   tokyo ghoul?", "a": "duplicada"},
+                "basura",
+            ]
+        )
+        self.assertEqual(len(items), 2)
+        kaneki = items[0]
+        self.assertEqual(kaneki.answers, ("Ken Kaneki",))
+        for guess in ("Kaneki", "ken", "KenKaneki", "kanekiken", "Kén Kanéki"):
+            self.assertIn(norm_answer(guess), kaneki.accepted)
+        self.assertEqual(kaneki.accepted, frozenset(expand_all_accepted_norms(["Ken Kaneki"])))
+
+
+class TestTriviaBank(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "trivia.json"
+        self.meta = {}
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _draw(self, bank):
+        return bank.draw(self.meta.get, self.meta.__setitem__)
+
+    def test_hot_reload_only_when_file_changes(self):
+        _write(self.path, [{"q": "a?", "a": ["x"]}], mtime=1000)
+        bank = TriviaBank(self.path)
+        self.assertTrue(bank.reload_if_needed())
+        self.assertFalse(bank.reload_if_needed())
+        _write(self.path, [{"q": "a?", "a": ["x"]}, {"q": "b?", "a": ["y"]}], mtime=2000)
+        self.assertTrue(bank.reload_if_needed())
+        self.assertEqual(len(bank), 2)
+        # JSON roto a mitad de edición: se conserva lo anterior.
+        self.path.write_text("[{", encoding="utf-8")
+        with self.assertLogs("cogs.economia.trivia_bank", level="ERROR"):
+            self.assertFalse(bank.reload_if_needed())
+        self.assertEqual(len(bank), 2)
+        self.path.unlink()
+        with self.assertLogs("cogs.economia.trivia_bank", level="WARNING"):
+            self.assertFalse(bank.reload_if_needed())
+        self.assertEqual(len(bank), 2)
+
+    def test_no_repeats_until_exhausted_across_restarts(self):
+        _write(self.path, [{"q": f"p{i}?", "a": [f"r{i}"]} for i in range(10)])
+        bank = TriviaBank(self.path, rng=random.Random(1))
+        bank.reload_if_needed()
+        first = [self._draw(bank).q for _ in range(4)]
+        # Reinicio: banco nuevo, mismo bot_meta.
+        bank = TriviaBank(self.path, rng=random.Random(2))
+        bank.reload_if_needed()
+        rest = [self._draw(bank).q for _ in range(6)]
+        self.assertEqual(sorted(first + rest), sorted(f"p{i}?" for i in range(10)))
+        nxt = self._draw(bank).q
+        self.assertNotEqual(nxt, rest[-1])
+        self.assertEqual(bank.stats()["cycles"], 1)
+        self.assertEqual(len(json.loads(self.meta[CURSOR_META_KEY])["left"]), 9)
+
+    def test_edit_mid_cycle_keeps_asked_out(self):
+        _write(self.path, [{"q": f"p{i}?", "a": [f"r{i}"]} for i in range(5)], mtime=1000)
+        bank = TriviaBank(self.path, rng=random.Random(3))
+        bank.reload_if_needed()
+        asked = {self._draw(bank).q for _ in range(3)}
+        # Se borra una ya preguntada y se agregan dos nuevas.
+        gone = sorted(asked)[0]
+        items = [{"q": f"p{i}?", "a": [f"r{i}"]} for i in range(5) if f"p{i}?" != gone]
+        items += [{"q": "n1?", "a": ["a"]}, {"q": "n2?", "a": ["b"]}]
+        _write(self.path, items, mtime=2000)
+        bank.reload_if_needed()
+        rest = [self._draw(bank).q for _ in range(4)]
+        self.assertEqual(len(set(rest)), 4)
+        self.assertFalse(asked & set(rest))
+        self.assertIn("n1?", rest)
+        self.assertIn("n2?", rest)
+
+
+class TestAniListBuffer(unittest.TestCase):
+    def test_prefetch_fills_and_pop_never_waits(self):
+        calls = []
+
+        async def fake_fetch():
+            calls.append(1)
+            n = len(calls)
+            if n == 2:
+                return None  # fallo puntual
+            await asyncio.sleep(0.01)
+            return {"q": f"¿Año de la obra {n % 4}?", "answers": [str(2000 + n)]}
+
+        async def main():
+            buf = AniListTriviaBuffer(size=3)
+            self.assertIsNone(buf.pop())
+            buf.kick()
+            buf.kick()  # idempotente
+            await buf._task
+            ready = len(buf)
+            tq = buf.pop()
+            buf.kick()
+            await buf._task
+            buf.close()
+            return buf, ready, tq
+
+        with mock.patch.object(trivia_anilist, "try_fetch_anilist_trivia_question", fake_fetch):
+            buf, ready, tq = asyncio.run(main())
+        self.assertEqual(ready, 3)
+        self.assertIn("2001", tq.accepted)
+        self.assertEqual(len(buf), 3)
+        # Preguntas repetidas (misma clave) no entran dos veces al buffer.
+        self.assertEqual(len({x.key for x in buf._items}), 3)
+        st = buf.stats()
+        self.assertEqual((st["served"], st["empty"], st["failed"]), (1, 1, 1))
+
+
+class TestRoundPick(unittest.TestCase):
+    def setUp(self):
+        from cogs.economia.trivia_cog import AnimeTriviaCog
+
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "trivia.json"
+        _write(path, [{"q": "¿Banco?", "a": ["local"]}])
+        self.db = EconomiaDBManagerV2(Path(self._tmp.name) / "eco.db")
+        with mock.patch.dict(os.environ, {"TRIVIA_QUESTIONS_PATH": str(path)}):
+            self.cog = AnimeTriviaCog(SimpleNamespace(economia_db=self.db))
+            self.cog._reload_questions_if_needed()
+
+    def tearDown(self):
+        self.cog._anilist.close()
+        self.db.close()
+        self._tmp.cleanup()
+
+    def _pick(self, mix):
+        async def main():
+            with mock.patch.dict(os.environ, {"TRIVIA_USE_ANILIST": "1", "TRIVIA_ANILIST_MIX": mix}):
+                # El relleno en segundo plano no debe tocar la red en el test.
+                with mock.patch.object(self.cog._anilist, "kick"):
+                    return await self.cog._pick_question()
+
+        return asyncio.run(main())
+
+    def test_empty_buffer_falls_back_to_bank(self):
+        self.assertEqual(self._pick("1").q, "¿Banco?")
+        self.assertEqual(self.cog._anilist.stats()["empty"], 1)
+
+    def test_buffered_anilist_question_is_used(self):
+        tq = trivia_anilist.compile_question("¿AniList?", ["1999"])
+        self.cog._anilist._items.append(tq)
+        self.assertIsInstance(tq, TriviaQuestion)
+        self.assertEqual(self._pick("1"), tq)
+        self.assertEqual(self._pick("0").q, "¿Banco?")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from cogs.semanal_versus.db import VersusDB
+
+WEEK = "2024-W18"
+
+
+class TestVersusTally(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "versus.db"
+        self.db = VersusDB(self.path)
+        self.db.insert_poll_new(WEEK, 10, 20, "Goku (DB)", "Naruto (Naruto)")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _scan(self, db):
+        rows = db.get_votes(WEEK)
+        c0 = sum(1 for r in rows if r["side"] == 0)
+        return c0, len(rows) - c0
+
+    def test_counts_follow_votes_and_side_switches(self):
+        for uid in range(1, 11):
+            self.db.set_vote(WEEK, uid, uid % 2)
+        self.assertEqual(self.db.set_vote(WEEK, 1, 1), (5, 5))  # mismo bando: no suma
+        self.assertEqual(self.db.set_vote(WEEK, 1, 0), (6, 4))
+        self.assertEqual(self.db.set_vote(WEEK, 2, 1), (5, 5))
+        self.assertEqual(self.db.get_counts(WEEK), self._scan(self.db))
+
+        # Otro proceso (o un reinicio) arma el conteo desde versus_tally y coincide.
+        fresh = VersusDB(self.path)
+        self.assertEqual(fresh.get_counts(WEEK), (5, 5))
+        self.assertEqual(fresh.set_vote(WEEK, 3, 0), (6, 4))
+        self.assertEqual(fresh.get_counts(WEEK), self._scan(fresh))
+
+    def test_poll_mirror_and_close(self):
+        self.assertEqual(self.db.get_poll(WEEK)["message_id"], 10)
+        self.db.update_poll_message(WEEK, 11, 21)
+        self.assertEqual((self.db.get_poll(WEEK)["message_id"], self.db.get_poll(WEEK)["channel_id"]), (11, 21))
+        self.db.set_vote(WEEK, 1, 0)
+        self.db.mark_closed(WEEK)
+        self.assertEqual(self.db.get_poll(WEEK)["closed"], 1)
+        self.assertEqual(self.db.get_counts(WEEK), (1, 0))
+
+    def test_legacy_db_backfills_tally(self):
+        with sqlite3.connect(self.path) as c:
+            c.execute("DROP TABLE versus_tally")
+            c.executemany(
+                "INSERT INTO versus_votes (week_key, user_id, side) VALUES (?, ?, ?)",
+                [("2024-W17", uid, int(uid > 3)) for uid in range(1, 6)],
+            )
+        self.assertEqual(VersusDB(self.path).get_counts("2024-W17"), (3, 2))
+
+    def test_tally_matches_vote_rows(self):
+        with sqlite3.connect(self.path) as c:
+            c.execute("DELETE FROM versus_tally")
+            c.executemany(
+                "INSERT INTO versus_votes (week_key, user_id, side) VALUES (?, ?, ?)",
+                [(WEEK, uid, uid % 2) for uid in range(5000)],
+            )
+        self.db = VersusDB(self.path)
+        self.db.set_vote(WEEK, 5000, 0)
+        self.db.set_vote(WEEK, 5000, 1)
+        self.assertEqual(self.db.get_counts(WEEK), (2500, 2501))
+        self.assertEqual(self._scan(self.db), (2500, 2501))
+
+
+if __name__ == "__main__":
+    unittest.main()